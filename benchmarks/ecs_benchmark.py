@@ -0,0 +1,430 @@
+"""ECS 效能基準測試 (ECS benchmark)
+
+在無視窗 (headless) 環境下，以 src/ecs/systems.py 中現有的 Processors
+模擬一場約 2000 個實體的戰鬥，量測每幀耗時。
+
+用法 (於專案根目錄執行):
+    python -m benchmarks.ecs_benchmark
+    python -m benchmarks.ecs_benchmark --entities 2000 --frames 300
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import esper
+
+from src.core.config import TILE_SIZE, ECS_COLUMN_DTYPE
+from src.ecs.components import (
+    Position, Velocity, Health, Defense, Combat, Buffs, Collider, Renderable, Tag, COLUMN_COMPONENTS
+)
+from src.ecs.systems import (
+    MovementSystem, CombatSystem, HealthSystem, BuffSystem, EnergySystem, LifetimeSystem, TimerSystem
+)
+from src.entities.bullet.bullet import (
+    create_standard_bullet_entity, standard_bullet_components, BULLET_COMPONENT_TYPES, BULLET_POOL_SIZE
+)
+from src.entities.ecs_factory import (
+    create_damage_text_entity, DAMAGE_TEXT_COMPONENT_TYPES, DAMAGE_TEXT_POOL_SIZE
+)
+
+ARENA_TILES = 64  # 競技場邊長 (格)
+ENEMY_RATIO = 0.2  # 敵人佔實體總數的比例
+BULLETS_PER_FRAME = 20  # 每幀補充的子彈數量上限
+
+
+class _ArenaDungeon:
+    """四周為牆的方形競技場，只提供 MovementSystem 需要的屬性。"""
+
+    def __init__(self, size: int):
+        self.grid_width = size
+        self.grid_height = size
+        self.dungeon_tiles = [
+            ['Room_floor' if 0 < x < size - 1 and 0 < y < size - 1 else 'Wall'
+             for x in range(size)]
+            for y in range(size)
+        ]
+
+
+def _make_game(dungeon):
+    """建立只包含 Processors 會用到之屬性的假 Game 物件。"""
+    game = SimpleNamespace(
+        world=esper,
+        current_time=0.0,
+        dungeon_manager=SimpleNamespace(get_dungeon=lambda: dungeon, current_dungeon_config=None),
+    )
+    game.on_player_death = lambda: None
+    return game
+
+
+def _random_point(rng, margin=2):
+    low = margin * TILE_SIZE
+    high = (ARENA_TILES - margin) * TILE_SIZE
+    return rng.uniform(low, high), rng.uniform(low, high)
+
+
+def _spawn_enemy(rng):
+    x, y = _random_point(rng)
+    speed = rng.uniform(20.0, 60.0)
+    return esper.create_entity(
+        Position(x=x, y=y),
+        Velocity(x=rng.uniform(-1, 1) * speed, y=rng.uniform(-1, 1) * speed, speed=speed),
+        Health(max_hp=10 ** 6, current_hp=10 ** 6),
+        Defense(),
+        Combat(damage=1, collision_cooldown=0.5),
+        Buffs(),
+        Collider(w=32, h=32),
+        Renderable(w=32, h=32),
+        Tag(tag="enemy"),
+    )
+
+
+def _spawn_bullet(rng):
+    x, y = _random_point(rng)
+    dx, dy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+    norm = max((dx * dx + dy * dy) ** 0.5, 1e-6)
+    return create_standard_bullet_entity(
+        world=esper,
+        start_pos=(x, y),
+        w=8,
+        h=8,
+        tag="player",
+        direction=(dx / norm, dy / norm),
+        max_speed=rng.uniform(150.0, 300.0),
+        damage=5,
+        max_penetration_count=1,
+    )
+
+
+def setup_fight(entities: int = 2000, seed: int = 0, world: str = "benchmark", broadphase: bool = True,
+                batched: bool = True, columns: bool = False):
+    """在獨立的 esper World 中建立戰鬥場景，回傳 (game, rng)。
+
+    broadphase=False 時 CombatSystem 兩兩比對；batched=False 時 MovementSystem 逐一處理；
+    columns=True 時與 Game 相同，以欄式儲存 COLUMN_COMPONENTS (需要 NumPy)。
+    """
+    esper.switch_world(world)
+    esper.clear_database()
+    for processor in list(esper._processors):
+        esper.remove_processor(type(processor))
+    if columns:
+        for component_type in COLUMN_COMPONENTS:
+            esper.set_column_storage(component_type, ECS_COLUMN_DTYPE)
+
+    rng = random.Random(seed)
+    dungeon = _ArenaDungeon(ARENA_TILES)
+    game = _make_game(dungeon)
+    esper.game = game
+
+    esper.add_processor(MovementSystem(batched=batched))
+    esper.add_processor(CombatSystem(broadphase=broadphase))
+    esper.add_processor(HealthSystem())
+    esper.add_processor(BuffSystem())
+    esper.add_processor(EnergySystem())
+    esper.add_processor(LifetimeSystem())
+    esper.add_processor(TimerSystem())
+    # 與 Game 相同的執行順序 (add_processor 以 priority 排序，同優先度保持加入順序)
+
+    enemies = int(entities * ENEMY_RATIO)
+    for _ in range(enemies):
+        _spawn_enemy(rng)
+    for _ in range(entities - enemies):
+        _spawn_bullet(rng)
+    return game, rng
+
+
+def _timed(processor, samples):
+    """包裝 processor.process，將每次呼叫耗時累加到 samples[類別名稱]。"""
+    process = processor.process
+    name = type(processor).__name__
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        process(*args, **kwargs)
+        samples[name] = samples.get(name, 0.0) + time.perf_counter() - start
+
+    processor.process = wrapper
+
+
+def run_fight(entities: int = 2000, frames: int = 300, seed: int = 0, dt: float = 1.0 / 60,
+              broadphase: bool = True, batched: bool = True, columns: bool = False):
+    """執行戰鬥，回傳 (每幀耗時列表, {processor 名稱: 總耗時})，單位為秒。"""
+    previous_game = getattr(esper, "game", None)
+    previous_world = esper.current_world
+    game, rng = setup_fight(entities, seed, broadphase=broadphase, batched=batched, columns=columns)
+    bullets_target = entities - int(entities * ENEMY_RATIO)
+
+    processor_times = {}
+    for processor in esper._processors:
+        _timed(processor, processor_times)
+
+    frame_times = []
+    # Processors 目前大量使用 print，量測時將輸出導向空處避免 I/O 主導結果
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        for _ in range(frames):
+            # 補充被牆壁/穿透銷毀的子彈，模擬持續射擊
+            alive_bullets = sum(1 for _, tag in esper.get_component(Tag) if tag.tag == "player")
+            for _ in range(min(BULLETS_PER_FRAME, bullets_target - alive_bullets)):
+                _spawn_bullet(rng)
+
+            start = time.perf_counter()
+            esper.process(dt)
+            frame_times.append(time.perf_counter() - start)
+            game.current_time += dt
+            sink.seek(0)
+            sink.truncate()
+
+    if columns:
+        for component_type in COLUMN_COMPONENTS:
+            esper.set_column_storage(component_type, None)
+    esper.switch_world(previous_world)
+    esper.delete_world("benchmark")
+    esper.game = previous_game
+    return frame_times, processor_times
+
+
+# src/ecs/systems.py 中各 Processor 每幀發出的查詢
+SYSTEM_QUERIES = (
+    (Position, Velocity),
+    (Position, Renderable),
+    (Position, Combat),
+    (Health,),
+    (Buffs,),
+    (Combat,),
+    (Tag,),
+)
+
+
+def run_churn(entities: int = 2000, frames: int = 300, seed: int = 0):
+    """只量測 ECS 儲存層：每幀生成/刪除 BULLETS_PER_FRAME 顆子彈後執行所有系統查詢。
+
+    回傳每幀耗時 (秒) 的列表。
+    """
+    previous_game = getattr(esper, "game", None)
+    previous_world = esper.current_world
+    _, rng = setup_fight(entities, seed)
+    for processor in list(esper._processors):
+        esper.remove_processor(type(processor))
+
+    bullets = [ent for ent, tag in esper.get_component(Tag) if tag.tag == "player"]
+    frame_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        for _ in range(BULLETS_PER_FRAME):
+            esper.delete_entity(bullets.pop(0))
+            bullets.append(_spawn_bullet(rng))
+        esper.clear_dead_entities()
+        _run_queries()
+        frame_times.append(time.perf_counter() - start)
+
+    esper.switch_world(previous_world)
+    esper.delete_world("benchmark")
+    esper.game = previous_game
+    return frame_times
+
+
+def _run_queries():
+    for query in SYSTEM_QUERIES:
+        if len(query) == 1:
+            for _ in esper.get_component(query[0]):
+                pass
+        else:
+            for _ in esper.get_components(*query):
+                pass
+
+
+def run_burst(entities: int = 2000, bursts: int = 200, density: int = 12, seed: int = 0):
+    """比較逐顆 spawn 與 spawn_many 發射一圈 density 顆子彈 (之後執行系統查詢) 的耗時。
+
+    回傳 {"spawn": [...], "spawn_many": [...]}，單位為秒。
+    """
+    previous_game = getattr(esper, "game", None)
+    previous_world = esper.current_world
+    setup_fight(entities, seed)
+    for processor in list(esper._processors):
+        esper.remove_processor(type(processor))
+
+    results = {"spawn": [], "spawn_many": []}
+    for _ in range(bursts):
+        for mode, samples in results.items():
+            components = [
+                standard_bullet_components(start_pos=(512.0, 512.0), w=12, h=12, tag="enemy",
+                                           direction=(1.0, 0.0), max_speed=250.0, pass_wall=True)
+                for _ in range(density)
+            ]
+            start = time.perf_counter()
+            if mode == "spawn":
+                spawned = [esper.spawn(*bullet) for bullet in components]
+            else:
+                spawned = esper.spawn_many(components)
+            _run_queries()
+            samples.append(time.perf_counter() - start)
+            for ent in spawned:
+                esper.delete_entity(ent, immediate=True)
+
+    esper.switch_world(previous_world)
+    esper.delete_world("benchmark")
+    esper.game = previous_game
+    return results
+
+
+def run_integrate(entities: int = 2000, frames: int = 300, seed: int = 0, columns: bool = False,
+                  dt: float = 1.0 / 60):
+    """量測 Position += Velocity * dt 的積分：逐一存取組件，或以欄式儲存批次運算。
+
+    columns=True 時啟用 Position/Velocity 的欄式儲存並使用 esper.get_column_batch。
+    回傳每幀耗時 (秒) 的列表。
+    """
+    previous_world = esper.current_world
+    esper.switch_world("benchmark")
+    esper.clear_database()
+    if columns:
+        esper.set_column_storage(Position)
+        esper.set_column_storage(Velocity)
+    rng = random.Random(seed)
+    esper.spawn_many(
+        (Position(rng.uniform(0, 1000), rng.uniform(0, 1000)), Velocity(rng.uniform(-50, 50), rng.uniform(-50, 50)))
+        for _ in range(entities)
+    )
+
+    frame_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        if columns:
+            batch = esper.get_column_batch(Position, Velocity)
+            for name in ("x", "y"):
+                positions = batch.gather(Position, name)
+                velocities = batch.gather(Velocity, name)
+                if esper.COLUMN_BACKEND == "numpy":
+                    batch.scatter(Position, name, positions + velocities * dt)
+                else:
+                    batch.scatter(Position, name, [p + v * dt for p, v in zip(positions, velocities)])
+        else:
+            for _, (pos, vel) in esper.get_components(Position, Velocity):
+                pos.x += vel.x * dt
+                pos.y += vel.y * dt
+        frame_times.append(time.perf_counter() - start)
+
+    if columns:
+        esper.set_column_storage(Position, None)
+        esper.set_column_storage(Velocity, None)
+    esper.switch_world(previous_world)
+    esper.delete_world("benchmark")
+    return frame_times
+
+
+def _spawn_wave(rng, count):
+    """生成 count 顆子彈與 count 個傷害數字。"""
+    entities = [_spawn_bullet(rng) for _ in range(count)]
+    entities += [create_damage_text_entity(esper, x=100.0, y=100.0, damage=rng.randint(1, 99))
+                 for _ in range(count)]
+    return entities
+
+
+def run_allocations(count: int = 200, waves: int = 20, seed: int = 0):
+    """以 tracemalloc 量測生成子彈與傷害數字時新配置的記憶體區塊。
+
+    每一輪先刪除上一輪的實體 (進入回收池)，再以快照比較生成 count 顆子彈與
+    count 個傷害數字後新增的區塊數與位元組數。回傳
+    {"pooled": (blocks, bytes), "unpooled": (blocks, bytes)}，為每輪平均值。
+    """
+    previous_world = esper.current_world
+    results = {}
+    for mode in ("unpooled", "pooled"):
+        esper.switch_world("benchmark")
+        esper.clear_database()
+        rng = random.Random(seed)
+        if mode == "unpooled":
+            esper.set_recycling(BULLET_COMPONENT_TYPES, 0)
+            esper.set_recycling(DAMAGE_TEXT_COMPONENT_TYPES, 0)
+        else:
+            esper.set_recycling(BULLET_COMPONENT_TYPES, BULLET_POOL_SIZE)
+            esper.set_recycling(DAMAGE_TEXT_COMPONENT_TYPES, DAMAGE_TEXT_POOL_SIZE)
+
+        live = _spawn_wave(rng, count)  # 預熱: 讓回收池與查詢快取就緒
+        blocks = size = 0
+        tracemalloc.start()
+        for _ in range(waves):
+            for ent in live:
+                esper.delete_entity(ent)
+            esper.clear_dead_entities()
+
+            before = tracemalloc.take_snapshot()
+            live = _spawn_wave(rng, count)
+            after = tracemalloc.take_snapshot()
+            for stat in after.compare_to(before, "filename"):
+                if stat.traceback[0].filename != tracemalloc.__file__:
+                    blocks += stat.count_diff
+                    size += stat.size_diff
+        tracemalloc.stop()
+        results[mode] = (blocks / waves, size / waves)
+
+        esper.switch_world(previous_world)
+        esper.delete_world("benchmark")
+
+    esper.set_recycling(BULLET_COMPONENT_TYPES, BULLET_POOL_SIZE)
+    esper.set_recycling(DAMAGE_TEXT_COMPONENT_TYPES, DAMAGE_TEXT_POOL_SIZE)
+    return results
+
+
+def _summary(name: str, samples) -> str:
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"{name:<24} mean {mean * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ECS benchmark (headless)")
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    frame_times, processor_times = run_fight(args.entities, args.frames, args.seed)
+    print(_summary(f"fight ({args.entities} entities)", frame_times))
+    for name, total in sorted(processor_times.items(), key=lambda item: -item[1]):
+        print(f"  {name:<22} mean {total / args.frames * 1000:8.3f} ms")
+    # CombatSystem 網格寬相與兩兩比對：完整戰鬥與一個怪物房的規模
+    for entities in (args.entities, 150):
+        enemies = int(entities * ENEMY_RATIO)
+        for broadphase in (True, False):
+            _, processor_times = run_fight(entities, args.frames, args.seed, broadphase=broadphase)
+            print(f"{'combat (' + ('grid' if broadphase else 'pairwise') + ')':<24} mean "
+                  f"{processor_times['CombatSystem'] / args.frames * 1000:8.3f} ms   "
+                  f"({enemies} enemies + {entities - enemies} bullets)")
+    # MovementSystem 逐一處理 / 批次 (組件物件) / 批次 (欄式儲存)，並列出整幀耗時：
+    # 欄式儲存讓移動較快，但其他系統逐一存取 Position / Velocity 時要經過欄位檢視，整幀可能反而較慢
+    modes = [("per-entity", False, False), ("batched", True, False)]
+    if esper.COLUMN_BACKEND == "numpy":
+        modes.append(("batched + columns", True, True))
+    for label, batched, columns in modes:
+        frame_times, processor_times = run_fight(args.entities, args.frames, args.seed,
+                                                 batched=batched, columns=columns)
+        print(f"{'movement (' + label + ')':<24} mean "
+              f"{processor_times['MovementSystem'] / args.frames * 1000:8.3f} ms   "
+              f"frame {sum(frame_times) / len(frame_times) * 1000:8.3f} ms")
+    print(_summary("storage churn", run_churn(args.entities, args.frames, args.seed)))
+    for mode, samples in run_burst(args.entities, seed=args.seed).items():
+        print(_summary(f"radial burst ({mode})", samples))
+    print(_summary("integrate (objects)", run_integrate(args.entities, args.frames, args.seed)))
+    print(_summary(f"integrate ({esper.COLUMN_BACKEND} columns)",
+                   run_integrate(args.entities, args.frames, args.seed, columns=True)))
+    for mode, (blocks, size) in run_allocations().items():
+        print(f"{'allocations (' + mode + ')':<24} {blocks:10.0f} blocks {size / 1024:10.1f} KiB per 200 bullets + 200 texts")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
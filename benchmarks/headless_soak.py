@@ -0,0 +1,102 @@
+"""無視窗整局模擬 (headless soak)
+
+以 src.core.headless 建立完整的 Game (SDL dummy 驅動、無繪製、無音效)，
+直接進入地牢樓層 (預設地牢 3、seed 1，約 135 個敵人)，再以隨機的腳本輸入 (走動、朝畫面隨機位置施放技能)
+用最快速度模擬大量 tick，回報每個 tick 的平均耗時與各系統耗時。
+樓層上沒有敵人時 (例如地牢 1、seed 0 只有玩家) 量測沒有意義，直接回報錯誤。
+
+用法 (於專案根目錄執行):
+    python -m benchmarks.headless_soak
+    python -m benchmarks.headless_soak --ticks 5000 --dungeon 3 --seed 1
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+
+import pygame
+
+from src.core import rng as rng_streams
+from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.core.headless import create_headless_game, enter_dungeon
+from src.core.input import ScriptedInput
+from src.ecs.components import Tag
+
+MOVE_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+
+def random_script(ticks: int, seed: int = 0, hold: int = 30, click_every: int = 20) -> ScriptedInput:
+    """每 hold 幀換一個移動方向，並每 click_every 幀朝畫面隨機位置點擊一次。"""
+    rng = random.Random(seed)
+    script = ScriptedInput()
+    for frame in range(0, ticks, hold):
+        script.press(frame, rng.choice(MOVE_KEYS), frames=hold)
+    for frame in range(click_every, ticks, click_every):
+        script.click(frame, (rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT)))
+    return script
+
+
+def instrument_processors(game) -> dict:
+    """包住 game 的每個 ECS 系統以累計耗時，回傳 {系統名稱: 總耗時秒數} (執行中持續更新)。"""
+    processor_times = {}
+    for processor in game.world._processors:
+        original = processor.process
+        name = type(processor).__name__
+
+        def timed(*args, _original=original, _name=name, **kwargs):
+            start = time.perf_counter()
+            _original(*args, **kwargs)
+            processor_times[_name] = processor_times.get(_name, 0.0) + time.perf_counter() - start
+
+        processor.process = timed
+    return processor_times
+
+
+def run_soak(ticks: int = 3000, dungeon_id: int = 3, seed: int = 1):
+    """回傳 (每 tick 耗時列表, {系統名稱: 總耗時秒數}, 實際執行的 tick 數)。
+
+    進入的樓層沒有任何敵人時拋出 ValueError。
+    """
+    random.seed(seed)
+    rng_streams.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(random_script(ticks, seed))
+        enter_dungeon(game, dungeon_id)
+    if not any(tag.tag == "enemy" for _, tag in game.world.get_component(Tag)):
+        raise ValueError(f"Dungeon {dungeon_id} (seed {seed}) has no enemies to soak")
+
+    processor_times = instrument_processors(game)
+    tick_times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ticks):
+            start = time.perf_counter()
+            if not game.simulate(1):
+                break
+            tick_times.append(time.perf_counter() - start)
+    return tick_times, processor_times, len(tick_times)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless soak run of the whole game loop")
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--dungeon", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    try:
+        tick_times, processor_times, ticks = run_soak(args.ticks, args.dungeon, args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    total = sum(tick_times)
+    print(f"{ticks} ticks in {total:.3f} s ({total / max(ticks, 1) * 1000:.3f} ms/tick, "
+          f"{ticks / total if total else float('inf'):.0f} ticks/s)")
+    for name, spent in sorted(processor_times.items(), key=lambda item: -item[1]):
+        print(f"  {name:<22} mean {spent / max(ticks, 1) * 1000:8.3f} ms")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""日誌開銷量測 (logging benchmark)
+
+以 src.core.headless 建立完整的 Game 並進入地牢，每一幀執行 update_frame 與
+RenderManager.draw_playing (繪製到離屏 Surface)，輪流在兩種日誌設定下量測幀時間：
+  - off:   預設等級 (WARNING)，除錯訊息在 debug_on 檢查處即返回
+  - debug: 所有分類 DEBUG，訊息格式化後寫到 os.devnull
+           (相當於原本每幀、每次命中無條件 print 的成本)
+兩種設定交錯執行多輪，抵消遊戲狀態 (敵人數量、子彈數量) 隨時間變化的影響；
+update (模擬) 與 draw (繪製) 的耗時分開回報。
+
+用法 (於專案根目錄執行):
+    python -m benchmarks.logging_benchmark
+    python -m benchmarks.logging_benchmark --frames 300 --rounds 5 --dungeon 1
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+import pygame
+
+from src.core import log
+from src.core.headless import create_headless_game, enter_dungeon
+from benchmarks.headless_soak import random_script
+
+MODES = ("off", "debug")
+
+
+def run_benchmark(frames: int = 300, rounds: int = 5, dungeon_id: int = 1, seed: int = 0):
+    """回傳 {設定: [(update 耗時, draw 耗時), ...] (秒)}。"""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(random_script(frames * rounds * len(MODES), seed))
+        enter_dungeon(game, dungeon_id)
+
+    frame_times = {mode: [] for mode in MODES}
+    with open(os.devnull, "w") as devnull:
+        try:
+            for _ in range(rounds):
+                for mode in MODES:
+                    log.configure("DEBUG" if mode == "debug" else "WARNING", {}, stream=devnull)
+                    times = frame_times[mode]
+                    for _ in range(frames):
+                        start = time.perf_counter()
+                        if not game.update_frame(game.timestep.dt):
+                            return frame_times
+                        updated = time.perf_counter()
+                        game.render_manager.draw_playing()
+                        times.append((updated - start, time.perf_counter() - updated))
+        finally:
+            log.configure("WARNING", {}, stream=sys.stderr)
+    return frame_times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Frame time with logging disabled vs. fully enabled")
+    parser.add_argument("--frames", type=int, default=300, help="frames per mode per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--dungeon", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.frames, args.rounds, args.dungeon, args.seed)
+    means = {}
+    for mode, times in results.items():
+        if not times:
+            continue
+        frame = sorted(update + draw for update, draw in times)
+        means[mode] = statistics.fmean(frame)
+        print(f"{mode:<6} {len(times):6d} frames   frame mean {means[mode] * 1000:7.3f} ms "
+              f"(p95 {frame[int(len(frame) * 0.95)] * 1000:7.3f})   "
+              f"update {statistics.fmean(update for update, _ in times) * 1000:7.3f} ms   "
+              f"draw {statistics.fmean(draw for _, draw in times) * 1000:7.3f} ms")
+    if len(means) == len(MODES):
+        saved = means["debug"] - means["off"]
+        print(f"disabled logging saves {saved * 1000:.3f} ms/frame ({saved / means['debug'] * 100:.1f}%)")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""組件記憶體報告 (memory report)
+
+量測一顆子彈、一個敵人與一個 Buff 佔用的記憶體：
+  - components: 每個組件實例本身 (含 __dict__，若有) 的 sys.getsizeof 總和
+  - allocated: 以 tracemalloc 量測生成 count 個實體新配置的位元組數 / count
+    (包含 esper 的索引、容器欄位與敵人的行為樹等)
+
+用法 (於專案根目錄執行):
+    python -m benchmarks.memory_report
+    python -m benchmarks.memory_report --count 2000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import esper
+
+from src.buffs.element_buff import ELEMENTAL_BUFFS
+from src.entities.bullet.bullet import create_standard_bullet_entity, BULLET_COMPONENT_TYPES, BULLET_POOL_SIZE
+from src.entities.ecs_factory import create_enemy1_entity
+
+
+def instance_size(obj) -> int:
+    """物件本身加上其 __dict__ (沒有 __slots__ 時) 的大小。"""
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, '__dict__', None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+
+def _spawn_bullet(index: int) -> int:
+    return create_standard_bullet_entity(esper, start_pos=(index, 0.0), direction=(1.0, 0.0), damage=5)
+
+
+def _spawn_enemy(index: int) -> int:
+    return create_enemy1_entity(esper, x=float(index), y=0.0)
+
+
+def _measure(spawn, count: int) -> float:
+    """tracemalloc 量測 spawn(i) 執行 count 次後仍存活的配置，回傳每次的平均位元組數。"""
+    spawn(-1)  # 預熱: 建立 archetype 與查詢快取
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for index in range(count):
+        keep.append(spawn(index))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename")
+               if stat.traceback[0].filename != tracemalloc.__file__)
+    return size / count
+
+
+def run_report(count: int = 1000):
+    """回傳 {名稱: (components 位元組, allocated 位元組, {組件名稱: 位元組})}。"""
+    previous_world = esper.current_world
+    esper.switch_world("memory_report")
+    esper.set_recycling(BULLET_COMPONENT_TYPES, 0)
+    report = {}
+    try:
+        for name, spawn in (("bullet", _spawn_bullet), ("enemy", _spawn_enemy)):
+            esper.clear_database()
+            with contextlib.redirect_stdout(io.StringIO()):
+                allocated = _measure(spawn, count)
+                sample = spawn(0)
+            sizes = {type(component).__name__: instance_size(component)
+                     for component in esper.components_for_entity(sample)}
+            report[name] = (sum(sizes.values()), allocated, sizes)
+
+        template = ELEMENTAL_BUFFS['fire']
+        buffs = []
+        allocated = _measure(lambda index: buffs.append(template.deepcopy()), count)
+        size = instance_size(template)
+        report["buff"] = (size, allocated, {type(template).__name__: size})
+    finally:
+        esper.set_recycling(BULLET_COMPONENT_TYPES, BULLET_POOL_SIZE)
+        esper.switch_world(previous_world)
+        esper.delete_world("memory_report")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory used per bullet, enemy and buff")
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    for name, (components, allocated, sizes) in run_report(args.count).items():
+        print(f"{name:<8} components {components:6d} B   allocated {allocated:9.1f} B")
+        for component_name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            print(f"    {component_name:<24} {size:6d} B")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""錄影重播量測 (replay benchmark)
+
+在無視窗模式下以最快速度重播 `python main.py --record PATH` 錄下的遊戲 (見 src/core/replay.py)，
+回報每幀耗時 (平均、p95、最大)、各系統耗時，以及結束時 World 的摘要雜湊。
+同一段錄影在不同 commit 上的模擬結果相同 (雜湊一致)，耗時即可直接比較；
+雜湊不同表示遊戲邏輯的行為改變了，此時耗時的比較沒有意義。
+
+用法 (於專案根目錄執行):
+    python main.py --record boss.replay
+    PYTHONHASHSEED=0 python -m benchmarks.replay_benchmark boss.replay --repeat 3
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+import pygame
+import esper
+
+from src.core import replay
+from benchmarks.headless_soak import instrument_processors
+
+
+def run_replay(recording: replay.Recording):
+    """
+    重播一次，回傳 (每幀耗時列表, {系統名稱: 總耗時秒數}, tick 數, World 摘要雜湊)。
+    每次都從空的 esper World 開始 (如同剛啟動的遊戲)，結束後丟棄重播建立的所有 World。
+    """
+    esper.switch_world("replay")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = replay.replay_game(recording)
+        processor_times = instrument_processors(game)
+        frame_times = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for dt in recording.dts:
+                start = time.perf_counter()
+                running = game.update_frame(dt)
+                frame_times.append(time.perf_counter() - start)
+                if not running:
+                    break
+        return frame_times, processor_times, game.timestep.ticks, replay.world_digest(game)
+    finally:
+        esper.switch_world("default")
+        for name in set(esper.list_worlds()) - {"default"}:
+            esper.delete_world(name)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless replay of a recorded session")
+    parser.add_argument("path", help="recording written by main.py --record")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    recording = replay.Recording.load(args.path)
+    print(f"{args.path}: {recording.frames} frames, seed {recording.seed}")
+    digests = set()
+    for run in range(args.repeat):
+        frame_times, processor_times, ticks, digest = run_replay(recording)
+        digests.add(digest)
+        ordered = sorted(frame_times)
+        total = sum(frame_times)
+        print(f"run {run + 1}: {len(frame_times)} frames / {ticks} ticks in {total:.3f} s   "
+              f"mean {statistics.fmean(frame_times) * 1000:.3f} ms   "
+              f"p95 {ordered[int(len(ordered) * 0.95)] * 1000:.3f} ms   max {ordered[-1] * 1000:.3f} ms")
+        for name, spent in sorted(processor_times.items(), key=lambda item: -item[1]):
+            print(f"  {name:<22} mean {spent / max(ticks, 1) * 1000:8.3f} ms/tick")
+    print(f"world digest {' / '.join(sorted(digests))}")
+    pygame.quit()
+    if len(digests) > 1:
+        print("replay is not deterministic: runs ended in different states")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""世界快照量測 (snapshot benchmark)
+
+以 src.core.headless 建立完整的 Game 並進入地牢 (預設地牢 3、seed 1，約 135 個敵人)，模擬數百幀後 (可另外加入 --enemies 個
+Enemy1 壓測)，重複量測 src/core/snapshot.py 的：
+  - capture: 擷取 World / 地牢 / 迷霧為各區段
+  - encode:  capture + 組成快照檔的位元組 (dumps)
+  - write:   dumps + 寫入檔案 (save)
+  - load:    mmap 映射檔案 + 還原整個樓層 (load)
+並回報快照大小與各區段的大小。
+
+用法 (於專案根目錄執行):
+    python -m benchmarks.snapshot_benchmark
+    python -m benchmarks.snapshot_benchmark --enemies 500 --repeat 50 --dungeon 3 --seed 1
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import pygame
+import esper
+
+from src.core import rng, snapshot
+from src.core.config import TILE_SIZE
+from src.core.headless import create_headless_game, enter_dungeon
+from src.entities.ecs_factory import create_enemy1_entity
+from benchmarks.headless_soak import random_script
+
+
+def prepare_game(frames: int = 300, enemies: int = 0, dungeon_id: int = 3, seed: int = 1):
+    """建立遊戲並推進到樓層中途；enemies > 0 時在玩家周圍額外生成敵人。"""
+    random.seed(seed)
+    rng.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(random_script(frames, seed))
+        enter_dungeon(game, dungeon_id)
+        player = game.entity_manager.player
+        for i in range(enemies):
+            angle = 2 * math.pi * i / enemies
+            create_enemy1_entity(esper, player.x + 12 * TILE_SIZE * math.cos(angle),
+                                 player.y + 12 * TILE_SIZE * math.sin(angle), game)
+        game.simulate(frames)
+    return game
+
+
+def _time(func, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_benchmark(frames: int = 300, enemies: int = 0, repeat: int = 30, dungeon_id: int = 3, seed: int = 1):
+    """回傳 ({量測項目: [耗時 (秒), ...]}, 快照大小, {區段: 大小}, 實體數)。"""
+    game = prepare_game(frames, enemies, dungeon_id, seed)
+    entity_count = len(esper._entities)
+    sections = snapshot.capture(game)
+    fd, path = tempfile.mkstemp(suffix=".snap")
+    os.close(fd)
+    try:
+        results = {
+            "capture": _time(lambda: snapshot.capture(game), repeat),
+            "encode": _time(lambda: snapshot.dumps(game), repeat),
+            "write": _time(lambda: snapshot.save(game, path), repeat),
+            "load": _time(lambda: snapshot.load(game, path), repeat),
+        }
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+    return results, size, {name: len(data) for name, (_, data) in sections.items()}, entity_count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="World snapshot write / load time and size")
+    parser.add_argument("--frames", type=int, default=300, help="frames simulated before snapshotting")
+    parser.add_argument("--enemies", type=int, default=0, help="extra enemies spawned around the player")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--dungeon", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sections", action="store_true", help="print the size of every section")
+    args = parser.parse_args(argv)
+
+    results, size, sections, entity_count = run_benchmark(
+        args.frames, args.enemies, args.repeat, args.dungeon, args.seed)
+    print(f"{entity_count} entities, snapshot {size} bytes ({size / 1024:.1f} KiB), "
+          f"NumPy {'on' if snapshot.np is not None else 'off'}")
+    for name, times in results.items():
+        ordered = sorted(times)
+        print(f"{name:<8} mean {statistics.fmean(times) * 1000:7.3f} ms   "
+              f"min {ordered[0] * 1000:7.3f} ms   p95 {ordered[int(len(ordered) * 0.95)] * 1000:7.3f} ms")
+    if args.sections:
+        for name, nbytes in sorted(sections.items(), key=lambda item: -item[1]):
+            print(f"  {name:<56} {nbytes:8d}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from types import MethodType as _MethodType
 from typing import Any as _Any
 from typing import Callable as _Callable
 from typing import Dict as _Dict
+from typing import FrozenSet as _FrozenSet
 from typing import List as _List
 from typing import Set as _Set
 from typing import Type as _Type
@@ -23,8 +24,20 @@ from weakref import WeakMethod as _WeakMethod
 
 from itertools import count as _count
 
+from array import array as _array
+from dataclasses import fields as _dataclass_fields
+from dataclasses import is_dataclass as _is_dataclass
+
+try:
+    import numpy as _np
+except ImportError:  # NumPy is optional; columns fall back to array.array
+    _np = None
+
 __version__ = version = '3.3'
 
+COLUMN_BACKEND: str = 'numpy' if _np is not None else 'array'
+"""The storage used by column-backed Components: ``'numpy'`` or ``'array'``."""
+
 
 ###################
 #  Event system
@@ -89,6 +102,96 @@ def remove_handler(name: str, func: _Callable[..., None]) -> None:
         del event_registry[name]
 
 
+def emit(event: _Any) -> None:
+    """Queue a typed event in the current World.
+
+    Unlike :py:func:`esper.dispatch_event`, nothing is called right away.
+    The event's type is its channel: Processors that run later in the
+    same frame can read it with :py:func:`esper.get_events`, and at the
+    end of the frame all events of a type are delivered together to the
+    handlers registered with :py:func:`esper.subscribe`.
+    """
+    try:
+        _events[type(event)].append(event)
+    except KeyError:
+        _events[type(event)] = [event]
+
+
+def get_events(event_type: _Type[_Any]) -> _List[_Any]:
+    """Get the events of exactly this type queued in the current World this frame.
+
+    Events are returned in the order they were emitted. The list is the
+    queue itself, so events emitted while iterating over it are also
+    visited; it must not be modified.
+    """
+    return _events.get(event_type, [])
+
+
+def _make_subscriber_callback(event_type: _Type[_Any]) -> _Callable[[_Any], None]:
+    """Create an internal callback to remove dead subscribers."""
+
+    def callback(weak_handler: _Any) -> None:
+        handlers = _event_subscribers.get(event_type)
+        if handlers is not None and weak_handler in handlers:
+            handlers.remove(weak_handler)
+            if not handlers:
+                del _event_subscribers[event_type]
+
+    return callback
+
+
+def subscribe(event_type: _Type[_Any], handler: _Callable[[_List[_Any]], None]) -> None:
+    """Register a function to handle the queued events of a type, in batches.
+
+    Once per frame, the handler is called with the list of all events of
+    `event_type` emitted in the active World, in emission order (see
+    :py:func:`esper.flush_events`). Handlers are called in the order they
+    subscribed. Subscriptions are shared by all Worlds.
+
+    .. note:: A weak reference is kept to the passed function,
+    """
+    if isinstance(handler, _MethodType):
+        weak_handler = _WeakMethod(handler, _make_subscriber_callback(event_type))
+    else:
+        weak_handler = _ref(handler, _make_subscriber_callback(event_type))
+    _event_subscribers.setdefault(event_type, []).append(weak_handler)
+
+
+def unsubscribe(event_type: _Type[_Any], handler: _Callable[[_List[_Any]], None]) -> None:
+    """Stop delivering events of a type to a handler.
+
+    If the handler is not subscribed to the type, this function call
+    will pass silently.
+    """
+    handlers = _event_subscribers.get(event_type, [])
+    for weak_handler in handlers:
+        if weak_handler() == handler:
+            handlers.remove(weak_handler)
+            break
+    if not handlers:
+        _event_subscribers.pop(event_type, None)
+
+
+def flush_events() -> None:
+    """Deliver the queued events of the current World to their subscribers.
+
+    Each subscriber of a type is called once with all of its events.
+    Types are handled in the order their first event was emitted. Events
+    emitted by the handlers are delivered in the same call. The queue is
+    empty afterwards. This is called by :py:func:`esper.process` after
+    all Processors have run, before the :py:data:`esper.command_buffer`
+    is played back.
+    """
+    while _events:
+        pending = dict(_events)
+        _events.clear()
+        for event_type, events in pending.items():
+            for weak_handler in list(_event_subscribers.get(event_type, ())):
+                handler = weak_handler()
+                if handler is not None:
+                    handler(events)
+
+
 ###################
 #   ECS Classes
 ###################
@@ -131,14 +234,455 @@ class Processor:
 #   ECS functions
 ###################
 
+_Signature = _FrozenSet[_Type[_Any]]
+
+
+class _Query:
+    """An incrementally updated result for one Component query.
+
+    The rows are stored in an insertion ordered ``{entity: components}``
+    dictionary that is patched in place whenever an Entity enters or leaves
+    the query (by changing its archetype), or replaces one of the queried
+    Component instances. The list returned to callers is built lazily from
+    the rows and only rebuilt after they have changed. Lists that were
+    already handed out are never mutated, so iterating over one while the
+    database is being modified is still safe.
+    """
+
+    __slots__ = ('component_types', 'signature', 'single', 'rows', 'result', 'batch')
+
+    def __init__(self, component_types: _Tuple[_Type[_Any], ...], single: bool) -> None:
+        self.component_types = component_types
+        self.signature: _Signature = frozenset(component_types)
+        self.single = single
+        self.rows: _Dict[int, _Any] = {}
+        self.result: _Optional[_List[_Any]] = None
+        self.batch: _Optional["ColumnBatch"] = None
+
+    def matches(self, signature: _Signature) -> bool:
+        return self.signature <= signature
+
+    def insert(self, entity: int, entity_components: _Dict[_Type[_Any], _Any]) -> None:
+        if self.single:
+            self.rows[entity] = entity_components[self.component_types[0]]
+        else:
+            self.rows[entity] = [entity_components[ct] for ct in self.component_types]
+        self.result = self.batch = None
+
+    def insert_many(self, entities: _Iterable[int], entity_db: _Dict[int, _Dict[_Type[_Any], _Any]]) -> None:
+        rows = self.rows
+        if self.single:
+            component_type = self.component_types[0]
+            for entity in entities:
+                rows[entity] = entity_db[entity][component_type]
+        else:
+            component_types = self.component_types
+            for entity in entities:
+                entity_components = entity_db[entity]
+                rows[entity] = [entity_components[ct] for ct in component_types]
+        self.result = self.batch = None
+
+    def discard(self, entity: int) -> None:
+        if entity in self.rows:
+            del self.rows[entity]
+            self.result = self.batch = None
+
+    def get(self) -> _List[_Any]:
+        if self.result is None:
+            self.result = list(self.rows.items())
+        return self.result
+
+
+# Array storage for each supported column dtype: (NumPy dtype, array.array typecode)
+_COLUMN_DTYPES = {'float64': 'd', 'float32': 'f'}
+
+
+def _column_property(columns: _List[_Any], index: int, name: str) -> property:
+    """A property that reads and writes one field of a column-backed Component."""
+    if _np is not None:
+        def fget(self: _Any) -> float:
+            return columns[index].item(self._slot)  # type: ignore[no-any-return]
+    else:
+        def fget(self: _Any) -> float:
+            return columns[index][self._slot]  # type: ignore[no-any-return]
+
+    def fset(self: _Any, value: float) -> None:
+        columns[index][self._slot] = value
+
+    return property(fget, fset, doc=f"Column-backed field '{name}'.")
+
+
+class ColumnStore:
+    """Dense, contiguous storage for the fields of one numeric Component type.
+
+    Column storage is enabled per Component type with
+    :py:func:`esper.set_column_storage`, and each World keeps one store per
+    type. Every instance of the type in the World gets a slot (row): its
+    field values live in one array per field (NumPy arrays when NumPy is
+    installed, :py:class:`array.array` otherwise), and the instance becomes
+    a view whose attributes read and write its row. Slots are kept dense,
+    so removing an Entity moves the last row into the hole.
+
+    The instances keep their identity, so existing references and query
+    results stay valid and ``pos.x += 1`` still works. When a Component
+    leaves the store (its Entity is deleted, or the Component is removed
+    or replaced), it is detached again, keeping its last values as a plain
+    instance.
+    """
+
+    __slots__ = ('component_type', 'view_type', 'dtype', 'fields', 'field_index',
+                 'columns', 'entities', 'views', 'slot_of', 'version')
+
+    def __init__(self, component_type: _Type[_Any], dtype: str = 'float64') -> None:
+        _check_column_type(component_type)
+        if dtype not in _COLUMN_DTYPES:
+            raise ValueError(f"Unsupported column dtype: {dtype!r}")
+        self.component_type = component_type
+        self.dtype = dtype
+        self.fields: _Tuple[str, ...] = tuple(field.name for field in _dataclass_fields(component_type))
+        self.field_index: _Dict[str, int] = {name: index for index, name in enumerate(self.fields)}
+        if _np is not None:
+            self.columns: _List[_Any] = [_np.zeros(64, dtype=dtype) for _ in self.fields]
+        else:
+            self.columns = [_array(_COLUMN_DTYPES[dtype]) for _ in self.fields]
+        # slot -> Entity, slot -> Component instance, and Entity -> slot:
+        self.entities: _List[int] = []
+        self.views: _List[_Any] = []
+        self.slot_of: _Dict[int, int] = {}
+        # Bumped whenever an existing row moves to a different slot:
+        self.version = 0
+        self.view_type = self._make_view_type()
+        _view_bases[self.view_type] = component_type
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def _make_view_type(self) -> _Type[_Any]:
+        base = self.component_type
+        names = self.fields
+
+        def __eq__(self: _Any, other: _Any) -> bool:
+            if isinstance(other, base):
+                return tuple(getattr(self, name) for name in names) == tuple(getattr(other, name) for name in names)
+            return NotImplemented
+
+        def __reduce__(self: _Any) -> _Tuple[_Any, ...]:
+            # Copies and pickles are plain instances, not tied to this store:
+            return base, tuple(getattr(self, name) for name in names)
+
+        namespace: _Dict[str, _Any] = {
+            '__module__': base.__module__,
+            '__qualname__': base.__qualname__,
+            '__eq__': __eq__,
+            '__hash__': None,
+            '__reduce__': __reduce__,
+        }
+        for index, name in enumerate(names):
+            namespace[name] = _column_property(self.columns, index, name)
+        return type(base.__name__, (base,), namespace)
+
+    def _write(self, slot: int, component: _Any) -> _Any:
+        """Move a Component's field values into a slot, and turn it into a view of that slot."""
+        if type(component) is not self.component_type:
+            # A view of another store (for example, copied from another World):
+            component = self.component_type(*[getattr(component, name) for name in self.fields])
+        values = component.__dict__
+        if slot == len(self.entities) and _np is None:
+            for column, name in zip(self.columns, self.fields):
+                column.append(values.pop(name))
+        else:
+            for column, name in zip(self.columns, self.fields):
+                column[slot] = values.pop(name)
+        component.__class__ = self.view_type
+        component._slot = slot
+        return component
+
+    def _detach(self, slot: int) -> _Any:
+        """Turn the view in a slot back into a plain instance holding its current values."""
+        component = self.views[slot]
+        values = component.__dict__
+        for name in self.fields:
+            values[name] = getattr(component, name)
+        del values['_slot']
+        component.__class__ = self.component_type
+        return component
+
+    def add(self, entity: int, component: _Any) -> _Any:
+        """Give an Entity's Component a new slot. Returns the view to store in the World."""
+        slot = len(self.entities)
+        if _np is not None and slot == len(self.columns[0]):
+            for index, column in enumerate(self.columns):
+                grown = _np.zeros(slot * 2, dtype=self.dtype)
+                grown[:slot] = column
+                self.columns[index] = grown
+        component = self._write(slot, component)
+        self.entities.append(entity)
+        self.views.append(component)
+        self.slot_of[entity] = slot
+        return component
+
+    def replace(self, entity: int, component: _Any) -> _Any:
+        """Put a new Component instance in an Entity's slot, detaching the old one."""
+        slot = self.slot_of[entity]
+        if component is self.views[slot]:
+            return component
+        self._detach(slot)
+        component = self.views[slot] = self._write(slot, component)
+        return component
+
+    def remove(self, entity: int) -> _Any:
+        """Free an Entity's slot. Returns its Component, detached."""
+        slot = self.slot_of.pop(entity)
+        component = self._detach(slot)
+        last = len(self.entities) - 1
+        if slot != last:
+            for column in self.columns:
+                column[slot] = column[last]
+            moved = self.views[slot] = self.views[last]
+            moved._slot = slot
+            moved_entity = self.entities[slot] = self.entities[last]
+            self.slot_of[moved_entity] = slot
+            self.version += 1
+        self.entities.pop()
+        self.views.pop()
+        if _np is None:
+            for column in self.columns:
+                column.pop()
+        return component
+
+    def clear(self) -> None:
+        """Detach every Component and empty the store."""
+        for slot in range(len(self.views)):
+            self._detach(slot)
+        self.entities.clear()
+        self.views.clear()
+        self.slot_of.clear()
+        if _np is None:
+            for column in self.columns:
+                del column[:]
+        self.version += 1
+
+    def column(self, name: str) -> _Any:
+        """The live array of one field, indexed by slot (see :py:attr:`entities`).
+
+        Writes to the array are seen by the Component views. The array is
+        only valid until the next structural change to the store.
+        """
+        column = self.columns[self.field_index[name]]
+        if _np is not None:
+            return column[:len(self.entities)]
+        return column
+
+
+class ColumnBatch:
+    """Column slots of every Entity in one query, for vectorized Processors.
+
+    Returned by :py:func:`esper.get_column_batch`. :py:attr:`entities` lists
+    the matching Entities in query order. :py:meth:`gather` reads one field
+    of one Component type for all of them, and :py:meth:`scatter` writes
+    values back. With NumPy, the values are arrays and each call is a single
+    fancy-indexing operation; without it, they are plain lists.
+    """
+
+    __slots__ = ('entities', '_stores', '_slots', '_versions')
+
+    def __init__(self, entities: _List[int], stores: _Dict[_Type[_Any], ColumnStore]) -> None:
+        self.entities = entities
+        self._stores = stores
+        self._slots: _Dict[_Type[_Any], _Any] = {}
+        for component_type, store in stores.items():
+            slot_of = store.slot_of
+            slots = [slot_of[entity] for entity in entities]
+            self._slots[component_type] = _np.array(slots, dtype=_np.intp) if _np is not None else slots
+        self._versions = tuple(store.version for store in stores.values())
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def is_current(self) -> bool:
+        """False once a row of one of the stores has moved to another slot."""
+        return self._versions == tuple(store.version for store in self._stores.values())
+
+    def gather(self, component_type: _Type[_Any], name: str) -> _Any:
+        """Read one field of `component_type` for every Entity in the batch."""
+        store = self._stores[component_type]
+        column = store.columns[store.field_index[name]]
+        slots = self._slots[component_type]
+        if _np is not None:
+            return column[slots]
+        return [column[slot] for slot in slots]
+
+    def scatter(self, component_type: _Type[_Any], name: str, values: _Iterable[float]) -> None:
+        """Write one field of `component_type` for every Entity in the batch."""
+        store = self._stores[component_type]
+        column = store.columns[store.field_index[name]]
+        slots = self._slots[component_type]
+        if _np is not None:
+            column[slots] = values
+        else:
+            for slot, value in zip(slots, values):
+                column[slot] = value
+
+
+class _ChangeLog:
+    """The recent changes to one tracked Component type in a World.
+
+    Each dictionary maps an Entity to the tick of its last addition,
+    change or removal, and is kept in tick order, so a reader only walks
+    the entries that are newer than its own tick.
+    """
+
+    __slots__ = ('added', 'changed', 'removed')
+
+    def __init__(self) -> None:
+        self.added: _Dict[int, int] = {}
+        self.changed: _Dict[int, int] = {}
+        self.removed: _Dict[int, int] = {}
+
+    @staticmethod
+    def touch(log: _Dict[int, int], entity: int, tick: int) -> None:
+        log.pop(entity, None)
+        log[entity] = tick
+
+    @staticmethod
+    def since(log: _Dict[int, int], tick: int) -> _List[int]:
+        entities = []
+        for entity, entry_tick in reversed(log.items()):
+            if entry_tick <= tick:
+                break
+            entities.append(entity)
+        entities.reverse()
+        return entities
+
+
+class CommandBuffer:
+    """Records structural changes to be applied later, at a sync point.
+
+    Processors should not create or destroy Entities while they are
+    iterating over a query. Instead, they can write to the current World's
+    buffer (:py:data:`esper.command_buffer`)::
+
+        for ent, (pos, col) in esper.get_components(Position, Collider):
+            if hit_wall(pos):
+                esper.command_buffer.delete_entity(ent)
+
+    The buffer is played back in recording order at the end of every call
+    to :py:func:`esper.process`, after all Processors have run, so every
+    Processor in a frame sees the same (cached) query results.
+
+    The buffer mirrors the structural part of the module API, so factory
+    functions that take a `world` argument can be pointed at it directly.
+    Entity IDs for buffered spawns are reserved right away, although the
+    Entities only exist after playback. Deleted Entities stop counting as
+    existent (see :py:func:`esper.entity_exists`) as soon as the deletion
+    is recorded, which lets Processors skip them for the rest of the frame.
+    """
+
+    __slots__ = ('_commands',)
+
+    def __init__(self) -> None:
+        self._commands: _List[_Tuple[_Callable[..., _Any], _Tuple[_Any, ...], _Dict[str, _Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def spawn(self, *components: _Any) -> int:
+        """Reserve an Entity ID, and create the Entity with these Components on playback."""
+        entity = next(_entity_count)
+        self._commands.append((_insert_entity, (entity, components), {}))
+        return entity
+
+    create_entity = spawn
+
+    def spawn_many(self, component_sets: _Iterable[_Iterable[_Any]]) -> _List[int]:
+        """Reserve Entity IDs, and create all the Entities as one batch on playback."""
+        component_sets = list(component_sets)
+        entities = [next(_entity_count) for _ in component_sets]
+        self._commands.append((_insert_many, (entities, component_sets), {}))
+        return entities
+
+    def respawn(self, entity: int, *components: _Any) -> int:
+        """Re-create a retired Entity ID with these Components on playback."""
+        self._commands.append((_insert_entity, (entity, components), {}))
+        return entity
+
+    def add_component(self, entity: int, component_instance: _Any, type_alias: _Optional[_Type[_Any]] = None) -> None:
+        """Add (or replace) a Component on playback. Skipped if the Entity no longer exists."""
+        self._commands.append((_deferred_add_component, (entity, component_instance, type_alias), {}))
+
+    def remove_component(self, entity: int, component_type: _Type[_Any]) -> None:
+        """Remove a Component on playback. Skipped if it is no longer present."""
+        self._commands.append((_deferred_remove_component, (entity, component_type), {}))
+
+    def delete_entity(self, entity: int) -> None:
+        """Delete an Entity on playback. It stops counting as existent immediately."""
+        _dead_entities.add(entity)
+
+    def call(self, func: _Callable[..., _Any], *args: _Any, **kwargs: _Any) -> None:
+        """Call any function on playback, for work that needs the new Entities to be live."""
+        self._commands.append((func, args, kwargs))
+
+    def clear(self) -> None:
+        """Discard all recorded commands without applying them."""
+        self._commands.clear()
+
+    def playback(self) -> None:
+        """Apply all recorded commands in order, then finalize the deletions.
+
+        Commands recorded during playback are applied in the same call.
+        """
+        while self._commands:
+            commands, self._commands = self._commands, []
+            for func, args, kwargs in commands:
+                func(*args, **kwargs)
+        clear_dead_entities()
+
+
 _current_world: str = "default"
 _entity_count: "_count[int]" = _count(start=1)
-_components: _Dict[_Type[_Any], _Set[_Any]] = {}
 _entities: _Dict[int, _Dict[_Type[_Any], _Any]] = {}
 _dead_entities: _Set[int] = set()
-_get_component_cache: _Dict[_Type[_Any], _List[_Any]] = {}
-_get_components_cache: _Dict[_Tuple[_Type[_Any], ...], _List[_Any]] = {}
+# Archetype tables: every distinct Component signature maps to the
+# Entities that currently have exactly that set of Component types.
+_archetypes: _Dict[_Signature, _Set[int]] = {}
+_entity_signatures: _Dict[int, _Signature] = {}
+# The cached queries that match each archetype's signature:
+_archetype_queries: _Dict[_Signature, _List[_Query]] = {}
+# Retired (deleted) Entities kept for reuse, for signatures registered
+# with :py:func:`esper.set_recycling`: {signature: [(entity, components), ...]}
+_retired: _Dict[_Signature, _List[_Tuple[int, _Dict[_Type[_Any], _Any]]]] = {}
+# {signature: max retired Entities kept per World}, shared by all Worlds:
+_recycle_limits: _Dict[_Signature, int] = {}
+# Column stores of the World, for types registered with :py:func:`esper.set_column_storage`:
+_columns: _Dict[_Type[_Any], ColumnStore] = {}
+# {component_type: dtype}, shared by all Worlds:
+_column_dtypes: _Dict[_Type[_Any], str] = {}
+# {view_type: component_type} for the views created by every ColumnStore:
+_view_bases: _Dict[_Type[_Any], _Type[_Any]] = {}
+# The Component type and attribute registered with :py:func:`esper.set_tag_index`,
+# shared by all Worlds:
+_tag_type: _Optional[_Type[_Any]] = None
+_tag_attribute: str = 'tag'
+# Tag index of the World: {tag: {entity: None}} (insertion ordered) and {entity: tag}:
+_tagged: _Dict[_Any, _Dict[int, None]] = {}
+_entity_tags: _Dict[int, _Any] = {}
+# Component types registered with :py:func:`esper.set_change_tracking`, shared by all Worlds:
+_tracked_types: _Set[_Type[_Any]] = set()
+# The last change tick handed out. It is shared by all Worlds, so a tick
+# kept by a Processor stays meaningful after switching Worlds:
+_change_tick: int = 0
+# At most this many removals are remembered per tracked type and World:
+_REMOVED_LOG_LIMIT = 4096
+_change_logs: _Dict[_Type[_Any], _ChangeLog] = {}
+# Typed events queued in the World since the last flush: {event_type: [event, ...]}
+_events: _Dict[_Type[_Any], _List[_Any]] = {}
+# {event_type: [weak handler, ...]}, shared by all Worlds:
+_event_subscribers: _Dict[_Type[_Any], _List[_Any]] = {}
+_get_component_cache: _Dict[_Type[_Any], _Query] = {}
+_get_components_cache: _Dict[_Tuple[_Type[_Any], ...], _Query] = {}
 _processors: _List[Processor] = []
+command_buffer: CommandBuffer = CommandBuffer()
+"""The active World's :py:class:`esper.CommandBuffer`."""
 process_times: _Dict[str, int] = {}
 event_registry: _Dict[str, _Any] = {}
 current_world: str = "default"
@@ -149,29 +693,127 @@ currently active World context. Modifying this has no effect;
 to switch Worlds, use the :py:func:`~switch_world` function.
 """
 
-# {context_name: (entity_count, components, entities, dead_entities,
-#                 comp_cache, comps_cache, processors, process_times, event_registry)}
+# {context_name: (entity_count, entities, dead_entities, archetypes, entity_signatures,
+#                 archetype_queries, retired, columns, comp_cache, comps_cache, processors,
+#                 command_buffer, process_times, event_registry, tagged, entity_tags, change_logs,
+#                 events)}
 _context_map: _Dict[str, _Tuple[
     "_count[int]",
-    _Dict[_Type[_Any], _Set[_Any]],
     _Dict[int, _Dict[_Type[_Any], _Any]],
     _Set[int],
-    _Dict[_Type[_Any], _List[_Any]],
-    _Dict[_Tuple[_Type[_Any], ...], _List[_Any]],
+    _Dict[_Signature, _Set[int]],
+    _Dict[int, _Signature],
+    _Dict[_Signature, _List[_Query]],
+    _Dict[_Signature, _List[_Tuple[int, _Dict[_Type[_Any], _Any]]]],
+    _Dict[_Type[_Any], ColumnStore],
+    _Dict[_Type[_Any], _Query],
+    _Dict[_Tuple[_Type[_Any], ...], _Query],
     _List[Processor],
+    CommandBuffer,
     _Dict[str, int],
-    _Dict[str, _Any]
-]] = {"default": (_entity_count, {}, {}, set(), {}, {}, [], {}, {})}
+    _Dict[str, _Any],
+    _Dict[_Any, _Dict[int, None]],
+    _Dict[int, _Any],
+    _Dict[_Type[_Any], _ChangeLog],
+    _Dict[_Type[_Any], _List[_Any]]
+]] = {"default": (_entity_count, _entities, _dead_entities, _archetypes, _entity_signatures,
+                  _archetype_queries, _retired, _columns, _get_component_cache, _get_components_cache,
+                  _processors, command_buffer, process_times, event_registry, _tagged, _entity_tags,
+                  _change_logs, _events)}
+
+# {World name: generation}. A new generation is drawn whenever a World is
+# created, cleared, or has Entities restored into it (see :py:func:`esper.world_generation`).
+_generations = _count(start=1)
+_world_generations: _Dict[str, int] = {"default": next(_generations)}
+
+
+def world_generation() -> int:
+    """Get the generation of the current World.
+
+    The value changes when the World is created (or re-created under the
+    same name), cleared with :py:func:`esper.clear_database`, or restored
+    into with :py:func:`esper.restore_entities`. Code that keeps per-World
+    state keyed by Entity ID, such as schedulers, can compare it to detect
+    that its state no longer describes the World.
+    """
+    return _world_generations[_current_world]
+
+
+def _archetype(signature: _Signature) -> _Set[int]:
+    """Get the Entity set for an archetype, creating the table if needed."""
+    try:
+        return _archetypes[signature]
+    except KeyError:
+        queries = [query for cache in (_get_component_cache, _get_components_cache)
+                   for query in cache.values() if query.matches(signature)]
+        _archetype_queries[signature] = queries
+        return _archetypes.setdefault(signature, set())
+
+
+def _register_query(query: _Query) -> _Query:
+    """Fill a new query from the archetype tables, and keep it up to date from now on."""
+    for signature, entities in _archetypes.items():
+        if query.matches(signature):
+            _archetype_queries[signature].append(query)
+            for entity in entities:
+                query.insert(entity, _entities[entity])
+    return query
+
+
+def _move_entity(entity: int, old_signature: _Signature, new_signature: _Signature) -> None:
+    """Move an Entity between archetype tables, patching only the affected queries."""
+    _archetypes[old_signature].discard(entity)
+    _archetype(new_signature).add(entity)
+    _entity_signatures[entity] = new_signature
+
+    for query in _archetype_queries[old_signature]:
+        if not query.matches(new_signature):
+            query.discard(entity)
+
+    entity_components = _entities[entity]
+    for query in _archetype_queries[new_signature]:
+        if not query.matches(old_signature):
+            query.insert(entity, entity_components)
+
+
+def _remove_entity(entity: int, retire: bool = True) -> None:
+    """Remove an Entity and its Components from the archetype tables and queries.
+
+    Unless `retire` is False, the Components are kept for reuse if recycling
+    is enabled for the Entity's signature (see :py:func:`esper.set_recycling`).
+    """
+    signature = _entity_signatures.pop(entity)
+    _archetypes[signature].discard(entity)
+    for query in _archetype_queries[signature]:
+        query.discard(entity)
+    entity_components = _entities.pop(entity)
+    for component_type, store in _columns.items():
+        if component_type in entity_components:
+            store.remove(entity)
+    if entity in _entity_tags:
+        _unindex_tag(entity)
+    if _tracked_types:
+        _record_removed(entity, entity_components)
+
+    limit = retire and _recycle_limits.get(signature)
+    if limit:
+        retired = _retired.setdefault(signature, [])
+        if len(retired) < limit:
+            retired.append((entity, entity_components))
 
 
 def clear_cache() -> None:
     """Manually clear the Component lookup cache.
 
-    Clearing the cache is not necessary to do manually,
-    but may be useful for benchmarking or debugging.
+    Query results are kept up to date incrementally, so clearing
+    the cache is never necessary. It may still be useful for
+    benchmarking or debugging, as the next query will be rebuilt
+    from the archetype tables.
     """
     _get_component_cache.clear()
     _get_components_cache.clear()
+    for queries in _archetype_queries.values():
+        queries.clear()
 
 
 def clear_database() -> None:
@@ -182,9 +824,21 @@ def clear_database() -> None:
     """
     global _entity_count
     _entity_count = _count(start=1)
-    _components.clear()
+    _context_map[_current_world] = (_entity_count,) + _context_map[_current_world][1:]
+    _world_generations[_current_world] = next(_generations)
     _entities.clear()
     _dead_entities.clear()
+    command_buffer.clear()
+    _archetypes.clear()
+    _entity_signatures.clear()
+    _archetype_queries.clear()
+    _retired.clear()
+    for store in _columns.values():
+        store.clear()
+    _tagged.clear()
+    _entity_tags.clear()
+    _change_logs.clear()
+    _events.clear()
     clear_cache()
 
 
@@ -233,6 +887,34 @@ def get_processor(processor_type: _Type[Processor]) -> _Optional[Processor]:
         return None
 
 
+def _insert_entity(entity: int, components: _Iterable[_Any]) -> None:
+    """Insert a new Entity with all of its Components into its archetype."""
+    entity_components = {type(component_instance): component_instance for component_instance in components}
+    _entities[entity] = entity_components
+    if _column_dtypes:
+        _attach_columns(entity, entity_components)
+
+    signature = frozenset(entity_components)
+    _archetype(signature).add(entity)
+    _entity_signatures[entity] = signature
+    for query in _archetype_queries[signature]:
+        query.insert(entity, entity_components)
+    if _tag_type in entity_components:
+        _index_tag(entity, entity_components[_tag_type])
+    if _tracked_types:
+        _record_added(entity, entity_components)
+
+
+def _deferred_add_component(entity: int, component_instance: _Any, type_alias: _Optional[_Type[_Any]]) -> None:
+    if entity in _entities:
+        add_component(entity, component_instance, type_alias)
+
+
+def _deferred_remove_component(entity: int, component_type: _Type[_Any]) -> None:
+    if component_type in _entities.get(entity, ()):
+        remove_component(entity, component_type)
+
+
 def create_entity(*components: _C) -> int:
     """Create a new Entity, with optional initial Components.
 
@@ -240,27 +922,473 @@ def create_entity(*components: _C) -> int:
     You can optionally pass one or more Component instances to be
     assigned to the Entity on creation. Components can be also be
     added later with the :py:func:`esper.add_component` funcion.
+
+    All initial Components are inserted together, so the Entity is
+    placed directly into its final archetype (see :py:func:`esper.spawn`).
     """
     entity = next(_entity_count)
+    _insert_entity(entity, components)
+    return entity
+
 
-    if entity not in _entities:
-        _entities[entity] = {}
+def spawn(*components: _C) -> int:
+    """Create a new Entity with all of its Components in one structural change.
 
-    for component_instance in components:
+    Prefer this over :py:func:`esper.create_entity` followed by several
+    :py:func:`esper.add_component` calls, which move the Entity through
+    one intermediate archetype (and query update) per Component.
+    Returns the new Entity ID.
+    """
+    return create_entity(*components)
+
+
+def _insert_many(entities: _List[int], component_sets: _Iterable[_Iterable[_Any]]) -> None:
+    """Insert a batch of new Entities, updating each archetype and query once per signature."""
+    batches: _Dict[_Signature, _List[int]] = {}
+
+    for entity, components in zip(entities, component_sets):
+        entity_components = {type(component_instance): component_instance for component_instance in components}
+        _entities[entity] = entity_components
+        if _column_dtypes:
+            _attach_columns(entity, entity_components)
+        signature = frozenset(entity_components)
+        _entity_signatures[entity] = signature
+        batches.setdefault(signature, []).append(entity)
+        if _tag_type in entity_components:
+            _index_tag(entity, entity_components[_tag_type])
+        if _tracked_types:
+            _record_added(entity, entity_components)
+
+    for signature, batch in batches.items():
+        _archetype(signature).update(batch)
+        for query in _archetype_queries[signature]:
+            query.insert_many(batch, _entities)
+
+
+def spawn_many(component_sets: _Iterable[_Iterable[_Any]]) -> _List[int]:
+    """Create many Entities at once, one per iterable of Components.
+
+    All Entities are inserted as a single structural change: Entities
+    sharing a signature are added to their archetype together, and each
+    affected query is updated once for the whole batch. Returns the new
+    Entity IDs, in the same order as `component_sets`.
+    """
+    component_sets = list(component_sets)
+    entities = [next(_entity_count) for _ in component_sets]
+    _insert_many(entities, component_sets)
+    return entities
+
+
+def restore_entities(entities: _List[int], component_sets: _Iterable[_Iterable[_Any]]) -> None:
+    """Insert Entities with the given IDs, such as when loading a saved World.
 
-        component_type = type(component_instance)
+    All Entities are inserted as a single structural change (see
+    :py:func:`esper.spawn_many`). Entity IDs created afterwards continue
+    after the largest ID that is live, reserved by the command buffer, or
+    kept for recycling in the current World.
 
-        if component_type not in _components:
-            _components[component_type] = set()
+    Raises a ValueError if any of the Entity IDs is currently in use.
+    """
+    global _entity_count
+    entities = list(entities)
+    in_use = [entity for entity in entities if entity in _entities]
+    if in_use or len(set(entities)) != len(entities):
+        raise ValueError(f"Entities {in_use or entities} are already in use and cannot be restored.")
+    _insert_many(entities, component_sets)
+
+    # Never hand out an ID that is live, reserved by a buffered spawn,
+    # or waiting in a recycle pool.
+    newest = max(next(_entity_count) - 1, max(_entities, default=0),
+                 max(_pending_entities(), default=0),
+                 max((entity for retired in _retired.values() for entity, _ in retired), default=0))
+    _entity_count = _count(start=newest + 1)
+    _context_map[_current_world] = (_entity_count,) + _context_map[_current_world][1:]
+    _world_generations[_current_world] = next(_generations)
+
+
+def _pending_entities() -> _Iterable[int]:
+    """Entity IDs created by commands still waiting in the :py:data:`esper.command_buffer`."""
+    for func, args, _ in command_buffer._commands:
+        if func is _insert_entity:
+            yield args[0]
+        elif func is _insert_many:
+            yield from args[0]
+
+
+def set_recycling(component_types: _Iterable[_Type[_Any]], limit: int) -> None:
+    """Keep up to `limit` deleted Entities of this exact signature for reuse.
+
+    When an Entity whose Component types are exactly `component_types`
+    is deleted, its ID and Component instances are kept in a per-World
+    list instead of being discarded. Factories for short-lived Entities
+    (such as projectiles) can then take one with :py:func:`esper.pop_retired`,
+    reset the Component instances, and bring it back with :py:func:`esper.respawn`.
+    A `limit` of 0 disables recycling for the signature. The setting is
+    shared by all Worlds.
+    """
+    signature = frozenset(component_types)
+    if limit > 0:
+        _recycle_limits[signature] = limit
+    else:
+        _recycle_limits.pop(signature, None)
+        for context in _context_map.values():
+            retired_by_signature = context[6]
+            retired_by_signature.pop(signature, None)
+    retired = _retired.get(signature)
+    if retired:
+        del retired[limit:]
+
+
+def pop_retired(component_types: _Iterable[_Type[_Any]]) -> _Optional[_Tuple[int, _Dict[_Type[_Any], _Any]]]:
+    """Take a retired Entity of this exact signature, if any.
+
+    Returns an ``(entity, {component_type: instance})`` tuple, or None.
+    The Entity ID is not live until it is passed to :py:func:`esper.respawn`.
+    """
+    retired = _retired.get(frozenset(component_types))
+    if retired:
+        return retired.pop()
+    return None
 
-        _components[component_type].add(entity)
 
-        _entities[entity][component_type] = component_instance
-        clear_cache()
+def respawn(entity: int, *components: _C) -> int:
+    """Re-create a retired Entity ID (see :py:func:`esper.pop_retired`) with new Components.
 
+    Raises a ValueError if the Entity ID is currently in use.
+    """
+    if entity in _entities:
+        raise ValueError(f"Entity {entity} is still alive and cannot be respawned.")
+    _insert_entity(entity, components)
     return entity
 
 
+def _check_column_type(component_type: _Type[_Any]) -> None:
+    if not _is_dataclass(component_type) or not _dataclass_fields(component_type):
+        raise TypeError(f"{component_type.__name__} must be a dataclass with fields to use column storage.")
+    if any(not field.init for field in _dataclass_fields(component_type)):
+        raise TypeError(f"All fields of {component_type.__name__} must be __init__ fields to use column storage.")
+    if hasattr(component_type, '__slots__'):
+        raise TypeError(f"{component_type.__name__} must not use __slots__ to use column storage.")
+
+
+def _column_store(component_type: _Type[_Any]) -> ColumnStore:
+    """Get the World's column store for a type, creating it if needed."""
+    try:
+        return _columns[component_type]
+    except KeyError:
+        store = _columns[component_type] = ColumnStore(component_type, _column_dtypes[component_type])
+        return store
+
+
+def _attach_columns(entity: int, entity_components: _Dict[_Type[_Any], _Any]) -> None:
+    """Move the column-backed Components of a new Entity into the World's column stores."""
+    for component_type in list(entity_components):
+        base = _view_bases.get(component_type, component_type)
+        if base in _column_dtypes:
+            if base is component_type:
+                component_instance = entity_components[component_type]
+            else:
+                component_instance = entity_components.pop(component_type)
+            entity_components[base] = _column_store(base).add(entity, component_instance)
+
+
+def set_column_storage(component_type: _Type[_Any], dtype: _Optional[str] = 'float64') -> None:
+    """Store the fields of a numeric Component type in contiguous columns.
+
+    The Component type must be a dataclass whose fields are all numeric
+    ``__init__`` fields, such as a position or velocity. Each World then
+    keeps the values of all its instances in one array per field (see
+    :py:class:`esper.ColumnStore`), with `dtype` ``'float64'`` or
+    ``'float32'``. Instances keep working as before through attribute
+    access, and Processors can work on all of them at once with
+    :py:func:`esper.get_column_batch`. Existing instances in every World
+    are moved into the columns right away.
+
+    A `dtype` of None disables column storage for the type again. The
+    setting is shared by all Worlds.
+    """
+    if dtype is not None:
+        _check_column_type(component_type)
+        if dtype not in _COLUMN_DTYPES:
+            raise ValueError(f"Unsupported column dtype: {dtype!r}")
+        if _column_dtypes.get(component_type) == dtype:
+            return
+
+    _column_dtypes.pop(component_type, None)
+    for context in _context_map.values():
+        store = context[7].pop(component_type, None)
+        if store is not None:
+            store.clear()
+    if dtype is None:
+        return
+
+    _column_dtypes[component_type] = dtype
+    for context in _context_map.values():
+        entities, columns = context[1], context[7]
+        for entity, entity_components in entities.items():
+            if component_type in entity_components:
+                if component_type not in columns:
+                    columns[component_type] = ColumnStore(component_type, dtype)
+                store = columns[component_type]
+                entity_components[component_type] = store.add(entity, entity_components[component_type])
+
+
+def has_column_storage(component_type: _Type[_Any]) -> bool:
+    """Check if column storage is enabled for a Component type."""
+    return component_type in _column_dtypes
+
+
+def get_column_store(component_type: _Type[_Any]) -> ColumnStore:
+    """Get the current World's :py:class:`esper.ColumnStore` for a Component type.
+
+    Raises a ValueError if column storage is not enabled for the type.
+    """
+    if component_type not in _column_dtypes:
+        raise ValueError(f"Column storage is not enabled for {component_type.__name__}.")
+    return _column_store(component_type)
+
+
+def get_column_batch(*component_types: _Type[_Any]) -> ColumnBatch:
+    """Get a :py:class:`esper.ColumnBatch` for all Entities with these Component types.
+
+    Every type must have column storage enabled (see :py:func:`esper.set_column_storage`).
+    The batch holds the same Entities, in the same order, as the equivalent
+    :py:func:`esper.get_components` query, and is cached until they change.
+    Raises a ValueError if a type is not column-backed.
+    """
+    stores = {component_type: get_column_store(component_type) for component_type in component_types}
+    if len(component_types) == 1:
+        get_component(component_types[0])
+        query = _get_component_cache[component_types[0]]
+    else:
+        get_components(*component_types)
+        query = _get_components_cache[component_types]
+
+    batch = query.batch
+    if batch is None or not batch.is_current():
+        batch = query.batch = ColumnBatch(list(query.rows), stores)
+    return batch
+
+
+def _index_tag(entity: int, component_instance: _Any) -> None:
+    tag = getattr(component_instance, _tag_attribute)
+    _entity_tags[entity] = tag
+    try:
+        _tagged[tag][entity] = None
+    except KeyError:
+        _tagged[tag] = {entity: None}
+
+
+def _unindex_tag(entity: int) -> None:
+    tag = _entity_tags.pop(entity)
+    members = _tagged[tag]
+    del members[entity]
+    if not members:
+        del _tagged[tag]
+
+
+def set_tag_index(component_type: _Optional[_Type[_Any]], attribute: str = 'tag') -> None:
+    """Index Entities by the value of a tag Component.
+
+    Every World then keeps a ``{tag: entities}`` index for the given
+    Component type, where the tag is the value of its `attribute`. The
+    index is updated whenever such a Component is added, replaced or
+    removed, and when an Entity is deleted, so :py:func:`esper.get_tagged`
+    never has to scan the database. Changing the attribute in place is
+    not tracked; use :py:func:`esper.retag` instead. Existing Entities in
+    every World are indexed right away.
+
+    A `component_type` of None disables the index again. The setting
+    is shared by all Worlds.
+    """
+    global _tag_type
+    global _tag_attribute
+    _tag_type = component_type
+    _tag_attribute = attribute
+
+    for context in _context_map.values():
+        entities, tagged, entity_tags = context[1], context[14], context[15]
+        tagged.clear()
+        entity_tags.clear()
+        if component_type is None:
+            continue
+        for entity, entity_components in entities.items():
+            if component_type in entity_components:
+                tag = getattr(entity_components[component_type], attribute)
+                entity_tags[entity] = tag
+                tagged.setdefault(tag, {})[entity] = None
+
+
+def retag(entity: int, tag: _Any) -> None:
+    """Change the tag of an Entity, keeping the tag index up to date.
+
+    Sets the indexed attribute of the Entity's tag Component (see
+    :py:func:`esper.set_tag_index`) to `tag`.
+
+    Raises a ValueError if no tag index is set up, and a KeyError if the
+    Entity does not exist or has no tag Component.
+    """
+    if _tag_type is None:
+        raise ValueError("No tag index is set up; see esper.set_tag_index.")
+    component_instance = _entities[entity][_tag_type]
+    setattr(component_instance, _tag_attribute, tag)
+    _unindex_tag(entity)
+    _index_tag(entity, component_instance)
+
+
+def get_tags() -> _List[_Any]:
+    """Get the tags that at least one Entity of the current World has."""
+    return list(_tagged)
+
+
+def get_tagged(tag: _Any, *component_types: _Type[_Any]) -> _List[_Tuple[int, _List[_Any]]]:
+    """Get the Entities with a tag, together with the requested Component types.
+
+    Returns a list of ``(entity, [component, ...])`` tuples in the order the
+    Entities were tagged, like :py:func:`esper.get_components` does for the
+    whole World. Only the Entities that have all of `component_types` are
+    returned; with no `component_types`, every tagged Entity is returned
+    with an empty list. Only the Entities indexed by
+    :py:func:`esper.set_tag_index` can be found.
+    """
+    members = _tagged.get(tag)
+    if not members:
+        return []
+    if not component_types:
+        return [(entity, []) for entity in members]
+
+    result = []
+    for entity in members:
+        entity_components = _entities[entity]
+        try:
+            result.append((entity, [entity_components[ct] for ct in component_types]))
+        except KeyError:
+            continue
+    return result
+
+
+def _change_log(component_type: _Type[_Any]) -> _ChangeLog:
+    """Get the World's change log for a tracked type, creating it if needed."""
+    try:
+        return _change_logs[component_type]
+    except KeyError:
+        log = _change_logs[component_type] = _ChangeLog()
+        return log
+
+
+def _record_added(entity: int, entity_components: _Dict[_Type[_Any], _Any]) -> None:
+    global _change_tick
+    _change_tick += 1
+    for component_type in _tracked_types:
+        if component_type in entity_components:
+            log = _change_log(component_type)
+            log.touch(log.added, entity, _change_tick)
+            log.touch(log.changed, entity, _change_tick)
+
+
+def _record_removed(entity: int, entity_components: _Dict[_Type[_Any], _Any]) -> None:
+    global _change_tick
+    _change_tick += 1
+    for component_type in _tracked_types:
+        if component_type in entity_components:
+            log = _change_log(component_type)
+            log.added.pop(entity, None)
+            log.changed.pop(entity, None)
+            log.touch(log.removed, entity, _change_tick)
+            if len(log.removed) > _REMOVED_LOG_LIMIT:
+                del log.removed[next(iter(log.removed))]
+
+
+def set_change_tracking(component_type: _Type[_Any], enabled: bool = True) -> None:
+    """Track when Components of a type are added, changed or removed.
+
+    Every World then remembers the change tick (see :py:func:`esper.change_tick`)
+    of the last addition, change and removal of each Entity's Component
+    of this type. Additions and removals are recorded automatically.
+    Changes to the Component instance itself are not detected; call
+    :py:func:`esper.mark_changed` after modifying one. Processors can
+    then ask only for what changed since their last run with
+    :py:func:`esper.get_added`, :py:func:`esper.get_changed` and
+    :py:func:`esper.get_removed`. Only changes made after tracking is
+    enabled are recorded. The setting is shared by all Worlds.
+    """
+    if enabled:
+        _tracked_types.add(component_type)
+        return
+
+    _tracked_types.discard(component_type)
+    for context in _context_map.values():
+        context[16].pop(component_type, None)
+
+
+def change_tick() -> int:
+    """Get the tick of the most recent recorded change, in any World.
+
+    Ticks only increase. Keep the value after handling the changes, and
+    pass it as `since` next time to get only the newer changes.
+    """
+    return _change_tick
+
+
+def mark_changed(entity: int, component_type: _Type[_Any]) -> None:
+    """Record that an Entity's Component was modified in place.
+
+    Does nothing if the type is not tracked (see :py:func:`esper.set_change_tracking`),
+    or if the Entity does not have such a Component, so it is safe to
+    call unconditionally after a modification.
+    """
+    global _change_tick
+    if component_type in _tracked_types and component_type in _entities.get(entity, ()):
+        _change_tick += 1
+        log = _change_log(component_type)
+        log.touch(log.changed, entity, _change_tick)
+
+
+def _tracked_log(component_type: _Type[_Any]) -> _ChangeLog:
+    if component_type not in _tracked_types:
+        raise ValueError(f"Change tracking is not enabled for {component_type.__name__}.")
+    return _change_log(component_type)
+
+
+def get_added(component_type: _Type[_C], since: int) -> _List[_Tuple[int, _C]]:
+    """Get the Entity, Component pairs added after the change tick `since`.
+
+    Pairs are in the order they were added. Raises a ValueError if
+    change tracking is not enabled for the type.
+    """
+    log = _tracked_log(component_type)
+    return [(entity, _entities[entity][component_type]) for entity in log.since(log.added, since)]
+
+
+def get_changed(component_type: _Type[_C], since: int) -> _List[_Tuple[int, _C]]:
+    """Get the Entity, Component pairs added or changed after the change tick `since`.
+
+    Pairs are in the order of their last change. Raises a ValueError if
+    change tracking is not enabled for the type.
+    """
+    log = _tracked_log(component_type)
+    return [(entity, _entities[entity][component_type]) for entity in log.since(log.changed, since)]
+
+
+def get_removed(component_type: _Type[_Any], since: int) -> _List[int]:
+    """Get the Entities that lost their Component after the change tick `since`.
+
+    This includes deleted Entities. Only the most recent removals are
+    kept, so a reader that falls far behind may miss some. Raises a
+    ValueError if change tracking is not enabled for the type.
+    """
+    log = _tracked_log(component_type)
+    return log.since(log.removed, since)
+
+
+def is_changed(entity: int, component_type: _Type[_Any], since: int) -> bool:
+    """Check if an Entity's Component was added or changed after the change tick `since`.
+
+    Raises a ValueError if change tracking is not enabled for the type.
+    """
+    return _tracked_log(component_type).changed.get(entity, 0) > since
+
+
 def delete_entity(entity: int, immediate: bool = False) -> None:
     """Delete an Entity from the current World.
 
@@ -274,17 +1402,35 @@ def delete_entity(entity: int, immediate: bool = False) -> None:
     Raises a KeyError if the given entity does not exist in the database.
     """
     if immediate:
-        for component_type in _entities[entity]:
-            _components[component_type].discard(entity)
+        _remove_entity(entity)
+    else:
+        _dead_entities.add(entity)
 
-            if not _components[component_type]:
-                del _components[component_type]
 
-        del _entities[entity]
-        clear_cache()
+def move_entity(entity: int, world: str) -> int:
+    """Move an Entity and its Components from the current World to another.
 
-    else:
-        _dead_entities.add(entity)
+    The Component instances themselves are moved, so references held
+    elsewhere stay valid. Entity IDs are allocated per World, so the
+    Entity is given a new ID in the target World, which is returned.
+    The target World is created if it does not exist yet. The current
+    World is not changed.
+
+    Raises a KeyError if the given entity does not exist in the database.
+    """
+    if world == _current_world:
+        return entity
+
+    components = list(_entities[entity].values())
+    _dead_entities.discard(entity)
+    _remove_entity(entity, retire=False)
+
+    source = _current_world
+    switch_world(world)
+    try:
+        return create_entity(*components)
+    finally:
+        switch_world(source)
 
 
 def entity_exists(entity: int) -> bool:
@@ -343,14 +1489,38 @@ def add_component(entity: int, component_instance: _C, type_alias: _Optional[_Ty
     later by some common parent type.
     """
     component_type = type_alias or type(component_instance)
+    entity_components = _entities[entity]
+    signature = _entity_signatures[entity]
+
+    if _column_dtypes:
+        component_type = _view_bases.get(component_type, component_type)
+        if component_type in _column_dtypes:
+            store = _column_store(component_type)
+            if component_type in entity_components:
+                component_instance = store.replace(entity, component_instance)
+            else:
+                component_instance = store.add(entity, component_instance)
+
+    if component_type is _tag_type:
+        if entity in _entity_tags:
+            _unindex_tag(entity)
+        _index_tag(entity, component_instance)
+    if component_type in _tracked_types:
+        if component_type in entity_components:
+            mark_changed(entity, component_type)
+        else:
+            _record_added(entity, {component_type: component_instance})
+
+    if component_type in entity_components:
+        # Same archetype; only the queries that return this type need patching:
+        entity_components[component_type] = component_instance
+        for query in _archetype_queries[signature]:
+            if component_type in query.signature:
+                query.insert(entity, entity_components)
+        return
 
-    if component_type not in _components:
-        _components[component_type] = set()
-
-    _components[component_type].add(entity)
-
-    _entities[entity][component_type] = component_instance
-    clear_cache()
+    entity_components[component_type] = component_instance
+    _move_entity(entity, signature, signature | {component_type})
 
 
 def remove_component(entity: int, component_type: _Type[_C]) -> _C:
@@ -363,39 +1533,38 @@ def remove_component(entity: int, component_type: _Type[_C]) -> _C:
     Raises a KeyError if either the given entity or Component type does
     not exist in the database.
     """
-    _components[component_type].discard(entity)
-
-    if not _components[component_type]:
-        del _components[component_type]
-
-    clear_cache()
-    return _entities[entity].pop(component_type)  # type: ignore[no-any-return]
-
-
-def _get_component(component_type: _Type[_C]) -> _Iterable[_Tuple[int, _C]]:
-    entity_db = _entities
-
-    for entity in _components.get(component_type, []):
-        yield entity, entity_db[entity][component_type]
-
-
-def _get_components(*component_types: _Type[_C]) -> _Iterable[_Tuple[int, _List[_C]]]:
-    entity_db = _entities
-    comp_db = _components
-
-    try:
-        for entity in set.intersection(*[comp_db[ct] for ct in component_types]):
-            yield entity, [entity_db[entity][ct] for ct in component_types]
-    except KeyError:
-        pass
+    component_instance = _entities[entity].pop(component_type)
+    if component_type in _columns:
+        component_instance = _columns[component_type].remove(entity)
+    if component_type is _tag_type:
+        _unindex_tag(entity)
+    if component_type in _tracked_types:
+        _record_removed(entity, {component_type: component_instance})
+    signature = _entity_signatures[entity]
+    _move_entity(entity, signature, signature - {component_type})
+    return component_instance  # type: ignore[no-any-return]
 
 
 def get_component(component_type: _Type[_C]) -> _List[_Tuple[int, _C]]:
     """Get an iterator for Entity, Component pairs."""
     try:
-        return _get_component_cache[component_type]
+        query = _get_component_cache[component_type]
     except KeyError:
-        return _get_component_cache.setdefault(component_type, list(_get_component(component_type)))
+        query = _get_component_cache[component_type] = _register_query(_Query((component_type,), single=True))
+    return query.get()
+
+
+def get_component_types() -> _List[_Type[_Any]]:
+    """Get the Component types assigned to at least one Entity in the current World.
+
+    Together with :py:func:`esper.get_component`, this can be used to
+    save every Component of a World, one type at a time.
+    """
+    component_types: _Set[_Type[_Any]] = set()
+    for signature, entities in _archetypes.items():
+        if entities:
+            component_types.update(signature)
+    return list(component_types)
 
 
 @_overload
@@ -417,9 +1586,10 @@ def get_components(__c1: _Type[_C], __c2: _Type[_C2], __c3: _Type[_C3], __c4: _T
 def get_components(*component_types: _Type[_Any]) -> _Iterable[_Tuple[int, _Tuple[_Any, ...]]]:
     """Get an iterator for Entity and multiple Component sets."""
     try:
-        return _get_components_cache[component_types]
+        query = _get_components_cache[component_types]
     except KeyError:
-        return _get_components_cache.setdefault(component_types, list(_get_components(*component_types)))
+        query = _get_components_cache[component_types] = _register_query(_Query(component_types, single=False))
+    return query.get()
 
 
 def try_component(entity: int, component_type: _Type[_C]) -> _Optional[_C]:
@@ -471,21 +1641,10 @@ def clear_dead_entities() -> None:
     calling your processors manually, this function should be called in
     your main loop after calling all processors.
     """
-    # In the interest of performance, this function duplicates code from the
-    # `delete_entity` function. If that function is changed, those changes should
-    # be duplicated here as well.
     for entity in _dead_entities:
-
-        for component_type in _entities[entity]:
-            _components[component_type].discard(entity)
-
-            if not _components[component_type]:
-                del _components[component_type]
-
-        del _entities[entity]
+        _remove_entity(entity)
 
     _dead_entities.clear()
-    clear_cache()
 
 
 def process(*args: _Any, **kwargs: _Any) -> None:
@@ -494,11 +1653,15 @@ def process(*args: _Any, **kwargs: _Any) -> None:
     Call the :py:meth:`esper.Processor.process` method on all assigned
     Processors, respective of their priority. In addition, any Entities
     that were marked for deletion since the last call will be deleted
-    at the start of this call.
+    at the start of this call. The :py:data:`esper.command_buffer` is
+    played back at the same point, and again after all Processors have run
+    and the queued events have been delivered (see :py:func:`esper.flush_events`).
     """
-    clear_dead_entities()
+    command_buffer.playback()
     for processor in _processors:
         processor.process(*args, **kwargs)
+    flush_events()
+    command_buffer.playback()
 
 
 def timed_process(*args: _Any, **kwargs: _Any) -> None:
@@ -508,11 +1671,13 @@ def timed_process(*args: _Any, **kwargs: _Any) -> None:
     it additionally records the elapsed time of each processor
     call (in milliseconds) in the`esper.process_times` dictionary.
     """
-    clear_dead_entities()
+    command_buffer.playback()
     for processor in _processors:
         start_time = _time.process_time()
         processor.process(*args, **kwargs)
         process_times[processor.__class__.__name__] = int((_time.process_time() - start_time) * 1000)
+    flush_events()
+    command_buffer.playback()
 
 
 def list_worlds() -> _List[str]:
@@ -532,7 +1697,10 @@ def delete_world(name: str) -> None:
     if _current_world == name:
         raise PermissionError("The active World context cannot be deleted.")
 
+    for store in _context_map[name][7].values():
+        store.clear()
     del _context_map[name]
+    _world_generations.pop(name, None)
 
 
 def switch_world(name: str) -> None:
@@ -552,21 +1720,33 @@ def switch_world(name: str) -> None:
     """
     if name not in _context_map:
         # Create a new context if the name does not already exist:
-        _context_map[name] = (_count(start=1), {}, {}, set(), {}, {}, [], {}, {})
+        _context_map[name] = (_count(start=1), {}, set(), {}, {}, {}, {}, {}, {}, {}, [], CommandBuffer(), {}, {},
+                              {}, {}, {}, {})
+        _world_generations[name] = next(_generations)
 
     global _current_world
     global _entity_count
-    global _components
     global _entities
     global _dead_entities
+    global _archetypes
+    global _entity_signatures
+    global _archetype_queries
+    global _retired
+    global _columns
     global _get_component_cache
     global _get_components_cache
     global _processors
+    global command_buffer
     global process_times
     global event_registry
+    global _tagged
+    global _entity_tags
+    global _change_logs
+    global _events
     global current_world
 
     # switch the references to the objects in the named context_map:
-    (_entity_count, _components, _entities, _dead_entities, _get_component_cache,
-     _get_components_cache, _processors, process_times, event_registry) = _context_map[name]
+    (_entity_count, _entities, _dead_entities, _archetypes, _entity_signatures, _archetype_queries, _retired,
+     _columns, _get_component_cache, _get_components_cache, _processors, command_buffer,
+     process_times, event_registry, _tagged, _entity_tags, _change_logs, _events) = _context_map[name]
     _current_world = current_world = name
@@ -1,16 +1,31 @@
+import argparse
 import pygame
 import asyncio
 from src.core.game import Game
+from src.core import log, replay, rng
 from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
-async def main():
+async def main(record_path: str = None, seed: int = None):
+    log.configure()  # 等級取自 config.LOG_LEVEL / LOG_LEVELS，環境變數 GAME_LOG 可覆寫
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Roguelike Dungeon")
     clock = pygame.time.Clock()
     game = Game(screen, clock)
-    await game.run()
+    # 錄製輸入與亂數種子，之後可用 benchmarks/replay_benchmark.py 在無視窗模式下重播
+    recording = replay.record(game, seed) if record_path else None
+    if recording is None and seed is not None:
+        rng.seed(seed)
+    try:
+        await game.run()
+    finally:
+        if recording is not None:
+            recording.save(record_path)
     await asyncio.sleep(0)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Roguelike Dungeon")
+    parser.add_argument("--record", metavar="PATH", help="record this session's input for headless replay")
+    parser.add_argument("--seed", type=int, help="master random seed (random when omitted)")
+    args = parser.parse_args()
+    asyncio.run(main(args.record, args.seed))
@@ -1,6 +1,10 @@
 # src/entities/buff/buff.py
 from typing import Dict, Callable, Optional
 class Buff:
+    # 每次命中都會複製一份 Buff，使用 __slots__ 省去每個實例的 __dict__
+    __slots__ = ('name', 'duration', 'element', 'effect_time', 'last_effect_time', 'multipliers',
+                 'effect_per_second', 'on_apply', 'on_remove', 'expires_at')
+
     def __init__(self, name: str, duration: float, element: str, multipliers: Dict[str, float],
                  effect_per_second: Optional[Callable["EntityInterface", None]] = None,
                  on_apply: Optional[Callable["EntityInterface", None]] = None,
@@ -14,7 +18,33 @@ class Buff:
         self.effect_per_second = effect_per_second # like damage per second
         self.on_apply = on_apply  # Optional callback when buff is applied
         self.on_remove = on_remove  # Optional callback when buff is removed
+        # 到期的遊戲時間，由 BuffSystem 排程時以 duration 算出；None 表示尚未排程
+        self.expires_at: Optional[float] = None
+
+    def remaining(self, now: float) -> float:
+        """在遊戲時間 now 時的剩餘秒數 (尚未排程時即 duration)。"""
+        if self.expires_at is None:
+            return self.duration
+        return max(0.0, self.expires_at - now)
+
+    def restart(self, duration: Optional[float] = None) -> None:
+        """
+        重新計時 (可同時改變持續時間)。
+        呼叫端需 esper.mark_changed(ent, Buffs)，BuffSystem 才會依新的 duration 重新排程。
+        """
+        if duration is not None:
+            self.duration = duration
+        self.expires_at = None
     
+    def extend(self, seconds: float) -> None:
+        """
+        延長持續時間 (已排程時到期時間一併延後)。
+        呼叫端需 esper.mark_changed(ent, Buffs)，BuffSystem 才會依新的到期時間重新排程。
+        """
+        self.duration += seconds
+        if self.expires_at is not None:
+            self.expires_at += seconds
+
     def deepcopy(self) -> 'Buff':
         """Create a deep copy of the buff."""
         return Buff(
@@ -25,6 +25,7 @@ class ElementBuff(Buff):
     Specialized Buff class for elemental effects.
     Extends Buff to include elemental-specific properties like affinity interactions and merge rules.
     """
+    __slots__ = ('strength',)
     
     def __init__(self, name: str, duration: float, element: str, multipliers: Dict[str, float],
                  effect_per_second: Optional[Callable[[], None]] = None,
@@ -139,7 +140,7 @@ ELEMENTAL_BUFFS = {
         duration=3.0,
         element='wind',
         multipliers={},
-        effect_per_second=lambda e: [setattr(b, 'duration', b.duration + 0.5) for b in e.buffs] if hasattr(e, 'buffs') else None,
+        effect_per_second=lambda e: e.extend_buffs(0.5) if hasattr(e, 'extend_buffs') else None,
         on_apply=None,
         on_remove=None,
     ),
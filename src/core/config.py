@@ -21,11 +21,40 @@ LOBBY_WIDTH = 30 # 大廳的寬度（瓦片數，確保大廳有足夠空間）
 LOBBY_HEIGHT = 20 # 大廳的高度（瓦片數，確保大廳有足夠空間）
 
 FPS = 60
+# 固定步長模擬：每秒模擬 tick 數，與每幀最多追趕的 tick 數 (超過的時間丟棄，遊戲暫時變慢)
+SIM_TICK_RATE = 60
+MAX_SIM_STEPS_PER_FRAME = 5
+# 達到追趕上限時最多連續跳過幾幀繪製，把時間留給模擬
+MAX_RENDER_SKIP = 2
 SCREEN_WIDTH = 1400
 SCREEN_HEIGHT = 750
 MAX_WEAPON_CHAINS_DEFAULT = 9
 MAX_WEAPON_CHAIN_LENGTH_DEFAULT = 5
 
+# ECS 欄式儲存：Position / Velocity 的數值存放在連續陣列中，供系統批次運算
+# 需要 NumPy (選用依賴，見 requirements.txt)；純 Python 的 array 後端逐一存取較慢，沒有好處。
+# 預設關閉：MovementSystem 變快 (2000 實體戰鬥 5.6 -> 3.6 ms)，但其他系統逐一存取組件時要經過欄位檢視，
+# CombatSystem 9.2 -> 11.9 ms，整幀 16.5 -> 18.0 ms；地城 3 (seed 1) 的 headless soak 也由 1.8 變成 2.0~2.3 ms/tick。
+# 量測到整幀變快之前不要開啟 (python -m benchmarks.ecs_benchmark 的 movement 列)
+ECS_COLUMN_STORAGE = False
+ECS_COLUMN_DTYPE = 'float64'  # 'float64' 或 'float32'
+# MovementSystem 批次模式：一次收集所有移動實體，以預先計算的通行表判斷牆壁與滑牆
+# 2000 實體戰鬥 (ecs_benchmark 的 movement 列，6 輪中位數)：逐一處理 5.3 ms、批次 4.4 ms，整幀 14.1 -> 13.4 ms；
+# 不依賴 NumPy，因此預設開啟。欄式儲存的陣列版本另由 ECS_COLUMN_STORAGE 控制
+ECS_BATCHED_MOVEMENT = True
+# CombatSystem 寬相 (broadphase)：以 COMBAT_CELL_SIZE 像素為一格的均勻網格找出可能重疊的配對，只對它們做矩形測試
+ECS_COMBAT_BROADPHASE = True
+COMBAT_CELL_SIZE = 2 * TILE_SIZE
+# esper World 名稱：大廳常駐於自己的 World，回到大廳只需切換 World，不重建 NPC
+LOBBY_WORLD = "lobby"
+DUNGEON_WORLD = "dungeon"
+# 日誌 (見 src/core/log.py)：所有分類的預設等級，與個別分類的等級，例如 {"ecs.combat": "DEBUG"}
+# 環境變數 GAME_LOG 可覆寫，例如 GAME_LOG=debug 或 GAME_LOG=info,ecs.combat=debug
+LOG_LEVEL = "WARNING"
+LOG_LEVELS = {}
+# 世界快照 (見 src/core/snapshot.py)：遊戲中按 F5 快速存檔、F9 讀檔
+SNAPSHOT_PATH = "quicksave.snap"
+
 # 顏色定義
 # ====== 基本顏色 ======
 BLACK       = (0, 0, 0)             # ⬛ 黑色 - 用於背景或外部區域
@@ -2,26 +2,41 @@
 import asyncio
 import pygame
 import esper # 引入 esper 模組
-from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, ECS_COLUMN_STORAGE, ECS_COLUMN_DTYPE, MAX_RENDER_SKIP
+from src.core.timestep import FixedTimestep
+from src.core.input import PygameInput
+from src.ecs.components import COLUMN_COMPONENTS
 import src.manager
 
 # 引入 ECS 系統（假設它們在 src.ecs.systems 中）
 from src.ecs.systems import (
     InputSystem, MovementSystem, CombatSystem, RenderSystem, 
-    HealthSystem, BuffSystem, EnergySystem, AISystem, TimerSystem
+    HealthSystem, BuffSystem, EnergySystem, AISystem, LifetimeSystem, TimerSystem
 )
 from src.menu.menus.main_menu import MainMenu
 class Game:
     """遊戲主類別，管理所有遊戲狀態和子系統。"""
     
-    def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock):
+    def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock,
+                 headless: bool = False, input_source=None):
+        """
+        Args:
+            screen: 繪製用的 Surface (無視窗模式下為離屏 Surface)。
+            clock: 控制幀率的時鐘。
+            headless: 無視窗模式：不繪製、不播放音效 (見 src.core.headless)。
+            input_source: 輸入來源 (事件、按鍵、滑鼠)，預設為 PygameInput。
+        """
         # 核心屬性
         self.screen = screen
         self.clock = clock
+        self.headless = headless
+        self.input = input_source if input_source is not None else PygameInput()
         self.running = True
         self.current_time = 0.0
         self.dt = 0.0
         self.time_scale = 1.0 # 時間流逝速度
+        self.timestep = FixedTimestep() # 固定步長模擬時鐘 (SIM_TICK_RATE)
+        self._skipped_renders = 0
         self.world = esper
         # 管理器初始化
         self.event_manager = src.manager.EventManager(self)
@@ -35,18 +50,22 @@ class Game:
         # --- ECS 初始化 (全域模式) ---
         # 修正: 將 Game 實例附加到 esper 模組上，供系統取用
         esper.game = self 
+
+        # Position / Velocity 改用欄式儲存 (需要 NumPy，預設關閉，見 config.ECS_COLUMN_STORAGE)
+        if ECS_COLUMN_STORAGE and esper.COLUMN_BACKEND == 'numpy':
+            for component_type in COLUMN_COMPONENTS:
+                esper.set_column_storage(component_type, ECS_COLUMN_DTYPE)
         
         # 註冊 ECS 系統 (使用全域註冊)
-        self.world.add_processor(InputSystem())
-        self.world.add_processor(AISystem(self))
-
-        self.world.add_processor(MovementSystem())
-        self.world.add_processor(CombatSystem())
-        self.world.add_processor(HealthSystem())
-        self.world.add_processor(BuffSystem())
-        self.world.add_processor(EnergySystem())
-        self.world.add_processor(TimerSystem())
-        self.world.add_processor(RenderSystem())
+        # 大廳與地牢各是一個 esper World，共用同一組系統實例 (見 EntityManager.enter_world)
+        self.processors = [
+            InputSystem(), AISystem(self), MovementSystem(), CombatSystem(),
+            HealthSystem(), BuffSystem(), EnergySystem(), LifetimeSystem(), TimerSystem(),
+        ]
+        for processor in self.processors:
+            self.world.add_processor(processor)
+        # RenderSystem 不加入 processor 列表：模擬 tick 不繪製，由 RenderManager 每幀呼叫一次
+        self.render_system = RenderSystem()
 
         # 菜單註冊
         self.menu_manager.register_menu('main_menu', MainMenu(self))
@@ -209,6 +228,10 @@ class Game:
     #         print(f"Game: 警告！嘗試隱藏菜單 {menu_name}，但當前頂層菜單為 {current_top_menu.__class__.__name__}，不執行操作。")
 
     async def update(self, dt: float) -> bool:
+        """核心遊戲更新邏輯 (與 asyncio 主循環兼容的包裝，見 update_frame)。"""
+        return self.update_frame(dt)
+
+    def update_frame(self, dt: float) -> bool:
         """
         核心遊戲更新邏輯。
         處理事件、更新實體和攝影機，並根據遊戲狀態執行更新。
@@ -216,10 +239,9 @@ class Game:
         if not self.running:
             return False
         self.dt = dt
-        self.current_time += dt * self.time_scale # 更新遊戲時間
 
-        # 處理 Pygame 事件
-        for event in pygame.event.get():
+        # 處理輸入事件 (PygameInput 或無視窗模式的 ScriptedInput)
+        for event in self.input.get_events(dt):
             if event.type == pygame.QUIT:
                 self.running = False
                 return False
@@ -229,17 +251,17 @@ class Game:
         # 根據遊戲狀態更新邏輯
         state = self.event_manager.state
         if self.menu_manager.active_menus:
-            # 菜單模式：只更新菜單
+            # 菜單模式：只更新菜單。遊戲時間 (current_time) 只在 step_simulation 中推進，
+            # 以它排程的 Buff、拋射物壽命、計時器與命中冷卻在菜單開啟期間一併暫停
             self.menu_manager.update_current_menus(dt)
         else:
-            # 遊戲模式：更新 ECS 系統和攝影機
-            
-            # --- ECS 更新 ---
-            # 修正: 呼叫全域的 esper.process() 函式，並傳遞必要的參數
-            # 這裡傳遞 screen 和 camera_offset 是因為 RenderSystem 需要它們
-            esper.process(dt,
-                          screen=self.screen,
-                          camera_offset=self.render_manager.camera_offset, current_time=self.current_time, game=self)
+            # 遊戲模式：以固定步長推進 ECS，本幀可能執行 0 ~ MAX_SIM_STEPS_PER_FRAME 個 tick
+            steps = self.timestep.advance(dt)
+            for step in range(steps):
+                if step == steps - 1:
+                    # 最後一個 tick 之前的狀態作為繪製內插的起點
+                    self.render_system.capture()
+                self.step_simulation(self.timestep.dt)
             
             # 攝影機更新 (RenderManager 應該處理)
             self.render_manager.update_camera(dt)
@@ -249,6 +271,23 @@ class Game:
 
         return self.running
     
+    def step_simulation(self, dt: float) -> None:
+        """執行一個固定 dt 的模擬 tick (所有 ECS 系統)。"""
+        self.current_time += dt * self.time_scale # 更新遊戲時間
+        esper.process(dt,
+                      screen=self.screen,
+                      camera_offset=self.render_manager.camera_offset, current_time=self.current_time, game=self)
+
+    def simulate(self, ticks: int) -> int:
+        """
+        以最快速度推進 ticks 幀，每幀剛好一個模擬 tick，不等待時鐘也不繪製。
+        供無視窗模式的 soak test 與效能量測使用；回傳實際執行的幀數 (遊戲結束時提前停止)。
+        """
+        for frame in range(ticks):
+            if not self.update_frame(self.timestep.dt):
+                return frame
+        return ticks
+
     async def run(self) -> None:
         """主遊戲循環，與 asyncio 兼容。"""
         print("Game: 已啟動，顯示主菜單")
@@ -256,13 +295,20 @@ class Game:
             dt = self.clock.tick(FPS) / 1000.0 # 控制幀率為 60 FPS
             if not await self.update(dt): # 更新遊戲狀態
                 break
-            self.draw() # 繪製畫面
+            if self.timestep.behind and self._skipped_renders < MAX_RENDER_SKIP:
+                # 負載過高 (已達追趕上限)：跳過本幀繪製，把時間留給模擬
+                self._skipped_renders += 1
+            else:
+                self._skipped_renders = 0
+                self.draw() # 繪製畫面
             await asyncio.sleep(0)
         
         pygame.quit() # 退出 Pygame
     
     def draw(self) -> None:
         """根據當前遊戲狀態繪製畫面。"""
+        if self.headless:
+            return # 無視窗模式不繪製，也不呼叫 pygame.display.flip
         self.screen.fill((0, 0, 0)) # 清空畫面
         
         # state = self.event_manager.state
@@ -0,0 +1,44 @@
+# src/core/headless.py
+"""
+無視窗 (headless) 模式
+使用 SDL dummy 驅動建立 Game：不開視窗、不播放音效、不執行 RenderSystem 與
+pygame.display.flip，輸入由 ScriptedInput 提供，可用最快速度模擬大量 tick，
+供 soak test 與 ECS 效能量測使用。
+"""
+import os
+from typing import Optional
+
+import pygame
+
+from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.core.input import ScriptedInput
+
+
+def init_headless() -> pygame.Surface:
+    """切換到 SDL dummy 視訊/音效驅動並初始化 pygame，回傳一個離屏的畫面 Surface。"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    # 載入圖片時的 convert_alpha() 需要已設定顯示模式；dummy 驅動下不會開啟視窗
+    pygame.display.set_mode((1, 1))
+    return pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def create_headless_game(input_source: Optional[ScriptedInput] = None) -> 'Game':
+    """建立無視窗模式的 Game。input_source 預設為空的 ScriptedInput。"""
+    from src.core.game import Game  # 延後匯入：必須先設定 SDL 驅動再初始化 pygame
+
+    screen = init_headless()
+    return Game(screen, pygame.time.Clock(), headless=True,
+                input_source=input_source if input_source is not None else ScriptedInput())
+
+
+def enter_dungeon(game: 'Game', dungeon_id: int = 1) -> None:
+    """略過大廳與傳送門菜單，直接進入指定的地牢樓層 (與 DungeonPortalNPC.enter_dungeon 相同的步驟)。"""
+    if not game.entity_manager.player:
+        game.start_game()
+    game.dungeon_manager.initialize_dungeon(dungeon_id)
+    game.entity_manager.initialize_dungeon_entities()
+    game.event_manager.state = "playing"
+    game.menu_manager.close_all_menus()
+    game.timestep.reset()
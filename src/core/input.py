@@ -0,0 +1,92 @@
+# src/core/input.py
+"""
+輸入來源
+Game 透過 input 物件取得事件、按鍵狀態與滑鼠位置：一般遊戲使用 PygameInput，
+無視窗模式 (headless) 或自動測試則以 ScriptedInput 依幀數重播預先排好的輸入。
+get_events(dt) 每幀呼叫一次，dt 為該幀經過的時間 (錄製輸入時使用，見 src.core.replay)。
+"""
+from typing import Dict, List, Set, Tuple
+import pygame
+
+
+class PygameInput:
+    """直接讀取 pygame 的事件佇列、鍵盤與滑鼠狀態。"""
+
+    def get_events(self, dt: float = 0.0) -> List[pygame.event.Event]:
+        return pygame.event.get()
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return pygame.mouse.get_pos()
+
+
+class _KeyState:
+    """模擬 pygame.key.get_pressed() 的回傳值：以按鍵常數索引，回傳是否按住。"""
+
+    def __init__(self, held: Set[int]):
+        self._held = held
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._held
+
+
+class ScriptedInput:
+    """
+    依幀數重播的腳本輸入。
+
+    每次 get_events() 代表一幀：回傳排在該幀的事件，並依其中的 KEYDOWN / KEYUP /
+    MOUSEMOTION / MOUSEBUTTONDOWN 更新按住的按鍵與滑鼠位置。無視窗模式下每幀剛好一個
+    模擬 tick (見 Game.simulate)，因此幀數即 tick 數。建構方法可串接：
+
+        script = ScriptedInput().press(0, pygame.K_d, frames=120).click(60, (700, 300))
+    """
+
+    def __init__(self):
+        self.frame = 0
+        self._script: Dict[int, List[pygame.event.Event]] = {}
+        self._held: Set[int] = set()
+        self._mouse_pos: Tuple[int, int] = (0, 0)
+
+    def at(self, frame: int, *events: pygame.event.Event) -> 'ScriptedInput':
+        """在第 frame 幀加入事件。"""
+        self._script.setdefault(frame, []).extend(events)
+        return self
+
+    def key_down(self, frame: int, key: int) -> 'ScriptedInput':
+        return self.at(frame, pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=''))
+
+    def key_up(self, frame: int, key: int) -> 'ScriptedInput':
+        return self.at(frame, pygame.event.Event(pygame.KEYUP, key=key, mod=0))
+
+    def press(self, frame: int, key: int, frames: int = 1) -> 'ScriptedInput':
+        """從第 frame 幀開始按住 key 共 frames 幀。"""
+        return self.key_down(frame, key).key_up(frame + frames, key)
+
+    def click(self, frame: int, pos: Tuple[int, int], button: int = 1) -> 'ScriptedInput':
+        """在第 frame 幀於螢幕座標 pos 按下並放開滑鼠按鍵。"""
+        return self.at(frame,
+                       pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button),
+                       pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button))
+
+    def quit(self, frame: int) -> 'ScriptedInput':
+        return self.at(frame, pygame.event.Event(pygame.QUIT))
+
+    def get_events(self, dt: float = 0.0) -> List[pygame.event.Event]:
+        events = self._script.pop(self.frame, [])
+        self.frame += 1
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self._held.add(event.key)
+            elif event.type == pygame.KEYUP:
+                self._held.discard(event.key)
+            elif event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self._mouse_pos = event.pos
+        return events
+
+    def get_pressed(self) -> _KeyState:
+        return _KeyState(self._held)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self._mouse_pos
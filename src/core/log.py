@@ -0,0 +1,144 @@
+# src/core/log.py
+"""
+分類、分級的日誌
+每個分類 (例如 "ecs.combat"、"render") 對應一個 Channel，包裝 logging.getLogger("game.<分類>")，
+分類以點號分層，設定 "ecs" 的等級即套用到 "ecs.combat"、"ecs.buff" 等子分類。
+
+Channel 以 debug_on / info_on 兩個布林屬性快取目前是否啟用：停用時 debug()/info() 只做一次
+屬性判斷就返回，訊息以 % 參數傳入，直到真正輸出時才格式化。每幀或每次命中都會執行的熱路徑
+先檢查屬性再呼叫，停用時連函式呼叫與參數求值都省下：
+
+    log = channel("ecs.combat")
+    if log.debug_on:
+        log.debug("Entity %d hit %d", attacker, target)
+
+等級由 configure() / set_level() 設定 (預設值見 config.LOG_LEVEL / LOG_LEVELS，環境變數 GAME_LOG
+可覆寫)，變更後會更新所有 Channel 的快取；請勿直接對 logging 的 Logger 呼叫 setLevel。
+未呼叫 configure() 時沿用 logging 的預設 (WARNING 以上輸出到 stderr)。
+"""
+import logging
+import os
+import sys
+from typing import Dict, Mapping, Optional, TextIO, Tuple, Union
+
+from src.core.config import LOG_LEVEL, LOG_LEVELS
+
+ROOT = "game"
+LOG_FORMAT = "%(name)s %(levelname)s: %(message)s"
+
+Level = Union[int, str]
+
+_channels: Dict[str, 'Channel'] = {}
+_handler: Optional[logging.StreamHandler] = None
+_overridden = set()  # 曾以 configure 設定過等級的分類，重新設定時先還原
+
+
+class Channel:
+    """一個日誌分類。debug_on / info_on 為快取的啟用狀態，熱路徑呼叫前先檢查。"""
+    __slots__ = ("name", "logger", "debug_on", "info_on")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.logger = logging.getLogger(f"{ROOT}.{name}")
+        self.refresh()
+
+    def refresh(self) -> None:
+        """依 Logger 目前的有效等級更新快取。"""
+        self.debug_on = self.logger.isEnabledFor(logging.DEBUG)
+        self.info_on = self.logger.isEnabledFor(logging.INFO)
+
+    def debug(self, msg: str, *args) -> None:
+        if self.debug_on:
+            self.logger.debug(msg, *args)
+
+    def info(self, msg: str, *args) -> None:
+        if self.info_on:
+            self.logger.info(msg, *args)
+
+    def warning(self, msg: str, *args) -> None:
+        self.logger.warning(msg, *args)
+
+    def error(self, msg: str, *args, exc_info: bool = False) -> None:
+        self.logger.error(msg, *args, exc_info=exc_info)
+
+
+def channel(name: str) -> Channel:
+    """取得 (必要時建立) 名為 name 的分類。"""
+    log = _channels.get(name)
+    if log is None:
+        log = _channels[name] = Channel(name)
+    return log
+
+
+def _refresh() -> None:
+    for log in _channels.values():
+        log.refresh()
+
+
+def _level(value: Level) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(value.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f"未知的日誌等級: {value!r}")
+    return level
+
+
+def parse_spec(spec: str) -> Tuple[Optional[Level], Dict[str, Level]]:
+    """
+    解析 GAME_LOG 格式的設定字串，回傳 (預設等級, {分類: 等級})。
+    例如 "debug"、"ecs.combat=debug,render=info"、"info,ecs=debug"。
+    """
+    default, levels = None, {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            name, value = part.split("=", 1)
+            levels[name.strip()] = value.strip()
+        else:
+            default = part
+    return default, levels
+
+
+def configure(level: Optional[Level] = None, levels: Optional[Mapping[str, Level]] = None,
+              stream: Optional[TextIO] = None) -> None:
+    """
+    設定日誌等級與輸出。
+    level: 所有分類的預設等級，levels: {分類: 等級}；兩者皆為 None 時使用 config 與 GAME_LOG 環境變數。
+    stream: 輸出目標 (預設 sys.stderr)。
+    """
+    if level is None and levels is None:
+        level, levels = LOG_LEVEL, dict(LOG_LEVELS)
+        env_level, env_levels = parse_spec(os.environ.get("GAME_LOG", ""))
+        if env_level is not None:
+            level = env_level
+        levels.update(env_levels)
+
+    global _handler
+    root = logging.getLogger(ROOT)
+    if _handler is None:
+        _handler = logging.StreamHandler(stream or sys.stderr)
+        _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(_handler)
+        root.propagate = False
+    elif stream is not None:
+        _handler.setStream(stream)
+
+    root.setLevel(_level(level) if level is not None else logging.WARNING)
+    for name in _overridden:
+        logging.getLogger(f"{ROOT}.{name}").setLevel(logging.NOTSET)
+    _overridden.clear()
+    for name, value in (levels or {}).items():
+        logging.getLogger(f"{ROOT}.{name}").setLevel(_level(value))
+        _overridden.add(name)
+    _refresh()
+
+
+def set_level(name: str, level: Level) -> None:
+    """設定單一分類 (空字串為全部分類) 的等級。"""
+    logging.getLogger(f"{ROOT}.{name}" if name else ROOT).setLevel(_level(level))
+    if name:
+        _overridden.add(name)
+    _refresh()
@@ -0,0 +1,216 @@
+# src/core/replay.py
+"""
+輸入錄製與重播
+錄製一段遊戲時記下：
+  - 主種子 (src.core.rng 的所有亂數串流由它推導)
+  - 開始錄製時的玩家存檔 (StorageManager.to_dict)
+  - 每幀的 dt、該幀的輸入事件、InputSystem 讀取的按鍵狀態與滑鼠位置 (只在改變時記錄)
+重播時建立無視窗的 Game，套回種子與存檔，依錄製的 dt 逐幀呼叫 update_frame：
+輸入、亂數與時間都相同，模擬結果也就相同，且不必等待時鐘，可用最快速度跑完。
+同一段錄影 (例如一場 Boss 戰) 可在不同 commit 上重播，比較每幀的耗時 (見 benchmarks/replay_benchmark.py)。
+
+錄影檔為 JSON：
+    {"version": 1, "seed": ..., "storage": {...}, "dts": [...],
+     "events": [[幀, 事件類型, {屬性}], ...], "keys": [[幀, [按住的鍵]], ...], "mouse": [[幀, x, y], ...]}
+
+用法：
+    recording = replay.record(game)          # 開始錄製 (之後照常執行遊戲)
+    recording.save("boss.replay")
+    game = replay.replay_game(Recording.load("boss.replay"))
+    replay.play(game, recording)             # 無視窗模式下以最快速度重播
+
+注意：集合 (set) 的走訪順序受字串雜湊影響，跨行程比較結果時請固定 PYTHONHASHSEED。
+"""
+import hashlib
+import json
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import pygame
+import esper
+
+from src.core import rng
+from src.core.input import PygameInput, _KeyState
+from src.ecs.components import Health, Position
+from src.core.log import channel
+
+log = channel("replay")
+
+VERSION = 1
+
+# 錄製的事件類型；其餘 (視窗、音訊裝置等) 不影響遊戲，錄製時也不交給遊戲處理
+RECORDED_EVENTS = frozenset((
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+))
+
+# InputSystem 每個 tick 以 get_pressed() 讀取的按鍵
+POLLED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+
+def _event_attrs(event: pygame.event.Event) -> Dict:
+    """事件屬性中可寫入 JSON 的部分 (略過 window 等物件)。"""
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[name] = value
+        elif isinstance(value, tuple) and all(isinstance(item, (int, float)) for item in value):
+            attrs[name] = list(value)
+    return attrs
+
+
+class Recording:
+    """一段錄影：主種子、起始存檔，以及依幀排列的 dt、事件、按鍵與滑鼠位置。"""
+
+    def __init__(self, seed: int, storage: Optional[Dict] = None):
+        self.seed = seed
+        self.storage = storage
+        self.dts: List[float] = []
+        self.events: Dict[int, List[Tuple[int, Dict]]] = {}
+        self.keys: Dict[int, FrozenSet[int]] = {}
+        self.mouse: Dict[int, Tuple[int, int]] = {}
+
+    @property
+    def frames(self) -> int:
+        return len(self.dts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": VERSION,
+            "seed": self.seed,
+            "storage": self.storage,
+            "dts": self.dts,
+            "events": [[frame, event_type, attrs]
+                       for frame, events in sorted(self.events.items())
+                       for event_type, attrs in events],
+            "keys": [[frame, sorted(held)] for frame, held in sorted(self.keys.items())],
+            "mouse": [[frame, x, y] for frame, (x, y) in sorted(self.mouse.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Recording':
+        if data.get("version") != VERSION:
+            raise ValueError(f"不支援的錄影版本: {data.get('version')!r}")
+        recording = cls(data["seed"], data.get("storage"))
+        recording.dts = [float(dt) for dt in data["dts"]]
+        for frame, event_type, attrs in data["events"]:
+            attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+            recording.events.setdefault(frame, []).append((event_type, attrs))
+        recording.keys = {frame: frozenset(held) for frame, held in data["keys"]}
+        recording.mouse = {frame: (x, y) for frame, x, y in data["mouse"]}
+        return recording
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, separators=(",", ":"))
+        log.info("Replay: Saved %s frames to %s", self.frames, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path, "r", encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+class RecordingInput:
+    """
+    包住實際的輸入來源並把每幀的輸入寫入 Recording。
+
+    按鍵狀態與滑鼠位置每幀只向來源取樣一次，本幀內回傳取樣值，
+    讓錄製時遊戲看到的輸入與重播時完全一致。
+    """
+
+    def __init__(self, source, recording: Recording):
+        self.source = source
+        self.recording = recording
+        self._held: FrozenSet[int] = frozenset()
+        self._mouse_pos: Tuple[int, int] = (0, 0)
+
+    def get_events(self, dt: float = 0.0) -> List[pygame.event.Event]:
+        recording = self.recording
+        frame = recording.frames
+        recording.dts.append(dt)
+        events = [event for event in self.source.get_events(dt) if event.type in RECORDED_EVENTS]
+        if events:
+            recording.events[frame] = [(event.type, _event_attrs(event)) for event in events]
+
+        pressed = self.source.get_pressed()
+        held = frozenset(key for key in POLLED_KEYS if pressed[key])
+        if held != self._held or frame == 0:
+            recording.keys[frame] = self._held = held
+        mouse_pos = tuple(self.source.get_mouse_pos())
+        if mouse_pos != self._mouse_pos or frame == 0:
+            recording.mouse[frame] = self._mouse_pos = mouse_pos
+        return events
+
+    def get_pressed(self) -> _KeyState:
+        return _KeyState(self._held)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self._mouse_pos
+
+
+class ReplayInput:
+    """依幀重播 Recording 中的事件、按鍵狀態與滑鼠位置。"""
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.frame = 0
+        self._held: FrozenSet[int] = frozenset()
+        self._mouse_pos: Tuple[int, int] = (0, 0)
+
+    def get_events(self, dt: float = 0.0) -> List[pygame.event.Event]:
+        recording, frame = self.recording, self.frame
+        self.frame += 1
+        self._held = recording.keys.get(frame, self._held)
+        self._mouse_pos = recording.mouse.get(frame, self._mouse_pos)
+        return [pygame.event.Event(event_type, attrs) for event_type, attrs in recording.events.get(frame, ())]
+
+    def get_pressed(self) -> _KeyState:
+        return _KeyState(self._held)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self._mouse_pos
+
+
+def record(game: 'Game', seed: Optional[int] = None) -> Recording:
+    """重設亂數串流並開始錄製 game 的輸入 (應在遊戲開始前呼叫)，回傳持續寫入的 Recording。"""
+    recording = Recording(rng.seed(seed), game.storage_manager.to_dict())
+    source = game.input if game.input is not None else PygameInput()
+    game.input = RecordingInput(source, recording)
+    log.info("Replay: Recording with seed %s", recording.seed)
+    return recording
+
+
+def replay_game(recording: Recording) -> 'Game':
+    """建立重播用的無視窗 Game：輸入來自錄影，套回起始存檔 (不寫回 player_data.json) 與主種子。"""
+    from src.core.headless import create_headless_game  # 延後匯入：建立前必須先設定 SDL 驅動
+
+    game = create_headless_game(ReplayInput(recording))
+    game.storage_manager.persistent = False
+    if recording.storage is not None:
+        game.storage_manager.load_from_dict(recording.storage)
+    rng.seed(recording.seed)
+    return game
+
+
+def play(game: 'Game', recording: Recording, frames: Optional[int] = None) -> int:
+    """依錄製的 dt 推進 game (不等待時鐘也不繪製)，回傳實際執行的幀數 (遊戲結束時提前停止)。"""
+    dts = recording.dts if frames is None else recording.dts[:frames]
+    for frame, dt in enumerate(dts):
+        if not game.update_frame(dt):
+            return frame
+    return len(dts)
+
+
+def world_digest(game: 'Game') -> str:
+    """目前 World 的摘要雜湊 (實體、位置與生命值，加上遊戲時間與 tick 數)，用來比對兩次重播是否一致。"""
+    digest = hashlib.sha1()
+    digest.update(repr((game.current_time, game.timestep.ticks, game.event_manager.state)).encode())
+    for entity in sorted(esper._entities):
+        position = esper.try_component(entity, Position)
+        health = esper.try_component(entity, Health)
+        digest.update(repr((
+            entity,
+            (position.x, position.y) if position else None,
+            (health.current_hp, health.current_shield) if health else None,
+        )).encode())
+    return digest.hexdigest()
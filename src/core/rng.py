@@ -0,0 +1,50 @@
+# src/core/rng.py
+"""
+可重現的亂數串流
+會影響遊戲結果的亂數分成幾個獨立的 random.Random 串流，全部由同一個主種子推導：
+  - dungeon: 地牢生成。生成器 (BSP、房間配置、Room.generate_tiles ...) 仍使用 random 模組，
+             DungeonManager 在每次生成樓層前以此串流重設 random 模組 (見 reseed_generation)
+  - spawn:   生成表抽怪、玩家與 NPC 的備用出生點
+  - ai:      RandomMoveAction 的方向、Boss 連段 (get_humanized_boss_combo)、彈幕偏移
+  - combat:  閃避判定
+菜單與畫面特效仍直接使用 random 模組；它們取用多少亂數取決於繪製的幀數，
+但不會改變上述串流的序列，因此錄製的輸入在無視窗模式下能重播出相同的結果 (見 src.core.replay)。
+"""
+import random
+from typing import Dict, Optional
+
+dungeon = random.Random()
+spawn = random.Random()
+ai = random.Random()
+combat = random.Random()
+
+STREAMS: Dict[str, random.Random] = {
+    "dungeon": dungeon,
+    "spawn": spawn,
+    "ai": ai,
+    "combat": combat,
+}
+
+_seed: Optional[int] = None
+
+
+def seed(value: Optional[int] = None) -> int:
+    """以主種子重設所有串流 (value 為 None 時隨機挑一個)，回傳使用的主種子。"""
+    global _seed
+    if value is None:
+        value = random.SystemRandom().getrandbits(63)
+    for name, stream in STREAMS.items():
+        # 字串種子的雜湊固定 (不受 PYTHONHASHSEED 影響)，各串流互不相關
+        stream.seed(f"{value}:{name}")
+    _seed = value
+    return value
+
+
+def current_seed() -> Optional[int]:
+    """最近一次 seed() 使用的主種子；尚未設定時為 None (串流由系統亂數初始化)。"""
+    return _seed
+
+
+def reseed_generation() -> None:
+    """從 dungeon 串流取出下一個種子重設 random 模組，供接下來的地牢生成使用。"""
+    random.seed(dungeon.getrandbits(64))
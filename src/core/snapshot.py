@@ -0,0 +1,775 @@
+# src/core/snapshot.py
+"""
+世界快照 (world snapshot)
+把地牢中途的狀態存成緊湊的二進位檔，供快速存檔 / 讀檔 (StorageManager.quick_save / quick_load)：
+目前 esper World 的所有實體 (保留實體 ID) 與組件、AI 動作列表與計時、Buff 計時、地牢瓦片、房間、
+迷霧地圖，以及攝影機、遊戲時間與玩家實體。
+
+檔案格式：
+    MAGIC (8 bytes) | 版本、位元組序、區段數 (<HcxI) | 區段表 | 區段資料 (各自 8 bytes 對齊)
+    區段表每一項：名稱長度 (<H)、名稱 (UTF-8)、型別碼 (1 byte)、位移 (<Q)、長度 (<Q)
+
+數值以欄式 (columnar) 存放，每個組件類別的每個欄位一個區段：
+    c/<組件>/entity     'q'  擁有該組件的實體 ID
+    c/<組件>/<欄位>     'B' (bool) / 'q' (int) / 'd' (float) / 'I' (字串表索引)；
+                        其他型別 (容器、物件或型別不一致) 為 'v'：逐一以值編碼器打包
+    tiles               'B' 或 'H'：瓦片名稱表 (meta 的 tile_names) 索引，grid_height * grid_width
+    fog                 'B'：已探索的格子
+    surfaces / surface_index   Surface 的 RGBA 像素與 (寬, 高, 位移)，同一個 Surface 只存一次；
+                        程式繪製的精靈圖 (src.entities.sprites) 只記錄鍵值，載入時重新取得
+    strings             字串表
+    meta                'v'：其餘狀態 (見 capture)
+寫入時只做 array.tobytes 與 struct 打包；讀取時以 mmap 映射檔案，數值欄以 memoryview.cast
+(安裝 NumPy 時為 np.frombuffer) 直接讀取映射的記憶體。數值區段使用寫入端的位元組序 (記錄於表頭)。
+
+無法序列化的值 (閉包、lambda、指向管理器的參照) 不寫入：
+  - AI 的行為樹與動作依 AI.brain 重建 (ecs_factory.AI_BRAINS)；AI.actions 只寫入各動作的
+    state_fields (計時、目前方向等)，載入後套用到重建的動作上
+  - Buff 的回呼依名稱從 ELEMENTAL_BUFFS 的範本補回
+  - NPC Facade 的方法 (NPCInteractComponent.start_interaction) 以 Facade 物件 + 方法名稱保存
+  - 組件欄位 metadata={'snapshot': False} 者不寫入 (例如玩家技能鏈，載入時沿用目前的技能鏈)
+其餘略過的值載入後為 None (物件的屬性則保持未設定)，略過的數量記錄在 info 日誌。
+"""
+import importlib
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from dataclasses import fields, is_dataclass, MISSING
+from enum import Enum
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+import esper
+import pygame
+
+from src.buffs.buff import Buff
+from src.buffs.element_buff import ELEMENTAL_BUFFS
+from src.core.log import channel
+from src.ecs.components import AI, PlayerComponent
+from src.entities.sprites import sprite, sprite_key
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用；沒有時以 memoryview.cast 讀取
+    np = None
+
+log = channel("snapshot")
+
+MAGIC = b"ADSNAP01"
+# 2: Combat.collision_list 改存到期時間，移除 ProjectileState.collision_tracking
+# 3: Buff 新增 expires_at (到期的遊戲時間)
+# 4: Buffs.modifiers 改為依槽位的向量，不寫入快照 (載入後由 BuffSystem 重算)
+# 5: ProjectileState 新增 expires_at (到期的遊戲時間)
+# 6: AI.actions 只存各動作的 state_fields；精靈圖 Surface 改存鍵值
+SNAPSHOT_VERSION = 6
+
+_HEADER = struct.Struct('<HcxI')
+_ENTRY = struct.Struct('<cQQ')
+_NAME_LEN = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_BYTEORDER = b'<' if sys.byteorder == 'little' else b'>'
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# 只接受這些模組中的類別與函數 (載入快照時會依名稱匯入)
+_TRUSTED_MODULES = ("src", "esper")
+
+# 值編碼的型別標記
+_NONE, _TRUE, _FALSE = b'N', b'T', b'F'
+_INT, _BIGINT, _FLOAT, _STR, _BYTES = b'i', b'L', b'd', b's', b'b'
+_LIST, _TUPLE, _SET, _FROZENSET, _DICT = b'l', b't', b'S', b'f', b'D'
+_ENUM, _OBJECT, _REF, _METHOD, _SURFACE, _GAME = b'E', b'O', b'R', b'M', b'P', b'G'
+_STR_LIST = b'Z'  # 全為字串的 list (例如瓦片列)：字串表索引陣列
+_FLOAT_ARRAY = b'A'  # array('d') (例如 Buffs.modifiers)：原始的 float64 位元組
+_SPRITE = b'K'  # sprites.sprite() 的 Surface：鍵值 (名稱, 寬, 高)
+
+
+# --- 名稱參照 ---
+
+_refs: Dict[Any, Optional[str]] = {}
+
+
+def _trusted(module: str) -> bool:
+    return any(module == name or module.startswith(name + ".") for name in _TRUSTED_MODULES)
+
+
+def _resolve(ref: str) -> Any:
+    """把 "模組:名稱" (或模組名稱) 解析回物件。"""
+    module_name, _, qualname = ref.partition(":")
+    if not _trusted(module_name):
+        raise ValueError(f"快照參照了不受信任的模組: {ref!r}")
+    obj = importlib.import_module(module_name)
+    for part in qualname.split(".") if qualname else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def _ref(obj: Any) -> Optional[str]:
+    """類別、模組層級函數或模組的 "模組:名稱"；無法以名稱取回 (閉包、lambda 等) 時回傳 None。"""
+    try:
+        return _refs[obj]
+    except KeyError:
+        pass
+    except TypeError:  # 無法雜湊
+        return None
+    if isinstance(obj, ModuleType):
+        ref = obj.__name__
+    else:
+        ref = f"{getattr(obj, '__module__', None)}:{getattr(obj, '__qualname__', '')}"
+    try:
+        ref = ref if _resolve(ref) is obj else None
+    except (ValueError, ImportError, AttributeError):
+        ref = None
+    _refs[obj] = ref
+    return ref
+
+
+def _object_state(obj: Any) -> Dict[str, Any]:
+    """物件的屬性 (含所有父類別 __slots__ 中已設定者)。"""
+    state = dict(getattr(obj, '__dict__', ()))
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name not in state and name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+_BUFF_TEMPLATES = {template.name: template for template in ELEMENTAL_BUFFS.values()}
+_BUFF_CALLBACKS = ('effect_per_second', 'on_apply', 'on_remove')
+
+
+def _restore_buff_callbacks(buff: Buff) -> None:
+    """補回未寫入快照的 Buff 回呼 (依名稱從 ELEMENTAL_BUFFS 範本取得，找不到時為 None)。"""
+    template = _BUFF_TEMPLATES.get(buff.name)
+    for name in _BUFF_CALLBACKS:
+        if getattr(buff, name, None) is None:
+            setattr(buff, name, getattr(template, name, None))
+
+
+# --- 值編碼 ---
+
+class _Encoder:
+    """把任意值編碼為帶型別標記的位元組；字串與 Surface 集中存放在共用的表中。"""
+
+    def __init__(self, game: Optional['Game'] = None):
+        self.game = game
+        self.strings: Dict[str, int] = {}
+        self.surfaces: Dict[int, int] = {}  # id(Surface) -> 索引
+        self.surface_index = array('q')     # 每個 Surface 的 (寬, 高, 位移)
+        self.pixels = bytearray()
+        self.dropped: Counter = Counter()   # 無法序列化而略過的值 (依型別名稱)
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def surface(self, surface: pygame.Surface) -> int:
+        index = self.surfaces.get(id(surface))
+        if index is None:
+            index = self.surfaces[id(surface)] = len(self.surfaces)
+            self.surface_index.extend((surface.get_width(), surface.get_height(), len(self.pixels)))
+            self.pixels += pygame.image.tobytes(surface, "RGBA")
+        return index
+
+    def pack(self, value: Any, out: bytearray) -> bool:
+        """把 value 附加到 out；無法序列化時寫入 None 並回傳 False。"""
+        kind = type(value)
+        if value is None:
+            out += _NONE
+        elif kind is bool:
+            out += _TRUE if value else _FALSE
+        elif kind is int:
+            if _INT64_MIN <= value <= _INT64_MAX:
+                out += _INT
+                out += _I64.pack(value)
+            else:
+                out += _BIGINT
+                out += _U32.pack(self.string(str(value)))
+        elif kind is float:
+            out += _FLOAT
+            out += _F64.pack(value)
+        elif kind is str:
+            out += _STR
+            out += _U32.pack(self.string(value))
+        elif kind is bytes:
+            out += _BYTES
+            out += _U32.pack(len(value))
+            out += value
+        elif kind is list and value and all(type(item) is str for item in value):
+            out += _STR_LIST
+            out += _U32.pack(len(value))
+            out += array('I', [self.string(item) for item in value]).tobytes()
+        elif kind is array and value.typecode == 'd':
+            out += _FLOAT_ARRAY
+            out += _U32.pack(len(value))
+            out += value.tobytes()
+        elif kind in _SEQUENCE_TAGS:
+            out += _SEQUENCE_TAGS[kind]
+            out += _U32.pack(len(value))
+            for item in value:
+                self.pack(item, out)
+        elif kind is dict:
+            out += _DICT
+            out += _U32.pack(len(value))
+            for key, item in value.items():
+                self.pack(key, out)
+                self.pack(item, out)
+        elif isinstance(value, Enum):
+            ref = _ref(kind)
+            if ref is None:
+                return self._drop(value, out)
+            out += _ENUM
+            out += _U32.pack(self.string(ref))
+            self.pack(value.value, out)
+        elif isinstance(value, pygame.Surface):
+            key = sprite_key(value)
+            if key is not None:
+                out += _SPRITE
+                self.pack(key, out)
+            else:
+                out += _SURFACE
+                out += _U32.pack(self.surface(value))
+        elif self.game is not None and value is self.game:
+            out += _GAME
+        elif isinstance(value, (ModuleType, FunctionType, BuiltinFunctionType, type)):
+            ref = _ref(value)
+            if ref is None:
+                return self._drop(value, out)
+            out += _REF
+            out += _U32.pack(self.string(ref))
+        elif kind is MethodType and not isinstance(value.__self__, (ModuleType, type)):
+            mark = len(out)
+            out += _METHOD
+            if not self.pack(value.__self__, out):
+                del out[mark:]
+                return self._drop(value, out)
+            out += _U32.pack(self.string(value.__name__))
+        else:
+            return self._pack_object(value, out)
+        return True
+
+    def _pack_object(self, value: Any, out: bytearray) -> bool:
+        """一般物件：類別參照 + 屬性；無法序列化的屬性直接略過 (載入時保持未設定)。"""
+        ref = _ref(type(value))
+        if ref is None:
+            return self._drop(value, out)
+        out += _OBJECT
+        out += _U32.pack(self.string(ref))
+        count_at = len(out)
+        out += _U32.pack(0)
+        count = 0
+        for name, item in _object_state(value).items():
+            mark = len(out)
+            out += _U32.pack(self.string(name))
+            if self.pack(item, out):
+                count += 1
+            else:
+                del out[mark:]
+        _U32.pack_into(out, count_at, count)
+        return True
+
+    def _drop(self, value: Any, out: bytearray) -> bool:
+        self.dropped[type(value).__name__] += 1
+        out += _NONE
+        return False
+
+
+_SEQUENCE_TAGS = {list: _LIST, tuple: _TUPLE, set: _SET, frozenset: _FROZENSET}
+
+
+class _Decoder:
+    """_Encoder 的反向操作 (meta 與 'v' 區段)。"""
+
+    def __init__(self, game: Optional['Game'], strings: List[str], surface_index: List[int], pixels: memoryview):
+        self.game = game
+        self.strings = strings
+        self.surface_index = surface_index
+        self.pixels = pixels
+        self.surfaces: Dict[int, pygame.Surface] = {}
+
+    def surface(self, index: int) -> pygame.Surface:
+        surface = self.surfaces.get(index)
+        if surface is None:
+            width, height, offset = self.surface_index[index * 3:index * 3 + 3]
+            data = bytes(self.pixels[offset:offset + width * height * 4])
+            surface = self.surfaces[index] = pygame.image.frombytes(data, (width, height), "RGBA")
+        return surface
+
+    def unpack_all(self, buffer: memoryview, count: int) -> List[Any]:
+        buffer = buffer.tobytes()  # 逐值解析時 bytes 的切片比 memoryview 快
+        values, pos = [], 0
+        for _ in range(count):
+            value, pos = self.unpack(buffer, pos)
+            values.append(value)
+        return values
+
+    def unpack(self, buffer: bytes, pos: int) -> Tuple[Any, int]:
+        tag = buffer[pos:pos + 1]
+        pos += 1
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _INT:
+            return _I64.unpack_from(buffer, pos)[0], pos + 8
+        if tag == _FLOAT:
+            return _F64.unpack_from(buffer, pos)[0], pos + 8
+        if tag == _GAME:
+            return self.game, pos
+        if tag == _SPRITE:
+            key, pos = self.unpack(buffer, pos)
+            return sprite(*key), pos
+        if tag == _METHOD:
+            owner, pos = self.unpack(buffer, pos)
+            (name,) = _U32.unpack_from(buffer, pos)
+            return getattr(owner, self.strings[name]), pos + 4
+        (number,) = _U32.unpack_from(buffer, pos)
+        pos += 4
+        if tag == _STR:
+            return self.strings[number], pos
+        if tag == _STR_LIST:
+            indices = array('I')
+            indices.frombytes(buffer[pos:pos + number * 4])
+            strings = self.strings
+            return [strings[index] for index in indices], pos + number * 4
+        if tag == _FLOAT_ARRAY:
+            values = array('d')
+            values.frombytes(buffer[pos:pos + number * 8])
+            return values, pos + number * 8
+        if tag == _BIGINT:
+            return int(self.strings[number]), pos
+        if tag == _BYTES:
+            return buffer[pos:pos + number], pos + number
+        if tag == _SURFACE:
+            return self.surface(number), pos
+        if tag == _REF:
+            return _resolve(self.strings[number]), pos
+        if tag in (_LIST, _TUPLE, _SET, _FROZENSET):
+            items = []
+            for _ in range(number):
+                item, pos = self.unpack(buffer, pos)
+                items.append(item)
+            return _SEQUENCE_TYPES[tag](items), pos
+        if tag == _DICT:
+            result = {}
+            for _ in range(number):
+                key, pos = self.unpack(buffer, pos)
+                result[key], pos = self.unpack(buffer, pos)
+            return result, pos
+        if tag == _ENUM:
+            value, pos = self.unpack(buffer, pos)
+            return _resolve(self.strings[number])(value), pos
+        if tag == _OBJECT:
+            return self._unpack_object(_resolve(self.strings[number]), buffer, pos)
+        raise ValueError(f"快照中有未知的型別標記 {tag!r}")
+
+    def _unpack_object(self, cls: type, buffer: bytes, pos: int) -> Tuple[Any, int]:
+        obj = cls.__new__(cls)
+        (count,) = _U32.unpack_from(buffer, pos)
+        pos += 4
+        for _ in range(count):
+            (name,) = _U32.unpack_from(buffer, pos)
+            value, pos = self.unpack(buffer, pos + 4)
+            setattr(obj, self.strings[name], value)
+        if isinstance(obj, Buff):
+            _restore_buff_callbacks(obj)
+        return obj, pos
+
+
+_SEQUENCE_TYPES = {_LIST: list, _TUPLE: tuple, _SET: set, _FROZENSET: frozenset}
+
+
+# --- 區段讀寫 ---
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_sections(sections: Dict[str, Tuple[str, bytes]]) -> bytes:
+    """把 {名稱: (型別碼, 資料)} 組成快照檔的位元組。"""
+    table = bytearray()
+    entries = []
+    offset = 0
+    for name, (typecode, data) in sections.items():
+        entries.append((name.encode(), typecode.encode(), offset, len(data)))
+        offset = _align(offset + len(data))
+    for encoded_name, typecode, data_offset, nbytes in entries:
+        table += _NAME_LEN.pack(len(encoded_name))
+        table += encoded_name
+        table += _ENTRY.pack(typecode, data_offset, nbytes)
+
+    header = MAGIC + _HEADER.pack(SNAPSHOT_VERSION, _BYTEORDER, len(entries))
+    base = _align(len(header) + len(table))
+    out = bytearray(base + offset)
+    out[:len(header)] = header
+    out[len(header):len(header) + len(table)] = table
+    for (_, _, data_offset, nbytes), (_, data) in zip(entries, sections.values()):
+        out[base + data_offset:base + data_offset + nbytes] = data
+    return bytes(out)
+
+
+class Snapshot:
+    """
+    讀取快照檔。buffer 可為 bytes 或 mmap；區段以 memoryview 存取，不複製資料。
+    用 Snapshot.open(path) 以 mmap 映射檔案，使用完畢後 close() (或使用 with)。
+    """
+
+    def __init__(self, buffer, mapping: Optional[mmap.mmap] = None):
+        self._mapping = mapping
+        self._buffer = memoryview(buffer)
+        if self._buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("不是快照檔 (MAGIC 不符)")
+        version, byteorder, count = _HEADER.unpack_from(self._buffer, len(MAGIC))
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"不支援的快照版本 {version} (目前為 {SNAPSHOT_VERSION})")
+        if byteorder != _BYTEORDER:
+            raise ValueError("快照的位元組序與本機不同")
+
+        entries = []
+        pos = len(MAGIC) + _HEADER.size
+        for _ in range(count):
+            (name_len,) = _NAME_LEN.unpack_from(self._buffer, pos)
+            name = self._buffer[pos + 2:pos + 2 + name_len].tobytes().decode()
+            pos += 2 + name_len
+            typecode, offset, nbytes = _ENTRY.unpack_from(self._buffer, pos)
+            pos += _ENTRY.size
+            entries.append((name, typecode.decode(), offset, nbytes))
+        base = _align(pos)
+        self.sections: Dict[str, Tuple[str, int, int]] = {
+            name: (typecode, base + offset, nbytes) for name, typecode, offset, nbytes in entries}
+        self.nbytes = len(self._buffer)
+
+    @classmethod
+    def open(cls, path: str) -> 'Snapshot':
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapping, mapping)
+        except Exception:
+            mapping.close()
+            raise
+
+    def close(self) -> None:
+        self._buffer.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def raw(self, name: str) -> memoryview:
+        """區段的原始位元組 (memoryview)。"""
+        _, offset, nbytes = self.sections[name]
+        return self._buffer[offset:offset + nbytes]
+
+    def array(self, name: str):
+        """數值區段：有 NumPy 時為 ndarray，否則為 memoryview (皆直接參照映射的記憶體)。"""
+        typecode = self.sections[name][0]
+        view = self.raw(name)
+        if np is not None:
+            return np.frombuffer(view, dtype=np.dtype(typecode))
+        return view.cast(typecode)
+
+    def values(self, name: str) -> List[Any]:
+        """數值區段轉為 Python 的 int / float 列表。"""
+        return self.array(name).tolist()
+
+
+# --- 擷取 ---
+
+_snapshot_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+def _fields_of(component_type: type) -> Tuple[str, ...]:
+    names = _snapshot_fields.get(component_type)
+    if names is None:
+        names = _snapshot_fields[component_type] = tuple(
+            f.name for f in fields(component_type) if f.metadata.get('snapshot', True))
+    return names
+
+
+def _action_states(actions: Dict[str, Any]) -> Dict[str, tuple]:
+    """AI.actions 中各動作的 state_fields 值；動作的設定 (傷害、持續時間、閉包等) 由 AI.brain 重建。"""
+    return {name: tuple(getattr(action, field) for field in action.state_fields)
+            for name, action in actions.items()}
+
+
+# 寫入前轉換的組件欄位 ((組件, 欄位): 轉換函數)，載入時的反向處理見 _restore_brains
+_FIELD_STATES = {(AI, 'actions'): _action_states}
+
+
+def _column(values: List[Any], encoder: _Encoder) -> Tuple[str, bytes]:
+    """一個欄位的所有值：型別一致的 bool / int / float / str 存成定長陣列，其餘逐一編碼。"""
+    kind = type(values[0])
+    if all(type(value) is kind for value in values):
+        if kind is bool:
+            return 'B', array('B', values).tobytes()
+        if kind is float:
+            return 'd', array('d', values).tobytes()
+        if kind is str:
+            return 'I', array('I', [encoder.string(value) for value in values]).tobytes()
+        if kind is int and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+            return 'q', array('q', values).tobytes()
+    out = bytearray()
+    for value in values:
+        encoder.pack(value, out)
+    return 'v', bytes(out)
+
+
+def _tile_grid(tiles: List[List[str]]) -> Tuple[List[str], str, bytes]:
+    """瓦片名稱表與索引陣列。"""
+    names: Dict[str, int] = {}
+    indices = [names.setdefault(tile, len(names)) for row in tiles for tile in row]
+    typecode = 'B' if len(names) <= 256 else 'H'
+    return list(names), typecode, array(typecode, indices).tobytes()
+
+
+def capture(game: 'Game') -> Dict[str, Tuple[str, bytes]]:
+    """擷取目前的 World、地牢與畫面狀態，回傳 {區段名稱: (型別碼, 資料)}。"""
+    encoder = _Encoder(game)
+    sections: Dict[str, Tuple[str, bytes]] = {}
+
+    component_table = []
+    for component_type in esper.get_component_types():
+        ref = _ref(component_type)
+        if ref is None or not is_dataclass(component_type):
+            encoder.dropped[component_type.__name__] += 1
+            continue
+        pairs = [(entity, component) for entity, component in esper.get_component(component_type)
+                 if esper.entity_exists(entity)]
+        if not pairs:
+            continue
+        names = _fields_of(component_type)
+        sections[f"c/{ref}/entity"] = ('q', array('q', [entity for entity, _ in pairs]).tobytes())
+        for name in names:
+            values = [getattr(component, name) for _, component in pairs]
+            state = _FIELD_STATES.get((component_type, name))
+            if state is not None:
+                values = [state(value) for value in values]
+            sections[f"c/{ref}/{name}"] = _column(values, encoder)
+        component_table.append((ref, names))
+
+    dungeon_manager = game.dungeon_manager
+    dungeon = dungeon_manager.dungeon
+    tile_names, typecode, tiles = _tile_grid(dungeon.dungeon_tiles)
+    sections['tiles'] = (typecode, tiles)
+
+    render_manager = game.render_manager
+    if render_manager.fog_map:
+        sections['fog'] = ('B', array('B', [explored for row in render_manager.fog_map
+                                            for explored in row]).tobytes())
+
+    player = game.entity_manager.player
+    meta = {
+        'world': esper.current_world,
+        'components': component_table,
+        'current_time': game.current_time,
+        'player': player.ecs_entity if player else None,
+        'camera': tuple(render_manager.camera_offset),
+        'grid': (dungeon.grid_width, dungeon.grid_height),
+        'tile_names': tile_names,
+        'config': dungeon.config,
+        'rooms': dungeon.rooms,
+        'bridges': dungeon.bridges,
+        'next_room_id': dungeon.next_room_id,
+        'total_appeared_rooms': dungeon.total_appeared_rooms,
+        'current_room_id': dungeon_manager.current_room_id,
+        'dungeon_config': dungeon_manager.current_dungeon_config,
+    }
+    out = bytearray()
+    encoder.pack(meta, out)
+    sections['meta'] = ('v', bytes(out))
+
+    sections['surface_index'] = ('q', encoder.surface_index.tobytes())
+    sections['surfaces'] = ('B', bytes(encoder.pixels))
+    strings = bytearray(_U32.pack(len(encoder.strings)))
+    for value in encoder.strings:
+        encoded = value.encode()
+        strings += _U32.pack(len(encoded))
+        strings += encoded
+    sections['strings'] = ('v', bytes(strings))
+
+    if encoder.dropped:
+        log.info("Snapshot: 略過無法序列化的值 %s", dict(encoder.dropped))
+    return sections
+
+
+def dumps(game: 'Game') -> bytes:
+    """擷取目前狀態並編碼為快照檔的位元組。"""
+    return write_sections(capture(game))
+
+
+def save(game: 'Game', path: str) -> int:
+    """把目前狀態寫入 path，回傳寫入的位元組數。"""
+    data = dumps(game)
+    with open(path, 'wb') as file:
+        file.write(data)
+    log.info("Snapshot: 已寫入 %s (%d bytes)", path, len(data))
+    return len(data)
+
+
+# --- 還原 ---
+
+def _read_strings(buffer: memoryview) -> List[str]:
+    (count,) = _U32.unpack_from(buffer, 0)
+    strings, pos = [], 4
+    for _ in range(count):
+        (length,) = _U32.unpack_from(buffer, pos)
+        strings.append(buffer[pos + 4:pos + 4 + length].tobytes().decode())
+        pos += 4 + length
+    return strings
+
+
+def _column_values(snapshot: Snapshot, name: str, count: int, decoder: _Decoder) -> List[Any]:
+    typecode = snapshot.sections[name][0]
+    if typecode == 'v':
+        return decoder.unpack_all(snapshot.raw(name), count)
+    values = snapshot.values(name)
+    if typecode == 'B':
+        return [bool(value) for value in values]
+    if typecode == 'I':
+        strings = decoder.strings
+        return [strings[value] for value in values]
+    return values
+
+
+def _field_default(field) -> Any:
+    if field.default is not MISSING:
+        return field.default
+    if field.default_factory is not MISSING:
+        return field.default_factory()
+    return None
+
+
+def _build_components(snapshot: Snapshot, meta: Dict[str, Any], decoder: _Decoder) -> Dict[int, List[Any]]:
+    """依欄式區段重建組件實例，回傳 {實體: [組件, ...]}。"""
+    components: Dict[int, List[Any]] = {}
+    for ref, names in meta['components']:
+        component_type = _resolve(ref)
+        entities = snapshot.values(f"c/{ref}/entity")
+        instances = [component_type.__new__(component_type) for _ in entities]
+        for name in names:
+            for instance, value in zip(instances, _column_values(snapshot, f"c/{ref}/{name}", len(entities), decoder)):
+                setattr(instance, name, value)
+        derived = False
+        for field in fields(component_type):
+            if field.name not in names:
+                derived = derived or not field.init
+                for instance in instances:
+                    setattr(instance, field.name, _field_default(field))
+        if derived:
+            # 不寫入快照的 init=False 欄位 (例如 Collider 的碰撞位元) 交由 __post_init__ 重新計算
+            for instance in instances:
+                instance.__post_init__()
+        for entity, instance in zip(entities, instances):
+            components.setdefault(entity, []).append(instance)
+    return components
+
+
+def _restore_brains() -> None:
+    """依 AI.brain 重建行為樹與動作，並套用快照中各動作的狀態 (計時、目前方向等)。"""
+    from src.entities.ecs_factory import AI_BRAINS
+
+    for entity, ai in esper.get_component(AI):
+        if not ai.brain or ai.brain[0] not in AI_BRAINS:
+            log.warning("Snapshot: 實體 %s 的 AI 無法重建 (brain=%r)，移除 AI 組件", entity, ai.brain)
+            esper.remove_component(entity, AI)
+            continue
+        name, kwargs = ai.brain
+        behavior_tree, actions = AI_BRAINS[name](**kwargs)
+        for action_name, action in actions.items():
+            saved = ai.actions.get(action_name)
+            if saved is not None:
+                for field, value in zip(action.state_fields, saved):
+                    setattr(action, field, value)
+        ai.behavior_tree = behavior_tree
+        ai.actions = actions
+
+
+def restore(game: 'Game', snapshot: Snapshot) -> None:
+    """以快照取代目前的 World、地牢與畫面狀態，並回到遊戲狀態。"""
+    decoder = _Decoder(game, _read_strings(snapshot.raw('strings')), snapshot.values('surface_index'),
+                       snapshot.raw('surfaces'))
+    (meta,) = decoder.unpack_all(snapshot.raw('meta'), 1)
+
+    # 1. 地牢：瓦片、房間與配置 (MovementSystem 的通行表依 dungeon_tiles 物件快取，換成新列表即會重建)
+    dungeon_manager = game.dungeon_manager
+    dungeon = dungeon_manager.dungeon
+    width, height = meta['grid']
+    tile_names = meta['tile_names']
+    flat = [tile_names[index] for index in snapshot.values('tiles')]
+    dungeon.config = meta['config']
+    dungeon.grid_width, dungeon.grid_height = width, height
+    dungeon.dungeon_tiles = [flat[y * width:(y + 1) * width] for y in range(height)]
+    dungeon.rooms = meta['rooms']
+    dungeon.bridges = meta['bridges']
+    dungeon.next_room_id = meta['next_room_id']
+    dungeon.total_appeared_rooms = meta['total_appeared_rooms']
+    dungeon_manager.current_room_id = meta['current_room_id']
+    dungeon_manager.current_dungeon_config = meta['dungeon_config']
+
+    # 2. World：切換到快照的 World 並以原本的實體 ID 重建 (技能鏈不在快照中，沿用目前玩家的)
+    entity_manager = game.entity_manager
+    player = entity_manager.player
+    skill_chain = None
+    if player and esper.has_component(player.ecs_entity, PlayerComponent):
+        skill_chain = esper.component_for_entity(player.ecs_entity, PlayerComponent).skill_chain
+    entity_manager.enter_world(meta['world'])
+    esper.clear_database()
+    components = _build_components(snapshot, meta, decoder)
+    esper.restore_entities(list(components), components.values())
+    _restore_brains()
+
+    # 3. 玩家 Facade 指向快照中的玩家實體
+    player_entity = meta['player']
+    if player_entity is not None:
+        if player is None:
+            from src.entities.player.player import Player
+            player = entity_manager.player = Player(game, player_entity)
+        player.ecs_entity = player_entity
+        if skill_chain is not None:
+            esper.component_for_entity(player_entity, PlayerComponent).skill_chain = skill_chain
+        else:
+            game.storage_manager.apply_skills_to_player()
+
+    # 4. 畫面與時間
+    render_manager = game.render_manager
+    render_manager.camera_offset = list(meta['camera'])
+    if 'fog' in snapshot:
+        explored = [bool(value) for value in snapshot.values('fog')]
+        render_manager.load_fog_map([explored[y * width:(y + 1) * width] for y in range(height)])
+    else:
+        render_manager.reset_minimap()
+        render_manager.reset_fog()
+    game.current_time = meta['current_time']
+    game.event_manager.state = "playing"
+    game.menu_manager.close_all_menus()
+    game.timestep.reset()
+    game.render_system.capture()
+
+
+def loads(game: 'Game', data: bytes) -> None:
+    """從快照檔的位元組還原 (見 restore)。"""
+    with Snapshot(data) as snapshot:
+        restore(game, snapshot)
+
+
+def load(game: 'Game', path: str) -> None:
+    """以 mmap 映射 path 並還原 (見 restore)。"""
+    with Snapshot.open(path) as snapshot:
+        restore(game, snapshot)
+    log.info("Snapshot: 已載入 %s", path)
@@ -0,0 +1,50 @@
+# src/core/timestep.py
+"""
+固定步長模擬時鐘
+把每幀實際經過的時間累加起來，切成固定 dt 的模擬 tick，
+讓遊戲結果與畫面幀率無關 (幀率抖動或卡頓不會產生巨大的 dt)。
+"""
+from src.core.config import SIM_TICK_RATE, MAX_SIM_STEPS_PER_FRAME
+
+
+class FixedTimestep:
+    """
+    固定步長累加器 (accumulator)。
+
+    advance(frame_time) 回傳本幀應執行的模擬 tick 數，每個 tick 都以固定的 dt 推進；
+    不足一個 tick 的時間留到下一幀。一幀最多追趕 max_steps 個 tick，超過的時間直接丟棄
+    (遊戲暫時變慢，而不是以巨大的 dt 讓子彈穿牆或一次觸發大量 buff tick)。
+    alpha 為剩餘時間佔一個 tick 的比例，供繪製時在最後兩個模擬狀態之間內插。
+    """
+
+    def __init__(self, tick_rate: float = SIM_TICK_RATE, max_steps: int = MAX_SIM_STEPS_PER_FRAME):
+        if tick_rate <= 0 or max_steps < 1:
+            raise ValueError("tick_rate 必須大於 0，max_steps 至少為 1")
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.behind = False  # 上一次 advance 是否達到追趕上限 (負載過高)
+        self.ticks = 0       # 累計執行的 tick 數
+
+    def advance(self, frame_time: float) -> int:
+        """加入本幀經過的時間 (秒)，回傳需要執行的 tick 數。"""
+        budget = self.dt * self.max_steps
+        accumulated = self.accumulator + max(frame_time, 0.0)
+        self.behind = accumulated >= budget
+        accumulated = min(accumulated, budget)
+
+        # 加上極小的容差，避免 1/60 之類的時間因浮點誤差少算一個 tick
+        steps = min(int(accumulated / self.dt + 1e-9), self.max_steps)
+        self.accumulator = max(accumulated - steps * self.dt, 0.0)
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """剩餘時間佔一個 tick 的比例 (0 ~ 1)，用於繪製內插。"""
+        return min(self.accumulator / self.dt, 1.0)
+
+    def reset(self) -> None:
+        """清空累積的時間 (例如切換場景後重新開始計時)。"""
+        self.accumulator = 0.0
+        self.behind = False
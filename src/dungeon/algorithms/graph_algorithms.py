@@ -5,6 +5,9 @@
 """
 from typing import List, Tuple, Set
 import random
+from src.core.log import channel
+
+log = channel("dungeon.builder")
 
 
 class UnionFind:
@@ -176,7 +179,7 @@ class GraphAlgorithms:
         
         # 如果過濾後沒有有效邊，返回原 MST
         if not valid_edges:
-            print("GraphAlgorithms: 過濾後沒有符合條件的額外邊")
+            log.debug("GraphAlgorithms: 過濾後沒有符合條件的額外邊")
             return mst_edges
         
         # 計算要添加的邊數量
@@ -187,7 +190,7 @@ class GraphAlgorithms:
         
         # 隨機選擇額外邊
         extra_edges = random.sample(valid_edges, min(num_extra, len(valid_edges)))
-        print(f"GraphAlgorithms: 添加 {len(extra_edges)} 條額外邊（過濾前: {len(non_mst_edges)}）")
+        log.debug("GraphAlgorithms: 添加 %s 條額外邊（過濾前: %s）", len(extra_edges), len(non_mst_edges))
         return mst_edges + extra_edges
     
     @staticmethod
@@ -16,6 +16,9 @@ from ..generators.corridor_generator import CorridorGenerator
 from ..generators.door_generator import DoorGenerator
 from ..managers.tile_manager import TileManager
 from ..room import Room, RoomType
+from src.core.log import channel
+
+log = channel("dungeon.builder")
 
 
 class DungeonBuilder:
@@ -49,22 +52,20 @@ class DungeonBuilder:
         Returns:
             (rooms, grid): 房間列表和瓦片網格
         """
-        print("=" * 60)
-        print("開始生成地牢...")
-        print("=" * 60)
+        log.info("開始生成地牢...")
         
         # 1. 生成 BSP 樹
-        print("\n[1/10] 生成 BSP 樹...")
+        log.debug("[1/10] 生成 BSP 樹...")
         bsp_tree = self.bsp_generator.generate(
             self.config.grid_width,
             self.config.grid_height
         )
         depth = self.bsp_generator.get_tree_depth(bsp_tree)
         total_nodes, leaf_nodes = self.bsp_generator.get_node_count(bsp_tree)
-        print(f"  ✓ BSP 樹深度: {depth}, 總節點: {total_nodes}, 葉節點: {leaf_nodes}")
+        log.debug("  ✓ BSP 樹深度: %s, 總節點: %s, 葉節點: %s", depth, total_nodes, leaf_nodes)
         
         # 2. 在 BSP 樹中放置房間
-        print("\n[2/10] 放置房間...")
+        log.debug("[2/10] 放置房間...")
         
         # Check if this is a special-room-only dungeon (boss or final only)
         special_config = self.config.special_rooms
@@ -73,7 +74,7 @@ class DungeonBuilder:
         
         if (is_boss_only or is_final_only) and self.config.monster_room_ratio == 0.0:
             # Special room only - create it directly instead of using BSP
-            print("  Detected special-room-only dungeon, creating room directly...")
+            log.debug("  Detected special-room-only dungeon, creating room directly...")
             rooms = []
             
             if is_boss_only:
@@ -98,42 +99,42 @@ class DungeonBuilder:
                 tiles=None
             )
             rooms.append(room)
-            print(f"  ✓ Created special room at ({x}, {y}) with size {w}x{h}")
+            log.debug("  ✓ Created special room at (%s, %s) with size %sx%s", x, y, w, h)
         else:
             # Normal BSP generation
             rooms = self.room_placer.place_rooms_in_bsp(bsp_tree)
             
-        print(f"  ✓ 生成 {len(rooms)} 個房間")
+        log.debug("  ✓ 生成 %s 個房間", len(rooms))
         
         # 3. 分配房間類型
-        print("\n[3/10] 分配房間類型...")
+        log.debug("[3/10] 分配房間類型...")
         self.room_type_assigner.assign_types(rooms)
         
         # [新增] 應用特殊房間配置 (Boss/Final)
         self._apply_special_rooms(rooms)
         
         type_counts = self.room_type_assigner.get_room_type_counts(rooms)
-        print(f"  ✓ 房間類型分布: {type_counts}")
+        log.debug("  ✓ 房間類型分布: %s", type_counts)
         
         # 4. 構建房間圖
-        print("\n[4/10] 構建房間連接圖...")
+        log.debug("[4/10] 構建房間連接圖...")
         edges = self._build_room_graph(rooms)
-        print(f"  ✓ 生成 {len(edges)} 條可能的連接")
+        log.debug("  ✓ 生成 %s 條可能的連接", len(edges))
         
         # 5. 計算最小生成樹
-        print("\n[5/10] 計算最小生成樹...")
+        log.debug("[5/10] 計算最小生成樹...")
         mst_edges = GraphAlgorithms.kruskal_mst(edges, len(rooms))
-        print(f"  ✓ MST 包含 {len(mst_edges)} 條邊")
+        log.debug("  ✓ MST 包含 %s 條邊", len(mst_edges))
         
         # 6. 添加額外邊
-        print("\n[6/10] 添加額外連接...")
+        log.debug("[6/10] 添加額外連接...")
         connections = GraphAlgorithms.add_extra_edges(
             mst_edges, edges, self.config.extra_bridge_ratio, rooms=rooms
         )
-        print(f"  ✓ 總連接數: {len(connections)}")
+        log.debug("  ✓ 總連接數: %s", len(connections))
         
         # 7. 初始化瓦片網格
-        print("\n[7/10] 初始化瓦片網格...")
+        log.debug("[7/10] 初始化瓦片網格...")
         self.tile_manager = TileManager(self.config.grid_width, self.config.grid_height)
         
         # 為每個房間生成瓦片
@@ -143,10 +144,10 @@ class DungeonBuilder:
         # 放置房間到網格
         for room in rooms:
             self.tile_manager.place_room(room)
-        print(f"  ✓ 網格尺寸: {self.config.grid_width}x{self.config.grid_height}")
+        log.debug("  ✓ 網格尺寸: %sx%s", self.config.grid_width, self.config.grid_height)
         
         # 8. 生成走廊
-        print("\n[8/10] 生成走廊...")
+        log.debug("[8/10] 生成走廊...")
         pathfinder = AStarPathfinder(
             self.tile_manager.grid,
             passable_tiles=None,  # 允許在 Outside 上尋路
@@ -158,10 +159,10 @@ class DungeonBuilder:
         # 膨脹走廊
         corridor_gen.expand_corridors(self.tile_manager.grid)
         corridor_count = self.tile_manager.count_tiles('Bridge_floor')
-        print(f"  ✓ 走廊瓦片數: {corridor_count}")
+        log.debug("  ✓ 走廊瓦片數: %s", corridor_count)
         
         # 9. 添加房間邊界
-        print("\n[9/10] 添加房間邊界...")
+        log.debug("[9/10] 添加房間邊界...")
         self.tile_manager.add_room_borders(rooms)
         border_count = sum(
             self.tile_manager.count_tiles(f'Border_wall{suffix}')
@@ -169,7 +170,7 @@ class DungeonBuilder:
                           '_top_left_corner', '_top_right_corner',
                           '_bottom_left_corner', '_bottom_right_corner']
         )
-        print(f"  ✓ 邊界牆瓦片數: {border_count}")
+        log.debug("  ✓ 邊界牆瓦片數: %s", border_count)
         
         # # 10. 生成門
         # print("\n[10/10] 生成門...")
@@ -178,14 +179,12 @@ class DungeonBuilder:
         # print(f"  ✓ 門數量: {door_count}")
         
         # 11. 最終牆壁調整
-        print("\n調整牆壁...")
+        log.debug("調整牆壁...")
         self._add_walls()
         self.adjust_wall()
-        print("  ✓ 牆壁調整完成")
+        log.debug("  ✓ 牆壁調整完成")
         
-        print("\n" + "=" * 60)
-        print("地牢生成完成！")
-        print("=" * 60)
+        log.info("地牢生成完成！")
         
         return rooms, self.tile_manager.grid
     
@@ -196,9 +195,9 @@ class DungeonBuilder:
         Args:
             dungeon_id: 地牢 ID
         """
-        print(f"DungeonBuilder: 開始初始化地牢 ID {dungeon_id}...")
+        log.info("DungeonBuilder: 開始初始化地牢 ID %s...", dungeon_id)
         rooms, grid = self.build()
-        print(f"DungeonBuilder: 地牢 ID {dungeon_id} 初始化完成，共有 {len(rooms)} 個房間。")
+        log.info("DungeonBuilder: 地牢 ID %s 初始化完成，共有 %s 個房間。", dungeon_id, len(rooms))
         # 這裡可以將生成的 rooms 和 grid 返回給 Dungeon 實例進行後續處理
         return rooms, grid
         pass
@@ -245,7 +244,7 @@ class DungeonBuilder:
             height=height,
             room_type=room_type
         )
-        print(f"Generated Room ID {room_id} of type {room_type.name} at ({x}, {y}) with size ({width}x{height})")
+        log.debug("Generated Room ID %s of type %s at (%s, %s) with size (%sx%s)", room_id, room_type.name, x, y, width, height)
         return room
     
     def _place_room(self, room: Room) -> None:
@@ -356,7 +355,7 @@ class DungeonBuilder:
         # 檢查 Boss Room
         boss_conf = special_config.get("boss_room", {})
         if boss_conf.get("enabled", False):
-            print(f"DungeonBuilder: Converting Room {target_room.id} to BOSS Room")
+            log.debug("DungeonBuilder: Converting Room %s to BOSS Room", target_room.id)
             target_room.room_type = RoomType.BOSS
             
             # 調整尺寸 (保持中心點不變)
@@ -373,7 +372,7 @@ class DungeonBuilder:
         # 檢查 Final Room
         final_conf = special_config.get("final_room", {})
         if final_conf.get("enabled", False):
-            print(f"DungeonBuilder: Converting Room {target_room.id} to FINAL Room")
+            log.debug("DungeonBuilder: Converting Room %s to FINAL Room", target_room.id)
             target_room.room_type = RoomType.FINAL
             
             size = final_conf.get("room_size")
@@ -8,6 +8,9 @@ import os
 from pathlib import Path
 from typing import Optional, Dict, Any
 from .level_config import LevelConfig, MonsterConfig, MonsterPoolConfig
+from src.core.log import channel
+
+log = channel("dungeon.config")
 
 
 class LevelConfigLoader:
@@ -39,7 +42,7 @@ class LevelConfigLoader:
         config_path = self.config_dir / f"level_{level_id}.json"
         
         if not config_path.exists():
-            print(f"警告: 找不到關卡 {level_id} 的配置文件: {config_path}")
+            log.warning("警告: 找不到關卡 %s 的配置文件: %s", level_id, config_path)
             return None
         
         try:
@@ -51,17 +54,17 @@ class LevelConfigLoader:
             # 驗證配置
             is_valid, error = level_config.validate()
             if not is_valid:
-                print(f"錯誤: 關卡 {level_id} 配置無效: {error}")
+                log.error("錯誤: 關卡 %s 配置無效: %s", level_id, error)
                 return None
             
-            print(f"成功載入關卡 {level_id} 配置: {level_config.level_name}")
+            log.info("成功載入關卡 %s 配置: %s", level_id, level_config.level_name)
             return level_config
             
         except json.JSONDecodeError as e:
-            print(f"錯誤: 無法解析 JSON 文件 {config_path}: {e}")
+            log.error("錯誤: 無法解析 JSON 文件 %s: %s", config_path, e)
             return None
         except Exception as e:
-            print(f"錯誤: 載入關卡 {level_id} 配置時發生錯誤: {e}")
+            log.error("錯誤: 載入關卡 %s 配置時發生錯誤: %s", level_id, e)
             return None
     
     def load_level_from_file(self, file_path: str) -> Optional[LevelConfig]:
@@ -77,7 +80,7 @@ class LevelConfigLoader:
         path = Path(file_path)
         
         if not path.exists():
-            print(f"警告: 找不到配置文件: {file_path}")
+            log.warning("警告: 找不到配置文件: %s", file_path)
             return None
         
         try:
@@ -89,17 +92,17 @@ class LevelConfigLoader:
             # 驗證配置
             is_valid, error = level_config.validate()
             if not is_valid:
-                print(f"錯誤: 配置文件 {file_path} 無效: {error}")
+                log.error("錯誤: 配置文件 %s 無效: %s", file_path, error)
                 return None
             
-            print(f"成功載入配置文件: {file_path}")
+            log.info("成功載入配置文件: %s", file_path)
             return level_config
             
         except json.JSONDecodeError as e:
-            print(f"錯誤: 無法解析 JSON 文件 {file_path}: {e}")
+            log.error("錯誤: 無法解析 JSON 文件 %s: %s", file_path, e)
             return None
         except Exception as e:
-            print(f"錯誤: 載入配置文件 {file_path} 時發生錯誤: {e}")
+            log.error("錯誤: 載入配置文件 %s 時發生錯誤: %s", file_path, e)
             return None
     
     def _parse_level_config(self, data: Dict[str, Any]) -> LevelConfig:
@@ -196,7 +199,7 @@ class LevelConfigLoader:
             # 驗證配置
             is_valid, error = level_config.validate()
             if not is_valid:
-                print(f"錯誤: 無法保存無效的配置: {error}")
+                log.error("錯誤: 無法保存無效的配置: %s", error)
                 return False
             
             # 轉換為字典並保存
@@ -205,11 +208,11 @@ class LevelConfigLoader:
             with open(config_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
-            print(f"成功保存關卡 {level_id} 配置到: {config_path}")
+            log.info("成功保存關卡 %s 配置到: %s", level_id, config_path)
             return True
             
         except Exception as e:
-            print(f"錯誤: 保存關卡 {level_id} 配置時發生錯誤: {e}")
+            log.error("錯誤: 保存關卡 %s 配置時發生錯誤: %s", level_id, e)
             return False
     
     def list_available_levels(self) -> list[int]:
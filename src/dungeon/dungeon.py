@@ -15,13 +15,17 @@ from .config.dungeon_config import (
     DungeonConfig, RoomType, 
     TILE_OUTSIDE, TILE_FLOOR, TILE_DOOR, TILE_WALL 
 ) 
+from src.core.log import channel
+
+log = channel("dungeon")
+
 
 # --- 3. 導入 Pygame 相關常數 (假設來自頂層 src/config.py) ---
 try:
     # 這些常數用於繪圖方法中的屏幕尺寸和回退顏色
     from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, GRAY, BLACK, DARK_GRAY 
 except ImportError:
-    print("警告：無法導入 src.config 中的屏幕/顏色常量。使用默認值。")
+    log.warning("警告：無法導入 src.config 中的屏幕/顏色常量。使用默認值。")
     SCREEN_WIDTH, SCREEN_HEIGHT = 1400, 750
     GRAY, BLACK, DARK_GRAY = (100, 100, 100), (0, 0, 0), (40, 40, 40)
 
@@ -53,6 +57,8 @@ class Dungeon:
         
         self.next_room_id = 1  
         self.total_appeared_rooms = 0  
+        # 大廳佈局快取 (rooms, bridges, tiles, next_room_id)：大廳只生成一次，之後直接還原
+        self._lobby_layout: Optional[Tuple[List[Room], List[Bridge], List[List[str]], int]] = None
 
         # --- 貼圖集資源 (由 ResourceLoader 注入) ---
         self.background_tileset: Optional[Dict[str, pygame.Surface]] = load_background_tileset(self.config, get_project_path)
@@ -63,7 +69,7 @@ class Dungeon:
 
     def initialize_dungeon(self, dungeon_id: int) -> None:
         """地牢生成入口。委派給 DungeonBuilder 執行整個生成流程。"""
-        print("Dungeon: 啟動 DungeonBuilder 進行地牢生成...")
+        log.info("Dungeon: 啟動 DungeonBuilder 進行地牢生成...")
         
         # 清空舊的地牢瓦片，防止切換時看到之前的地牢
         self.dungeon_tiles = deepcopy([['Outside' for _ in range(self.config.grid_width)] 
@@ -82,13 +88,27 @@ class Dungeon:
         self.grid_height = self.config.grid_height
         
         self.dungeon_tiles = self.builder.tile_manager.grid
-        print("Dungeon: 生成完成，地牢數據已準備就緒。")
+        log.info("Dungeon: 生成完成，地牢數據已準備就緒。")
 
-    def initialize_lobby(self) -> None:
+    def initialize_lobby(self, rebuild: bool = False) -> None:
         """
         僅初始化一個大廳房間的地牢 (常用於遊戲起始點)。
         注意：此方法調用 DungeonBuilder 的內部方法，體現 Dungeon 作為門面。
+
+        大廳佈局固定，第一次生成後即快取；之後再回到大廳只還原快取，
+        不再重跑放置房間、牆壁與 adjust_wall()。rebuild=True 可強制重新生成。
         """
+        if self._lobby_layout is not None and not rebuild:
+            rooms, bridges, tiles, next_room_id = self._lobby_layout
+            self.rooms = list(rooms)
+            self.bridges = list(bridges)
+            self.dungeon_tiles = tiles
+            self.grid_height = len(tiles)
+            self.grid_width = len(tiles[0]) if tiles else 0
+            self.next_room_id = next_room_id
+            self.total_appeared_rooms = len(self.rooms)
+            return
+
         # 清空舊的地牢瓦片，防止切換時看到之前的地牢
         self.dungeon_tiles = deepcopy([['Outside' for _ in range(self.config.grid_width)] 
                                for _ in range(self.config.grid_height)])
@@ -120,8 +140,9 @@ class Dungeon:
         self.builder._add_walls() 
         self.builder.adjust_wall() 
         self.dungeon_tiles = self.builder.tile_manager.grid
+        self._lobby_layout = (list(self.rooms), list(self.bridges), self.dungeon_tiles, self.next_room_id)
         
-        print(f"初始化大廳：房間 {lobby_room.id} 在 ({lobby_x}, {lobby_y})，尺寸 {lobby_width}x{lobby_height}")
+        log.info("初始化大廳：房間 %s 在 (%s, %s)，尺寸 %sx%s", lobby_room.id, lobby_x, lobby_y, lobby_width, lobby_height)
 
 
     def set_tilesets(self, background_ts: Dict[str, pygame.Surface], foreground_ts: Dict[str, pygame.Surface]) -> None:
@@ -137,7 +158,7 @@ class Dungeon:
         """
         Draw the dungeon background tiles, optimized by camera clipping.
         """
-        print("Dungeon: 繪製背景瓦片...")
+        log.debug("Dungeon: 繪製背景瓦片...")
         offset_x, offset_y = camera_offset
         tile_size = self.config.tile_size # 使用配置
         
@@ -238,14 +259,14 @@ class Dungeon:
             center_y = int(start_room.y + start_room.height // 2) * tile_size
             return center_x, center_y
         except StopIteration:
-            print("警告：未找到起始房間 (RoomType.START)！回傳 (0, 0)。")
+            log.warning("警告：未找到起始房間 (RoomType.START)！回傳 (0, 0)。")
             return 0, 0
     
     def reset(self) -> None:
         """
         重置地牢狀態以準備重新生成。
         """
-        print("Dungeon: 重置地牢狀態...")
+        log.info("Dungeon: 重置地牢狀態...")
         self.dungeon_tiles = deepcopy([['Outside' for _ in range(self.config.grid_width)] 
                                for _ in range(self.config.grid_height)])
         self.rooms = []  # 清空房間列表
@@ -7,6 +7,9 @@ from typing import List, Tuple, Set
 from ..room import Room
 from ..algorithms.pathfinding import AStarPathfinder
 from ..config.dungeon_config import DungeonConfig
+from src.core.log import channel
+
+log = channel("dungeon.builder")
 
 
 class CorridorGenerator:
@@ -61,7 +64,7 @@ class CorridorGenerator:
         path = self.pathfinder.find_path(start, end, allow_diagonal=False)
         
         if not path:
-            print(f"Warning: Could not find path between rooms {room1.id} and {room2.id}")
+            log.warning("Warning: Could not find path between rooms %s and %s", room1.id, room2.id)
             return
         
         # 將路徑上的瓦片轉換為 Bridge_floor
@@ -3,6 +3,9 @@ from typing import List, Tuple
 from dataclasses import dataclass
 from src.dungeon.config.dungeon_config import RoomType
 import random
+from src.core.log import channel
+
+log = channel("dungeon.room")
 
 
 # 定義房間數據結構，用於儲存房間的屬性和瓦片數據
@@ -27,7 +30,7 @@ class Room:
     
     def generate_tiles(self) -> None:
         """Configure tiles based on room type with optimized item placement"""
-        print(f"Generating tiles for Room ID {self.id} of type {self.room_type}")
+        log.debug("Generating tiles for Room ID %s of type %s", self.id, self.room_type)
         # 初始化所有瓦片為基本地板
         self.tiles = [['Room_floor' for _ in range(int(self.width))] 
                           for _ in range(int(self.height))]
@@ -43,14 +46,14 @@ class Room:
                 for col in range(1, int(self.width) - 1):
                     self.tiles[row][col] = 'End_room_floor'
             self.tiles[center_y][center_x] = 'End_room_portal'
-            print(f"End Room (ID: {self.id}) Portal placed.")
+            log.debug("End Room (ID: %s) Portal placed.", self.id)
 
         elif self.room_type == RoomType.START:
             for row in range(int(self.height)):
                 for col in range(int(self.width)):
                     self.tiles[row][col] = 'Start_room_floor'
             self.tiles[center_y][center_x] = 'Player_spawn'
-            print(f"Start Room (ID: {self.id}) Player spawn placed.")
+            log.debug("Start Room (ID: %s) Player spawn placed.", self.id)
 
         elif self.room_type == RoomType.LOBBY:
             for row in range(int(self.height)):
@@ -67,7 +70,7 @@ class Room:
             self.tiles[int(self.height) - 3][int(self.width) - 4] = 'Dummy_spawn'  # 右下
             self.tiles[center_y + 3][center_x] = 'Player_spawn'  # 中心下
             self.tiles[center_y - 3][center_x] = 'NPC_spawn'  # 中心 NPC
-            print(f"Lobby Room (ID: {self.id}) NPC and Player spawns placed.")
+            log.debug("Lobby Room (ID: %s) NPC and Player spawns placed.", self.id)
 
         elif self.room_type == RoomType.MONSTER:
             # Monster room: Scale number of monsters based on room size
@@ -87,7 +90,7 @@ class Room:
             for i in range(min(num_monsters, len(spawn_points))):
                 row, col = spawn_points[i]
                 self.tiles[row][col] = 'Monster_spawn'
-            print(f"Monster Room (ID: {self.id}) with {num_monsters} monsters placed.")
+            log.debug("Monster Room (ID: %s) with %s monsters placed.", self.id, num_monsters)
 
         elif self.room_type == RoomType.TRAP:
             # Trap room: Random trap placement with NPC in center
@@ -111,7 +114,7 @@ class Room:
             for i in range(min(num_traps, len(spawn_points))):
                 row, col = spawn_points[i]
                 self.tiles[row][col] = 'Trap_spawn'
-            print(f"Trap Room (ID: {self.id}) with {num_traps} traps placed.")
+            log.debug("Trap Room (ID: %s) with %s traps placed.", self.id, num_traps)
 
         elif self.room_type == RoomType.REWARD:
             # Reward room: Place 1-5 treasure chests in center area
@@ -122,7 +125,7 @@ class Room:
             
             self.tiles[center_y][center_x] = 'Reward_spawn'
             
-            print(f"Reward Room (ID: {self.id}) with chests placed.")
+            log.debug("Reward Room (ID: %s) with chests placed.", self.id)
                 
         elif self.room_type == RoomType.BOSS:
             # Boss Room: Center spawning for boss, specialized floor
@@ -135,7 +138,7 @@ class Room:
             
             # Spawn Player near the center
             self.tiles[center_y + 3][center_x] = 'Player_spawn'
-            print(f"Boss Room (ID: {self.id}) Boss spawn placed.")
+            log.debug("Boss Room (ID: %s) Boss spawn placed.", self.id)
 
         elif self.room_type == RoomType.FINAL:
             # Final Room: Center NPC, surrounded by chests
@@ -156,14 +159,14 @@ class Room:
                 if 1 <= r < int(self.height) - 1 and 1 <= c < int(self.width) - 1:
                     self.tiles[r][c] = 'Reward_spawn'
             
-            print(f"Final Room (ID: {self.id}) Final NPC and chests placed.")
+            log.debug("Final Room (ID: %s) Final NPC and chests placed.", self.id)
 
         elif self.room_type == RoomType.NPC:
             for row in range(int(self.height)):
                 for col in range(int(self.width)):
                     self.tiles[row][col] = 'NPC_room_floor'
             self.tiles[center_y][center_x] = 'NPC_spawn'
-            print(f"NPC Room (ID: {self.id}) NPC placed.")
+            log.debug("NPC Room (ID: %s) NPC placed.", self.id)
         # 未來可為其他房間類型（如 MONSTER、TRAP、REWARD）添加特殊瓦片邏輯
         elif self.room_type == RoomType.EMPTY: pass
         
@@ -4,14 +4,19 @@ from abc import ABC, abstractmethod
 from typing import List, Tuple, Callable, Dict, Optional, Any
 import math
 import pygame
-import random
 # 引入 ECS 組件
 import esper
-from src.ecs.components import PlayerComponent, Position, Tag, Velocity, Health, Combat, AI, Collider, Renderable
+from src.ecs.components import (
+    PlayerComponent, Position, Tag, Velocity, Health, Combat, Explosion, PercentageDamage, AI, Collider, Renderable
+)
 from src.core.config import TILE_SIZE, RED, PASSABLE_TILES
 from src.entities.bullet.expand_circle_bullet import create_expanding_circle_bullet
-from src.entities.bullet.bullet import create_standard_bullet_entity
+from src.entities.bullet.bullet import create_standard_bullet_entity, spawn_standard_bullets
 from src.buffs.element_buff import ELEMENTAL_BUFFS
+from src.core.log import channel
+from src.core import rng
+
+log = channel("ecs.ai")
 
 # --- 實體操作 Facade（用於行為樹內部） ---
 
@@ -25,6 +30,11 @@ class EnemyContext:
     def _get_comp(self, component_type):
         """安全地獲取組件，若無則報錯（ECS 實體應有此組件）"""
         return self.world.component_for_entity(self.ecs_entity, component_type)
+
+    def _get_cold_comp(self, component_type):
+        """獲取可選的冷組件，實體沒有時回傳該組件的預設實例。"""
+        component = self.world.try_component(self.ecs_entity, component_type)
+        return component if component is not None else component_type()
     
     @property
     def cause_death(self) -> bool:
@@ -54,22 +64,23 @@ class EnemyContext:
     def damage(self) -> int: return self._get_comp(Combat).damage
     @property
     def buffs(self) -> List[str]: return self._get_comp(Combat).buffs
+    # 爆炸與百分比傷害是冷組件 (Explosion / PercentageDamage)，沒有時回傳預設值
     @property
-    def explosion_range(self) -> int: return self._get_comp(Combat).explosion_range
+    def explosion_range(self) -> int: return self._get_cold_comp(Explosion).range
     @property
-    def explosion_damage(self) -> int: return self._get_comp(Combat).explosion_damage
+    def explosion_damage(self) -> int: return self._get_cold_comp(Explosion).damage
     @property
-    def explosion_element(self) -> str: return self._get_comp(Combat).explosion_element
+    def explosion_element(self) -> str: return self._get_cold_comp(Explosion).element
     @property
-    def explosion_buffs(self) -> List[str]: return self._get_comp(Combat).explosion_buffs
+    def explosion_buffs(self) -> List[str]: return self._get_cold_comp(Explosion).buffs
     @property
     def max_penetration_count(self) -> int: return self._get_comp(Combat).max_penetration_count
     @property
-    def max_hp_percentage_damage(self) -> float: return self._get_comp(Combat).max_hp_percentage_damage
+    def max_hp_percentage_damage(self) -> float: return self._get_cold_comp(PercentageDamage).max_hp
     @property
-    def current_hp_percentage_damage(self) -> float: return self._get_comp(Combat).current_hp_percentage_damage
+    def current_hp_percentage_damage(self) -> float: return self._get_cold_comp(PercentageDamage).current_hp
     @property
-    def lose_hp_percentage_damage(self) -> float: return self._get_comp(Combat).lose_hp_percentage_damage
+    def lose_hp_percentage_damage(self) -> float: return self._get_cold_comp(PercentageDamage).lose_hp
 
     def set_current_action(self, action_id: str):
         self._get_comp(AI).current_action = action_id
@@ -93,9 +104,9 @@ class EnemyContext:
     def is_alive(self) -> bool:
         return self.current_hp > 0
     
-    def get_entities_with_tag(self, tag: str) -> List[Any]:
-        """通過遊戲實例訪問 entity_manager，獲取具有特定標籤的實體列表。"""
-        return [e for e in self.game.entity_manager.get_all_entities() if getattr(e, 'tag', None) == tag]
+    def get_entities_with_tag(self, tag: str, *component_types) -> List[Tuple[int, List[Any]]]:
+        """從 esper 的標籤索引取得 [(entity, [Position, *component_types])]。"""
+        return self.world.get_tagged(tag, Position, *component_types)
     # # 簡化：不實現 MeleeAttackAction 複雜的 collision 邏輯，僅發送傷害事件
     # def apply_melee_damage(self, damage: int):
     #     if self.player and not self.player.invulnerable:
@@ -199,7 +210,9 @@ class IdleNode(BehaviorNode):
 # 所有的 Action.update/start 簽名也必須調整為接受 Context
 
 class Action(ABC):
-    # ... (init, reset 保持不變) ...
+    # 執行期間會改變的屬性 (快照只寫入這些，其餘設定由 AI.brain 重建)；子類別有額外狀態時延伸
+    state_fields: Tuple[str, ...] = ('timer', 'started')
+
     def __init__(self, action_id: str, duration: float = 0.0):
         self.action_id = action_id
         self.duration = duration
@@ -220,6 +233,8 @@ class Action(ABC):
 
 class RandomMoveAction(Action):
     # ... (邏輯使用 context.move) ...
+    state_fields = Action.state_fields + ('direction', 'change_timer')
+
     def __init__(self, duration: float, action_id: str, speed: float):
         super().__init__(action_id, duration)
         self.speed = speed
@@ -238,7 +253,7 @@ class RandomMoveAction(Action):
         
         self.change_timer -= dt
         if self.change_timer <= 0:
-            angle = random.uniform(0, 2 * math.pi)
+            angle = rng.ai.uniform(0, 2 * math.pi)
             self.direction = (math.cos(angle), math.sin(angle))
             self.change_timer = self.change_interval
             
@@ -332,7 +347,7 @@ class AttackAction(Action):
 
     def start(self, context: 'EnemyContext', current_time: float) -> None:
         context.set_current_action(self.action_id)
-        print(f"Action Started: {self.action_id} by Entity {context.ecs_entity}")
+        log.debug("Action Started: %s by Entity %s", self.action_id, context.ecs_entity)
 
     def update(self, context: 'EnemyContext', dt: float, current_time: float) -> bool:
         if not context.can_attack or not context.player:
@@ -399,6 +414,8 @@ class WaitAction(Action):
         return self.timer > 0
 
 class PatrolAction(Action):
+    state_fields = Action.state_fields + ('current_waypoint',)
+
     def __init__(self, duration: float, action_id: str, waypoints: List[Tuple[float, float]]):
         super().__init__(action_id, duration)
         self.waypoints = waypoints
@@ -429,6 +446,8 @@ class PatrolAction(Action):
 
 class DodgeAction(Action):
     # ... (邏輯使用 context 訪問屬性，使用 dungeon_manager 檢查可行走區域) ...
+    state_fields = Action.state_fields + ('dodge_direction_timer', 'chosen_dodge_direction')
+
     def __init__(self, duration: float, action_id: str):
         super().__init__(action_id, duration)
         self.max_threat_distance: float = 5 * TILE_SIZE 
@@ -484,7 +503,8 @@ class DodgeAction(Action):
         closest_bullet = None
         min_distance = float('inf')
 
-        bullets = [bullet for bullet in context.world.get_components(Position,Tag) if bullet[1][1].tag == "player"]
+        player_entity = context.player.ecs_entity if context.player else None
+        bullets = [bullet for bullet in context.get_entities_with_tag("player") if bullet[0] != player_entity]
         bullets = bullets[:self.max_bullets_to_check]
         # [省略了內部複雜的威脅計算和移動方向選擇邏輯]
         # 由於邏輯與原文件相同，且僅替換了實體訪問方式，這裡保留結構：
@@ -641,12 +661,13 @@ class FanAttackAction(Action):
         start_angle = base_angle - (self.spread_angle / 2)
         step_angle = self.spread_angle / (self.num_bullets - 1) if self.num_bullets > 1 else 0
 
+        # 整組子彈一次發射 (重用回收的子彈，其餘以一次 spawn_many 插入)
+        volley = []
         for i in range(self.num_bullets):
             angle = start_angle + (step_angle * i)
             direction = (math.cos(angle), math.sin(angle))
             
-            create_standard_bullet_entity(
-                world=context.world,
+            volley.append(dict(
                 start_pos=(context.x, context.y),
                 w=10, h=10, tag=context.tag,
                 direction=direction,
@@ -655,7 +676,8 @@ class FanAttackAction(Action):
                 damage=self.damage,
                 atk_element=context.atk_element,
                 pass_wall=False
-            )
+            ))
+        spawn_standard_bullets(context.world, volley)
 
     def update(self, context: 'EnemyContext', dt: float, current_time: float) -> bool:
         self.timer -= dt
@@ -677,14 +699,15 @@ class RadialBurstAction(Action):
         step_angle = (2 * math.pi) / self.density
         
         # 加上一點隨機偏移，讓連續釋放時子彈縫隙不同
-        offset = random.uniform(0, step_angle)
+        offset = rng.ai.uniform(0, step_angle)
 
+        # 整圈子彈一次發射 (重用回收的子彈，其餘以一次 spawn_many 插入)
+        volley = []
         for i in range(self.density):
             angle = offset + (step_angle * i)
             direction = (math.cos(angle), math.sin(angle))
             
-            create_standard_bullet_entity(
-                world=context.world,
+            volley.append(dict(
                 start_pos=(context.x, context.y),
                 w=12, h=12, tag=context.tag,
                 direction=direction,
@@ -693,7 +716,8 @@ class RadialBurstAction(Action):
                 damage=self.damage,
                 atk_element="fire", # Boss 特效屬性
                 pass_wall=True      # Boss 大招通常穿牆
-            )
+            ))
+        spawn_standard_bullets(context.world, volley)
 
     def update(self, context: 'EnemyContext', dt: float, current_time: float) -> bool:
         self.timer -= dt
@@ -703,6 +727,8 @@ class DashAction(Action):
     """
     衝刺：短時間內極高速度向玩家衝刺。
     """
+    state_fields = Action.state_fields + ('dash_dir',)
+
     def __init__(self, action_id: str, duration: float = 0.4, speed_mult: float = 3.0):
         super().__init__(action_id, duration)
         self.speed_mult = speed_mult
@@ -734,6 +760,8 @@ class DashBackAction(Action):
     """
     衝刺後退：短時間內極高速度背離玩家衝刺。
     """
+    state_fields = Action.state_fields + ('dash_dir',)
+
     def __init__(self, action_id: str, duration: float = 0.4, speed_mult: float = 3.0):
         super().__init__(action_id, duration)
         self.speed_mult = speed_mult
@@ -823,13 +851,14 @@ class TauntAction(Action):
         self.timer = self.duration
         context.set_current_action(self.action_id)
         context.move(0, 0, 0) # 站定
-        print(f"Boss is taunting! HP: {context.current_hp}")
+        log.debug("Boss is taunting! HP: %s", context.current_hp)
         
         # 可以在這裡加入回血邏輯
         if self.heal_amount > 0:
             current_hp = context._get_comp(Health).current_hp
             max_hp = context._get_comp(Health).max_hp
             context._get_comp(Health).current_hp = min(max_hp, current_hp + self.heal_amount)
+            context.world.mark_changed(context.ecs_entity, Health)
 
     def update(self, context: 'EnemyContext', dt: float, current_time: float) -> bool:
         self.timer -= dt
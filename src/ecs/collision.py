@@ -0,0 +1,81 @@
+# src/ecs/collision.py
+"""
+碰撞層 (collision layer) 與互動矩陣
+每個碰撞組 (Collider.collision_group) 在註冊時取得一個整數位元 (category)，並依 COLLISION_RULES
+預先算好 組 × 組 的互動矩陣：每組一個遮罩 (mask)，列出會與它互動的組的位元。
+Collider 建立時 (__post_init__) 取得自己的 category 與 mask，collision_mask 可覆寫該組預設的遮罩；
+CombatSystem 對每個候選配對只需做位元 AND (見 interacts)，子彈與子彈等不互動的配對直接略過。
+
+自訂的組請在建立任何 Collider 之前以 register_group 註冊；未註冊的組名視為 "default"。
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.log import channel
+
+log = channel("ecs.combat")
+
+# 預設的互動規則 (對稱，每一對只需列一次)。子彈之間 (projectile / bullet) 不互動；
+# 傳送門等不參與戰鬥的組不與任何組互動。沒有 Collider 的戰鬥實體屬於 "default"，與所有戰鬥組互動。
+COLLISION_RULES: Dict[str, Tuple[str, ...]] = {
+    "default": ("default", "player", "enemy", "projectile", "bullet", "npc"),
+    "player": ("enemy", "projectile", "bullet", "npc"),
+    "enemy": ("projectile", "bullet", "npc"),
+    "projectile": ("npc",),
+    "bullet": ("npc",),
+    "npc": (),
+    "portal": (),
+}
+
+_group_bits: Dict[str, int] = {}
+_group_masks: Dict[int, int] = {}  # 互動矩陣：{組的位元: 會互動的組的位元遮罩}
+_unknown_groups = set()
+
+
+def register_group(name: str, interacts_with: Iterable[str] = ()) -> int:
+    """註冊碰撞組 (已註冊時只加入新的互動)，回傳其位元。互動是對稱的，對方的遮罩也會更新。"""
+    bit = _group_bits.get(name)
+    if bit is None:
+        bit = _group_bits[name] = 1 << len(_group_bits)
+        _group_masks[bit] = 0
+    for other in interacts_with:
+        other_bit = register_group(other)
+        _group_masks[bit] |= other_bit
+        _group_masks[other_bit] |= bit
+    return bit
+
+
+def group_bit(name: str) -> int:
+    """碰撞組的位元；未註冊的組名視為 "default"。"""
+    bit = _group_bits.get(name)
+    if bit is None:
+        if name not in _unknown_groups:
+            _unknown_groups.add(name)
+            log.warning("Unregistered collision group %r, treated as 'default'", name)
+        bit = _group_bits["default"]
+    return bit
+
+
+def mask_bits(groups: Iterable[str]) -> int:
+    """多個碰撞組的位元遮罩。"""
+    mask = 0
+    for name in groups:
+        mask |= group_bit(name)
+    return mask
+
+
+def collision_layers(group: str, mask: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+    """(category, mask)：mask 為 None 時取互動矩陣中該組的預設遮罩。"""
+    bit = group_bit(group)
+    return bit, _group_masks[bit] if mask is None else mask_bits(mask)
+
+
+def interacts(category_a: int, mask_a: int, category_b: int, mask_b: int) -> bool:
+    """兩個碰撞體是否互動 (雙方的遮罩都包含對方的組)。"""
+    return bool(mask_a & category_b and mask_b & category_a)
+
+
+for _group, _others in COLLISION_RULES.items():
+    register_group(_group, _others)
+
+# 沒有 Collider 的戰鬥實體使用的 (category, mask)
+DEFAULT_LAYERS = collision_layers("default")
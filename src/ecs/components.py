@@ -1,6 +1,9 @@
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, TYPE_CHECKING, Tuple, Callable
+from dataclasses import dataclass, field, fields, MISSING
+from typing import Any, Optional, List, Dict, TYPE_CHECKING, Tuple, Callable
+import esper
 from ..core.config import TILE_SIZE
+from .collision import collision_layers
+from .modifiers import modifier_vector
 
 if TYPE_CHECKING:
     from ..skills.skill import Skill 
@@ -10,7 +13,7 @@ else:
     SkillType = object
 
 # ProjectileState 和 BulletComponent 合併
-@dataclass
+@dataclass(slots=True)
 class ProjectileState:
     """
     通用拋射物 (Projectile) 的運行狀態組件。
@@ -22,22 +25,21 @@ class ProjectileState:
     can_move: bool = True
     
     # 壽命與計時
-    max_lifetime: float = 5.0     # 總壽命
-    current_lifetime: float = field(init=False)
+    max_lifetime: float = 5.0     # 總壽命 (LifetimeSystem 在加入時排程，到期刪除實體)
+    current_lifetime: float = field(init=False)  # 到期時設為 0
+    # 到期的遊戲時間，由 LifetimeSystem 排程時算出 (None 表示尚未排程)；寫入快照，載入後沿用
+    expires_at: Optional[float] = field(init=False)
     
-    # 碰撞行為
+    # 碰撞行為 (命中冷卻記錄在 Combat.collision_list)
     explode_on_collision: bool = True # 在非穿透碰撞時是否觸發爆炸或銷毀
-    
-    # 碰撞追蹤 (取代 hitted_entities / last_hit_times)
-    # Key: 實體 ID (int), Value: 上次擊中時間 (float)
-    collision_tracking: Dict[int, float] = field(default_factory=dict)
 
     def __post_init__(self):
         """初始化後，當前壽命等於最大壽命。"""
         self.current_lifetime = self.max_lifetime
+        self.expires_at = None
 
 # ExpandingCircleState (名稱更精確為 ExpansionLifecycle)
-@dataclass
+@dataclass(slots=True)
 class ExpansionLifecycle:
     """
     ExpandingCircleBullet 獨特的生命週期組件。
@@ -56,7 +58,7 @@ class ExpansionLifecycle:
         self.is_hidden = self.hide_time > 0
         
 # ExpansionRenderData (保留，但名稱稍作調整以強調其視覺性質)
-@dataclass
+@dataclass(slots=True)
 class ExpansionRenderData:
     """
     ExpandingCircleBullet 視覺上的半徑、擴張速度和動畫幀數據。
@@ -80,7 +82,7 @@ class ExpansionRenderData:
         self.initial_inner_radius = self.outer_radius * 0.1
         self.current_inner_radius = self.initial_inner_radius
 
-@dataclass
+@dataclass(slots=True)
 class PlayerComponent:
     """
     玩家專屬的資料組件 (ECS Component)。
@@ -95,7 +97,9 @@ class PlayerComponent:
     max_skill_chain_length: int = 8
     
     # skill_chain: 技能鏈列表。由於是可變類型 (List)，使用 field(default_factory) 確保每個實例獨立。
-    skill_chain: List[List[List[SkillType]]] = field(default_factory=lambda: [[] for _ in range(9)])
+    # 技能由 StorageManager 的技能庫建立，不寫入快照 (metadata snapshot=False)，載入時沿用目前的技能鏈
+    skill_chain: List[List[List[SkillType]]] = field(default_factory=lambda: [[] for _ in range(9)],
+                                                     metadata={'snapshot': False})
     
     # 當前活動技能鏈索引
     current_skill_chain_idx: int = 0
@@ -123,7 +127,13 @@ class PlayerComponent:
     vision_radius: int = 10    # 視野半徑 (以地圖格計算)
     mana: int = 0              # 貨幣單位 (在您的程式碼片段中為 0)
 
+    # --- 元素、增幅器與移動 (由 StorageManager / Player Facade 設定) ---
+    elements: set = field(default_factory=set)       # 已覺醒的元素
+    amplifiers: Dict = field(default_factory=dict)   # {類型: [效果]}
+    base_max_speed: float = 4 * TILE_SIZE            # 基底移動速度
+
 
+# Position / Velocity 不使用 __slots__：欄式儲存需要以 __class__ 切換與 __dict__ 存放欄位 (見 esper.ColumnStore)
 @dataclass
 class Position:
     x: float
@@ -135,7 +145,10 @@ class Velocity:
     y: float = 0.0
     speed: float = 100.0
 
-@dataclass
+# 熱路徑上的數值組件，可用 esper.set_column_storage 改為欄式儲存 (見 Game.__init__)
+COLUMN_COMPONENTS = (Position, Velocity)
+
+@dataclass(slots=True)
 class Health:
     base_max_hp: int = 100  # 用於儲存基礎最大生命值
     max_hp: int = 100
@@ -145,7 +158,7 @@ class Health:
     regen_rate: float = 0.0
     
 
-@dataclass
+@dataclass(slots=True)
 class Defense:
     defense: int = 0
     dodge_rate: float = 0.0
@@ -153,7 +166,7 @@ class Defense:
     resistances: Optional[Dict[str, float]] = None
     invulnerable: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class Combat:
     damage: int = 0
     can_attack: bool = True
@@ -162,24 +175,32 @@ class Combat:
     max_penetration_count: int = 2147483647
     current_penetration_count: int = 0
     collision_cooldown: float = 0.2
-    collision_list: Dict[int, float] = field(default_factory=dict)
-    explosion_range: float = 0.0
-    explosion_damage: int = 0
-    explosion_element: str = "untyped"
-    # Percentage damage
+    # 命中冷卻 {目標實體: 冷卻到期的遊戲時間}，CombatSystem 在同一對實體再次重疊時才比較與清除
+    collision_list: Dict[int, float] = field(default_factory=dict, metadata={'pool_clear': True})
+    cause_death: bool = True
+    # Buffs to apply on hit
+    buffs: List = field(default_factory=list)  # List[Buff]
+    # 很少設定的欄位拆成冷組件 (Explosion / PercentageDamage)，只有需要的實體才附加
+
+@dataclass(slots=True)
+class PercentageDamage:
+    """命中時依目標生命值計算的額外百分比傷害 (冷組件，搭配 Combat)。"""
+    max_hp: int = 0
+    current_hp: int = 0
+    lose_hp: int = 0
+
+@dataclass(slots=True)
+class Explosion:
+    """命中 (或達到穿透上限) 時觸發的範圍爆炸 (冷組件，搭配 Combat)。"""
+    range: float = 0.0
+    damage: int = 0
+    element: str = "untyped"
     max_hp_percentage_damage: int = 0
     current_hp_percentage_damage: int = 0
     lose_hp_percentage_damage: int = 0
-    cause_death: bool = True
-    # Buffs to apply on hit
     buffs: List = field(default_factory=list)  # List[Buff]
-    # Explosion percentage damage
-    explosion_max_hp_percentage_damage: int = 0
-    explosion_current_hp_percentage_damage: int = 0
-    explosion_lose_hp_percentage_damage: int = 0
-    explosion_buffs: List = field(default_factory=list)  # List[Buff]
 
-@dataclass
+@dataclass(slots=True)
 class Renderable:
     image: Optional[object] = None  # pygame.Surface
     shape: str = "rect"
@@ -189,7 +210,7 @@ class Renderable:
     layer: int = 0
     visible: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class Input:
     dx: float = 0.0
     dy: float = 0.0
@@ -198,46 +219,60 @@ class Input:
     target_x: float = 0.0
     target_y: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class Buffs:
     active_buffs: List = field(default_factory=list)  # List[Buff]
-    modifiers: Dict[str, float] = field(default_factory=dict)
+    # 依槽位排列的修正值 (見 src/ecs/modifiers.py)，由 BuffSystem 依 active_buffs 計算，不寫入快照
+    modifiers: Any = field(default_factory=modifier_vector, metadata={'snapshot': False})
 
-@dataclass
+@dataclass(slots=True)
 class Collider:
     w: int = 32
     h: int = 32
     pass_wall: bool = False
     destroy_on_collision: bool = False
     collision_group: str = "default"
-    collision_mask: Optional[List[str]] = None
+    collision_mask: Optional[List[str]] = None  # 會互動的組；None 取 COLLISION_RULES 中該組的預設
+    # collision_group / collision_mask 註冊後的位元 (見 src/ecs/collision.py)，由 __post_init__ 計算
+    category: int = field(init=False, metadata={'snapshot': False})
+    mask: int = field(init=False, metadata={'snapshot': False})
 
-@dataclass
+    def __post_init__(self):
+        self.category, self.mask = collision_layers(self.collision_group, self.collision_mask)
+
+@dataclass(slots=True)
 class AI:
-    behavior_tree: Optional[object] = None
+    # 行為樹只含節點與閉包，不寫入快照；載入時依 brain 重建 (見 ecs_factory.AI_BRAINS)
+    behavior_tree: Optional[object] = field(default=None, metadata={'snapshot': False})
     current_action: str = "idle"
     action_list: List[str] = field(default_factory=list)
     actions: Dict[str, object] = field(default_factory=dict)
     vision_radius: int = 5
     half_hp_triggered: bool = False
+    # (名稱, 參數)：AI_BRAINS[名稱](**參數) 可重建 behavior_tree 與 actions
+    brain: Optional[tuple] = None
 
-@dataclass
+@dataclass(slots=True)
 class Tag:
     tag: str = "untagged"
 
-@dataclass
+# esper 依 Tag.tag 維護 {tag: 實體} 索引，用 esper.get_tagged 查詢；
+# 執行期改標籤請用 esper.retag，直接改 tag 欄位不會更新索引
+esper.set_tag_index(Tag)
+
+@dataclass(slots=True)
 class BossComponent:
     """標記實體為 Boss，用於特殊顯示和機制"""
     boss_name: str = "BOSS"  # Boss 名稱
     is_boss: bool = True  # Boss 標記
 
-@dataclass
+@dataclass(slots=True)
 class NPCInteractComponent:
     """
     NPC 專屬的 ECS 組件。包含其交互範圍和狀態。
     """
-    # tag
-    tag = "npc"
+    # tag (由各 NPC Facade 改寫為具體名稱)
+    tag: str = "npc"
     # 交互屬性
     interaction_range: float = 2*TILE_SIZE
     alchemy_options: List[Dict] = field(default_factory=list) # 合成配方列表
@@ -251,7 +286,7 @@ class NPCInteractComponent:
     # field(default=None) 表示初始值為 None，將在實體創建後被設置為 NPC Facade 的方法。
     start_interaction: Callable[[], None] = field(default=None)
 
-@dataclass
+@dataclass(slots=True)
 class DungeonPortalComponent:
     """
     地牢傳送門專屬 ECS 組件。
@@ -263,17 +298,67 @@ class DungeonPortalComponent:
     portal_effect_active: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TimerComponent:
     """
     通用計時器組件。
     用於追蹤延遲、冷卻時間或其他需要計時的機制。
+    TimerSystem 在組件加入時排程到期時間；修改 duration / elapsed_time 後呼叫
+    esper.mark_changed(實體, TimerComponent) 重新排程，移除組件或刪除實體即取消。
     """
     duration: float = 0.0      # 計時器總時間
-    elapsed_time: float = 0.0  # 已經過的時間
-    on_expire: Optional[Callable[[], None]] = None  # 計時器到期時調用的函數
+    elapsed_time: float = 0.0  # 排程時已經過的時間 (不逐 tick 累加；到期時重複計時器歸零，單次計時器設為 duration)
+    on_expire: Optional[Callable[[int], None]] = None  # 計時器到期時以實體 ID 調用的函數
+    repeat: bool = True        # 到期後重新計時；False 為單次計時器
 
-@dataclass
+@dataclass(slots=True)
 class TreasureStateComponent:
     """記錄寶藏是否已被領取"""
-    is_looted: bool = False
\ No newline at end of file
+    is_looted: bool = False
+
+# 變更追蹤：就地修改這些組件後需呼叫 esper.mark_changed，
+# BuffSystem 與 HUD 只重算自上次以來有變動的實體 (esper.get_changed / esper.is_changed)
+# LifetimeSystem 與 TimerSystem 以 esper.get_added / get_removed 排程與取消計時組件
+CHANGE_TRACKED_COMPONENTS = (
+    Health, Defense, PlayerComponent, Buffs, ProjectileState, ExpansionLifecycle, TimerComponent,
+)
+for _component_type in CHANGE_TRACKED_COMPONENTS:
+    esper.set_change_tracking(_component_type)
+
+# --- 物件池支援 ---
+
+# {組件類別: ((欄位名稱, 預設值, default_factory, 是否原地清空), ...)}
+_RESET_SPECS: Dict[type, Tuple[Tuple[str, Any, Any, bool], ...]] = {}
+
+def reset_component(component: Any, **values: Any) -> Any:
+    """
+    將 dataclass 組件重設為剛建構時的狀態，供物件池重複使用實例 (reset hook)。
+
+    values 中的欄位直接指定；其餘欄位恢復預設值。標記為 metadata={'pool_clear': True}
+    的容器欄位 (只存放執行時狀態，例如 Combat.collision_list) 會原地清空而非重新配置。
+    init=False 的欄位交由 __post_init__ 重新計算。
+    """
+    cls = type(component)
+    spec = _RESET_SPECS.get(cls)
+    if spec is None:
+        spec = _RESET_SPECS[cls] = tuple(
+            (f.name, f.default, f.default_factory, f.metadata.get('pool_clear', False))
+            for f in fields(cls) if f.init
+        )
+
+    for name, default, default_factory, pool_clear in spec:
+        if name in values:
+            setattr(component, name, values[name])
+        elif pool_clear:
+            getattr(component, name).clear()
+        elif default is not MISSING:
+            setattr(component, name, default)
+        elif default_factory is not MISSING:
+            setattr(component, name, default_factory())
+        else:
+            raise TypeError(f"reset_component() missing required field '{name}' for {cls.__name__}")
+
+    post_init = getattr(component, '__post_init__', None)
+    if post_init is not None:
+        post_init()
+    return component
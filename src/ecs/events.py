@@ -0,0 +1,50 @@
+"""戰鬥相關的型別化事件 (esper.emit / esper.get_events / esper.subscribe)
+
+事件在一個 tick 內收集，由關心的系統整批處理：
+  - DamageEvent:      CombatSystem 發出傷害請求，HealthSystem 在自己的 process 中整批結算並填入結果；
+                      直接呼叫 HealthSystem.take_damage 也會送出一筆已結算的事件。
+                      幀末訂閱者 (傷害數字等) 收到的都是已結算的事件。
+  - DeathEvent:       HealthSystem 偵測到生命值歸零時發出，並在同一次 process 中處理死亡。
+  - BuffAppliedEvent: 命中或爆炸要附加的 Buff，由 BuffSystem 整批加入目標。
+  - SpawnRequest:     幀末 (esper.flush_events) 以 factory(world=esper, **kwargs) 建立實體，
+                      此時沒有系統在走訪查詢，可以直接建立。
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass(slots=True)
+class DamageEvent:
+    target: int
+    source: Optional[int] = None
+    base_damage: float = 0
+    element: str = "untyped"
+    factor: float = 1.0
+    max_hp_percentage_damage: float = 0
+    current_hp_percentage_damage: float = 0
+    lose_hp_percentage_damage: float = 0
+    cause_death: bool = True
+    # 由 HealthSystem 結算後填入
+    resolved: bool = False
+    damage: int = 0
+    text: Any = None  # 傷害數字顯示的內容 (傷害值、"Miss"、"Immune")，None 表示不顯示
+    killed: bool = False
+
+
+@dataclass(slots=True)
+class DeathEvent:
+    entity: int
+
+
+@dataclass(slots=True)
+class BuffAppliedEvent:
+    target: int
+    buff: Any  # 已複製的 Buff 實例，直接加入目標的 Buffs
+    source: Optional[int] = None
+    trigger_on_apply: bool = True
+
+
+@dataclass(slots=True)
+class SpawnRequest:
+    factory: Callable[..., Any]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,107 @@
+# src/ecs/modifiers.py
+"""
+屬性修正值 (modifier) 的註冊表
+每個修正值名稱 (Buff.multipliers 的 key，例如 "speed_multiplier") 在註冊時取得一個固定的槽位 (slot) 與種類：
+加法 (ADDITIVE，未修正為 0，例如抗性與閃避) 或乘法 (MULTIPLICATIVE，未修正為 1，例如速度與傷害倍率)。
+Buffs.modifiers 是依槽位排列的 array('d')，由 fold_modifiers 逐一把各 Buff 的效果寫入對應的槽位；
+讀取端以模組層級的槽位常數直接索引 (例如 modifiers[SPEED_MULTIPLIER])，不需字串查詢與分類。
+
+BuffSkill 等動態組出的名稱 (f'{element}_resistance_multiplier') 第一次出現時依命名慣例自動註冊；
+之後建立的向量才有新的槽位，讀取可能較短的舊向量請用 modifier_value。
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.elements import ELEMENTS
+
+ADDITIVE = "add"
+MULTIPLICATIVE = "mul"
+
+# 預先註冊的修正值 (名稱: 種類)，各元素的抗性另外註冊
+MODIFIER_KINDS: Dict[str, str] = {
+    "speed_multiplier": MULTIPLICATIVE,
+    "damage_multiplier": MULTIPLICATIVE,
+    "defense_multiplier": MULTIPLICATIVE,
+    "vision_radius_multiplier": MULTIPLICATIVE,
+    "can_attack_multiplier": MULTIPLICATIVE,
+    "all_resistance_multiplier": ADDITIVE,
+    "dodge_rate_add": ADDITIVE,
+    "health_regen_per_second": ADDITIVE,
+}
+
+_slots: Dict[str, int] = {}
+_additive: List[bool] = []  # 依槽位：是否為加法修正
+_identity = array('d')      # 依槽位：未修正時的值
+
+
+def register_modifier(name: str, kind: Optional[str] = None) -> int:
+    """
+    註冊修正值 (已註冊時直接回傳)，回傳其槽位。
+    kind 為 None 時沿用原本的命名慣例：名稱含 "resistance" 或 "add" 者為加法，其餘為乘法。
+    """
+    slot = _slots.get(name)
+    if slot is not None:
+        return slot
+    if kind is None:
+        kind = ADDITIVE if "resistance" in name or "add" in name else MULTIPLICATIVE
+    if kind not in (ADDITIVE, MULTIPLICATIVE):
+        raise ValueError(f"Unknown modifier kind {kind!r} for {name!r}")
+    slot = _slots[name] = len(_additive)
+    _additive.append(kind == ADDITIVE)
+    _identity.append(0.0 if kind == ADDITIVE else 1.0)
+    return slot
+
+
+def modifier_slot(name: str) -> int:
+    """修正值的槽位 (未註冊的名稱依命名慣例註冊)。"""
+    slot = _slots.get(name)
+    return slot if slot is not None else register_modifier(name)
+
+
+def modifier_kind(name: str) -> str:
+    return ADDITIVE if _additive[modifier_slot(name)] else MULTIPLICATIVE
+
+
+def modifier_vector(values: Optional[Dict[str, float]] = None) -> array:
+    """未修正的向量 (Buffs.modifiers 的預設值)；values 中的名稱直接指定為該值。"""
+    vector = array('d', _identity)
+    if values:
+        for name, value in values.items():
+            vector[modifier_slot(name)] = value
+    return vector
+
+
+def modifier_value(vector: array, slot: int) -> float:
+    """向量中槽位的值；向量建立時尚未註冊的槽位視為未修正。"""
+    return vector[slot] if slot < len(vector) else _identity[slot]
+
+
+def fold_modifiers(contributions: Iterable[Tuple[Dict[str, float], float]]) -> array:
+    """
+    從未修正的值開始，逐個 Buff、逐個 key 把 (multipliers, 強度) 累計到對應的槽位 (純 Python 迴圈，非向量化運算)。
+    加法修正累加 value * 強度 (例如抗性 +10% * 1.5 = +15%)；
+    乘法修正連乘 (value - 1) * 強度 + 1 (例如 0.9 (減少 10%) * 強度 2.0 = 0.8 (減少 20%))。
+    """
+    vector = array('d', _identity)
+    for multipliers, strength in contributions:
+        for name, value in multipliers.items():
+            slot = _slots.get(name)
+            if slot is None:
+                slot = register_modifier(name)
+            if slot >= len(vector):
+                vector.extend(_identity[len(vector):])
+            if _additive[slot]:
+                vector[slot] += value * strength
+            else:
+                vector[slot] *= 1.0 + (value - 1.0) * strength
+    return vector
+
+
+for _name, _kind in MODIFIER_KINDS.items():
+    register_modifier(_name, _kind)
+for _element in ELEMENTS:
+    register_modifier(f"{_element}_resistance_multiplier", ADDITIVE)
+
+# 系統每個 tick 讀取的槽位
+SPEED_MULTIPLIER = modifier_slot("speed_multiplier")
+DAMAGE_MULTIPLIER = modifier_slot("damage_multiplier")
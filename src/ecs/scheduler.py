@@ -0,0 +1,119 @@
+# src/ecs/scheduler.py
+"""
+以絕對時間排程的到期佇列
+拋射物壽命、擴張子彈的階段與 TimerComponent 都是「某個時間點到了才需要處理」的狀態：
+與其每個 tick 逐一累加 dt 並比較，不如在加入時算出到期時間放進最小堆積，
+每個 tick 只彈出已到期的項目 (工作量與到期數量成正比，與存活數量無關)。
+
+系統實例由大廳與地牢等多個 esper World 共用 (見 EntityManager.enter_world)，
+實體 ID 只在各自的 World 內有意義，因此每個 World 有獨立的 WorldSchedule (時鐘、佇列與變更追蹤進度)。
+"""
+import heapq
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import esper
+
+
+class DeadlineQueue:
+    """
+    以到期時間排序的最小堆積，每個 key 同時只有一個到期時間。
+    重新排程與取消只更新 {key: 到期時間}，堆積中過時的項目在彈出時略過 (lazy deletion)，
+    過時項目太多時才重建堆積。
+    """
+    __slots__ = ('_heap', '_deadlines', '_order')
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._order = count()  # 同時到期時依排程順序彈出
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        return self._deadlines.get(key)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """排程 (或重新排程) key 於 deadline 到期。"""
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._order), key))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def cancel(self, key: Hashable) -> Optional[float]:
+        """取消 key 的排程，回傳原本的到期時間 (沒有排程時為 None)。"""
+        return self._deadlines.pop(key, None)
+
+    def pop_due(self, now: float) -> List[Tuple[Hashable, float]]:
+        """移除並依到期順序回傳所有到期時間 <= now 的 (key, 到期時間)。"""
+        heap, deadlines = self._heap, self._deadlines
+        due = []
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if deadlines.get(key) == deadline:
+                del deadlines[key]
+                due.append((key, deadline))
+        return due
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _compact(self) -> None:
+        deadlines = self._deadlines
+        self._heap = [entry for entry in self._heap if deadlines.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+
+class WorldSchedule:
+    """一個 World 的排程狀態：時鐘、變更追蹤的進度 (esper.change_tick) 與各個到期佇列。"""
+    __slots__ = ('generation', 'time', 'since', 'queues')
+
+    def __init__(self, generation: int):
+        # 該 World 的 esper.world_generation()：重新建立、清空或載入快照後即失效
+        self.generation = generation
+        self.time: Optional[float] = None  # 上一個 tick 的時間
+        self.since = esper.change_tick()
+        self.queues: Dict[str, DeadlineQueue] = {}
+
+    def advance(self, dt: float, current_time: Optional[float] = None) -> Tuple[float, float]:
+        """
+        推進時鐘，回傳 (上一個 tick 的時間, 現在)。
+        有 current_time (Game.step_simulation 傳入的遊戲時間) 時以它為準，否則累加 dt。
+        自上一個 tick 以來加入的項目以上一個 tick 的時間為起點排程，與逐 tick 累加 dt 的結果相同。
+        """
+        if current_time is None:
+            now = (self.time if self.time is not None else 0.0) + dt
+        else:
+            now = current_time
+        previous = self.time if self.time is not None else now - dt
+        self.time = now
+        return previous, now
+
+    def queue(self, name: str) -> DeadlineQueue:
+        queue = self.queues.get(name)
+        if queue is None:
+            queue = self.queues[name] = DeadlineQueue()
+        return queue
+
+
+def current_schedule(schedules: Dict[str, WorldSchedule]) -> Tuple[WorldSchedule, bool]:
+    """
+    回傳 (目前 World 的排程狀態, 是否為新建)。
+    World 第一次處理、以同名重新建立、被清空 (clear_database) 或載入快照 (restore_entities) 後
+    會建立新的狀態 (時鐘與佇列都重來)，呼叫端應完整掃描一次現有的組件；
+    之後只需以 esper.get_added / get_removed 處理 schedule.since 之後的變動。
+    """
+    name = esper.current_world
+    schedule = schedules.get(name)
+    generation = esper.world_generation()
+    if schedule is not None and schedule.generation == generation:
+        return schedule, False
+    for stale in set(schedules) - set(esper.list_worlds()):
+        del schedules[stale]
+    schedule = schedules[name] = WorldSchedule(generation)
+    return schedule, True
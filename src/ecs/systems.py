@@ -1,20 +1,318 @@
 import esper
 import pygame
 import math
-from .components import Position, TimerComponent, Velocity, Renderable, Input, Health, Defense, Combat, Buffs, AI, Collider, PlayerComponent, Tag
+from .components import (
+    Position, TimerComponent, Velocity, Renderable, Input, Health, Defense, Combat, Buffs, AI, Collider,
+    PlayerComponent, Tag, Explosion, PercentageDamage, ProjectileState, ExpansionLifecycle, ExpansionRenderData
+)
+from .collision import DEFAULT_LAYERS
+from .modifiers import DAMAGE_MULTIPLIER, SPEED_MULTIPLIER, fold_modifiers
+from .scheduler import current_schedule
+from .events import DamageEvent, DeathEvent, BuffAppliedEvent, SpawnRequest
 from src.ecs.ai import EnemyContext
-from src.core.config import TILE_SIZE, PASSABLE_TILES, SCREEN_WIDTH, SCREEN_HEIGHT
+from src.core.config import (
+    TILE_SIZE, PASSABLE_TILES, SCREEN_WIDTH, SCREEN_HEIGHT, ECS_BATCHED_MOVEMENT,
+    ECS_COMBAT_BROADPHASE, COMBAT_CELL_SIZE,
+)
 from src.entities.ecs_factory import create_damage_text_entity, create_dungeon_portal_npc
 from src.buffs.element_buff import ElementBuff, ELEMENTAL_BUFFS
 from src.utils.elements import WEAKTABLE
 from src.buffs.buff import Buff
+from src.core.log import channel
+from src.core import rng
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用：沒有時批次移動使用純 Python 路徑
+    np = None
+
+health_log = channel("ecs.health")
+buff_log = channel("ecs.buff")
+combat_log = channel("ecs.combat")
+ai_log = channel("ecs.ai")
+
+# 攻擊者沒有 PercentageDamage 冷組件時使用的預設值 (唯讀)
+_NO_PERCENTAGE_DAMAGE = PercentageDamage()
+
+
+def _spawn_damage_texts(events):
+    """幀末整批為已結算的 DamageEvent 建立傷害數字。"""
+    if not getattr(esper, 'game', None):
+        return
+    for event in events:
+        if event.text is None:
+            continue
+        try:
+            pos = esper.try_component(event.target, Position)
+        except KeyError:  # 目標已不存在
+            continue
+        if pos is not None:
+            create_damage_text_entity(world=esper, x=pos.x, y=pos.y, damage=event.text, color=(255, 0, 0), duration=1.0)
+
+
+def _handle_spawn_requests(requests):
+    """幀末依序執行 SpawnRequest 的工廠函式。"""
+    for request in requests:
+        request.factory(world=esper, **request.kwargs)
+
+
+esper.subscribe(DamageEvent, _spawn_damage_texts)
+esper.subscribe(SpawnRequest, _handle_spawn_requests)
+
+
+def _sweep_hits_wall(x, y, new_x, new_y, passable, width, height):
+    """
+    線段 (x, y) → (new_x, new_y) 是否撞牆 (撞牆即銷毀的子彈使用)。
+
+    以 DDA (Amanatides & Woo 網格走訪) 依序走訪線段經過的每一格 (不含起點格；沒有跨格時檢查目的格)，
+    有任一格位於地牢內且不可通行時回傳 True；地牢外的格子不算牆。
+    高速子彈或掉幀時一步跨過整面牆也會被擋下，結果不依賴幀率。
+    """
+    tile_x, tile_y = int(x // TILE_SIZE), int(y // TILE_SIZE)
+    end_x, end_y = int(new_x // TILE_SIZE), int(new_y // TILE_SIZE)
+    steps = abs(end_x - tile_x) + abs(end_y - tile_y)
+    if steps <= 1:
+        return 0 <= end_x < width and 0 <= end_y < height and not passable[end_y * width + end_x]
+
+    # t 為線段上的參數 (0 ~ 1)：t_max 為下一條格線的位置，t_delta 為跨越一整格所需的 t
+    dx, dy = new_x - x, new_y - y
+    step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+    t_max_x = ((tile_x + (dx > 0)) * TILE_SIZE - x) / dx if dx else math.inf
+    t_max_y = ((tile_y + (dy > 0)) * TILE_SIZE - y) / dy if dy else math.inf
+    t_delta_x = TILE_SIZE / abs(dx) if dx else math.inf
+    t_delta_y = TILE_SIZE / abs(dy) if dy else math.inf
+    for _ in range(steps):
+        # 已到達目的欄 (列) 時只沿另一軸前進，確保 steps 步後剛好停在目的格
+        if tile_x != end_x and (tile_y == end_y or t_max_x < t_max_y):
+            tile_x += step_x
+            t_max_x += t_delta_x
+        else:
+            tile_y += step_y
+            t_max_y += t_delta_y
+        if 0 <= tile_x < width and 0 <= tile_y < height and not passable[tile_y * width + tile_x]:
+            return True
+    return False
+
+
+def _sweep_hits_wall_array(x, y, new_x, new_y, passable, width, height):
+    """_sweep_hits_wall 的 NumPy 版本：所有子彈同時沿各自的線段走訪，回傳布林陣列 (運算順序相同，結果一致)。"""
+    def blocked(tile_x, tile_y):
+        inside = (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+        return inside & ~passable[np.where(inside, tile_y * width + tile_x, 0)]
+
+    tile_x = np.floor_divide(x, TILE_SIZE).astype(np.int64)
+    tile_y = np.floor_divide(y, TILE_SIZE).astype(np.int64)
+    end_x = np.floor_divide(new_x, TILE_SIZE).astype(np.int64)
+    end_y = np.floor_divide(new_y, TILE_SIZE).astype(np.int64)
+    steps = np.abs(end_x - tile_x) + np.abs(end_y - tile_y)
+    hit = (steps <= 1) & blocked(end_x, end_y)
+    if not len(steps) or steps.max() <= 1:
+        return hit
+
+    dx, dy = new_x - x, new_y - y
+    step_x, step_y = np.where(dx > 0, 1, -1), np.where(dy > 0, 1, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_max_x = np.where(dx != 0, ((tile_x + (dx > 0)) * TILE_SIZE - x) / dx, np.inf)
+        t_max_y = np.where(dy != 0, ((tile_y + (dy > 0)) * TILE_SIZE - y) / dy, np.inf)
+        t_delta_x = np.where(dx != 0, TILE_SIZE / np.abs(dx), np.inf)
+        t_delta_y = np.where(dy != 0, TILE_SIZE / np.abs(dy), np.inf)
+    swept = steps > 1
+    for step in range(1, int(steps.max()) + 1):
+        active = swept & (step <= steps) & ~hit
+        along_x = active & (tile_x != end_x) & ((tile_y == end_y) | (t_max_x < t_max_y))
+        along_y = active & ~along_x
+        tile_x = np.where(along_x, tile_x + step_x, tile_x)
+        t_max_x = np.where(along_x, t_max_x + t_delta_x, t_max_x)
+        tile_y = np.where(along_y, tile_y + step_y, tile_y)
+        t_max_y = np.where(along_y, t_max_y + t_delta_y, t_max_y)
+        hit |= active & blocked(tile_x, tile_y)
+    return hit
+
+
 class MovementSystem(esper.Processor):
+    """移動與牆壁碰撞 (含滑牆)。
+
+    batched=True (預設取自 ECS_BATCHED_MOVEMENT) 時一次收集所有移動實體的位置、速度、
+    速度倍率與碰撞旗標，並以預先計算的通行表 (依 dungeon_tiles 快取) 取代逐格的字串查詢；
+    只有在 Position/Velocity 已啟用 NumPy 欄式儲存 (config.ECS_COLUMN_STORAGE，預設關閉) 時
+    才整批以陣列與遮罩運算 (_process_columns)，否則逐一讀寫組件物件 (_process_batched)。
+    結果與逐一處理 (batched=False) 完全相同。
+
+    撞牆即銷毀 (Collider.destroy_on_collision) 的子彈沿移動線段檢查經過的每一格 (見 _sweep_hits_wall)，
+    不會一步穿過牆；其餘實體只檢查目的格並滑牆。
+    """
+
+    def __init__(self, batched: bool = ECS_BATCHED_MOVEMENT):
+        self.batched = batched
+        self._passable_tiles = None  # 建立通行表時的 dungeon_tiles 物件
+        self._passable = None
+        self._collider_rows = None  # esper.get_component(Collider) 的快取結果
+        self._colliders = {}
+
     def process(self, *args, **kwargs):
         dt = args[0] if args else 0.0
         # Get dungeon from game instance attached to world
         game = getattr( esper, 'game', None)
         dungeon = game.dungeon_manager.get_dungeon() if game else None
-        
+
+        if not self.batched:
+            self._process_entities(dt, dungeon)
+        elif (np is not None and esper.has_column_storage(Position)
+                and esper.has_column_storage(Velocity)):
+            self._process_columns(dt, dungeon)
+        else:
+            self._process_batched(dt, dungeon)
+
+    def _passability(self, dungeon):
+        """dungeon_tiles 的一維通行表 (索引為 tile_y * grid_width + tile_x)。
+
+        地牢重新生成時會換成新的網格物件，因此以網格物件本身作為快取鍵。
+        """
+        tiles = dungeon.dungeon_tiles
+        if self._passable_tiles is not tiles:
+            width = dungeon.grid_width
+            passable = bytearray(dungeon.grid_width * dungeon.grid_height)
+            for tile_y, row in enumerate(tiles[:dungeon.grid_height]):
+                for tile_x, tile in enumerate(row[:width]):
+                    if tile in PASSABLE_TILES:
+                        passable[tile_y * width + tile_x] = 1
+            if np is not None:
+                passable = np.frombuffer(bytes(passable), dtype=np.uint8).astype(bool)
+            self._passable_tiles = tiles
+            self._passable = passable
+        return self._passable
+
+    def _collider_map(self):
+        """{實體: Collider}，只在 Collider 查詢結果變動時重建。"""
+        rows = esper.get_component(Collider)
+        if rows is not self._collider_rows:
+            self._collider_rows = rows
+            self._colliders = dict(rows)
+        return self._colliders
+
+    @staticmethod
+    def _speed_multipliers():
+        return {ent: buffs.modifiers[SPEED_MULTIPLIER] for ent, buffs in esper.get_component(Buffs)}
+
+    def _process_batched(self, dt, dungeon):
+        """純 Python 批次路徑：收集旗標後以通行表判斷，語意同 _process_entities。"""
+        colliders = self._collider_map()
+        speed_mults = self._speed_multipliers()
+        if dungeon:
+            passable = self._passability(dungeon)
+            width, height = dungeon.grid_width, dungeon.grid_height
+
+        for ent, (pos, vel) in esper.get_components(Position, Velocity):
+            vx, vy = vel.x, vel.y
+            if vx == 0 and vy == 0:
+                continue
+            speed_mult = speed_mults.get(ent, 1.0)
+            x, y = pos.x, pos.y
+            new_x = x + vx * dt * speed_mult
+            new_y = y + vy * dt * speed_mult
+
+            collider = colliders.get(ent)
+            if not dungeon or (collider is not None and collider.pass_wall):
+                pos.x = new_x
+                pos.y = new_y
+                continue
+            if (collider is not None and collider.destroy_on_collision
+                    and _sweep_hits_wall(x, y, new_x, new_y, passable, width, height)):
+                esper.command_buffer.delete_entity(ent)
+                continue
+
+            tile_x, tile_y = int(new_x // TILE_SIZE), int(new_y // TILE_SIZE)
+            if not (0 <= tile_x < width and 0 <= tile_y < height):
+                vel.x = 0
+                vel.y = 0
+            elif passable[tile_y * width + tile_x]:
+                pos.x = new_x
+                pos.y = new_y
+            elif collider is not None and collider.destroy_on_collision:
+                esper.command_buffer.delete_entity(ent)
+            else:
+                # 滑牆：先試只沿 X 移動，再試只沿 Y 移動
+                tile_x_curr, tile_y_curr = int(x // TILE_SIZE), int(y // TILE_SIZE)
+                if 0 <= tile_y_curr < height and passable[tile_y_curr * width + tile_x]:
+                    pos.x = new_x
+                    vel.y = 0
+                elif 0 <= tile_x_curr < width and passable[tile_y * width + tile_x_curr]:
+                    pos.y = new_y
+                    vel.x = 0
+                else:
+                    vel.x = 0
+                    vel.y = 0
+
+    def _process_columns(self, dt, dungeon):
+        """NumPy 欄式路徑：整批計算候選格、通行與滑牆遮罩，語意同 _process_entities。"""
+        batch = esper.get_column_batch(Position, Velocity)
+        if not batch.entities:
+            return
+        entities = batch.entities
+        # 以 float64 運算，與逐一處理時的 Python float 結果一致 (即使欄位為 float32)
+        x, y = (np.asarray(batch.gather(Position, name), dtype=float) for name in ('x', 'y'))
+        vx, vy = (np.asarray(batch.gather(Velocity, name), dtype=float) for name in ('x', 'y'))
+
+        speed_mults = self._speed_multipliers()
+        if speed_mults:
+            speed_mult = np.fromiter((speed_mults.get(ent, 1.0) for ent in entities), dtype=float, count=len(entities))
+        else:
+            speed_mult = 1.0
+        moving = (vx != 0) | (vy != 0)
+        new_x = x + vx * dt * speed_mult
+        new_y = y + vy * dt * speed_mult
+
+        if not dungeon:
+            batch.scatter(Position, 'x', np.where(moving, new_x, x))
+            batch.scatter(Position, 'y', np.where(moving, new_y, y))
+            return
+
+        colliders = self._collider_map()
+        flags = [colliders.get(ent) for ent in entities]
+        pass_wall = np.fromiter((c is not None and c.pass_wall for c in flags), dtype=bool, count=len(flags))
+        destroy = np.fromiter((c is not None and c.destroy_on_collision for c in flags), dtype=bool, count=len(flags))
+
+        passable = self._passability(dungeon)
+        width, height = dungeon.grid_width, dungeon.grid_height
+
+        def tile_index(tile_x, tile_y):
+            inside = (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+            return inside, np.where(inside, tile_y * width + tile_x, 0)
+
+        # 撞牆即銷毀的子彈沿線段掃過 (只對這些列計算)
+        hit = np.zeros(len(entities), dtype=bool)
+        swept = np.flatnonzero(moving & ~pass_wall & destroy)
+        if len(swept):
+            hit[swept] = _sweep_hits_wall_array(x[swept], y[swept], new_x[swept], new_y[swept], passable, width, height)
+
+        free = moving & pass_wall
+        walled = moving & ~pass_wall & ~hit
+        tile_x = np.floor_divide(new_x, TILE_SIZE).astype(np.int64)
+        tile_y = np.floor_divide(new_y, TILE_SIZE).astype(np.int64)
+        inside, index = tile_index(tile_x, tile_y)
+        open_tile = inside & passable[index]
+        blocked = walled & inside & ~open_tile
+        destroyed = (blocked & destroy) | hit
+        sliding = blocked & ~destroy
+
+        tile_x_curr = np.floor_divide(x, TILE_SIZE).astype(np.int64)
+        tile_y_curr = np.floor_divide(y, TILE_SIZE).astype(np.int64)
+        x_inside, x_index = tile_index(tile_x, tile_y_curr)
+        y_inside, y_index = tile_index(tile_x_curr, tile_y)
+        x_allowed = sliding & x_inside & passable[x_index]
+        y_allowed = sliding & ~x_allowed & y_inside & passable[y_index]
+        stopped = (walled & ~inside) | (sliding & ~x_allowed & ~y_allowed)
+
+        moved = free | (walled & open_tile)
+        batch.scatter(Position, 'x', np.where(moved | x_allowed, new_x, x))
+        batch.scatter(Position, 'y', np.where(moved | y_allowed, new_y, y))
+        batch.scatter(Velocity, 'x', np.where(y_allowed | stopped, 0.0, vx))
+        batch.scatter(Velocity, 'y', np.where(x_allowed | stopped, 0.0, vy))
+
+        for slot in np.flatnonzero(destroyed):
+            esper.command_buffer.delete_entity(entities[slot])
+
+    def _process_entities(self, dt, dungeon):
+        """逐一處理每個移動實體 (原始路徑)。"""
         for ent, (pos, vel) in  esper.get_components(Position, Velocity):
             if vel.x == 0 and vel.y == 0:
                 continue
@@ -23,7 +321,7 @@ class MovementSystem(esper.Processor):
             speed_mult = 1.0
             if esper.has_component(ent, Buffs):
                 buffs_comp = esper.component_for_entity(ent, Buffs)
-                speed_mult = buffs_comp.modifiers.get('speed_multiplier', 1.0)
+                speed_mult = buffs_comp.modifiers[SPEED_MULTIPLIER]
             
             # Get Collider if exists, else default
             collider =  esper.try_component(ent, Collider)
@@ -37,6 +335,11 @@ class MovementSystem(esper.Processor):
             new_y = pos.y + vel.y * dt * speed_mult
             
             if not pass_wall and dungeon:
+                # 撞牆即銷毀的子彈檢查整條移動線段，避免高速時穿過牆
+                if destroy_on_collision and _sweep_hits_wall(
+                        pos.x, pos.y, new_x, new_y, self._passability(dungeon), dungeon.grid_width, dungeon.grid_height):
+                    esper.command_buffer.delete_entity(ent)
+                    continue
                 # Check bounds and walls
                 tile_x, tile_y = int(new_x // TILE_SIZE), int(new_y // TILE_SIZE)
                 x_valid = 0 <= tile_x < dungeon.grid_width
@@ -49,9 +352,9 @@ class MovementSystem(esper.Processor):
                         pos.y = new_y
                     else:
                         if destroy_on_collision:
-                            # Mark entity for deletion (to be handled by a cleanup system)
-                             esper.delete_entity(ent)
-                             continue
+                            # 記錄到 command buffer，於本幀所有系統執行完後才真正刪除
+                            esper.command_buffer.delete_entity(ent)
+                            continue
                         # Sliding logic
                         tile_x_curr = int(pos.x // TILE_SIZE)
                         tile_y_new = int(new_y // TILE_SIZE)
@@ -88,7 +391,44 @@ class MovementSystem(esper.Processor):
                 pos.y = new_y
 
 class RenderSystem(esper.Processor):
-    def process(self, *args, **kwargs):
+    """繪製所有可見的 Renderable。
+
+    不加入 esper 的 processor 列表 (模擬 tick 不繪製)，由 RenderManager 每幀呼叫一次。
+    Game 在每幀最後一個模擬 tick 之前呼叫 capture() 記錄位置，繪製時以 alpha
+    在該位置與目前位置之間內插，使畫面在模擬 tick 與畫面幀率不同步時仍然平滑。
+    """
+    # 兩個模擬狀態之間移動超過此距離 (例如傳送、回收後重用的實體) 時不內插
+    SNAP_DISTANCE = TILE_SIZE * 4
+
+    def __init__(self):
+        self._previous = {}
+
+    def capture(self):
+        """記錄目前的位置，作為下一個 tick 之後繪製時的內插起點。"""
+        self._previous = {ent: (pos.x, pos.y) for ent, (pos, _) in esper.get_components(Position, Renderable)}
+
+    def render_list(self, alpha=1.0):
+        """回傳 [(x, y, rend, ent)]，位置已內插，並依圖層與 Y 座標排序。"""
+        previous = self._previous
+        snap = self.SNAP_DISTANCE
+        render_list = []
+        for ent, (pos, rend) in  esper.get_components(Position, Renderable):
+            if not rend.visible:
+                continue
+            x, y = pos.x, pos.y
+            start = previous.get(ent)
+            if start is not None and alpha < 1.0:
+                dx, dy = x - start[0], y - start[1]
+                if abs(dx) <= snap and abs(dy) <= snap:
+                    x = start[0] + dx * alpha
+                    y = start[1] + dy * alpha
+            render_list.append((x, y, rend, ent))
+
+        # Sort by layer then Y position for depth
+        render_list.sort(key=lambda x: (x[2].layer, x[1]))
+        return render_list
+
+    def process(self, *args, alpha=1.0, **kwargs):
         game = getattr( esper, 'game', None)
         if not game:
             return
@@ -96,19 +436,9 @@ class RenderSystem(esper.Processor):
         screen = game.screen
         camera_offset = game.render_manager.camera_offset
         
-        # Collect and sort renderables
-        render_list = []
-        for ent, (pos, rend) in  esper.get_components(Position, Renderable):
-            if not rend.visible:
-                continue
-            render_list.append((pos, rend, ent))
-            
-        # Sort by layer then Y position for depth
-        render_list.sort(key=lambda x: (x[1].layer, x[0].y))
-        
-        for pos, rend, ent in render_list:
-            screen_x = pos.x - camera_offset[0] - rend.w // 2
-            screen_y = pos.y - camera_offset[1] - rend.h // 2
+        for x, y, rend, ent in self.render_list(alpha):
+            screen_x = x - camera_offset[0] - rend.w // 2
+            screen_y = y - camera_offset[1] - rend.h // 2
             
             # Culling: Don't draw if off screen
             if (screen_x + rend.w < 0 or screen_x > SCREEN_WIDTH or 
@@ -129,9 +459,9 @@ class RenderSystem(esper.Processor):
                 # Skip drawing health bar above boss (will be drawn at top of screen)
                 if not is_boss:
                     health =  esper.component_for_entity(ent, Health)
-                    self.draw_health_bar(screen, pos, health, rend, camera_offset)
+                    self.draw_health_bar(screen, x, y, health, rend, camera_offset)
 
-    def draw_health_bar(self, screen, pos, health, rend, camera_offset):
+    def draw_health_bar(self, screen, x, y, health, rend, camera_offset):
         if health.max_hp <= 0:
             return
             
@@ -140,8 +470,8 @@ class RenderSystem(esper.Processor):
         health_ratio = health.current_hp / health.max_hp
         shield_ratio = health.current_shield / health.max_shield if health.max_shield > 0 else 0.0
         
-        bar_x = pos.x - camera_offset[0] - bar_width // 2
-        bar_y = pos.y - camera_offset[1] - rend.h // 2 - 10
+        bar_x = x - camera_offset[0] - bar_width // 2
+        bar_y = y - camera_offset[1] - rend.h // 2 - 10
         
         # Background
         pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
@@ -157,7 +487,10 @@ class RenderSystem(esper.Processor):
 
 class InputSystem(esper.Processor):
     def process(self, *args, **kwargs):
-        keys = pygame.key.get_pressed()
+        # 經由 Game 的輸入來源讀取按鍵 (無視窗模式下為腳本輸入)
+        game = getattr( esper, 'game', None)
+        source = getattr(game, 'input', None)
+        keys = source.get_pressed() if source else pygame.key.get_pressed()
         
         for ent, (inp, vel) in  esper.get_components(Input, Velocity):
             if  esper.has_component(ent, PlayerComponent):
@@ -185,48 +518,80 @@ class InputSystem(esper.Processor):
 class HealthSystem(esper.Processor):
     def process(self, *args, **kwargs):
         game = getattr( esper, 'game', None)
+
+        # 1. 整批結算本 tick 收到的傷害請求 (CombatSystem 等發出的 DamageEvent)
+        for event in esper.get_events(DamageEvent):
+            if not event.resolved:
+                self.resolve_damage(event)
         
-        # Check for dead entities and handle death
+        # 2. Regen, and check for dead entities
         for ent, health in  esper.get_component(Health):
+            # 本幀稍早已被刪除的實體 (仍在查詢列表中，直到 command buffer 回放)
+            if not esper.entity_exists(ent):
+                continue
             self.heal(ent, int(health.regen_rate * args[0] if args else 0.0))
             if health.current_hp <= 0:
-                self._handle_death(ent, game)
+                esper.emit(DeathEvent(ent))
+
+        # 3. 整批處理死亡
+        for event in esper.get_events(DeathEvent):
+            if esper.entity_exists(event.entity):
+                self._handle_death(event.entity, game)
     
     def take_damage(self, entity, factor=1.0, element="untyped", base_damage=0,
                    max_hp_percentage_damage=0, current_hp_percentage_damage=0,
-                   lose_hp_percentage_damage=0, cause_death=True):
+                   lose_hp_percentage_damage=0, cause_death=True, source=None):
         """
-        Apply damage to an entity with Health and Defense components.
+        Apply damage to an entity with Health and Defense components right away.
+        The resolved DamageEvent is also queued, for damage text and other subscribers.
         Returns: (killed: bool, actual_damage: int)
         """
-        if not  esper.has_component(entity, Health):
+        event = DamageEvent(
+            target=entity, source=source, base_damage=base_damage, element=element, factor=factor,
+            max_hp_percentage_damage=max_hp_percentage_damage,
+            current_hp_percentage_damage=current_hp_percentage_damage,
+            lose_hp_percentage_damage=lose_hp_percentage_damage,
+            cause_death=cause_death,
+        )
+        esper.emit(event)
+        return self.resolve_damage(event)
+
+    def resolve_damage(self, event):
+        """
+        Apply a DamageEvent, filling in its result (damage, text, killed).
+        Returns: (killed: bool, actual_damage: int)
+        """
+        event.resolved = True
+        entity = event.target
+        if not esper.entity_exists(entity) or not esper.has_component(entity, Health):
             return False, 0
         
         health =  esper.component_for_entity(entity, Health)
         defense =  esper.try_component(entity, Defense)
+        element = event.element
+        base_damage = event.base_damage
         
         # Check invulnerability
         if defense and defense.invulnerable:
-            self._create_damage_text(entity, "Immune")
+            event.text = "Immune"
             return False, 0
         
         # Check dodge
         if defense and defense.dodge_rate > 0:
-            import random
-            if random.random() < defense.dodge_rate:
-                self._create_damage_text(entity, "Miss")
+            if rng.combat.random() < defense.dodge_rate:
+                event.text = "Miss"
                 return False, 0
         
         # Calculate affinity multiplier
         affinity_multiplier = self._calculate_affinity_multiplier(element, defense.element if defense else "untyped")
         
         # Add percentage-based damage
-        if max_hp_percentage_damage > 0:
-            base_damage += health.max_hp * max_hp_percentage_damage / 100
-        if current_hp_percentage_damage > 0:
-            base_damage += health.current_hp * current_hp_percentage_damage / 100
-        if lose_hp_percentage_damage > 0:
-            base_damage += (health.max_hp - health.current_hp) * lose_hp_percentage_damage / 100
+        if event.max_hp_percentage_damage > 0:
+            base_damage += health.max_hp * event.max_hp_percentage_damage / 100
+        if event.current_hp_percentage_damage > 0:
+            base_damage += health.current_hp * event.current_hp_percentage_damage / 100
+        if event.lose_hp_percentage_damage > 0:
+            base_damage += (health.max_hp - health.current_hp) * event.lose_hp_percentage_damage / 100
         
         # Calculate resistance
         resistance = 0.0
@@ -235,36 +600,38 @@ class HealthSystem(esper.Processor):
         
         # Calculate final damage
         defense_value = defense.defense if defense else 0
-        final_damage = max(1, int(base_damage * affinity_multiplier * (1.0 - resistance) * factor - defense_value))
+        final_damage = max(1, int(base_damage * affinity_multiplier * (1.0 - resistance) * event.factor - defense_value))
         
         # Apply shield first (if any)
         if health.current_shield > 0:
-            print(f"Entity {entity} has {health.current_shield} shield")
+            health_log.debug("Entity %s has %s shield", entity, health.current_shield)
             if final_damage >= health.current_shield:
                 # Damage exceeds shield - shield absorbs all damage and breaks
-                print(f"Shield absorbed all damage ({final_damage}), shield depleted")
+                health_log.debug("Shield absorbed all damage (%s), shield depleted", final_damage)
                 health.current_shield = 0
                 # Shield blocks the entire attack - NO overflow damage to HP
                 final_damage = 0
             else:
                 # Shield absorbs partial damage
                 health.current_shield -= final_damage
-                print(f"Shield reduced by {final_damage}, remaining shield: {health.current_shield}")
+                health_log.debug("Shield reduced by %s, remaining shield: %s", final_damage, health.current_shield)
                 final_damage = 0
         
         # Apply to health
         if final_damage > 0:
             remain_hp = health.current_hp - final_damage
-            if remain_hp <= 0 and not cause_death:
+            if remain_hp <= 0 and not event.cause_death:
                 final_damage = health.current_hp - 1
                 health.current_hp = 1
             else:
                 health.current_hp = max(0, remain_hp)
+        esper.mark_changed(entity, Health)
         
         killed = health.current_hp <= 0
 
-        self._create_damage_text(entity, final_damage)
-        
+        event.damage = final_damage
+        event.text = final_damage
+        event.killed = killed
         return killed, final_damage
     
     def heal(self, entity, amount):
@@ -273,7 +640,11 @@ class HealthSystem(esper.Processor):
             return
         
         health =  esper.component_for_entity(entity, Health)
-        health.current_hp = min(health.max_hp, health.current_hp + amount)
+        current_hp = min(health.max_hp, health.current_hp + amount)
+        # 每幀的 regen 多半為 0，數值不變時不標記變更
+        if current_hp != health.current_hp:
+            health.current_hp = current_hp
+            esper.mark_changed(entity, Health)
     
     def add_shield(self, entity, amount):
         """Add shield to an entity by the specified amount."""
@@ -282,6 +653,7 @@ class HealthSystem(esper.Processor):
         
         health =  esper.component_for_entity(entity, Health)
         health.current_shield = min(health.max_shield, health.current_shield + amount)
+        esper.mark_changed(entity, Health)
     
     def set_max_hp(self, entity, new_max_hp):
         """Set max HP and scale current HP proportionally."""
@@ -296,6 +668,7 @@ class HealthSystem(esper.Processor):
             health.current_hp = int(health.current_hp * new_max_hp / old_max)
         else:
             health.current_hp = new_max_hp
+        esper.mark_changed(entity, Health)
     
     def set_max_shield(self, entity, new_max_shield):
         """Set max shield and clamp current shield."""
@@ -305,6 +678,7 @@ class HealthSystem(esper.Processor):
         health =  esper.component_for_entity(entity, Health)
         health.max_shield = max(0, new_max_shield)
         health.current_shield = min(health.max_shield, health.current_shield)
+        esper.mark_changed(entity, Health)
     
     def _calculate_affinity_multiplier(self, attack_element, defend_element):
         """Calculate elemental affinity multiplier based on WEAKTABLE."""
@@ -323,26 +697,9 @@ class HealthSystem(esper.Processor):
         
         return 1.0  # Neutral
     
-    def _create_damage_text(self, entity, text):
-        """Create damage text at entity position."""
-        game = getattr( esper, 'game', None)
-        if not game or not  esper.has_component(entity, Position):
-            return
-        
-        pos =  esper.component_for_entity(entity, Position)
-        
-        create_damage_text_entity(
-            world=esper,
-            x=pos.x,
-            y=pos.y,
-            damage=text,
-            color=(255, 0, 0),
-            duration=1.0
-        )
-    
     def _handle_death(self, entity, game):
         """Handle entity death."""
-        print(f"Entity {entity} died!")
+        health_log.debug("Entity %s died!", entity)
         if esper.has_component(entity, PlayerComponent):
             if game:
                 game.on_player_death()
@@ -351,7 +708,7 @@ class HealthSystem(esper.Processor):
             from src.ecs.components import BossComponent
             if esper.has_component(entity, BossComponent):
                 boss_comp = esper.component_for_entity(entity, BossComponent)
-                print(f"Boss {boss_comp.boss_name} died! Spawning portal...")
+                health_log.info("Boss %s died! Spawning portal...", boss_comp.boss_name)
                 if game and esper.has_component(entity, Position):
                     pos = esper.component_for_entity(entity, Position)
                     
@@ -369,15 +726,27 @@ class HealthSystem(esper.Processor):
                     else:
                          available_dungeons = [{'name': 'Return to Start', 'level': 1, 'dungeon_id': 1}]
 
-                    create_dungeon_portal_npc(
-                        esper, x=pos.x, y=pos.y, 
-                        available_dungeons=available_dungeons, 
+                    # 傳送門的 Facade 需要實體立即存在，因此整個工廠延後到幀末 (SpawnRequest) 執行
+                    esper.emit(SpawnRequest(create_dungeon_portal_npc, dict(
+                        x=pos.x, y=pos.y,
+                        available_dungeons=available_dungeons,
                         game=game
-                    )
+                    )))
 
-            esper.delete_entity(entity)
+            esper.command_buffer.delete_entity(entity)
 
 class BuffSystem(esper.Processor):
+    """
+    Buff 的到期、每秒效果、合成與屬性修正。
+
+    Buffs 組件加入或以 esper.mark_changed 標記時才同步該實體：尚未排程的 Buff 以遊戲時間算出
+    到期時間 (Buff.expires_at) 放入到期佇列，有新 Buff 時才檢查合成，最後重算修正值。
+    每秒效果 (effect_per_second 與 health_regen_per_second) 在共用的 1 Hz tick (遊戲時間的整數秒) 批次套用，
+    只有帶這類效果的實體會排入。沒有變動、到期或效果 tick 時每個 tick 的成本與實體數量無關。
+    外部改變 active_buffs 或 Buff 的持續時間 (Buff.restart) 後需 esper.mark_changed(ent, Buffs)。
+    """
+    EFFECT_INTERVAL = 1.0
+
     def __init__(self):
         super().__init__()
         # Buff synthesis rules
@@ -399,41 +768,100 @@ class BuffSystem(esper.Processor):
             ('Tear', 'Entangled'): 'Enpty',
             ('Paralysis', 'Dist'): 'Enpty',
         }
-    
-    def process(self, *args, **kwargs):
-        dt = args[0] if args else 0.0
-        
+        # 編譯後的合成表 (修改 synthesis_rules 後需重新編譯)
+        self._synthesis_pairs, self._synthesis_partners = self._compile_synthesis_rules(self.synthesis_rules)
+        self._schedules = {}  # {World 名稱: WorldSchedule}
+
+    def process(self, dt: float = 0.0, *args, current_time=None, **kwargs) -> None:
         game = getattr( esper, 'game', None)
-        
-        for ent, buffs in  esper.get_component(Buffs):
-            if not buffs.active_buffs:
+
+        # 0. 加入本 tick 命中/爆炸附加的 Buff (CombatSystem 發出的 BuffAppliedEvent)
+        for event in esper.get_events(BuffAppliedEvent):
+            if not esper.entity_exists(event.target):
+                continue
+            buffs = esper.try_component(event.target, Buffs)
+            if buffs is None:
+                continue
+            buffs.active_buffs.append(event.buff)
+            esper.mark_changed(event.target, Buffs)
+            if event.trigger_on_apply and event.buff.on_apply:
+                event.buff.on_apply(EntityWrapper(event.target, esper, game))
+            if buff_log.debug_on:
+                buff_log.debug("Applied buff %s to entity %s", event.buff.name, event.target)
+
+        schedule, fresh = current_schedule(self._schedules)
+        expiries, effects = schedule.queue('buff'), schedule.queue('buff_effect')
+        previous, now = schedule.advance(dt, current_time)
+
+        # 1. 移除到期的 Buff (key 為 (實體, Buff)；已被外部移除或換掉的 Buff 在此略過)
+        for key, _ in expiries.pop_due(now):
+            ent, buff = key
+            buffs = esper.try_component(ent, Buffs) if esper.entity_exists(ent) else None
+            if buffs is None:
+                continue
+            if buff.expires_at is None:
+                continue  # 已重新計時 (Buff.restart)，下面的同步會重新排程
+            if buff.expires_at > now:
+                # 延長過 (Buff.extend) 但尚未同步的 Buff，依新的到期時間重新排程
+                expiries.schedule(key, buff.expires_at)
+                continue
+            self._remove_buff(ent, buff, buffs, game)
+
+        # 2. 同步有變動的實體 (含上面移除到期 Buff 的實體)：排程、合成、重算修正值
+        changed = esper.get_component(Buffs) if fresh else esper.get_changed(Buffs, schedule.since)
+        for ent, buffs in changed:
+            self._sync(ent, buffs, previous, expiries, effects, game)
+        schedule.since = esper.change_tick()
+
+        # 3. 共用的 1 Hz tick：套用本 tick 內經過的每個整數秒的效果
+        for ent, tick in effects.pop_due(now):
+            buffs = esper.try_component(ent, Buffs) if esper.entity_exists(ent) else None
+            if buffs is None or not self._has_periodic_effect(buffs):
                 continue
-            
-            # 1. Update buff durations and apply effects
             for buff in buffs.active_buffs[:]:
-                buff.duration -= dt
-                if buff.duration <= 0:
-                    # Buff expired, remove it
-                    self._remove_buff(ent, buff, buffs, game)
-                else:
-                    # Apply effect per second
-                    self._apply_buff_effects(ent, buff, dt, game)
-            
-            # 2. Synthesize buffs
-            self._synthesize_buffs(ent, buffs, game)
-            
-            # 3. Update modifiers based on active buffs
-            self._update_modifiers(ent, buffs, game)
-    
+                self._apply_buff_effects(ent, buff, self.EFFECT_INTERVAL, game)
+            # 效果可能刪除實體或移除 Buff，下一個 tick 的同步會再確認
+            effects.schedule(ent, tick + self.EFFECT_INTERVAL)
+
+    def _sync(self, entity, buffs_comp, now, expiries, effects, game):
+        """排程新的 Buff，有新 Buff 時檢查合成，並重算修正值與每秒效果的排程。"""
+        added = self._schedule_buffs(entity, buffs_comp, now, expiries)
+        if added and self._synthesize_buffs(entity, buffs_comp, added, game):
+            self._schedule_buffs(entity, buffs_comp, now, expiries)
+        self._update_modifiers(entity, buffs_comp, game)
+        if self._has_periodic_effect(buffs_comp):
+            if entity not in effects:
+                effects.schedule(entity, (math.floor(now / self.EFFECT_INTERVAL) + 1) * self.EFFECT_INTERVAL)
+        else:
+            effects.cancel(entity)
+
+    @staticmethod
+    def _schedule_buffs(entity, buffs_comp, now, expiries) -> list:
+        """把尚未排程或已重新計時的 Buff 放入到期佇列，回傳其中新排程的 Buff。"""
+        added = []
+        for buff in buffs_comp.active_buffs:
+            if buff.expires_at is None:
+                buff.expires_at = now + buff.duration
+                added.append(buff)
+            key = (entity, buff)
+            if expiries.deadline(key) != buff.expires_at:
+                # 快照還原的 Buff 已有到期時間，只需重新放入佇列
+                expiries.schedule(key, buff.expires_at)
+        return added
+
+    @staticmethod
+    def _has_periodic_effect(buffs_comp) -> bool:
+        return any(buff.effect_per_second or buff.multipliers.get('health_regen_per_second', 0.0)
+                   for buff in buffs_comp.active_buffs)
+
     def _apply_buff_effects(self, entity, buff, dt, game):
-        """Apply ongoing effects of a buff."""
+        """Apply ongoing effects of a buff (dt 秒份，於共用的 1 Hz tick 呼叫)."""
         if buff.effect_per_second:
             buff.effect_time += dt
-            if buff.effect_time - buff.last_effect_time >= 1.0:
-                # Create entity wrapper for callback
-                wrapper = EntityWrapper(entity,  esper, game)
-                buff.effect_per_second(wrapper)
-                buff.last_effect_time = buff.effect_time
+            # Create entity wrapper for callback
+            wrapper = EntityWrapper(entity,  esper, game)
+            buff.effect_per_second(wrapper)
+            buff.last_effect_time = buff.effect_time
         
         # Apply health regen
         health_regen = buff.multipliers.get('health_regen_per_second', 0.0)
@@ -442,7 +870,7 @@ class BuffSystem(esper.Processor):
             health_regen *= buff.strength
             
         if health_regen != 0 and  esper.has_component(entity, Health):
-            health_system = game.ecs_world.get_processor(HealthSystem) if game else None
+            health_system = esper.get_processor(HealthSystem) if game else None
             if health_system:
                 if health_regen > 0:
                     health_system.heal(entity, int(health_regen * dt))
@@ -456,79 +884,93 @@ class BuffSystem(esper.Processor):
         """Remove a buff and trigger on_remove callback."""
         if buff in buffs_comp.active_buffs:
             buffs_comp.active_buffs.remove(buff)
+            esper.mark_changed(entity, Buffs)
             
             if buff.on_remove:
                 wrapper = EntityWrapper(entity,  esper, game)
                 buff.on_remove(wrapper)
             
-            print(f"Removed buff: {buff.name} from entity {entity}")
+            buff_log.debug("Removed buff: %s from entity %s", buff.name, entity)
     
-    def _synthesize_buffs(self, entity, buffs_comp, game):
-        """Check for and apply buff synthesis rules."""
-        if len(buffs_comp.active_buffs) < 2:
-            return
-        buff_map = {buff.name: buff for buff in buffs_comp.active_buffs}
-        buff_names = [buff.name for buff in buffs_comp.active_buffs]
-        
-        for (buff1_name, buff2_name), result_name in self.synthesis_rules.items():
-            if buff1_name in buff_names and buff2_name in buff_names:
-                
-                # Find the buff objects
-                buff1 = buff_map[buff1_name]
-                buff2 = buff_map[buff2_name]
-                
-                self._remove_buff(entity, buff1, buffs_comp, game)
-                self._remove_buff(entity, buff2, buffs_comp, game)
-                
-                if result_name in ELEMENTAL_BUFFS:
-                    
-                    new_buff = ELEMENTAL_BUFFS[result_name].deepcopy()
-                    strength1 = buff1.strength if isinstance(buff1, ElementBuff) else 1.0
-                    strength2 = buff2.strength if isinstance(buff2, ElementBuff) else 1.0
-                    new_strength = max(strength1, strength2)
-                    new_buff.strength = new_strength
-                    new_buff.duration *= (0.5 + 0.5 * new_strength)
-                    buffs_comp.active_buffs.append(new_buff)
-                    if new_buff.on_apply:
-                        wrapper = EntityWrapper(entity, esper, game)
-                        new_buff.on_apply(wrapper)
-                    print(f"Synthesized {buff1_name}({strength1}) + {buff2_name}({strength2}) = {result_name}({new_strength}) on entity {entity}")
-                
+    def _synthesize_buffs(self, entity, buffs_comp, added, game) -> bool:
+        """
+        Apply synthesis rules involving the newly added buffs, 回傳是否有合成。
+        只檢查與新 Buff 有關的規則 (反向索引)；多個組合同時成立時依 synthesis_rules 的順序。
+        合成的結果視為新加入的 Buff，連鎖的合成在同一次呼叫內完成。
+        """
+        pending = {buff.name for buff in added}
+        synthesized = False
+        while pending and len(buffs_comp.active_buffs) >= 2:
+            # 同名的 Buff 取最後加入者
+            buff_map = {buff.name: buff for buff in buffs_comp.active_buffs}
+            match = None
+            for name in pending:
+                if name not in buff_map:
+                    continue
+                for order, partner in self._synthesis_partners.get(name, ()):
+                    if partner in buff_map:
+                        if match is None or order < match[0]:
+                            match = (order, name, partner)
+                        break
+            if match is None:
                 break
+            _, buff1_name, buff2_name = match
+            result_name = self._synthesis_pairs[frozenset((buff1_name, buff2_name))]
+            pending.discard(buff1_name)
+            pending.discard(buff2_name)
+            synthesized = True
+
+            # Find the buff objects
+            buff1 = buff_map[buff1_name]
+            buff2 = buff_map[buff2_name]
+            
+            self._remove_buff(entity, buff1, buffs_comp, game)
+            self._remove_buff(entity, buff2, buffs_comp, game)
+            
+            if result_name in ELEMENTAL_BUFFS:
+                
+                new_buff = ELEMENTAL_BUFFS[result_name].deepcopy()
+                strength1 = buff1.strength if isinstance(buff1, ElementBuff) else 1.0
+                strength2 = buff2.strength if isinstance(buff2, ElementBuff) else 1.0
+                new_strength = max(strength1, strength2)
+                new_buff.strength = new_strength
+                new_buff.duration *= (0.5 + 0.5 * new_strength)
+                buffs_comp.active_buffs.append(new_buff)
+                esper.mark_changed(entity, Buffs)
+                pending.add(new_buff.name)
+                if new_buff.on_apply:
+                    wrapper = EntityWrapper(entity, esper, game)
+                    new_buff.on_apply(wrapper)
+                if buff_log.debug_on:
+                    buff_log.debug("Synthesized %s(%s) + %s(%s) = %s(%s) on entity %s",
+                                   buff1_name, strength1, buff2_name, strength2, result_name, new_strength, entity)
+        return synthesized
+
+    @staticmethod
+    def _compile_synthesis_rules(rules):
+        """
+        把 synthesis_rules 編成 ({frozenset((名稱1, 名稱2)): 結果}, {名稱: [(規則順序, 另一個名稱)]})。
+        同一組名稱 (不論順序) 只取第一條規則。
+        """
+        pairs = {}
+        partners = {}
+        for order, ((name1, name2), result) in enumerate(rules.items()):
+            key = frozenset((name1, name2))
+            if key in pairs:
+                continue
+            pairs[key] = result
+            partners.setdefault(name1, []).append((order, name2))
+            if name2 != name1:
+                partners.setdefault(name2, []).append((order, name1))
+        return pairs, partners
     
     def _update_modifiers(self, entity, buffs_comp, game = None):
-        """根據 Buff 計算屬性修正值"""
-        # 重置修正值
-        # 分離乘法修正和加法修正
-        for key in list(buffs_comp.modifiers.keys()):
-            if 'resistance' in key or 'add' in key:
-                buffs_comp.modifiers[key] = 0.0
-            else:
-                buffs_comp.modifiers[key] = 1.0
-        
-        # 累加所有 Active Buff 的效果
-        for buff in buffs_comp.active_buffs:
-            # [整合點] 獲取強度
-            strength = buff.strength if isinstance(buff, ElementBuff) else 1.0
-            for modifier_name, value in buff.multipliers.items():
-                if modifier_name not in buffs_comp.modifiers:
-                    if 'resistance' in modifier_name or 'add' in modifier_name:
-                        buffs_comp.modifiers[modifier_name] = 0.0
-                    else:
-                        buffs_comp.modifiers[modifier_name] = 1.0
-                
-                # 根據修正類型應用強度
-                if 'resistance' in modifier_name or 'add' in modifier_name:
-                    # 加法修正：直接乘以強度 (例如抗性 +10% * 1.5 = +15%)
-                    buffs_comp.modifiers[modifier_name] += (value * strength)
-                else:
-                    # 乘法修正：這比較複雜。
-                    # 如果是 0.5 (減速)，強度 1.5 應該變成 0.25 還是 0.5 / 1.5?
-                    # 簡單算法： (Value - 1) * Strength + 1
-                    # 例：0.9 (減少10%) * 2.0強度 = -0.1 * 2 + 1 = 0.8 (減少20%)
-                    base_effect = value - 1.0
-                    scaled_effect = base_effect * strength
-                    buffs_comp.modifiers[modifier_name] *= (1.0 + scaled_effect)
+        """根據 Buff 計算屬性修正值 (依槽位的向量，加法/乘法的種類見 src/ecs/modifiers.py)"""
+        # [整合點] ElementBuff 的強度放大其效果
+        buffs_comp.modifiers = fold_modifiers(
+            (buff.multipliers, buff.strength if isinstance(buff, ElementBuff) else 1.0)
+            for buff in buffs_comp.active_buffs
+        )
 
 class EntityWrapper:
     """Wrapper class to provide entity-like interface for ECS entities."""
@@ -597,127 +1039,283 @@ class EntityWrapper:
     def heal(self, amount):
         """Delegate to HealthSystem."""
         if self.game:
-            health_system = self.game.ecs_world.get_processor(HealthSystem)
+            health_system = esper.get_processor(HealthSystem)
             if health_system:
                 health_system.heal(self.ecs_entity, amount)
     
+    def extend_buffs(self, seconds):
+        """延長所有 Buff 的持續時間 (並標記變更讓 BuffSystem 重新排程到期時間)。"""
+        if esper.has_component(self.ecs_entity, Buffs):
+            for buff in esper.component_for_entity(self.ecs_entity, Buffs).active_buffs:
+                buff.extend(seconds)
+            esper.mark_changed(self.ecs_entity, Buffs)
+    
     def add_buff(self, buff):
         """Add a buff to this entity."""
         if  esper.has_component(self.ecs_entity, Buffs):
             buffs_comp =  esper.component_for_entity(self.ecs_entity, Buffs)
             
             # Check if buff with same name exists, replace if new one has longer duration
+            now = getattr(self.game, 'current_time', None)
             for existing_buff in buffs_comp.active_buffs[:]:
                 if existing_buff.name == buff.name:
-                    if buff.duration > existing_buff.duration:
+                    remaining = existing_buff.duration if now is None else existing_buff.remaining(now)
+                    if buff.duration > remaining:
                         buffs_comp.active_buffs.remove(existing_buff)
                     else:
                         return  # Keep existing buff
             
             buffs_comp.active_buffs.append(buff)
+            esper.mark_changed(self.ecs_entity, Buffs)
             
             # Trigger on_apply callback
             if buff.on_apply:
                 buff.on_apply(self)
             
-            print(f"Added buff: {buff.name} to entity {self.ecs_entity}")
+            buff_log.debug("Added buff: %s to entity %s", buff.name, self.ecs_entity)
+
+def _combat_bounds(x, y, w, h):
+    """
+    與 pygame.Rect(x, y, w, h) 相同的整數範圍 (left, top, right, bottom)，但不建立 Rect 物件；
+    寬或高為 0 時回傳 None (pygame 的空矩形不與任何矩形碰撞)。
+    """
+    left, top, w, h = int(x), int(y), int(w), int(h)
+    if not w or not h:
+        return None
+    right, bottom = left + w, top + h
+    if w < 0:
+        left, right = right, left
+    if h < 0:
+        top, bottom = bottom, top
+    return (left, top, right, bottom)
+
+
+def _bounds_overlap(a, b):
+    """兩個 _combat_bounds 範圍是否重疊 (同 pygame.Rect.colliderect)。"""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
 
 class CombatSystem(esper.Processor):
-    def process(self, *args, **kwargs):
+    """碰撞傷害：不同標籤的戰鬥實體矩形重疊時互相造成傷害，並處理命中冷卻、穿透次數與爆炸。
+
+    配對先以碰撞層過濾 (Collider 的 category / mask，見 src/ecs/collision.py)：子彈與子彈等
+    不互動的組合整組或逐對以位元 AND 略過，爆炸也以來源的 mask 判斷會波及哪些組。
+    broadphase=True (預設取自 ECS_COMBAT_BROADPHASE) 時每個 tick 依標籤把實體的矩形放入
+    cell_size 像素一格的均勻網格，只對落在同一格的配對做矩形測試；否則兩組實體兩兩比對。
+    兩種方式的命中順序相同，冷卻與穿透的結果也完全相同。
+
+    命中冷卻 (Combat.collision_list) 記錄的是到期的遊戲時間，只在同一對實體再次重疊時與現在比較，
+    過期的項目在比較時或冷卻表變大時才移除，不必每個 tick 走訪所有冷卻。
+    """
+    # 冷卻表超過此大小時，加入新項目前先清掉過期的項目
+    COOLDOWN_PRUNE_SIZE = 16
+
+    def __init__(self, broadphase: bool = ECS_COMBAT_BROADPHASE, cell_size: int = COMBAT_CELL_SIZE):
+        self.broadphase = broadphase
+        self.cell_size = cell_size
+        self.now = 0.0  # 本 tick 的遊戲時間
+
+    @staticmethod
+    def _combat_entry(ent, pos, combat, tag):
+        """
+        (ent, bounds, combat, pos, tag, category, mask)：bounds 以 Collider 或 Renderable 的尺寸置中於 pos
+        (見 _combat_bounds)，category / mask 取自 Collider，沒有 Collider 時屬於 "default" 組。
+        """
+        w, h = 32, 32
+        category, mask = DEFAULT_LAYERS
+        col = esper.try_component(ent, Collider)
+        if col is not None:
+            w, h = col.w, col.h
+            category, mask = col.category, col.mask
+        else:
+            rend = esper.try_component(ent, Renderable)
+            if rend is not None:
+                w, h = rend.w, rend.h
+        return (ent, _combat_bounds(pos.x - w//2, pos.y - h//2, w, h), combat, pos, tag, category, mask)
+
+    def process(self, *args, current_time=None, **kwargs):
         dt = args[0] if args else 0.0
         game = getattr(esper, 'game', None)
         if not game:
-            print("CombatSystem: No game instance found.")
+            combat_log.debug("CombatSystem: No game instance found.")
             return
-        print("CombatSystem: Processing combat...")
-        
-        # 1. Update Cooldowns
-        for ent, combat in esper.get_component(Combat):
-            if combat.collision_list:
-                to_remove = []
-                for key in combat.collision_list.keys():
-                    combat.collision_list[key] -= dt
-                    if combat.collision_list[key] <= 0:
-                        to_remove.append(key)
-                for key in to_remove:
-                    del combat.collision_list[key]
-
-        # 2. Collect and classify entities by tag
-        entities_by_tag = {}  # {tag: [(ent, rect, combat, pos), ...]}
+        combat_log.debug("CombatSystem: Processing combat...")
         
-        for ent, (pos, combat) in esper.get_components(Position, Combat):
-            if not combat.can_attack:
-                continue
-                
-            # Get entity size
-            w, h = 32, 32
-            if esper.has_component(ent, Collider):
-                col = esper.component_for_entity(ent, Collider)
-                w, h = col.w, col.h
-            elif esper.has_component(ent, Renderable):
-                rend = esper.component_for_entity(ent, Renderable)
-                w, h = rend.w, rend.h
-            
-            # Get entity tag
-            tagcmp = esper.try_component(ent, Tag)
-            tag = tagcmp.tag if tagcmp else "untagged"
-            
-            # Create rect and add to tag group
-            rect = pygame.Rect(pos.x - w//2, pos.y - h//2, w, h)
-            
-            if tag not in entities_by_tag:
-                entities_by_tag[tag] = []
-            entities_by_tag[tag].append((ent, rect, combat, pos, tag))
+        # 1. 本 tick 的時間 (沒有傳入 current_time 時累加 dt)，命中冷卻以它比較
+        self.now = current_time if current_time is not None else self.now + dt
+
+        # 2. Collect entities by tag, straight from esper's tag index
+        entities_by_tag = {}  # {tag: [(ent, bounds, combat, pos, tag, category, mask), ...]}
+        indexed = 0
+
+        for tag in esper.get_tags():
+            tagged = esper.get_tagged(tag, Position, Combat)
+            indexed += len(tagged)
+            group = [self._combat_entry(ent, pos, combat, tag) for ent, (pos, combat) in tagged
+                     if combat.can_attack and esper.entity_exists(ent)]
+            if group:
+                entities_by_tag[tag] = group
+
+        # 沒有 Tag 組件的戰鬥實體 (少見) 才需要掃描整個查詢
+        if indexed < len(esper.get_components(Position, Combat)):
+            untagged = [self._combat_entry(ent, pos, combat, "untagged")
+                        for ent, (pos, combat) in esper.get_components(Position, Combat)
+                        if combat.can_attack and esper.entity_exists(ent) and not esper.has_component(ent, Tag)]
+            if untagged:
+                entities_by_tag.setdefault("untagged", []).extend(untagged)
         
         # 3. Check collisions only between different tag groups
         tag_list = list(entities_by_tag.keys())
+        # 每個標籤所有成員的 category / mask 聯集：兩組之間沒有任何會互動的碰撞層時整組略過
+        layers = {}
+        for tag, group in entities_by_tag.items():
+            categories = masks = 0
+            for entry in group:
+                categories |= entry[5]
+                masks |= entry[6]
+            layers[tag] = (categories, masks)
+        grids = {}  # 配對 (tag1, tag2) 只查詢 tag2 的網格，需要時才建立
         
         for i, tag1 in enumerate(tag_list):
+            categories1, masks1 = layers[tag1]
             for tag2 in tag_list[i+1:]:  # Only check each pair once
                 # Skip if same tag (already filtered by different groups)
                 if tag1 == tag2:
                     continue
-                
-                # Check collisions between tag1 group and tag2 group
-                for ent1, rect1, combat1, pos1, _ in entities_by_tag[tag1]:
-                    for ent2, rect2, combat2, pos2, _ in entities_by_tag[tag2]:
-                        # Check collisiond
-                        if rect1.colliderect(rect2):
-                            # Check cooldown
-                            if ent2 in combat1.collision_list:
-                                continue
-                            
-                            # Check penetration
-                            if combat1.max_penetration_count > 0 and combat1.current_penetration_count >= combat1.max_penetration_count:
-                                continue
-                                
-                            # Apply Damage from ent1 to ent2
-                            if esper.has_component(ent2, Health):
-                                self._apply_collision_damage(ent1, ent2, combat1, game, entities_by_tag)
-                        
-                        # Also check reverse collision (ent2 attacking ent1)
-                        if rect2.colliderect(rect1):
-                            # Check cooldown
-                            if ent1 in combat2.collision_list:
-                                continue
-                            
-                            # Check penetration
-                            if combat2.max_penetration_count > 0 and combat2.current_penetration_count >= combat2.max_penetration_count:
-                                continue
-                                
-                            # Apply Damage from ent2 to ent1
-                            if esper.has_component(ent1, Health):
-                                self._apply_collision_damage(ent2, ent1, combat2, game, entities_by_tag)
+                categories2, masks2 = layers[tag2]
+                if not (masks1 & categories2 and masks2 & categories1):
+                    continue
+                if self.broadphase:
+                    grid = grids.get(tag2)
+                    if grid is None:
+                        grid = grids[tag2] = self._build_grid(entities_by_tag[tag2])
+                    self._collide_cells(entities_by_tag[tag1], entities_by_tag[tag2], grid, game, entities_by_tag)
+                else:
+                    self._collide_all(entities_by_tag[tag1], entities_by_tag[tag2], game, entities_by_tag)
+
+    def _build_grid(self, group):
+        """{(格 x, 格 y): [group 中的索引 (遞增)]}，每個實體登記在其矩形涵蓋的所有格子。"""
+        cell = self.cell_size
+        grid = {}
+        for index, entry in enumerate(group):
+            bounds = entry[1]
+            if bounds is None:
+                continue
+            left, top, right, bottom = bounds
+            for cy in range(top // cell, (bottom - 1) // cell + 1):
+                for cx in range(left // cell, (right - 1) // cell + 1):
+                    cell_entries = grid.get((cx, cy))
+                    if cell_entries is None:
+                        grid[(cx, cy)] = [index]
+                    else:
+                        cell_entries.append(index)
+        return grid
+
+    def _collide_all(self, group1, group2, game, entities_by_tag):
+        """兩組實體兩兩做矩形測試 (不使用寬相)。"""
+        for first in group1:
+            bounds1, category1, mask1 = first[1], first[5], first[6]
+            if bounds1 is None:
+                continue
+            for second in group2:
+                bounds2 = second[1]
+                if (mask1 & second[5] and second[6] & category1
+                        and bounds2 is not None and _bounds_overlap(bounds1, bounds2)):
+                    if not self._collide(first, second, game, entities_by_tag):
+                        break
+
+    def _collide_cells(self, group1, group2, grid2, game, entities_by_tag):
+        """group1 的每個實體只與 grid2 中同格的 group2 實體做矩形測試，順序與 _collide_all 相同。"""
+        cell = self.cell_size
+        for first in group1:
+            bounds1, category1, mask1 = first[1], first[5], first[6]
+            if bounds1 is None:
+                continue
+            left, top, right, bottom = bounds1
+            x0, x1 = left // cell, (right - 1) // cell
+            y0, y1 = top // cell, (bottom - 1) // cell
+            if x0 == x1 and y0 == y1:
+                candidates = grid2.get((x0, y0))
+                if not candidates:
+                    continue
+            else:
+                found = set()
+                for cy in range(y0, y1 + 1):
+                    for cx in range(x0, x1 + 1):
+                        cell_entries = grid2.get((cx, cy))
+                        if cell_entries:
+                            found.update(cell_entries)
+                if not found:
+                    continue
+                candidates = sorted(found)
+            for index in candidates:
+                second = group2[index]
+                if mask1 & second[5] and second[6] & category1 and _bounds_overlap(bounds1, second[1]):
+                    if not self._collide(first, second, game, entities_by_tag):
+                        break
+
+    def _collide(self, first, second, game, entities_by_tag):
+        """
+        結算一對矩形重疊的實體：先 first 攻擊 second，再反向。
+        回傳 False 表示 first 已被銷毀，不必再與其他實體比對。
+        """
+        ent1, combat1 = first[0], first[2]
+        ent2, combat2 = second[0], second[2]
+        # 本幀已被銷毀的實體 (例如達到穿透上限的子彈) 不再參與碰撞
+        if not esper.entity_exists(ent1):
+            return False
+        if not esper.entity_exists(ent2):
+            return True
+
+        # Check cooldown
+        if combat1.collision_list and self._on_cooldown(combat1.collision_list, ent2):
+            return True
+        
+        # Check penetration
+        if combat1.max_penetration_count > 0 and combat1.current_penetration_count >= combat1.max_penetration_count:
+            return True
+            
+        # Apply Damage from ent1 to ent2
+        if esper.has_component(ent2, Health):
+            self._apply_collision_damage(ent1, ent2, combat1, game, entities_by_tag)
+        
+        # Also check reverse collision (ent2 attacking ent1)
+        if not esper.entity_exists(ent1):
+            return False
+
+        # Check cooldown
+        if combat2.collision_list and self._on_cooldown(combat2.collision_list, ent1):
+            return True
+        
+        # Check penetration
+        if combat2.max_penetration_count > 0 and combat2.current_penetration_count >= combat2.max_penetration_count:
+            return True
+            
+        # Apply Damage from ent2 to ent1
+        if esper.has_component(ent1, Health):
+            self._apply_collision_damage(ent2, ent1, combat2, game, entities_by_tag)
+        return True
+
+    def _on_cooldown(self, cooldowns, target):
+        """target 是否仍在命中冷卻中；冷卻已過的項目順便移除。"""
+        expiry = cooldowns.get(target)
+        if expiry is None:
+            return False
+        if expiry > self.now:
+            return True
+        del cooldowns[target]
+        return False
 
     def _apply_collision_damage(self, attacker, target, combat, game, entities_by_tag):
         """Apply damage from attacker to target."""
         
-        print(f"Applying damage from Entity {attacker} to Entity {target}")
+        if combat_log.debug_on:
+            combat_log.debug("Applying damage from Entity %s to Entity %s", attacker, target)
         # Get damage multiplier from buffs if attacker has buffs
         damage_mult = 1.0
         if  esper.has_component(attacker, Buffs):
             buffs_comp =  esper.component_for_entity(attacker, Buffs)
-            damage_mult = buffs_comp.modifiers.get('damage_multiplier', 1.0)
+            damage_mult = buffs_comp.modifiers[DAMAGE_MULTIPLIER]
         
         # Calculate element multiplier
         element_mult = 1.0
@@ -727,71 +1325,68 @@ class CombatSystem(esper.Processor):
         # Calculate effective damage
         effective_damage = int(combat.damage * element_mult * damage_mult)
         
-        # Use HealthSystem to apply damage
-        health_system = esper.get_processor(HealthSystem)
-        if health_system:
-            killed, actual_damage = health_system.take_damage(
-                target,
-                element=combat.atk_element,
-                base_damage=effective_damage,
-                max_hp_percentage_damage=combat.max_hp_percentage_damage,
-                current_hp_percentage_damage=combat.current_hp_percentage_damage,
-                lose_hp_percentage_damage=combat.lose_hp_percentage_damage,
-                cause_death=combat.cause_death
-            )
-            
-            # Add to cooldown
-            combat.collision_list[target] = combat.collision_cooldown
-            
-            # Increment penetration count
-            if combat.max_penetration_count >= 0:
-                combat.current_penetration_count += 1
-            
-            print(f"ECS Combat: Entity {attacker} hit {target} for {actual_damage} damage!")
-            
-            # Apply buffs to target
-            if combat.buffs and esper.has_component(target, Buffs):
-                target_buffs = esper.component_for_entity(target, Buffs)
-                for buff in combat.buffs:
-                    # 確保是 ElementBuff 或 Buff 實例
-                    if isinstance(buff, (Buff, ElementBuff)):
-                        # [整合點] 使用 deepcopy 確保每個實體有獨立的 Buff 實例 (計時器獨立)
-                        buff_copy = buff.deepcopy()
-                        
-                        # 可以根據攻擊者的某些屬性增強 Buff 強度
-                        # 例如：如果有 "Status Effect Potency" 的屬性
-                        # buff_copy.strength *= attacker_potency 
-                        
-                        target_buffs.active_buffs.append(buff_copy)
-                        
-                        # 觸發應用回調
-                        if buff_copy.on_apply:
-                            wrapper = EntityWrapper(target, esper, game)
-                            buff_copy.on_apply(wrapper)
-                            
-                        print(f"Applied buff {buff_copy.name} to entity {target}")
+        # 傷害交給 HealthSystem 在本 tick 整批結算 (見 src/ecs/events.py)
+        # 百分比傷害與爆炸是冷組件，大部分攻擊者沒有
+        percentage = esper.try_component(attacker, PercentageDamage) or _NO_PERCENTAGE_DAMAGE
+        explosion = esper.try_component(attacker, Explosion)
+        esper.emit(DamageEvent(
+            target,
+            source=attacker,
+            element=combat.atk_element,
+            base_damage=effective_damage,
+            max_hp_percentage_damage=percentage.max_hp,
+            current_hp_percentage_damage=percentage.current_hp,
+            lose_hp_percentage_damage=percentage.lose_hp,
+            cause_death=combat.cause_death
+        ))
+        
+        # Add to cooldown (記錄到期時間)
+        cooldowns = combat.collision_list
+        if len(cooldowns) >= self.COOLDOWN_PRUNE_SIZE:
+            now = self.now
+            for key in [key for key, expiry in cooldowns.items() if expiry <= now]:
+                del cooldowns[key]
+        cooldowns[target] = self.now + combat.collision_cooldown
+        
+        # Increment penetration count
+        if combat.max_penetration_count >= 0:
+            combat.current_penetration_count += 1
+        
+        if combat_log.debug_on:
+            combat_log.debug("ECS Combat: Entity %s hit %s for %s base damage!", attacker, target, effective_damage)
+        
+        # Apply buffs to target (由 BuffSystem 整批加入)
+        if combat.buffs and esper.has_component(target, Buffs):
+            for buff in combat.buffs:
+                # 確保是 ElementBuff 或 Buff 實例
+                if isinstance(buff, (Buff, ElementBuff)):
+                    # [整合點] 使用 deepcopy 確保每個實體有獨立的 Buff 實例 (計時器獨立)
+                    # 可以根據攻擊者的某些屬性增強 Buff 強度
+                    # 例如：如果有 "Status Effect Potency" 的屬性
+                    # buff_copy.strength *= attacker_potency 
+                    esper.emit(BuffAppliedEvent(target, buff.deepcopy(), source=attacker))
+        
+        # Check if penetration limit reached
+        if combat.max_penetration_count >= 0 and combat.current_penetration_count >= combat.max_penetration_count:
+            combat_log.debug("Penetration limit reached (%s/%s)", combat.current_penetration_count, combat.max_penetration_count)
             
-            # Check if penetration limit reached
-            if combat.max_penetration_count >= 0 and combat.current_penetration_count >= combat.max_penetration_count:
-                print(f"Penetration limit reached ({combat.current_penetration_count}/{combat.max_penetration_count})")
-                
-                # Trigger explosion if configured
-                if combat.explosion_range > 0:
-                    print(f"Triggering final explosion before destroying entity {attacker}")
-                    self._trigger_explosion(attacker, combat, game, damage_mult, entities_by_tag)
-                
-                # Destroy the projectile
-                print(f"Destroying entity {attacker} due to penetration limit")
-                esper.delete_entity(attacker)
-                return  # Exit early since entity is destroyed
+            # Trigger explosion if configured
+            if explosion and explosion.range > 0:
+                combat_log.debug("Triggering final explosion before destroying entity %s", attacker)
+                self._trigger_explosion(attacker, combat, explosion, game, damage_mult, entities_by_tag)
             
-            # Trigger explosion if configured (non-limit case)
-            if combat.explosion_range > 0 and combat.current_penetration_count < combat.max_penetration_count:
-                self._trigger_explosion(attacker, combat, game, damage_mult, entities_by_tag)
+            # Destroy the projectile
+            combat_log.debug("Destroying entity %s due to penetration limit", attacker)
+            esper.command_buffer.delete_entity(attacker)
+            return  # Exit early since entity is destroyed
+        
+        # Trigger explosion if configured (non-limit case)
+        if explosion and explosion.range > 0 and combat.current_penetration_count < combat.max_penetration_count:
+            self._trigger_explosion(attacker, combat, explosion, game, damage_mult, entities_by_tag)
 
-    def _trigger_explosion(self, source, combat, game, damage_mult, entities_by_tag):
+    def _trigger_explosion(self, source, combat, explosion, game, damage_mult, entities_by_tag):
         """Trigger explosion damage around source entity."""
-        if combat.explosion_range <= 0:
+        if explosion.range <= 0:
             return
         
         # Get source position
@@ -801,21 +1396,21 @@ class CombatSystem(esper.Processor):
         source_pos =  esper.component_for_entity(source, Position)
         source_tagcmp =  esper.try_component(source, Tag)
         source_tag = source_tagcmp.tag if source_tagcmp else "untagged"
+        source_collider = esper.try_component(source, Collider)
+        source_mask = source_collider.mask if source_collider is not None else DEFAULT_LAYERS[1]
         explosion_center = (source_pos.x, source_pos.y)
-        range_sq = combat.explosion_range ** 2
+        range_sq = explosion.range ** 2
         
         for target_tag, targets in entities_by_tag.items():
             if target_tag == source_tag: # 免疫同標籤傷害
                 continue
             # Check all entities for explosion damage
-            for ent, ent_rect, ent_combat, ent_pos, tag in targets:
+            for ent, ent_bounds, ent_combat, ent_pos, tag, category, mask in targets:
                 if ent == source:
                     continue
                 
-                # Check team (don't damage same team)
-                is_player_source =  esper.has_component(source, Input)
-                is_player_target =  esper.has_component(ent, Input)
-                if is_player_source == is_player_target:
+                # 只波及來源的碰撞層會互動的組 (例如不波及子彈)
+                if not source_mask & category:
                     continue
                 
                 # Calculate distance
@@ -833,38 +1428,35 @@ class CombatSystem(esper.Processor):
                     (explosion_center[1] - entity_center[1])**2
                 )
                 
-                if distance <= combat.explosion_range:
+                if distance <= explosion.range:
                     # Apply explosion damage
                     if  esper.has_component(ent, Health):
                         # Calculate explosion element multiplier
                         explosion_mult = 1.0
                         if combat.damage_to_element:
-                            explosion_mult = combat.damage_to_element.get(combat.explosion_element, 1.0)
+                            explosion_mult = combat.damage_to_element.get(explosion.element, 1.0)
+                        
+                        effective_explosion_damage = int(explosion.damage * explosion_mult * damage_mult)
                         
-                        effective_explosion_damage = int(combat.explosion_damage * explosion_mult * damage_mult)
+                        esper.emit(DamageEvent(
+                            ent,
+                            source=source,
+                            element=explosion.element,
+                            base_damage=effective_explosion_damage,
+                            max_hp_percentage_damage=explosion.max_hp_percentage_damage,
+                            current_hp_percentage_damage=explosion.current_hp_percentage_damage,
+                            lose_hp_percentage_damage=explosion.lose_hp_percentage_damage,
+                            cause_death=combat.cause_death
+                        ))
                         
-                        # Use HealthSystem to apply explosion damage
-                        health_system = game.ecs_world.get_processor(HealthSystem)
-                        if health_system:
-                            killed, actual_damage = health_system.take_damage(
-                                ent,
-                                element=combat.explosion_element,
-                                base_damage=effective_explosion_damage,
-                                max_hp_percentage_damage=combat.explosion_max_hp_percentage_damage,
-                                current_hp_percentage_damage=combat.explosion_current_hp_percentage_damage,
-                                lose_hp_percentage_damage=combat.explosion_lose_hp_percentage_damage,
-                                cause_death=combat.cause_death
-                            )
-                            
-                            print(f"Explosion damage: {actual_damage} to entity {ent}")
-                            
-                            # Apply explosion buffs
-                            if combat.explosion_buffs and  esper.has_component(ent, Buffs):
-                                target_buffs =  esper.component_for_entity(ent, Buffs)
-                                for buff in combat.explosion_buffs:
-                                    import copy
-                                    buff_copy = copy.deepcopy(buff)
-                                    target_buffs.active_buffs.append(buff_copy)
+                        if combat_log.debug_on:
+                            combat_log.debug("Explosion damage: %s base damage to entity %s", effective_explosion_damage, ent)
+                        
+                        # Apply explosion buffs (爆炸附加的 Buff 不觸發 on_apply)
+                        if explosion.buffs and  esper.has_component(ent, Buffs):
+                            for buff in explosion.buffs:
+                                # Buff.deepcopy 只複製 multipliers，比 copy.deepcopy 走訪整個物件快得多
+                                esper.emit(BuffAppliedEvent(ent, buff.deepcopy(), source=source, trigger_on_apply=False))
 
 # class AISystem(esper.Processor):
 #     def process(self, *args, **kwargs):
@@ -1012,6 +1604,7 @@ class EnergySystem(esper.Processor):
                 # 限制不超過最大值
                 if comp.energy > comp.max_energy:
                     comp.energy = comp.max_energy
+                esper.mark_changed(ent, PlayerComponent)
 
 class AISystem(esper.Processor):
     def __init__(self, game: 'Game'):
@@ -1021,26 +1614,133 @@ class AISystem(esper.Processor):
     def process(self, *args, **kwargs):
         dt = args[0]
         current_time = self.game.current_time
-        print("AISystem: Processing AI behavior trees...")
+        ai_log.debug("AISystem: Processing AI behavior trees...")
+        trace = ai_log.debug_on  # 每個敵人每幀一次：停用時只檢查一次
         for ent, (pos, ai_comp) in esper.get_components(Position, AI):
-            print(f"AISystem: Executing behavior tree for entity {ent}")
+            if trace:
+                ai_log.debug("AISystem: Executing behavior tree for entity %s", ent)
             # 創建 Context Facade
             context = EnemyContext(esper, ent, self.game, ai_comp)
             # 執行行為樹
             ai_comp.behavior_tree.execute(context, dt, current_time)
 
+class LifetimeSystem(esper.Processor):
+    """
+    拋射物壽命與擴張子彈的階段切換。
+
+    ProjectileState 加入時 (esper.get_added) 依 max_lifetime 排入到期佇列，到期時刪除實體；
+    ExpansionLifecycle 依 hide_time、wait_time 與 ExpansionRenderData.expansion_duration 排入下一個階段：
+    隱藏期間不繪製也不參與戰鬥，之後等待並擴張，擴張完成時 expanded = True。
+    每個 tick 只處理新加入、被移除與到期的實體，與存活的拋射物數量無關 (見 src/ecs/scheduler.py)。
+    """
+
+    def __init__(self):
+        self._schedules = {}  # {World 名稱: WorldSchedule}
+
+    def process(self, dt: float = 0.0, *args, current_time=None, **kwargs) -> None:
+        schedule, fresh = current_schedule(self._schedules)
+        lifetimes, phases = schedule.queue('lifetime'), schedule.queue('expansion')
+        previous, now = schedule.advance(dt, current_time)
+        if fresh:
+            added_states = esper.get_component(ProjectileState)
+            added_lifecycles = esper.get_component(ExpansionLifecycle)
+        else:
+            for ent in esper.get_removed(ProjectileState, schedule.since):
+                lifetimes.cancel(ent)
+            for ent in esper.get_removed(ExpansionLifecycle, schedule.since):
+                phases.cancel(ent)
+            added_states = esper.get_added(ProjectileState, schedule.since)
+            added_lifecycles = esper.get_added(ExpansionLifecycle, schedule.since)
+        for ent, state in added_states:
+            if state.expires_at is None:
+                state.expires_at = previous + state.max_lifetime
+            # 快照還原的拋射物沿用原本的到期時間 (遊戲時間一併還原)
+            lifetimes.schedule(ent, state.expires_at)
+        for ent, lifecycle in added_lifecycles:
+            if lifecycle.is_hidden:
+                self._set_hidden(ent, True)
+            self._schedule_phase(ent, lifecycle, previous, phases)
+        schedule.since = esper.change_tick()
+
+        # 被移除的組件已在上面取消；仍需確認實體存在 (移除紀錄只保留最近的一段)
+        for ent, _ in lifetimes.pop_due(now):
+            state = esper.try_component(ent, ProjectileState) if esper.entity_exists(ent) else None
+            if state is not None:
+                state.current_lifetime = 0.0
+                esper.command_buffer.delete_entity(ent)
+        for ent, deadline in phases.pop_due(now):
+            lifecycle = esper.try_component(ent, ExpansionLifecycle) if esper.entity_exists(ent) else None
+            if lifecycle is None:
+                continue
+            if lifecycle.is_hidden:
+                lifecycle.is_hidden = False
+                self._set_hidden(ent, False)
+                self._schedule_phase(ent, lifecycle, deadline, phases)
+            else:
+                lifecycle.expanded = True
+
+    @staticmethod
+    def _schedule_phase(ent, lifecycle, now, phases):
+        """排入 lifecycle 目前階段結束的時間：隱藏結束，或等待加上擴張結束。"""
+        if lifecycle.is_hidden:
+            phases.schedule(ent, now + lifecycle.hide_time)
+        elif not lifecycle.expanded:
+            render_data = esper.try_component(ent, ExpansionRenderData)
+            expansion_duration = render_data.expansion_duration if render_data is not None else 0.0
+            phases.schedule(ent, now + lifecycle.wait_time + expansion_duration)
+
+    @staticmethod
+    def _set_hidden(ent, hidden):
+        rend = esper.try_component(ent, Renderable)
+        if rend is not None:
+            rend.visible = not hidden
+        combat = esper.try_component(ent, Combat)
+        if combat is not None:
+            combat.can_attack = not hidden
+
+
 class TimerSystem(esper.Processor):
-    def process(self, dt: float, *args, **kwargs) -> None:
-        """更新所有擁有 TimerComponent 的實體的計時器。"""
-        
-        for ent, timer_comp in esper.get_component(TimerComponent):
-            timer_comp.elapsed_time += dt
-            if timer_comp.elapsed_time >= timer_comp.duration:
-                # 計時器到期，觸發回調
-                if timer_comp.on_expire:
-                    timer_comp.on_expire(ent)
-                # 重置計時器
-                timer_comp.elapsed_time = 0.0
+    """
+    TimerComponent 計時器。
+
+    組件加入 (或以 esper.mark_changed 標記) 時，以遊戲時間 (current_time) 算出絕對的到期時間
+    duration - elapsed_time 後放入最小堆積；到期時呼叫 on_expire(ent)，repeat=True 時從到期時間起重新計時。
+    移除組件或刪除實體即取消排程。每個 tick 只處理有變動與到期的計時器，與計時器總數無關。
+    """
+
+    def __init__(self):
+        self._schedules = {}  # {World 名稱: WorldSchedule}
+
+    def process(self, dt: float = 0.0, *args, current_time=None, **kwargs) -> None:
+        """觸發本 tick 到期的計時器。"""
+        schedule, fresh = current_schedule(self._schedules)
+        timers = schedule.queue('timer')
+        previous, now = schedule.advance(dt, current_time)
+        if fresh:
+            changed = esper.get_component(TimerComponent)
+        else:
+            for ent in esper.get_removed(TimerComponent, schedule.since):
+                timers.cancel(ent)
+            changed = esper.get_changed(TimerComponent, schedule.since)
+        for ent, timer_comp in changed:
+            timers.schedule(ent, previous + timer_comp.duration - timer_comp.elapsed_time)
+        # 回調中加入或重設的計時器留到下一個 tick 排程
+        schedule.since = esper.change_tick()
+
+        for ent, deadline in timers.pop_due(now):
+            timer_comp = esper.try_component(ent, TimerComponent) if esper.entity_exists(ent) else None
+            if timer_comp is None:
+                continue
+            timer_comp.elapsed_time = 0.0 if timer_comp.repeat else timer_comp.duration
+            # 計時器到期，觸發回調
+            if timer_comp.on_expire:
+                timer_comp.on_expire(ent)
+            # 重複的計時器重新計時 (回調可能已刪除實體或換掉組件)
+            if (timer_comp.repeat and esper.entity_exists(ent)
+                    and esper.try_component(ent, TimerComponent) is timer_comp):
+                # 本 tick 到期的項目已全部取出，即使新的到期時間 <= now 也留到下一個 tick 觸發
+                timers.schedule(ent, deadline + timer_comp.duration)
+
 # 遊戲主循環應在 MovementSystem, RenderSystem 之前調用 AISystem:
 # self.world.add_processor(AISystem(self))
 # ...
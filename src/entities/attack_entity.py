@@ -4,7 +4,7 @@ import pygame
 import math
 from .basic_entity import BasicEntity
 from .buff.buff import Buff
-from src.ecs.components import Combat
+from src.ecs.components import Combat, Explosion
 
 class AttackEntity(BasicEntity):
     def __init__(self,
@@ -79,11 +79,14 @@ class AttackEntity(BasicEntity):
                  max_penetration_count=max_penetration_count,
                  current_penetration_count=0,
                  collision_cooldown=collision_cooldown,
-                 collision_list={},
-                 explosion_range=explosion_range,
-                 explosion_damage=explosion_damage,
-                 explosion_element=explosion_element
+                 collision_list={}
              ))
+             if explosion_range > 0:
+                 self.game.ecs_world.add_component(self.ecs_entity, Explosion(
+                     range=explosion_range,
+                     damage=explosion_damage,
+                     element=explosion_element
+                 ))
 
     # Getters
     @property
@@ -221,7 +224,7 @@ class AttackEntity(BasicEntity):
                 target.add_buff(buff.deepcopy())
         
         # Trigger explosion
-        explosion_range = combat_data.explosion_range if combat_data else self.explosion_range
+        explosion_range = self.explosion_range
         if explosion_range > 0 and entities:
             self.trigger_explosion(entities)
         
@@ -260,10 +263,15 @@ class AttackEntity(BasicEntity):
         self.explosion_buffs = [buff.deepcopy() for buff in buffs] if buffs else []
         
         if self.ecs_entity is not None and self.game and hasattr(self.game, 'ecs_world'):
-            combat = self.game.ecs_world.component_for_entity(self.ecs_entity, Combat)
-            combat.explosion_range = range
-            combat.explosion_damage = damage
-            combat.explosion_element = element
+            self.game.ecs_world.add_component(self.ecs_entity, Explosion(
+                range=range,
+                damage=damage,
+                element=element,
+                max_hp_percentage_damage=max_hp_percentage_damage,
+                current_hp_percentage_damage=current_hp_percentage_damage,
+                lose_hp_percentage_damage=lose_hp_percentage_damage,
+                buffs=self.explosion_buffs
+            ))
     
     def trigger_explosion(self, entities: List['EntityInterface']) -> None:
         """Trigger explosion and damage nearby entities."""
@@ -271,7 +279,7 @@ class AttackEntity(BasicEntity):
         if self.ecs_entity is not None and self.game and hasattr(self.game, 'ecs_world'):
             combat_data = self.game.ecs_world.component_for_entity(self.ecs_entity, Combat)
 
-        explosion_range = combat_data.explosion_range if combat_data else self.explosion_range
+        explosion_range = self.explosion_range
         if explosion_range <= 0:
             return
         
@@ -291,8 +299,8 @@ class AttackEntity(BasicEntity):
             )
             
             if distance <= explosion_range:
-                explosion_element = combat_data.explosion_element if combat_data else self.explosion_element
-                explosion_damage = combat_data.explosion_damage if combat_data else self.explosion_damage
+                explosion_element = self.explosion_element
+                explosion_damage = self.explosion_damage
                 damage_to_element_map = combat_data.damage_to_element if combat_data else self.damage_to_element
 
                 multiplier = damage_to_element_map.get(explosion_element, 1.0)
@@ -416,7 +424,7 @@ class AttackEntity(BasicEntity):
                 target.add_buff(buff.deepcopy())
         
         # Trigger explosion
-        explosion_range = combat_data.explosion_range if combat_data else self.explosion_range
+        explosion_range = self.explosion_range
         if explosion_range > 0 and entities:
             self.trigger_explosion(entities)
         
@@ -455,10 +463,15 @@ class AttackEntity(BasicEntity):
         self.explosion_buffs = [buff.deepcopy() for buff in buffs] if buffs else []
         
         if self.ecs_entity is not None and self.game and hasattr(self.game, 'ecs_world'):
-            combat = self.game.ecs_world.component_for_entity(self.ecs_entity, Combat)
-            combat.explosion_range = range
-            combat.explosion_damage = damage
-            combat.explosion_element = element
+            self.game.ecs_world.add_component(self.ecs_entity, Explosion(
+                range=range,
+                damage=damage,
+                element=element,
+                max_hp_percentage_damage=max_hp_percentage_damage,
+                current_hp_percentage_damage=current_hp_percentage_damage,
+                lose_hp_percentage_damage=lose_hp_percentage_damage,
+                buffs=self.explosion_buffs
+            ))
     
     def trigger_explosion(self, entities: List['EntityInterface']) -> None:
         """Trigger explosion and damage nearby entities."""
@@ -466,7 +479,7 @@ class AttackEntity(BasicEntity):
         if self.ecs_entity is not None and self.game and hasattr(self.game, 'ecs_world'):
             combat_data = self.game.ecs_world.component_for_entity(self.ecs_entity, Combat)
 
-        explosion_range = combat_data.explosion_range if combat_data else self.explosion_range
+        explosion_range = self.explosion_range
         if explosion_range <= 0:
             return
         
@@ -486,8 +499,8 @@ class AttackEntity(BasicEntity):
             )
             
             if distance <= explosion_range:
-                explosion_element = combat_data.explosion_element if combat_data else self.explosion_element
-                explosion_damage = combat_data.explosion_damage if combat_data else self.explosion_damage
+                explosion_element = self.explosion_element
+                explosion_damage = self.explosion_damage
                 damage_to_element_map = combat_data.damage_to_element if combat_data else self.damage_to_element
 
                 multiplier = damage_to_element_map.get(explosion_element, 1.0)
@@ -1,12 +1,39 @@
 # 假設此函數位於 src/entities/factories.py 或一個專門的 ECS 創建模組中
 import esper
 import pygame
-from typing import Tuple, Dict, List, Any
+from typing import Tuple, Dict, List, Any, Iterable, Optional
 from dataclasses import dataclass
-from src.ecs.components import Position, Velocity, Combat, Renderable, Collider, ProjectileState, Tag
+from src.ecs.components import (
+    Position, Velocity, Combat, Renderable, Collider, ProjectileState, Tag, Explosion, PercentageDamage,
+    reset_component
+)
 
-def create_standard_bullet_entity(
-    world: esper = esper,
+# 標準子彈的組件簽名。被銷毀的子彈 (實體 ID 與組件實例) 會由 esper 保留在回收池中，
+# 下次創建子彈時以 reset_component 重設後重複使用，避免大量配置短命物件。
+BULLET_COMPONENT_TYPES = (Position, Velocity, Renderable, Collider, Combat, ProjectileState, Tag)
+BULLET_POOL_SIZE = 512
+# 有爆炸或百分比傷害的子彈另外附加冷組件，每種組合是不同的簽名，各自有回收池
+BULLET_SIGNATURES = (
+    BULLET_COMPONENT_TYPES,
+    BULLET_COMPONENT_TYPES + (Explosion,),
+    BULLET_COMPONENT_TYPES + (PercentageDamage,),
+    BULLET_COMPONENT_TYPES + (Explosion, PercentageDamage),
+)
+for _signature in BULLET_SIGNATURES:
+    esper.set_recycling(_signature, BULLET_POOL_SIZE)
+
+def bullet_component_types(explosion_range: float = 0.0,
+                           percentage_damage: Optional[Dict[str, int]] = None,
+                           **kwargs: Any) -> Tuple[type, ...]:
+    """依 standard_bullet_components 的參數決定子彈的組件簽名 (是否附加冷組件)。"""
+    component_types = BULLET_COMPONENT_TYPES
+    if explosion_range > 0:
+        component_types += (Explosion,)
+    if percentage_damage and any(percentage_damage.values()):
+        component_types += (PercentageDamage,)
+    return component_types
+
+def standard_bullet_components(
     start_pos: Tuple[float, float] = (0.0, 0.0),
     w: int = 32,
     h: int = 32,
@@ -31,67 +58,113 @@ def create_standard_bullet_entity(
     # Collider
     pass_wall: bool = False,
     # 其他
-    cause_death: bool = True
-) -> int:
-    """創建一個標準 ECS 子彈實體，取代 Bullet 類別的初始化。"""
-    
-    bullet_entity = world.create_entity()
-    
-    # 1. Position & Movement
-    world.add_component(bullet_entity, Position(x=start_pos[0], y=start_pos[1]))
+    cause_death: bool = True,
+    # 物件池: 回收的 {組件類別: 實例}，提供時重設並沿用這些實例
+    recycled: Optional[Dict[type, Any]] = None
+) -> Tuple[Any, ...]:
+    """建立標準子彈的所有組件 (尚未加入 World)，供 spawn / spawn_many 一次插入。"""
     
     vel_x = direction[0] * max_speed
     vel_y = direction[1] * max_speed
-    world.add_component(bullet_entity, Velocity(x=vel_x, y=vel_y, speed=max_speed))
-    
-    # 2. Renderable (使用 rect shape)
-    world.add_component(bullet_entity, Renderable(
-        image=None, # 讓 RenderSystem 處理默認繪製或加載圖像
-        shape="rect",
-        w=w,
-        h=h,
-        color=(255, 255, 0), # 默認黃色
-        layer=1 
-    ))
-
-    # 3. Collider
-    world.add_component(bullet_entity, Collider(
-        w=w, 
-        h=h, 
-        pass_wall=pass_wall,
-        destroy_on_collision=True,
-        collision_group="projectile" 
-    ))
-
-    # 4. Combat & Attack
-    world.add_component(bullet_entity, Combat(
-        damage=damage,
-        can_attack=True,
-        atk_element=atk_element,
-        damage_to_element=damage_to_element,
-        max_penetration_count=max_penetration_count,
-        collision_cooldown=collision_cooldown,
-        explosion_range=explosion_range,
-        explosion_damage=explosion_damage,
-        explosion_element=explosion_element,
-        explosion_buffs=explosion_buffs,
-        buffs=buffs,
-        # 將百分比傷害展開
-        max_hp_percentage_damage=percentage_damage['max_hp'],
-        current_hp_percentage_damage=percentage_damage['current_hp'],
-        lose_hp_percentage_damage=percentage_damage['lose_hp'],
-        cause_death=cause_death
-    ))
-
-    # 5. Projectile State & Tag
-    world.add_component(bullet_entity, ProjectileState(
-        direction=direction,
-        max_speed=max_speed,
-        max_lifetime=lifetime, 
-        can_move=True,
-        explode_on_collision=(max_penetration_count <= 0) # 假設無穿透時碰撞即爆炸
-    ))
-    
-    world.add_component(bullet_entity, Tag(tag=tag))
-    
-    return bullet_entity
\ No newline at end of file
+
+    specs = (
+        # 1. Position & Movement
+        (Position, dict(x=start_pos[0], y=start_pos[1])),
+        (Velocity, dict(x=vel_x, y=vel_y, speed=max_speed)),
+
+        # 2. Renderable (使用 rect shape)
+        (Renderable, dict(
+            image=None, # 讓 RenderSystem 處理默認繪製或加載圖像
+            shape="rect",
+            w=w,
+            h=h,
+            color=(255, 255, 0), # 默認黃色
+            layer=1 
+        )),
+
+        # 3. Collider
+        (Collider, dict(
+            w=w, 
+            h=h, 
+            pass_wall=pass_wall,
+            destroy_on_collision=True,
+            collision_group="projectile" 
+        )),
+
+        # 4. Combat & Attack
+        (Combat, dict(
+            damage=damage,
+            can_attack=True,
+            atk_element=atk_element,
+            damage_to_element=damage_to_element,
+            max_penetration_count=max_penetration_count,
+            collision_cooldown=collision_cooldown,
+            buffs=buffs,
+            cause_death=cause_death
+        )),
+
+        # 5. Projectile State & Tag
+        (ProjectileState, dict(
+            direction=direction,
+            max_speed=max_speed,
+            max_lifetime=lifetime, 
+            can_move=True,
+            explode_on_collision=(max_penetration_count <= 0) # 假設無穿透時碰撞即爆炸
+        )),
+        (Tag, dict(tag=tag)),
+    )
+
+    # 6. 冷組件 (只在有設定時附加，見 bullet_component_types)
+    if explosion_range > 0:
+        specs += ((Explosion, dict(
+            range=explosion_range,
+            damage=explosion_damage,
+            element=explosion_element,
+            buffs=explosion_buffs,
+        )),)
+    if any(percentage_damage.values()):
+        specs += ((PercentageDamage, dict(
+            max_hp=percentage_damage['max_hp'],
+            current_hp=percentage_damage['current_hp'],
+            lose_hp=percentage_damage['lose_hp'],
+        )),)
+
+    if recycled is None:
+        return tuple(component_type(**values) for component_type, values in specs)
+    return tuple(reset_component(recycled[component_type], **values) for component_type, values in specs)
+
+def create_standard_bullet_entity(world: esper = esper, **kwargs) -> int:
+    """創建一個標準 ECS 子彈實體，取代 Bullet 類別的初始化。
+
+    參數與 standard_bullet_components 相同；優先重用回收池中的子彈，所有組件以一次 spawn 插入。
+    需要同時發射多顆子彈時，請改用 spawn_standard_bullets。
+    """
+    retired = esper.pop_retired(bullet_component_types(**kwargs))
+    if retired is None:
+        return world.spawn(*standard_bullet_components(**kwargs))
+
+    entity, components = retired
+    return world.respawn(entity, *standard_bullet_components(recycled=components, **kwargs))
+
+def spawn_standard_bullets(world: esper = esper, volley: Iterable[Dict[str, Any]] = ()) -> List[int]:
+    """一次發射多顆標準子彈 (每個 dict 為 standard_bullet_components 的參數)。
+
+    先重用回收池中的子彈，其餘以一次 spawn_many 插入。回傳的實體 ID 與 volley 的順序一一對應。
+    """
+    entities = []
+    fresh = []
+    fresh_indices = []
+    for kwargs in volley:
+        retired = esper.pop_retired(bullet_component_types(**kwargs))
+        if retired is None:
+            fresh_indices.append(len(entities))
+            entities.append(None)
+            fresh.append(standard_bullet_components(**kwargs))
+        else:
+            entity, components = retired
+            entities.append(world.respawn(entity, *standard_bullet_components(recycled=components, **kwargs)))
+
+    if fresh:
+        for index, entity in zip(fresh_indices, world.spawn_many(fresh)):
+            entities[index] = entity
+    return entities
@@ -9,7 +9,7 @@ from src.ecs.components import Tag, TimerComponent
 from src.buffs.element_buff import ELEMENTAL_BUFFS
 # 假設這是您的組件導入路徑
 from src.ecs.components import (
-    Position, Velocity, Combat, Renderable, Collider, 
+    Position, Velocity, Combat, Explosion, Renderable, Collider, 
     ProjectileState, ExpansionLifecycle, ExpansionRenderData
 )
 
@@ -44,8 +44,7 @@ def load_expansion_frames(outer_radius: float) -> List[pygame.Surface]:
 
 # ----------------- 實體工廠函數 -----------------
 
-def create_expanding_circle_bullet(
-    world: esper,
+def expanding_circle_bullet_components(
     x: float,
     y: float,
     direction: Tuple[float, float],
@@ -58,80 +57,85 @@ def create_expanding_circle_bullet(
     hide_time: float = 0.0,
     wait_time: float = 0.0,
     atk_element: str = "untyped",
-) -> int:
+) -> Tuple[object, ...]:
     """
-    創建一個 ECS 實體，作為 ExpandingCircleBullet。
-    將所有必要的數據組件附加到該實體上。
+    建立 ExpandingCircleBullet 所需的所有數據組件 (尚未加入 World)，
+    供 spawn / spawn_many 一次插入。
     """
-    bullet_entity = world.create_entity()
-
-    # 1. 基礎屬性 (Position, Velocity, Tag)
-    world.add_component(bullet_entity, Position(x=x, y=y))
     # 子彈在創建時就設定為全速移動
     vel_x = direction[0] * max_speed
     vel_y = direction[1] * max_speed
-    world.add_component(bullet_entity, Velocity(x=vel_x, y=vel_y, speed=max_speed))
-    world.add_component(bullet_entity, Tag(tag=tag))
 
+    def on_expire(entity: int):
+        """當計時器結束回調函數"""
+        esper.delete_entity(entity)
 
-    # 2. 視覺與碰撞 (Renderable, Collider)
-    # 圖像將由 RenderSystem 根據 ExpansionRenderData 動態生成或選擇幀
-    world.add_component(bullet_entity, Renderable(
-        image=None,  # 初始為 None，由 RenderSystem/ExpansionSystem 處理
-        shape="circle",
-        w=int(outer_radius * 2),
-        h=int(outer_radius * 2),
-        color=(255, 255, 255),
-        layer=2
-    ))
-    # Collider 的尺寸應與 RenderData 的 outer_radius 匹配
-    world.add_component(bullet_entity, Collider(
-        w=int(outer_radius * 2),
-        h=int(outer_radius * 2),
-        pass_wall=True,  # ExpandingCircleBullet 允許穿牆
-        collision_group="bullet"
-    ))
+    return (
+        # 1. 基礎屬性 (Position, Velocity, Tag)
+        Position(x=x, y=y),
+        Velocity(x=vel_x, y=vel_y, speed=max_speed),
+        Tag(tag=tag),
 
-    # 3. 戰鬥屬性 (Combat)
-    world.add_component(bullet_entity, Combat(
-        damage=0.0,  # 直接碰撞不造成傷害
-        can_attack=True,
-        explosion_range=outer_radius, # 爆炸範圍通常是其最終大小
-        explosion_damage=damage,
-        explosion_element=atk_element,
-        explosion_buffs=[ELEMENTAL_BUFFS.get(atk_element)] if atk_element in ELEMENTAL_BUFFS else [],
-        collision_cooldown=1.0, # 擴張子彈碰撞冷卻較長
-        max_penetration_count=-1, # -1 表示無限穿透 (直到擴張完成)
-    ))
+        # 2. 視覺與碰撞 (Renderable, Collider)
+        # 圖像將由 RenderSystem 根據 ExpansionRenderData 動態生成或選擇幀
+        Renderable(
+            image=None,  # 初始為 None，由 RenderSystem/ExpansionSystem 處理
+            shape="circle",
+            w=int(outer_radius * 2),
+            h=int(outer_radius * 2),
+            color=(255, 255, 255),
+            layer=2
+        ),
+        # Collider 的尺寸應與 RenderData 的 outer_radius 匹配
+        Collider(
+            w=int(outer_radius * 2),
+            h=int(outer_radius * 2),
+            pass_wall=True,  # ExpandingCircleBullet 允許穿牆
+            collision_group="bullet"
+        ),
 
-    # 4. 拋射物運行狀態 (ProjectileState)
-    world.add_component(bullet_entity, ProjectileState(
-        direction=direction,
-        max_speed=max_speed,
-        max_lifetime=lifetime,
-        explode_on_collision=True # 碰撞即銷毀並爆炸
-    ))
+        # 3. 戰鬥屬性 (Combat)
+        Combat(
+            damage=0.0,  # 直接碰撞不造成傷害
+            can_attack=True,
+            collision_cooldown=1.0, # 擴張子彈碰撞冷卻較長
+            max_penetration_count=-1, # -1 表示無限穿透 (直到擴張完成)
+        ),
+        Explosion(
+            range=outer_radius, # 爆炸範圍通常是其最終大小
+            damage=damage,
+            element=atk_element,
+            buffs=[ELEMENTAL_BUFFS.get(atk_element)] if atk_element in ELEMENTAL_BUFFS else [],
+        ),
 
-    # 5. 擴張生命週期 (ExpansionLifecycle)
-    world.add_component(bullet_entity, ExpansionLifecycle(
-        hide_time=hide_time,
-        wait_time=wait_time,
-    ))
+        # 4. 拋射物運行狀態 (ProjectileState)
+        ProjectileState(
+            direction=direction,
+            max_speed=max_speed,
+            max_lifetime=lifetime,
+            explode_on_collision=True # 碰撞即銷毀並爆炸
+        ),
 
-    # 6. 擴張渲染數據 (ExpansionRenderData)
-    # 載入動畫幀
-    frames = load_expansion_frames(outer_radius)
-    world.add_component(bullet_entity, ExpansionRenderData(
-        outer_radius=outer_radius,
-        expansion_duration=expansion_duration,
-        animation_frames=frames
-    ))
-    
-    
-    def on_expire(entity: int):
-        """當計時器結束回調函數"""
-        esper.delete_entity(entity)
-    world.add_component(bullet_entity, TimerComponent(duration=lifetime+1.0, on_expire=on_expire))
-    # 確保子彈在 lifetime 後被移除
+        # 5. 擴張生命週期 (ExpansionLifecycle)
+        ExpansionLifecycle(
+            hide_time=hide_time,
+            wait_time=wait_time,
+        ),
+
+        # 6. 擴張渲染數據 (ExpansionRenderData)
+        ExpansionRenderData(
+            outer_radius=outer_radius,
+            expansion_duration=expansion_duration,
+            animation_frames=load_expansion_frames(outer_radius)  # 載入動畫幀
+        ),
+
+        # 確保子彈在 lifetime 後被移除
+        TimerComponent(duration=lifetime+1.0, on_expire=on_expire, repeat=False),
+    )
 
-    return bullet_entity
\ No newline at end of file
+def create_expanding_circle_bullet(world: esper, **kwargs) -> int:
+    """
+    創建一個 ECS 實體，作為 ExpandingCircleBullet。
+    參數與 expanding_circle_bullet_components 相同，所有數據組件以一次 spawn 附加到該實體上。
+    """
+    return world.spawn(*expanding_circle_bullet_components(**kwargs))
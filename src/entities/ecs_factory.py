@@ -5,19 +5,21 @@
 import esper
 import pygame
 import math
-from typing import List, Dict, Optional, TYPE_CHECKING
-import random
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 # 類型檢查：假設 Game 類在 src.game 模組中
 if TYPE_CHECKING:
     from src.core.game import Game 
 
 # 假設 TILE_SIZE 在 src.config 模組中
 from src.core.config import TILE_SIZE 
+from src.core.rng import ai as ai_random
+from src.entities.sprites import sprite
 
 # 假設這些是您自定義的組件 (Components)
 from ..ecs.components import (
     Position, TimerComponent, Velocity, Renderable, Collider, Health, Defense, Combat, Buffs, AI, Tag, 
-    NPCInteractComponent, DungeonPortalComponent, PlayerComponent, TreasureStateComponent
+    NPCInteractComponent, DungeonPortalComponent, PlayerComponent, TreasureStateComponent,
+    reset_component
 )
 
 # 假設這些是您自定義的 AI 行為和行為樹節點
@@ -28,7 +30,8 @@ from ..ecs.ai import (
     FanAttackAction,
     RadialBurstAction, WaitAction, PatrolAction, DodgeAction, 
     SpecialAttackAction, MeleeAttackAction, RandomMoveAction, # 動作類
-    RefillActionList, PerformNextAction, Sequence, Selector, ConditionNode # 行為樹節點
+    RefillActionList, PerformNextAction, Sequence, Selector, ConditionNode, # 行為樹節點
+    Action,
 )
 
 # 【新增 Facade 類別的導入】
@@ -36,6 +39,7 @@ from ..ecs.ai import (
 from ..entities.npc.alchemy_pot_npc import AlchemyPotNPC
 from ..entities.npc.dungeon_portal_npc import DungeonPortalNPC
 from ..entities.npc.magic_crystal_npc import MagicCrystalNPC
+from ..entities.npc.win_npc import WinNPC
 
 
 def create_player_entity(
@@ -129,18 +133,10 @@ def create_player_entity(
     
     return player_entity
 
-def create_enemy1_entity(
-    world: esper, x: float = 0.0, y: float = 0.0, game: 'Game' = None, tag: str = "enemy",
-    base_max_hp: int = 100, max_speed: float = 2 * TILE_SIZE, element: str = "fire", 
-    defense: int = 10, damage: int = 5, w: int = TILE_SIZE // 2, h: int = TILE_SIZE // 2,
-) -> int:
-    """
-    創建一個 Enemy1 ECS 實體並附上所有組件。
-    """
-    # 1. 創建實體
-    enemy = world.create_entity()
-
-    # 2. 初始化動作和行為樹
+def build_enemy1_brain(
+    x: float = 0.0, y: float = 0.0, tag: str = "enemy", damage: int = 5, max_speed: float = 2 * TILE_SIZE,
+) -> Tuple[Selector, Dict[str, Action]]:
+    """建立 Enemy1 的動作表與行為樹，回傳 (behavior_tree, actions)。"""
     patrol_points = [(x + i * TILE_SIZE * 2, y) for i in range(-2, 3)]
     
     actions = {
@@ -172,9 +168,9 @@ def create_enemy1_entity(
         
         # Check for nearby player bullets
         bullet_nearby = False
-        for bullet in context.get_entities_with_tag("player"):
-            if bullet.tag != "player": continue
-            if math.hypot(bullet.x - context.x, bullet.y - context.y) < 3 * TILE_SIZE:
+        for bullet, (pos,) in context.get_entities_with_tag("player"):
+            if bullet == context.player.ecs_entity: continue
+            if math.hypot(pos.x - context.x, pos.y - context.y) < 3 * TILE_SIZE:
                 bullet_nearby = True
                 break
         
@@ -206,13 +202,31 @@ def create_enemy1_entity(
         perform_action_sequence,
         refill_node
     ])
+
+    return behavior_tree, actions
+
+
+def create_enemy1_entity(
+    world: esper, x: float = 0.0, y: float = 0.0, game: 'Game' = None, tag: str = "enemy",
+    base_max_hp: int = 100, max_speed: float = 2 * TILE_SIZE, element: str = "fire", 
+    defense: int = 10, damage: int = 5, w: int = TILE_SIZE // 2, h: int = TILE_SIZE // 2,
+) -> int:
+    """
+    創建一個 Enemy1 ECS 實體並附上所有組件。
+    """
+    # 1. 創建實體
+    enemy = world.create_entity()
+
+    # 2. 初始化動作和行為樹 (brain 記錄重建所需的參數，供快照載入時使用)
+    brain = ('enemy1', dict(x=x, y=y, tag=tag, damage=damage, max_speed=max_speed))
+    behavior_tree, actions = build_enemy1_brain(**brain[1])
     
     # 3. 附加組件
     
     # 幾何與運動
     world.add_component(enemy, Position(x=x, y=y))
     world.add_component(enemy, Velocity(speed=max_speed, x=0.0, y=0.0))
-    world.add_component(enemy, Collider(w=w, h=h))
+    world.add_component(enemy, Collider(w=w, h=h, collision_group="enemy"))
     
     # 健康與戰鬥
     world.add_component(enemy, Health(max_hp=base_max_hp, current_hp=base_max_hp))
@@ -221,10 +235,8 @@ def create_enemy1_entity(
     world.add_component(enemy, Buffs())
     world.add_component(enemy, Tag(tag=tag))
     
-    # 渲染
-    image = pygame.Surface((w, h))
-    image.fill((0, 255, 0)) # 綠色方塊
-    world.add_component(enemy, Renderable(image=image, layer=1, w=w, h=h))
+    # 渲染 (同尺寸的 Enemy1 共用一張綠色方塊)
+    world.add_component(enemy, Renderable(image=sprite('enemy1', w, h), layer=1, w=w, h=h))
     
     # AI
     world.add_component(enemy, AI(
@@ -232,6 +244,7 @@ def create_enemy1_entity(
         action_list=[],
         actions=actions,
         vision_radius=15,
+        brain=brain,
     ))
 
     return enemy
@@ -486,6 +499,20 @@ def create_dummy_entity(
 
     return npc_entity
 
+# 傷害數字的組件簽名。到期刪除的傷害數字實體會保留在 esper 的回收池中重複使用。
+DAMAGE_TEXT_COMPONENT_TYPES = (Position, Velocity, Renderable, TimerComponent)
+DAMAGE_TEXT_POOL_SIZE = 128
+esper.set_recycling(DAMAGE_TEXT_COMPONENT_TYPES, DAMAGE_TEXT_POOL_SIZE)
+
+_damage_text_font = None
+
+def _get_damage_text_font():
+    """傷害數字共用的字型 (首次使用時建立，避免每次都重新載入字型)。"""
+    global _damage_text_font
+    if _damage_text_font is None:
+        _damage_text_font = pygame.font.SysFont('Arial', 24)
+    return _damage_text_font
+
 def create_damage_text_entity(
     world: esper,
     x: float = 0.0,
@@ -494,48 +521,38 @@ def create_damage_text_entity(
     color: tuple = (255, 0, 0),
     duration: float = 1.0,
 ) -> int:
-    """創建一個顯示傷害數字的實體。"""
-    
-    damage_text_entity = world.create_entity()
-
-    # 1. 位置組件
-    world.add_component(damage_text_entity, Position(x=x, y=y))
-    world.add_component(damage_text_entity, Velocity(x=0.0, y=-30.0)) # 向上移動
-    # 2. 渲染組件
-    font = pygame.font.SysFont('Arial', 24)
-    text_surface = font.render(str(damage), True, color)
-    world.add_component(damage_text_entity, Renderable(
-        image=text_surface,
-        shape="text",
-        w=text_surface.get_width(),
-        h=text_surface.get_height(),
-        color=color,
-        layer=2 
-    ))
+    """創建一個顯示傷害數字的實體 (優先重用回收池中的實體，所有組件以一次 spawn 插入)。"""
+    
+    text_surface = _get_damage_text_font().render(str(damage), True, color)
+
+    specs = (
+        # 1. 位置組件
+        (Position, dict(x=x, y=y)),
+        (Velocity, dict(x=0.0, y=-30.0)), # 向上移動
+        # 2. 渲染組件
+        (Renderable, dict(
+            image=text_surface,
+            shape="text",
+            w=text_surface.get_width(),
+            h=text_surface.get_height(),
+            color=color,
+            layer=2 
+        )),
+        # 3. 壽命組件 (用於控制顯示時間，到期時移除自身)
+        (TimerComponent, dict(duration=duration, on_expire=world.delete_entity, repeat=False)),
+    )
 
-    # 3. 壽命組件 (用於控制顯示時間)
-    on_expire = lambda e_id: world.delete_entity(e_id)
-    world.add_component(damage_text_entity, TimerComponent(duration=duration, on_expire=on_expire))
+    retired = esper.pop_retired(DAMAGE_TEXT_COMPONENT_TYPES)
+    if retired is None:
+        return world.spawn(*(component_type(**values) for component_type, values in specs))
 
-    return damage_text_entity
+    entity, components = retired
+    return world.respawn(entity, *(reset_component(components[component_type], **values)
+                                   for component_type, values in specs))
 
-def create_boss_entity(
-    world: esper, x: float = 0.0, y: float = 0.0, game: 'Game' = None, 
-    boss_id: str = "boss_dark_king"
-) -> int:
-    from src.ecs.components import BossComponent
-    
-    # 1. 創建實體 (調整數值)
-    boss = create_enemy1_entity(
-        world, x, y, game, tag="enemy",
-        base_max_hp=6000, # 血量稍微增加，因為有人性化硬直
-        damage=45,
-        w=TILE_SIZE * 3, h=TILE_SIZE * 3,
-        defense=40,
-        max_speed=TILE_SIZE * 2.0 # 移動速度提升，但會經常停頓
-    )
-    
-    # 2. 定義 Boss 動作庫
+def build_boss_brain() -> Tuple[Selector, Dict[str, Action]]:
+    """建立 Boss 的動作表與行為樹，回傳 (behavior_tree, actions)。"""
+    # 定義 Boss 動作庫
     # 新增了 strafe (走位) 和 taunt (嘲諷)
     actions = {
         # --- 移動 ---
@@ -572,7 +589,7 @@ def create_boss_entity(
         dist = math.hypot(context.player.x - context.x, context.player.y - context.y)
         
         # 隨機因子：模擬人類的「心情」或「失誤」
-        rng = random.random()
+        rng = ai_random.random()
 
         # === Phase 3: 絕境/狂暴模式 (HP < 50%) ===
         # Boss 處於瀕死狀態，腎上腺素飆升。
@@ -662,20 +679,48 @@ def create_boss_entity(
         perform_action_sequence,
         refill_node
     ])
+
+    return behavior_tree, actions
+
+
+# AI.brain 的名稱 -> 建立 (behavior_tree, actions) 的函數。
+# 行為樹與動作中的閉包無法序列化，載入快照時以 AI.brain 重新建立 (見 src/core/snapshot.py)
+AI_BRAINS = {
+    'enemy1': build_enemy1_brain,
+    'boss': build_boss_brain,
+}
+
+
+def create_boss_entity(
+    world: esper, x: float = 0.0, y: float = 0.0, game: 'Game' = None, 
+    boss_id: str = "boss_dark_king"
+) -> int:
+    from src.ecs.components import BossComponent
+    
+    # 1. 創建實體 (調整數值)
+    boss = create_enemy1_entity(
+        world, x, y, game, tag="enemy",
+        base_max_hp=6000, # 血量稍微增加，因為有人性化硬直
+        damage=45,
+        w=TILE_SIZE * 3, h=TILE_SIZE * 3,
+        defense=40,
+        max_speed=TILE_SIZE * 2.0 # 移動速度提升，但會經常停頓
+    )
+    
+    # 2. Boss 動作庫與人性化決策 (見 build_boss_brain)
+    behavior_tree, actions = build_boss_brain()
     
     world.add_component(boss, AI(
         behavior_tree=behavior_tree,
         action_list=[],
         actions=actions,
         vision_radius=25,
+        brain=('boss', {}),
     ))
     world.add_component(boss, BossComponent(boss_name=boss_id))
     
-    # 視覺調整：將 Boss 渲染成紅色或加上光環 (若是純色塊)
-    image = pygame.Surface((TILE_SIZE * 3, TILE_SIZE * 3))
-    image.fill((150, 0, 0)) # 暗紅色
-    # 可以在中間畫個 "眼睛" 增加識別度
-    pygame.draw.rect(image, (255, 255, 0), (TILE_SIZE, TILE_SIZE, TILE_SIZE, TILE_SIZE))
+    # 視覺調整：將 Boss 渲染成暗紅色方塊，中間有黃色 "眼睛" (見 sprites._draw_boss)
+    image = sprite('boss', TILE_SIZE * 3, TILE_SIZE * 3)
     world.add_component(boss, Renderable(image=image, layer=2, w=TILE_SIZE*3, h=TILE_SIZE*3))
 
     return boss
@@ -716,15 +761,9 @@ def create_win_npc_entity(
     world.add_component(npc_entity, NPCInteractComponent(interaction_range=80.0))
     
     #借用 NPCInteraction 的邏輯 ， 來打開 WinMenu
-    
-    # 如果 WinMenu 已存在，我們可以讓它打開 WinMenu
     if game:
-        def open_win_menu():
-            print("Win NPC Interacted -> Opening Win Menu")
-            game.menu_manager.open_menu("win_menu") # 假設 MenuManager 有這個 key
-            
-        interact_comp = world.component_for_entity(npc_entity, NPCInteractComponent)
-        interact_comp.start_interaction = open_win_menu
+        # 這會調用 WinNPC.__init__，將 start_interaction 方法連結到 NPCInteractComponent 上
+        WinNPC(game, npc_entity)
 
     return npc_entity
 
@@ -4,10 +4,10 @@ from .basic_entity import BasicEntity
 from ..core.config import *
 import pygame
 import math
-import random
 import copy
 from src.utils.elements import WEAKTABLE, ELEMENTS
 from .damage_text import DamageText
+from src.core import rng
 
 # Base class for health and defense mechanics
 class HealthEntity(BasicEntity):
@@ -146,7 +146,7 @@ class HealthEntity(BasicEntity):
             return False, 0
             
         if self.dodge_rate > 0:
-            if random.random() < self.dodge_rate:
+            if rng.combat.random() < self.dodge_rate:
                 damage_text = DamageText((self.x, self.y), "Miss")
                 self.game.entity_manager.damage_text_group.add(damage_text)
                 return False, 0
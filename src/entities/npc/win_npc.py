@@ -0,0 +1,26 @@
+from .base_npc_facade import AbstractNPCFacade
+from src.core.log import channel
+
+log = channel("entity")
+
+
+class WinNPC(AbstractNPCFacade):
+    """
+    終點 NPC 門面 (Facade)。
+    交互後開啟勝利菜單 (WinMenu)。
+    """
+    def __init__(self, game, ecs_entity: int):
+        super().__init__(game, ecs_entity)
+
+        # 綁定交互邏輯 (沿用 NPCInteractComponent 預設的 tag)
+        interact_comp = self._get_interact_comp()
+        interact_comp.start_interaction = self.start_interaction
+
+    def start_interaction(self) -> None:
+        """開啟勝利菜單"""
+        log.info("Win NPC Interacted -> Opening Win Menu")
+        self.game.menu_manager.open_menu("win_menu")
+
+    def end_interaction(self) -> None:
+        """勝利菜單由 MenuManager 自行關閉"""
+        self._get_interact_comp().is_interacting = False
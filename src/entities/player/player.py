@@ -94,6 +94,7 @@ class Player:
             
         if len(comp.skill_chain[chain_idx]) < comp.max_skill_chain_length:
             comp.skill_chain[chain_idx].append(skill)
+            self.world.mark_changed(self.ecs_entity, PlayerComponent)
             return True
         # ... print statements ...
         return False
@@ -105,6 +106,7 @@ class Player:
         if 0 <= chain_idx < len(comp.skill_chain):
             comp.current_skill_chain_idx = chain_idx
             comp.current_skill_idx = 0
+            self.world.mark_changed(self.ecs_entity, PlayerComponent)
             # ... print statements ...
         # ... else print statements ...
 
@@ -116,6 +118,7 @@ class Player:
             current_chain = comp.skill_chain[comp.current_skill_chain_idx]
             if 0 <= index < len(current_chain):
                 comp.current_skill_idx = index
+                self.world.mark_changed(self.ecs_entity, PlayerComponent)
                 # ... print statements ...
             # ... else print statements ...
 
@@ -142,6 +145,7 @@ class Player:
         # 消耗能量 (直接修改 Component)
         comp.energy -= skill.energy_cost
         comp.energy = max(0.0, comp.energy) # 確保能量不為負
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
         # Auto-switch to next skill in chain
         current_chain = comp.skill_chain[comp.current_skill_chain_idx]
@@ -162,6 +166,7 @@ class Player:
         """Add a buff to the player. 假設有一個 Buffs 組件來管理 Buff 列表。"""
         buffs_comp = self._get_buffs_comp()
         buffs_comp.active_buffs.append(buff)
+        self.world.mark_changed(self.ecs_entity, Buffs)
         buff.on_apply(self)
     
     # --- Property 訪問器 (用於取代直接屬性訪問) ---
@@ -209,33 +214,44 @@ class Player:
     @max_energy.setter
     def max_energy(self, value: float) -> None:
         self._get_player_comp().max_energy = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     # --- Health / Shield Properties (Health Component) ---
     @property
     def current_hp(self) -> int: return self._get_health_comp().current_hp
     @current_hp.setter
-    def current_hp(self, value: int) -> None: self._get_health_comp().current_hp = value
+    def current_hp(self, value: int) -> None:
+        self._get_health_comp().current_hp = value
+        self.world.mark_changed(self.ecs_entity, Health)
     
     @property
     def max_hp(self) -> int: return self._get_health_comp().max_hp
     @max_hp.setter
-    def max_hp(self, value: int) -> None: self._get_health_comp().max_hp = value
+    def max_hp(self, value: int) -> None:
+        self._get_health_comp().max_hp = value
+        self.world.mark_changed(self.ecs_entity, Health)
     
     @property
     def base_max_hp(self) -> int: return self._get_health_comp().base_max_hp
     @base_max_hp.setter
-    def base_max_hp(self, value: int) -> None: self._get_health_comp().base_max_hp = value
+    def base_max_hp(self, value: int) -> None:
+        self._get_health_comp().base_max_hp = value
+        self.world.mark_changed(self.ecs_entity, Health)
 
     @property
     def max_shield(self) -> int: return self._get_health_comp().max_shield
     @max_shield.setter
-    def max_shield(self, value: int) -> None: self._get_health_comp().max_shield = value
+    def max_shield(self, value: int) -> None:
+        self._get_health_comp().max_shield = value
+        self.world.mark_changed(self.ecs_entity, Health)
     
     # --- Defense Properties (Defense Component) ---
     @property
     def defense(self) -> int: return self._get_defense_comp().defense
     @defense.setter
-    def defense(self, value: int) -> None: self._get_defense_comp().defense = value
+    def defense(self, value: int) -> None:
+        self._get_defense_comp().defense = value
+        self.world.mark_changed(self.ecs_entity, Defense)
     
     # --- Combat Properties (Combat Component) ---
     @property
@@ -252,46 +268,62 @@ class Player:
     @property
     def _base_max_speed(self) -> float: return self._get_player_comp().base_max_speed
     @_base_max_speed.setter
-    def _base_max_speed(self, value: float) -> None: self._get_player_comp().base_max_speed = value
+    def _base_max_speed(self, value: float) -> None:
+        self._get_player_comp().base_max_speed = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     # --- Energy Properties (PlayerComponent) ---
     @property
     def energy_regen_rate(self) -> float: return self._get_player_comp().energy_regen_rate
     @energy_regen_rate.setter
-    def energy_regen_rate(self, value: float) -> None: self._get_player_comp().energy_regen_rate = value
+    def energy_regen_rate(self, value: float) -> None:
+        self._get_player_comp().energy_regen_rate = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     @property
     def base_energy_regen_rate(self) -> float: return self._get_player_comp().base_energy_regen_rate
     @base_energy_regen_rate.setter
-    def base_energy_regen_rate(self, value: float) -> None: self._get_player_comp().base_energy_regen_rate = value
+    def base_energy_regen_rate(self, value: float) -> None:
+        self._get_player_comp().base_energy_regen_rate = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     # --- Element/Amplifier/Skill Properties (PlayerComponent) ---
     @property
     def elements(self) -> set: return self._get_player_comp().elements
     @elements.setter
-    def elements(self, value: set) -> None: self._get_player_comp().elements = value
+    def elements(self, value: set) -> None:
+        self._get_player_comp().elements = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     @property
     def amplifiers(self) -> Dict: return self._get_player_comp().amplifiers
     @amplifiers.setter
-    def amplifiers(self, value: Dict) -> None: self._get_player_comp().amplifiers = value
+    def amplifiers(self, value: Dict) -> None:
+        self._get_player_comp().amplifiers = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     @property
     def max_skill_chains(self) -> int: return self._get_player_comp().max_skill_chains
     @property
     def skill_chain(self) -> List: return self._get_player_comp().skill_chain
     @skill_chain.setter
-    def skill_chain(self, value: List) -> None: self._get_player_comp().skill_chain = value
+    def skill_chain(self, value: List) -> None:
+        self._get_player_comp().skill_chain = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     @property
     def current_skill_chain_idx(self) -> int: return self._get_player_comp().current_skill_chain_idx
     @current_skill_chain_idx.setter
-    def current_skill_chain_idx(self, value: int) -> None: self._get_player_comp().current_skill_chain_idx = value
+    def current_skill_chain_idx(self, value: int) -> None:
+        self._get_player_comp().current_skill_chain_idx = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
 
     @property
     def current_skill_idx(self) -> int: return self._get_player_comp().current_skill_idx
     @current_skill_idx.setter
-    def current_skill_idx(self, value: int) -> None: self._get_player_comp().current_skill_idx = value
+    def current_skill_idx(self, value: int) -> None:
+        self._get_player_comp().current_skill_idx = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     # 視野屬性 (兼容 RenderManager)
     @property
@@ -302,17 +334,23 @@ class Player:
     @property
     def mana(self) -> int: return self._get_player_comp().mana
     @mana.setter
-    def mana(self, value: int) -> None: self._get_player_comp().mana = value
+    def mana(self, value: int) -> None:
+        self._get_player_comp().mana = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     @property
     def current_shield(self) -> int: return self._get_player_comp().current_shield
     @current_shield.setter
-    def current_shield(self, value: int) -> None: self._get_player_comp().current_shield = value
+    def current_shield(self, value: int) -> None:
+        self._get_player_comp().current_shield = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     @property
     def max_shield(self) -> int: return self._get_player_comp().max_shield
     @max_shield.setter
-    def max_shield(self, value: int) -> None: self._get_player_comp().max_shield = value
+    def max_shield(self, value: int) -> None:
+        self._get_player_comp().max_shield = value
+        self.world.mark_changed(self.ecs_entity, PlayerComponent)
     
     @property
     def displacement(self) -> Tuple[int, int]:
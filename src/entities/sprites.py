@@ -0,0 +1,50 @@
+# src/entities/sprites.py
+"""
+程式繪製的精靈圖 (sprite)
+SPRITES[名稱](w, h) 繪製一張 Surface；sprite() 依 (名稱, 寬, 高) 快取，同款實體共用同一個 Surface
+(Renderable.image 只會被 blit，不會就地修改)。
+世界快照對這些 Surface 只記錄鍵值 (sprite_key)，載入時以 sprite() 重新取得，不寫入像素。
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+import pygame
+
+SpriteKey = Tuple[str, int, int]  # (名稱, 寬, 高)
+
+
+def _draw_enemy1(w: int, h: int) -> pygame.Surface:
+    image = pygame.Surface((w, h))
+    image.fill((0, 255, 0))  # 綠色方塊
+    return image
+
+
+def _draw_boss(w: int, h: int) -> pygame.Surface:
+    image = pygame.Surface((w, h))
+    image.fill((150, 0, 0))  # 暗紅色
+    # 中間畫個 "眼睛" 增加識別度
+    pygame.draw.rect(image, (255, 255, 0), (w // 3, h // 3, w // 3, h // 3))
+    return image
+
+
+SPRITES: Dict[str, Callable[[int, int], pygame.Surface]] = {
+    'enemy1': _draw_enemy1,
+    'boss': _draw_boss,
+}
+
+_cache: Dict[SpriteKey, pygame.Surface] = {}
+_keys: Dict[int, SpriteKey] = {}  # id(Surface) -> 鍵值 (快取中的 Surface 不會被回收，id 不會重複)
+
+
+def sprite(name: str, w: int, h: int) -> pygame.Surface:
+    """名稱與尺寸對應的共用 Surface (第一次取得時繪製)。"""
+    key = (name, w, h)
+    image = _cache.get(key)
+    if image is None:
+        image = _cache[key] = SPRITES[name](w, h)
+        _keys[id(image)] = key
+    return image
+
+
+def sprite_key(image: pygame.Surface) -> Optional[SpriteKey]:
+    """由 sprite() 取得的 Surface 的鍵值；其他 Surface 回傳 None。"""
+    return _keys.get(id(image))
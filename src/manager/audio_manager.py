@@ -1,5 +1,9 @@
 # src/audio_manager.py
 import pygame
+from src.core.log import channel
+
+log = channel("audio")
+
 
 class AudioManager:
     def __init__(self, game: 'Game'):
@@ -9,7 +13,10 @@ class AudioManager:
             game: 遊戲主類的實例，用於與其他模組交互。
         """
         self.game = game  # 保存遊戲實例引用
-        pygame.mixer.init()  # 初始化 Pygame 音效模組
+        # 無視窗模式 (headless) 下不初始化混音器，所有載入與播放都是 no-op
+        self.enabled = not getattr(game, 'headless', False)
+        if self.enabled:
+            pygame.mixer.init()  # 初始化 Pygame 音效模組
         self.background_music = None  # 用於儲存背景音樂的變數，初始為空
         self.sound_effects = {}  # 用於儲存音效的字典，鍵為音效名稱，值為音效對象
         self.load_sound_effect("skill_activate", "src/asserts/sounds/skill.wav")  # 預設載入技能啟動音效
@@ -23,10 +30,12 @@ class AudioManager:
         Raises:
             Exception: 如果載入音樂失敗，會捕獲並打印錯誤信息。
         """
+        if not self.enabled:
+            return
         try:
             self.background_music = pygame.mixer.Sound(file_path)  # 載入背景音樂
         except Exception as e:
-            print(f"錯誤：無法載入背景音樂 {file_path}，原因：{e}")
+            log.error("錯誤：無法載入背景音樂 %s，原因：%s", file_path, e)
 
     def play_background_music(self) -> None:
         """播放背景音樂，循環播放。
@@ -54,10 +63,12 @@ class AudioManager:
         Raises:
             Exception: 如果載入音效失敗，會捕獲並打印錯誤信息。
         """
+        if not self.enabled:
+            return
         try:
             self.sound_effects[name] = pygame.mixer.Sound(file_path)  # 載入音效並存入字典
         except Exception as e:
-            print(f"錯誤：無法載入音效 {name}，路徑：{file_path}，原因：{e}")
+            log.error("錯誤：無法載入音效 %s，路徑：%s，原因：%s", name, file_path, e)
 
     def play_sound_effect(self, name: str) -> None:
         """播放指定名稱的音效。
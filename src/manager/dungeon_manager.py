@@ -3,6 +3,11 @@ from typing import Tuple
 from src.dungeon.dungeon import Dungeon
 from src.dungeon.room import Room
 from src.core.config import TILE_SIZE
+from src.core.log import channel
+from src.core import rng
+
+log = channel("dungeon")
+
 
 class DungeonManager:
     def __init__(self, game: 'Game'):
@@ -28,15 +33,15 @@ class DungeonManager:
         try:
             path = get_project_path("dungeon", "config", "dungeon_flow.json")
             if not os.path.exists(path):
-                print(f"DungeonManager: Config file not found at {path}")
+                log.warning("DungeonManager: Config file not found at %s", path)
                 return {}
                 
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                print(f"DungeonManager: Loaded dungeon flow config.")
+                log.info("DungeonManager: Loaded dungeon flow config.")
                 return data
         except Exception as e:
-            print(f"DungeonManager: Failed to load dungeon flow: {e}")
+            log.error("DungeonManager: Failed to load dungeon flow: %s", e)
             return {}
 
     def initialize_dungeon(self, dungeon_id: int) -> None:
@@ -45,7 +50,7 @@ class DungeonManager:
         dungeon_data = self.dungeon_flow.get("dungeons", {}).get(str(dungeon_id))
         
         if dungeon_data:
-            print(f"DungeonManager: Initializing Dungeon {dungeon_id} ({dungeon_data.get('name')})")
+            log.info("DungeonManager: Initializing Dungeon %s (%s)", dungeon_id, dungeon_data.get('name'))
             self.dungeon.reset()  # 重置地牢狀態
             # 應用配置到 DungeonConfig
             config_data = dungeon_data.get("config", {})
@@ -64,9 +69,10 @@ class DungeonManager:
             # 儲存配置供 EntityManager 使用 (Portal 數據)
             self.current_dungeon_config = dungeon_data
         else:
-            print(f"DungeonManager: No config found for Dungeon ID {dungeon_id}, using defaults.")
+            log.warning("DungeonManager: No config found for Dungeon ID %s, using defaults.", dungeon_id)
             self.current_dungeon_config = None
 
+        rng.reseed_generation()  # 生成器使用 random 模組：由 dungeon 串流決定種子，重播時產生相同的地牢
         self.dungeon.initialize_dungeon(dungeon_id)
         self.current_room_id = 1
     
@@ -89,7 +95,7 @@ class DungeonManager:
                 "available_dungeons": lobby_data.get("portal_npc", {}).get("available_dungeons", [])
             }
         }
-        print(f"DungeonManager: Initializing Lobby with config: {self.current_dungeon_config}")
+        log.info("DungeonManager: Initializing Lobby with config: %s", self.current_dungeon_config)
 
         self.dungeon.initialize_lobby()
         self.current_room_id = 0  # 將當前房間設置為大廳
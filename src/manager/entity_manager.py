@@ -3,7 +3,6 @@
 from typing import List, Tuple, Dict, Optional
 import esper
 import pygame
-import random
 
 # 引入 ECS 實體工廠函數 (假設這些工廠函數已經在 ecs_factory.py 中定義)
 from src.entities.ecs_factory import (
@@ -14,8 +13,14 @@ from src.entities.ecs_factory import (
 # 引入 Player Facade (假設這是玩家實體的外部接口)
 from src.entities.player.player import Player 
 # 引入 ECS 組件 (用於清理和位置操作)
-from src.ecs.components import Position, NPCInteractComponent, PlayerComponent
-from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE
+from src.ecs.components import Position, NPCInteractComponent, PlayerComponent, Buffs, Health
+from src.ecs.modifiers import modifier_vector
+from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, LOBBY_WORLD, DUNGEON_WORLD
+from src.core.log import channel
+from src.core import rng
+
+log = channel("entity")
+
 
 class EntityManager:
     """
@@ -29,6 +34,9 @@ class EntityManager:
         self.world: esper = esper 
         # 玩家 Facade，用於外部系統調用 (如 storage_manager.apply_all_to_player())
         self.player: Optional['Player'] = None 
+        # 常駐大廳的快取：玩家出生點與小地圖/迷霧狀態 (大廳實體第一次生成後設定)
+        self.lobby_spawn: Optional[Tuple[float, float]] = None
+        self.lobby_map_state: Optional[tuple] = None
         
         # 移除 Pygame sprite groups，ECS 通過實體 ID 管理
         # self.entity_group = pygame.sprite.Group() 
@@ -53,8 +61,43 @@ class EntityManager:
 
     # --- ECS 初始化與生成 ---
     
+    def enter_world(self, name: str, clear: bool = False) -> bool:
+        """
+        切換到名為 name 的 esper World，玩家實體 (若存在) 隨之遷移。
+        World 不存在時會建立並註冊 Game 的系統；clear=True 時先丟棄該 World 的舊實體。
+        回傳切換前該 World 是否已經存在 (常駐)。
+        """
+        resident = name in self.world.list_worlds()
+        if name == self.world.current_world:
+            return resident
+        if clear and resident:
+            self.world.delete_world(name)
+            resident = False
+
+        if self.player:
+            # 實體 ID 各 World 獨立分配，遷移後玩家會取得新 ID，組件實例不變
+            self.player.ecs_entity = self.world.move_entity(self.player.ecs_entity, name)
+        self.world.switch_world(name)
+        if not resident:
+            for processor in self.game.processors:
+                self.world.add_processor(processor, processor.priority)
+        # 另一個 World 的實體 ID 可能重疊，重新擷取繪製內插的起點
+        self.game.render_system.capture()
+        log.info("EntityManager: 切換至 World '%s'，%s", name, '常駐' if resident else '新建')
+        return resident
+
     def initialize_lobby_entities(self, room) -> None:
-        """初始化大廳房間的 ECS 實體，使用工廠函數生成。"""
+        """
+        初始化大廳房間的 ECS 實體，使用工廠函數生成。
+        大廳實體只在第一次進入時生成並常駐於 LOBBY_WORLD；之後回到大廳只切換 World、
+        重置玩家並還原小地圖與迷霧。
+        """
+        if self.enter_world(LOBBY_WORLD) and self.lobby_spawn is not None:
+            self.refresh_player(*self.lobby_spawn)
+            self.game.render_manager.restore_map_state(self.lobby_map_state)
+            log.info("EntityManager: 回到常駐大廳，沿用既有實體。")
+            return
+
         self.clear_entities() 
         
         spawn_map: Dict[str, List[str]] = {
@@ -76,7 +119,7 @@ class EntityManager:
         if player_tiles:
             player_tile = player_tiles[0] 
         elif fallback_tiles:
-            player_tile = random.choice(fallback_tiles)
+            player_tile = rng.spawn.choice(fallback_tiles)
         
         if player_tile:
             player_x, player_y = self.tile_to_pixel(*player_tile)
@@ -90,10 +133,10 @@ class EntityManager:
             self.player = Player(self.game, player_ecs_id)
             self.refresh_player(x=player_x, y=player_y)
             self.game.storage_manager.apply_all_to_player() 
-            print(f"EntityManager: 初始化玩家實體 ID: {player_ecs_id}，像素座標 ({player_x}, {player_y})")
+            log.info("EntityManager: 初始化玩家實體 ID: %s，像素座標 (%s, %s)", player_ecs_id, player_x, player_y)
         else:
             self.refresh_player(x=player_x, y=player_y)
-            print("EntityManager: 玩家實體已存在，跳過創建。")
+            log.info("EntityManager: 玩家實體已存在，跳過創建。")
         
         # self.game.storage_manager.apply_all_to_player() 
             
@@ -115,7 +158,7 @@ class EntityManager:
             elif fallback_tiles:
                 available_tiles = [t for t in fallback_tiles if t not in used_tiles]
                 if available_tiles:
-                    npc_tile = random.choice(available_tiles)
+                    npc_tile = rng.spawn.choice(available_tiles)
             
             if npc_tile:
                 npc_x, npc_y = self.tile_to_pixel(*npc_tile)
@@ -161,24 +204,30 @@ class EntityManager:
                     npc_entity_id = factory_func(self.world, x=npc_x, y=npc_y,game=self.game)
 
                 used_tiles.add(npc_tile)
-                print(f"EntityManager: 初始化 {npc_key} 實體 ID: {npc_entity_id}")
+                log.debug("EntityManager: 初始化 %s 實體 ID: %s", npc_key, npc_entity_id)
             else:
-                print(f"EntityManager: 無有效瓦片可供 {npc_key}，跳過")
+                log.debug("EntityManager: 無有效瓦片可供 %s，跳過", npc_key)
 
         # 重置小地圖和迷霧 (與 initialize_dungeon_entities 保持一致)
         self.game.render_manager.reset_minimap()
         self.game.render_manager.reset_fog()
+        self.lobby_spawn = (player_x, player_y)
+        self.lobby_map_state = self.game.render_manager.save_map_state()
 
-        print(f"EntityManager: 總共創建了 {len(self.world._entities)} 個實體。")
+        log.info("EntityManager: 總共創建了 %s 個實體。", len(self.world._entities))
 
 
     def initialize_dungeon_entities(self) -> None:
         """初始化地牢房間的 ECS 實體，使用工廠函數生成並重定位玩家。"""
-        self.clear_entities() 
+        if self.world.current_world == DUNGEON_WORLD:
+            self.clear_entities() # 地牢之間的傳送：保留玩家，清除其餘實體
+        else:
+            # 從大廳進入：大廳實體留在 LOBBY_WORLD，地牢 World 重新開始
+            self.enter_world(DUNGEON_WORLD, clear=True)
         dungeon = self.game.dungeon_manager.dungeon
         assert dungeon is not None, "EntityManager: Dungeon 未初始化，無法生成實體。"
         assert dungeon.dungeon_tiles is not None, "EntityManager: Dungeon 瓦片數據缺失，無法生成實體。"
-        print("EntityManager: 開始初始化地牢實體...")
+        log.info("EntityManager: 開始初始化地牢實體...")
         for y in range(int(dungeon.grid_height)):
             for x in range(int(dungeon.grid_width)):
                 tile_type = dungeon.dungeon_tiles[y][x]
@@ -189,12 +238,12 @@ class EntityManager:
                         # 移動玩家實體的位置組件 (使用 Facade)
                         pos_comp = self.world.component_for_entity(self.player.ecs_entity, Position)
                         pos_comp.x, pos_comp.y = entity_x, entity_y
-                        print(f"EntityManager: 在瓦片 ({x}, {y}) 重定位玩家，像素座標 ({entity_x}, {entity_y}), 實體ID: {self.player.ecs_entity}")
+                        log.debug("EntityManager: 在瓦片 (%s, %s) 重定位玩家，像素座標 (%s, %s), 實體ID: %s", x, y, entity_x, entity_y, self.player.ecs_entity)
                     else:
                         # 創建新玩家 (防禦性編程)
                         player_ecs_id = create_player_entity(self.world, x=entity_x, y=entity_y) 
                         self.player = Player(self.game, player_ecs_id)
-                        print(f"EntityManager: 創建新玩家實體 ID: {player_ecs_id}，像素座標 ({entity_x}, {entity_y})")
+                        log.info("EntityManager: 創建新玩家實體 ID: %s，像素座標 (%s, %s)", player_ecs_id, entity_x, entity_y)
                         self.game.storage_manager.apply_all_to_player() 
                         
                     self.game.render_manager.camera_offset = [entity_x - SCREEN_WIDTH // 2, entity_y - SCREEN_HEIGHT // 2] 
@@ -205,7 +254,7 @@ class EntityManager:
                     spawn_table = current_config.get("spawn_table", {"enemy_slime": 1.0}) if current_config else {"enemy_slime": 1.0}
                     
                     if spawn_table:
-                        monster_id = random.choices(list(spawn_table.keys()), weights=list(spawn_table.values()), k=1)[0]
+                        monster_id = rng.spawn.choices(list(spawn_table.keys()), weights=list(spawn_table.values()), k=1)[0]
                     else:
                         monster_id = "enemy_slime"
 
@@ -217,7 +266,7 @@ class EntityManager:
                         enemy_id = create_enemy1_entity(self.world, x=entity_x, y=entity_y, game=self.game)
                 elif tile_type == 'Reward_spawn':
                     treasure_id = create_treasure_entity(self.world, x=entity_x, y=entity_y, game=self.game)
-                    print(f"EntityManager: Spawning Treasure at ({x}, {y})")
+                    log.debug("EntityManager: Spawning Treasure at (%s, %s)", x, y)
                 
                 elif tile_type == 'Boss_spawn':
                     current_config = self.game.dungeon_manager.current_dungeon_config
@@ -225,14 +274,14 @@ class EntityManager:
                     boss_id = special_rooms.get("boss_room", {}).get("boss_id", "boss_dark_king")
                     
                     create_boss_entity(self.world, x=entity_x, y=entity_y, game=self.game, boss_id=boss_id)
-                    print(f"EntityManager: Spawning BOSS {boss_id} at ({x}, {y})")
+                    log.debug("EntityManager: Spawning BOSS %s at (%s, %s)", boss_id, x, y)
 
                 elif tile_type == 'Final_NPC_spawn':
                     create_win_npc_entity(self.world, x=entity_x, y=entity_y, game=self.game)
-                    print(f"EntityManager: Spawning Final NPC at ({x}, {y})")
+                    log.debug("EntityManager: Spawning Final NPC at (%s, %s)", x, y)
                 elif tile_type == 'NPC_spawn':
                     create_trader_entity(self.world, x=entity_x, y=entity_y, game=self.game)
-                    print(f"EntityManager: Spawning Trader NPC at ({x}, {y})")    
+                    log.debug("EntityManager: Spawning Trader NPC at (%s, %s)", x, y)    
                 elif tile_type == 'End_room_portal':
                     # 獲取當前地牢配置的傳送門數據
                     dungeon_config = self.game.dungeon_manager.current_dungeon_config
@@ -255,7 +304,7 @@ class EntityManager:
                         available_dungeons=available_dungeons,
                         game=self.game
                     )
-                    print(f"EntityManager: 創建地牢傳送門實體於瓦片 ({x}, {y})，像素座標 ({entity_x}, {entity_y}), 實體ID: {npc_id}")
+                    log.debug("EntityManager: 創建地牢傳送門實體於瓦片 (%s, %s)，像素座標 (%s, %s), 實體ID: %s", x, y, entity_x, entity_y, npc_id)
                         
                 
 
@@ -299,7 +348,7 @@ class EntityManager:
         # 注意: 投射物和傷害文字現在也應通過它們的 ECS ID 被刪除
         # 假設它們已包含在上面的 world._entities 列表中
         
-        print(f"EntityManager: 已清除 {len(entities_to_delete)} 個非玩家實體。")
+        log.info("EntityManager: 已清除 %s 個非玩家實體。", len(entities_to_delete))
     
     def get_interactable_entities(self) -> List[Tuple[int, Position, 'NPCInteractComponent']]:
         """
@@ -321,7 +370,7 @@ class EntityManager:
                 player_comp = self.world.component_for_entity(self.player.ecs_entity, PlayerComponent)
                 return player_comp
             except KeyError:
-                print("EntityManager: 玩家實體缺少 Position 組件。")
+                log.warning("EntityManager: 玩家實體缺少 Position 組件。")
                 return None
         return None
     
@@ -337,12 +386,14 @@ class EntityManager:
         """
         buff_comp = self.player._get_buffs_comp()
         buff_comp.active_buffs.clear()
-        buff_comp.modifiers.clear()
+        buff_comp.modifiers = modifier_vector()
         health_comp = self.player._get_health_comp()
         health_comp.max_hp = health_comp.base_max_hp
         health_comp.current_hp = health_comp.max_hp
+        self.world.mark_changed(self.player.ecs_entity, Buffs)
+        self.world.mark_changed(self.player.ecs_entity, Health)
         pos_comp = self.player._get_position_comp()
         pos_comp.x = x
         pos_comp.y = y
-        print("EntityManager: 玩家數值已刷新至最大值。")
+        log.info("EntityManager: 玩家數值已刷新至最大值。")
         
\ No newline at end of file
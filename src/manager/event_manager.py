@@ -8,12 +8,16 @@ from src.menu.menu_config import (
     BasicAction,
     MenuNavigation,
 )
+from src.core.log import channel
+
 # --- 為了 ECS 查詢兼容性，假設需要導入 ECS 組件 (例如 Position, Interactable) ---
 # 實際部署時，請確保這些組件已正確導入
 # from src.ecs.components import Position
 # from src.ecs.components import Interactable
 # ----------------------------------------------------------------------------------------
 
+log = channel("event")
+
 
 class EventManager:
     def __init__(self, game: 'Game'):
@@ -42,7 +46,7 @@ class EventManager:
         """
         # 檢查是否有激活的菜單（使用新的列表模式）
         if self.game.menu_manager.active_menus:
-            print(f"EventManager: Passing event {event.type} to MenuManager due to active menus")
+            log.debug("EventManager: Passing event %s to MenuManager due to active menus", event.type)
             self._handle_menu_event(event)
         else:
             self._handle_playing_event(event)
@@ -65,28 +69,28 @@ class EventManager:
         action = self.game.menu_manager.handle_event(event)
         return
         if action:
-            print(f"EventManager: Received action {action} from menu")
+            log.info("EventManager: Received action %s from menu", action)
             if action == "enter_lobby":
                 self.game.start_game()  # Enter lobby
                 self.state = "lobby"
-                print("EventManager: Entered lobby")
+                log.info("EventManager: Entered lobby")
             elif action == "show_setting":
-                print("EventManager: Showing settings menu (not implemented)")
+                log.info("EventManager: Showing settings menu (not implemented)")
                 # TODO: Implement settings menu logic
             elif action == "exit":
                 pygame.event.post(pygame.event.Event(pygame.QUIT))  # Exit game
-                print("EventManager: Exiting game")
+                log.info("EventManager: Exiting game")
             elif action == "back_to_lobby":
                 self.state = "lobby"
                 # 關閉所有菜單
                 self.game.menu_manager.close_all_menus()
-                print("EventManager: Returned to lobby")
+                log.info("EventManager: Returned to lobby")
             elif action == "close":
                 # 關閉最後一個菜單
                 current_menu = self.game.menu_manager.get_current_menu()
                 if current_menu:
                     self.game.menu_manager.close_menu(current_menu)
-                print("EventManager: Closed menu")
+                log.info("EventManager: Closed menu")
             elif action.startswith("edit_chain_"):
                 # 【修正點 1】: 處理編輯技能鏈的動作，切換到技能選擇狀態
                 try:
@@ -99,11 +103,11 @@ class EventManager:
                         self.state = "skill_selection" # 切換到技能選擇狀態
                         self.game.hide_menu('skill_chain_menu') # 隱藏技能鏈選單
                         self.game.show_menu('skill_selection_menu', chain_idx=chain_idx) # 顯示技能選擇選單
-                        print(f"EventManager: Entering skill selection for chain index {chain_idx}")
+                        log.info("EventManager: Entering skill selection for chain index %s", chain_idx)
                     else:
-                        print(f"EventManager: Invalid skill chain index: {chain_idx} or player not available.")
+                        log.warning("EventManager: Invalid skill chain index: %s or player not available.", chain_idx)
                 except (ValueError, IndexError, AttributeError) as e:
-                    print(f"EventManager: Failed to process action '{action}'. Error: {e}")
+                    log.error("EventManager: Failed to process action '%s'. Error: %s", action, e)
             elif action == 'RETURN_TO_GAME_STATE':
                 self.state = 'playing'
             elif action == BasicAction.EXIT_MENU:
@@ -232,37 +236,41 @@ class EventManager:
                     self.game.menu_manager.open_menu(MenuNavigation.SKILL_CHAIN_MENU)  # Open skill chain menu if no NPC
             elif event.key == pygame.K_ESCAPE:
                 self.game.menu_manager.open_menu(MenuNavigation.PAUSE_MENU)  # Open pause menu
+            elif event.key == pygame.K_F5:
+                self.game.storage_manager.quick_save()  # Quick save the current floor
+            elif event.key == pygame.K_F9:
+                self.game.storage_manager.quick_load()  # Resume the quick-saved floor
             elif event.key in range(pygame.K_1, pygame.K_9 + 1):
                 chain_idx = event.key - pygame.K_1  # 1-9 keys map to chain_idx 0-8
                 self.game.entity_manager.player.switch_skill_chain(chain_idx)
-                print(f"EventManager: Playing - Switched skill chain to {chain_idx}")          
+                log.debug("EventManager: Playing - Switched skill chain to %s", chain_idx)          
             elif event.key == pygame.K_w:
                 current_disp = self.game.entity_manager.player.displacement
                 self.game.entity_manager.player.displacement = (current_disp[0], -1)  # Move up
-                print(f"EventManager: Playing - Set displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Set displacement to %s", self.game.entity_manager.player.displacement)
             elif event.key == pygame.K_s:
                 current_disp = self.game.entity_manager.player.displacement
                 self.game.entity_manager.player.displacement = (current_disp[0], 1)  # Move down
-                print(f"EventManager: Playing - Set displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Set displacement to %s", self.game.entity_manager.player.displacement)
             elif event.key == pygame.K_a:
                 current_disp = self.game.entity_manager.player.displacement
                 self.game.entity_manager.player.displacement = (-1, current_disp[1])  # Move left
-                print(f"EventManager: Playing - Set displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Set displacement to %s", self.game.entity_manager.player.displacement)
             elif event.key == pygame.K_d:
                 current_disp = self.game.entity_manager.player.displacement
                 self.game.entity_manager.player.displacement = (1, current_disp[1])  # Move right
-                print(f"EventManager: Playing - Set displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Set displacement to %s", self.game.entity_manager.player.displacement)
         elif event.type == pygame.KEYUP:
             current_disp = self.game.entity_manager.player.displacement
             if event.key in (pygame.K_w, pygame.K_s):
                 self.game.entity_manager.player.displacement = (current_disp[0], 0)  # Reset vertical displacement
-                print(f"EventManager: Playing - Reset vertical displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Reset vertical displacement to %s", self.game.entity_manager.player.displacement)
             elif event.key in (pygame.K_a, pygame.K_d):
                 self.game.entity_manager.player.displacement = (0, current_disp[1])  # Reset horizontal displacement
-                print(f"EventManager: Playing - Reset horizontal displacement to {self.game.entity_manager.player.displacement}")
+                log.debug("EventManager: Playing - Reset horizontal displacement to %s", self.game.entity_manager.player.displacement)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1: 
-                mouse_pos = pygame.mouse.get_pos()  # Get mouse position
+                mouse_pos = self.game.input.get_mouse_pos()  # Get mouse position
                 target_pos = (mouse_pos[0] + self.game.render_manager.camera_offset[0], 
                               mouse_pos[1] + self.game.render_manager.camera_offset[1])  # Calculate target position
                 dx = target_pos[0] - (self.game.entity_manager.player.x + self.game.entity_manager.player.w / 2)
@@ -271,7 +279,7 @@ class EventManager:
                 direction = (dx / magnitude, dy / magnitude) if magnitude > 0 else (0, 0)  # Calculate direction vector
                 self.game.entity_manager.player.activate_skill(direction, self.game.current_time, target_pos)  # Activate skill
                 self.game.audio_manager.play_sound_effect("skill_activate")  # Play skill sound effect
-                print("EventManager: Playing - Activated skill")
+                log.debug("EventManager: Playing - Activated skill")
             elif event.button == 2:
                 pass
             elif event.button == 3:
@@ -280,12 +288,12 @@ class EventManager:
                 current_idx = self.game.entity_manager.player.current_skill_chain_idx
                 next_idx = (current_idx + 1) % self.game.entity_manager.player.max_skill_chains
                 self.game.entity_manager.player.switch_skill_chain(next_idx)
-                print(f"EventManager: Playing - Switched to next skill chain {next_idx}")
+                log.debug("EventManager: Playing - Switched to next skill chain %s", next_idx)
             elif event.button == 5:  # Mouse wheel down: switch to previous skill chain
                 current_idx = self.game.entity_manager.player.current_skill_chain_idx
                 prev_idx = (current_idx - 1) % self.game.entity_manager.player.max_skill_chains
                 self.game.entity_manager.player.switch_skill_chain(prev_idx)
-                print(f"EventManager: Playing - Switched to previous skill chain {prev_idx}")
+                log.debug("EventManager: Playing - Switched to previous skill chain %s", prev_idx)
 
     def _handle_interaction(self) -> bool:
         """Handle interaction with the nearest NPC.
@@ -337,12 +345,12 @@ class EventManager:
             if nearest_npc_id:
                 # 觸發互動，假設 Interactable 組件包含 start_interaction() 方法
                 nearest_npc_comp.start_interaction() 
-                print(f"EventManager: Interacting with {nearest_npc_tag}, Entity ID: {nearest_npc_id}")
+                log.info("EventManager: Interacting with %s, Entity ID: %s", nearest_npc_tag, nearest_npc_id)
                 return True
         else:
             # 如果沒有抽象化的方法，我們無法安全地進行 ECS 查詢，
             # 因此我們將輸出錯誤訊息，並保持不互動
-            print("EventManager: ECS query helper not found. Cannot perform interaction check.")
+            log.warning("EventManager: ECS query helper not found. Cannot perform interaction check.")
             return False
         # 【修正點 2】: 移除這裡冗餘的菜單開啟邏輯。
         # self.game.show_menu('skill_chain_menu') 
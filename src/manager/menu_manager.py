@@ -28,6 +28,11 @@ from src.menu.menus.death_menu import DeathMenu
 from src.menu.menus.trader_menu import TraderMenu
 from src.menu.menus.treasure_menu import TreasureMenu
 from src.menu.menus.pause_menu import PauseMenu
+from src.core.log import channel
+
+log = channel("menu")
+
+
 class MenuManager:
     def __init__(self, game):
         """初始化菜單管理器，負責管理遊戲中的各個菜單。
@@ -51,15 +56,15 @@ class MenuManager:
         """
         if menu_name in self.menus and self.menus[menu_name] is not None:
             if update:
-                print(f"MenuManager: 菜單 {menu_name} 已存在，正在更新實例。")
+                log.debug("MenuManager: 菜單 %s 已存在，正在更新實例。", menu_name)
                 self.menus[menu_name] = menu
             else:
-                print(f"MenuManager: 菜單 {menu_name} 已存在，且未強制更新 ，因此無法重複註冊")
+                log.warning("MenuManager: 菜單 %s 已存在，且未強制更新 ，因此無法重複註冊", menu_name)
             return
         self.menus[menu_name] = menu
         if menu is not None:
             menu.activate(False)  # 設置菜單為非激活狀態
-        print(f"MenuManager: 已註冊菜單 {menu_name}，實例：{menu.__class__.__name__ if menu else 'None'}")
+        log.debug("MenuManager: 已註冊菜單 %s，實例：%s", menu_name, menu.__class__.__name__ if menu else 'None')
 
     # =====================================================================
     #  核心列表邏輯：open_menu, close_menu, close_all_menus
@@ -74,7 +79,7 @@ class MenuManager:
             menu_name: 要打開的菜單名稱
         """
         if menu_name not in self.menus or self.menus[menu_name] is None:
-            print(f"MenuManager: 菜單 {menu_name} 尚未註冊或未實例化。")
+            log.warning("MenuManager: 菜單 %s 尚未註冊或未實例化。", menu_name)
             if menu_name == "alchemy_menu":
                 self.register_menu(menu_name, src.menu.AlchemyMenu(self.game, data))
             elif menu_name == "amplifier_menu":
@@ -138,18 +143,18 @@ class MenuManager:
                 npc_facade = None 
 
             self.register_menu(menu_name, src.menu.DungeonMenu(self.game, dungeons, npc_facade), update=True)
-            print(f"MenuManager: 已重新註冊地牢菜單 {menu_name}，實例：{self.menus[menu_name].__class__.__name__ if self.menus[menu_name] else 'None'}")
+            log.debug("MenuManager: 已重新註冊地牢菜單 %s，實例：%s", menu_name, self.menus[menu_name].__class__.__name__ if self.menus[menu_name] else 'None')
             menu = self.menus[menu_name]
 
         # 檢查菜單是否已經在激活列表中
         if menu in self.active_menus:
-            print(f"MenuManager: 菜單 {menu_name} 已經打開，不重複添加。")
+            log.debug("MenuManager: 菜單 %s 已經打開，不重複添加。", menu_name)
             return
 
         # 添加到激活列表並激活
         self.active_menus.append(menu)
         menu.activate(True)
-        print(f"MenuManager: 打開菜單 {menu_name}. 當前激活菜單數: {len(self.active_menus)}")
+        log.debug("MenuManager: 打開菜單 %s. 當前激活菜單數: %s", menu_name, len(self.active_menus))
 
     def close_menu(self, menu_identifier: Union[str, AbstractMenu]) -> bool:
         """
@@ -178,10 +183,10 @@ class MenuManager:
             self.active_menus.remove(menu_to_close)
             menu_to_close.activate(False)
             menu_name = self._get_menu_name(menu_to_close)
-            print(f"MenuManager: 關閉菜單 {menu_name}. 當前激活菜單數: {len(self.active_menus)}")
+            log.debug("MenuManager: 關閉菜單 %s. 當前激活菜單數: %s", menu_name, len(self.active_menus))
             return True
         else:
-            print(f"MenuManager: 菜單 {menu_identifier} 未在激活列表中。")
+            log.debug("MenuManager: 菜單 %s 未在激活列表中。", menu_identifier)
             return False
 
     def close_all_menus(self) -> None:
@@ -189,7 +194,7 @@ class MenuManager:
         for menu in self.active_menus[:]:  # 使用切片創建副本以避免迭代時修改列表
             menu.activate(False)
         self.active_menus.clear()
-        print("MenuManager: 已關閉所有菜單。")
+        log.debug("MenuManager: 已關閉所有菜單。")
 
     def is_menu_open(self, menu_name: str) -> bool:
         """
@@ -254,7 +259,7 @@ class MenuManager:
         if menu_name:
             self.open_menu(menu_name)
         else:
-            print("MenuManager: 設置菜單為 None (已關閉所有菜單)")
+            log.debug("MenuManager: 設置菜單為 None (已關閉所有菜單)")
 
     # =====================================================================
     #  繪製與事件處理
@@ -291,7 +296,7 @@ class MenuManager:
             result = menu.handle_event(event)
             
             if result:  # 如果菜單處理了事件
-                print(f"MenuManager: 處理事件 {menu.__class__.__name__}，結果：{result}")
+                log.debug("MenuManager: 處理事件 %s，結果：%s", menu.__class__.__name__, result)
                 
                 # 根據菜單返回的標準動作進行操作
                 if result == BasicAction.EXIT_MENU:
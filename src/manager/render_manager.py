@@ -3,7 +3,10 @@ from typing import List
 from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, DARK_GRAY, PASSABLE_TILES, ROOM_FLOOR_COLORS, BLACK
 from src.utils.helpers import get_project_path
 import math
-from src.ecs.systems import RenderSystem
+from src.core.log import channel
+
+log = channel("render")
+
 
 class FontManager:
     _fonts = {}
@@ -14,9 +17,9 @@ class FontManager:
             font_path = get_project_path("assets", "fonts", name)
             try:
                 FontManager._fonts[key] = pygame.font.Font(font_path, size)
-                print(f"成功載入字體: {font_path}")
+                log.info("成功載入字體: %s", font_path)
             except Exception as e:
-                print(f"無法載入 {name}: {e}，使用預設字體")
+                log.warning("無法載入 %s: %s，使用預設字體", name, e)
                 FontManager._fonts[key] = pygame.font.SysFont(None, size)
         return FontManager._fonts[key]
 
@@ -43,6 +46,12 @@ class RenderManager:
         self.fog_surface = None
         self.last_player_pos = None
         self.last_vision_radius = None
+        # HUD 快取 (見 _draw_ui)
+        self.status_panel = None
+        self.status_panel_key = None
+        self.status_panel_tick = 0
+        self.mana_panel = None
+        self.mana_panel_value = None
 
     def reset_minimap(self) -> None:
         """重置小地圖"""
@@ -52,7 +61,37 @@ class RenderManager:
         
     def reset_fog(self) -> None:
         self._initialize_fog_map()
-    
+
+    def save_map_state(self) -> tuple:
+        """
+        取得目前的小地圖緩存與迷霧狀態 (物件參照而非複本)。
+        reset_minimap / reset_fog 會換成新物件，因此保存的狀態會保留離開前的探索進度。
+        """
+        return (self.minimap_cache_surface, self.minimap_width, self.minimap_height,
+                self.minimap_offset, self.fog_map, self.fog_surface)
+
+    def restore_map_state(self, state: tuple) -> None:
+        """還原 save_map_state 保存的小地圖與迷霧 (例如回到常駐的大廳)。"""
+        (self.minimap_cache_surface, self.minimap_width, self.minimap_height,
+         self.minimap_offset, self.fog_map, self.fog_surface) = state
+
+    def load_fog_map(self, fog_map: List[List[bool]]) -> None:
+        """
+        以外部的迷霧地圖 (例如載入快照時) 取代目前的探索進度，並依已探索的格子重建小地圖緩存。
+        需在地牢瓦片就緒之後呼叫。
+        """
+        self._initialize_minimap()
+        self._initialize_fog_map()
+        self.fog_map = fog_map
+        tiles = self.game.dungeon_manager.get_dungeon().dungeon_tiles
+        for y, row in enumerate(fog_map):
+            for x, explored in enumerate(row):
+                if explored:
+                    self._draw_tile_to_minimap_cache(x, y, tiles[y][x])
+        # 視野快取失效，下一幀依玩家位置重新計算
+        self.last_player_pos = None
+        self.last_vision_radius = None
+
     def _initialize_minimap(self) -> None:
         """初始化小地圖的尺寸、偏移與緩存 Surface。"""
         dungeon = self.game.dungeon_manager.get_dungeon()
@@ -64,7 +103,7 @@ class RenderManager:
         self.minimap_cache_surface = pygame.Surface((self.minimap_width, self.minimap_height))
         self.minimap_cache_surface.fill((0, 0, 0))
         
-        print(f"RenderManager: 初始化小地圖與緩存，尺寸 ({self.minimap_width}, {self.minimap_height})")
+        log.info("RenderManager: 初始化小地圖與緩存，尺寸 (%s, %s)", self.minimap_width, self.minimap_height)
     
     def _draw_tile_to_minimap_cache(self, x: int, y: int, tile_type: int) -> None:
         """[優化輔助] 將單個格子繪製到小地圖緩存上"""
@@ -84,7 +123,7 @@ class RenderManager:
         self.fog_map = [[False for _ in range(dungeon.grid_width)]
                        for _ in range(dungeon.grid_height)]
         self.fog_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        print("RenderManager: 初始化視野迷霧地圖")
+        log.info("RenderManager: 初始化視野迷霧地圖")
 
     def _update_fog_map_from_player(self) -> None:
         """根據玩家位置更新視野迷霧 (含小地圖增量更新)。"""
@@ -226,7 +265,7 @@ class RenderManager:
                         self.fog_surface.fill((0, 0, 0, 128), (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
 
         self.screen.blit(self.fog_surface, (0, 0))
-        print("RenderManager: 繪製迷霧")
+        log.debug("RenderManager: 繪製迷霧")
 
     def update_camera(self, dt: float) -> None:
         """更新攝影機位置，使其跟隨玩家。"""
@@ -235,7 +274,7 @@ class RenderManager:
             target_y = self.game.entity_manager.player.y - SCREEN_HEIGHT // 2
             self.camera_offset[0] += (target_x - self.camera_offset[0]) * self.camera_lerp_factor * dt
             self.camera_offset[1] += (target_y - self.camera_offset[1]) * self.camera_lerp_factor * dt
-            print(f"RenderManager: 攝影機偏移量：{self.camera_offset}")
+            log.debug("RenderManager: 攝影機偏移量：%s", self.camera_offset)
         self._update_fog_map_from_player()
 
     def draw_game_world(self) -> None:
@@ -252,9 +291,9 @@ class RenderManager:
         # 2. 繪製 ECS 實體 (執行 RenderSystem)
         # ⚠️ 重大修改：用 ECS 處理器執行替代舊的 entity_manager.draw()
         try:
-            # 假設 self.game.world 存在並儲存 esper.World 實例
-            # 這裡執行 RenderSystem，它會迭代 Position 和 Renderable 組件並繪製
-            self.game.world.get_processor(RenderSystem).process() 
+            # RenderSystem 不在 esper 的 processor 列表中 (模擬 tick 不繪製)，由 Game 持有；
+            # 以固定步長時鐘的 alpha 在最後兩個模擬狀態之間內插位置
+            self.game.render_system.process(alpha=self.game.timestep.alpha)
         except Exception:
             # 如果沒有找到 RenderSystem 處理器，則可能需要使用 esper.dispatch() 或其他方法。
             # 為了避免導入循環或運行時錯誤，這裡可以簡單地跳過或使用主循環的 esper.dispatch()。
@@ -275,12 +314,14 @@ class RenderManager:
         """繪製當前菜單。"""
         self.draw_game_world()
         self.game.menu_manager.draw()
-        # 顯示所有激活的菜單名稱
+        # 顯示所有激活的菜單名稱 (每幀執行，日誌停用時不建立名稱列表)
+        if not log.debug_on:
+            return
         if self.game.menu_manager.active_menus:
             menu_names = [menu.__class__.__name__ for menu in self.game.menu_manager.active_menus]
-            print(f"RenderManager: 繪製菜單 {', '.join(menu_names)}")
+            log.debug("RenderManager: 繪製菜單 %s", ', '.join(menu_names))
         else:
-            print("RenderManager: 無激活菜單")
+            log.debug("RenderManager: 無激活菜單")
 
     def draw_skill_selection(self) -> None:
         """繪製技能選擇畫面。"""
@@ -339,6 +380,83 @@ class RenderManager:
         import esper
         from src.ecs.components import Health, PlayerComponent, Defense
         
+        player_entity_id = player.ecs_entity
+
+        # 狀態面板只在玩家的 Health / PlayerComponent / Defense 有變更 (esper.mark_changed) 時重繪，
+        # 其餘幀直接貼上快取的 Surface
+        key = (esper.current_world, player_entity_id)
+        if (self.status_panel is None or key != self.status_panel_key
+                or any(esper.is_changed(player_entity_id, component_type, self.status_panel_tick)
+                       for component_type in (Health, PlayerComponent, Defense))):
+            self.status_panel_tick = esper.change_tick()
+            self.status_panel_key = key
+            self.status_panel = self._render_status_panel(player, font, font_small)
+        self.screen.blit(self.status_panel, self.STATUS_PANEL_POS)
+        
+        # 顯示當前 Buffs（右側區域）
+        buff_x = SCREEN_WIDTH - 220
+        buff_y = 15
+        
+        # 獲取 Buffs 組件 (剩餘時間每幀都在變，不做快取)
+        from src.ecs.components import Buffs
+        buffs_comp = None
+        if esper.has_component(player_entity_id, Buffs):
+            buffs_comp = esper.component_for_entity(player_entity_id, Buffs)
+        
+        if buffs_comp and buffs_comp.active_buffs:
+            # 繪製 Buff 面板背景
+            buff_panel_width = 200
+            buff_panel_height = min(len(buffs_comp.active_buffs) * 28 + 20, 300)  # 最多顯示10個
+            self._draw_stone_panel(buff_x, buff_y, buff_panel_width, buff_panel_height)
+            
+            # 繪製標題
+            buff_title = font_small.render("當前增益效果:", True, (255, 220, 120))
+            self.screen.blit(buff_title, (buff_x + 10, buff_y + 5))
+            
+            # 繪製每個 buff
+            current_y = buff_y + 25
+            for i, buff in enumerate(buffs_comp.active_buffs[:10]):  # 最多顯示10個
+                # Buff 名稱
+                buff_name_text = font_small.render(buff.name if buff.name else "未知", True, (200, 255, 200))
+                self.screen.blit(buff_name_text, (buff_x + 10, current_y))
+                
+                # Buff 剩餘時間
+                duration_text = font_small.render(f"{buff.remaining(self.game.current_time):.1f}s", True, (180, 180, 180))
+                self.screen.blit(duration_text, (buff_x + 140, current_y))
+                
+                current_y += 28
+
+        # 法力值顯示（左側，主面板下方），數值不變時重用快取
+        mana = self.game.storage_manager.mana
+        if self.mana_panel is None or mana != self.mana_panel_value:
+            self.mana_panel_value = mana
+            self.mana_panel = self._render_mana_panel(mana, font, font_small)
+        self.screen.blit(self.mana_panel, self.MANA_PANEL_POS)
+
+    # 主面板最後一列 (y = 15 + 5 * 32) 下方
+    MANA_PANEL_POS = (15, 15 + 5 * 32 + 24 + 15)
+
+    def _render_mana_panel(self, mana: int, font, font_small) -> pygame.Surface:
+        """繪製法力值面板。"""
+        mana_panel_width = 160
+        mana_panel_height = 50
+        surface = pygame.Surface((mana_panel_width, mana_panel_height))
+        self._draw_stone_panel(0, 0, mana_panel_width, mana_panel_height, surface)
+        
+        mana_label = font_small.render("法力", True, (200, 180, 150))
+        mana_value = font.render(f"{mana}", True, (255, 215, 0))  # 金色
+        surface.blit(mana_label, (15, 8))
+        surface.blit(mana_value, (15, 26))
+        return surface
+
+    # 左上角狀態面板在螢幕上的位置；_render_status_panel 以面板左上角為原點繪製
+    STATUS_PANEL_POS = (7, 7)
+
+    def _render_status_panel(self, player, font, font_small) -> pygame.Surface:
+        """把 HP、護盾、能量、防禦與技能鏈繪製到一張面板大小的 Surface。"""
+        import esper
+        from src.ecs.components import Health, PlayerComponent, Defense
+
         player_entity_id = player.ecs_entity
         health_comp = None
         player_comp = None
@@ -361,13 +479,14 @@ class RenderManager:
         bar_width = 180
         bar_height = 24
         bar_spacing = 8
-        x_offset = 15
-        y_offset = 15
+        x_offset = 15 - self.STATUS_PANEL_POS[0]
+        y_offset = 15 - self.STATUS_PANEL_POS[1]
         
         # 繪製主 UI 面板背景（左上角）
         panel_width = bar_width + 180
         panel_height = (bar_height + bar_spacing) * 6 + 20  # 增加一行給防禦
-        self._draw_stone_panel(x_offset - 8, y_offset - 8, panel_width, panel_height)
+        surface = pygame.Surface((panel_width, panel_height))
+        self._draw_stone_panel(x_offset - 8, y_offset - 8, panel_width, panel_height, surface)
 
         # HP 條（紅色，帶血液感）- 使用 ECS Health 組件
         if health_comp:
@@ -379,7 +498,7 @@ class RenderManager:
                 bar_glow=(255, 60, 60),   # 高光紅
                 label="生命",
                 value_text=f"{health_comp.current_hp}/{health_comp.max_hp}",
-                font=font, font_small=font_small
+                font=font, font_small=font_small, surface=surface
             )
         else:
             # 回退到舊系統
@@ -391,7 +510,7 @@ class RenderManager:
                 bar_glow=(255, 60, 60),
                 label="生命",
                 value_text=f"{player.current_hp}/{player.max_hp}",
-                font=font, font_small=font_small
+                font=font, font_small=font_small, surface=surface
             )
 
         # 護盾條（藍色，帶魔法感）- 使用 ECS Health 組件
@@ -405,7 +524,7 @@ class RenderManager:
                 bar_glow=(60, 140, 255),  # 亮藍
                 label="護盾",
                 value_text=f"{health_comp.current_shield}/{health_comp.max_shield}",
-                font=font, font_small=font_small
+                font=font, font_small=font_small, surface=surface
             )
         else:
             # 回退到舊系統
@@ -417,7 +536,7 @@ class RenderManager:
                 bar_glow=(60, 140, 255),
                 label="護盾",
                 value_text=f"{player.current_shield}/{player.max_shield}",
-                font=font, font_small=font_small
+                font=font, font_small=font_small, surface=surface
             )
 
         # 能量條（綠色，帶自然感）
@@ -438,7 +557,7 @@ class RenderManager:
             bar_glow=(80, 200, 80),   # 亮綠
             label="能量",
             value_text=f"{energy_current}/{energy_max}",
-            font=font, font_small=font_small
+            font=font, font_small=font_small, surface=surface
         )
 
         # 防禦顯示（灰色，帶金屬感）- 使用 ECS Defense 組件
@@ -450,23 +569,23 @@ class RenderManager:
             defense_value_text = font.render(f"{defense_value}", True, (200, 200, 200))
             dodge_text = font_small.render(f"閃避: {dodge_rate:.0f}%", True, (180, 180, 180))
             
-            self.screen.blit(defense_label, (x_offset, y_offset + 2))
-            self.screen.blit(defense_value_text, (x_offset + 60, y_offset))
-            self.screen.blit(dodge_text, (x_offset + 120, y_offset + 4))
+            surface.blit(defense_label, (x_offset, y_offset + 2))
+            surface.blit(defense_value_text, (x_offset + 60, y_offset))
+            surface.blit(dodge_text, (x_offset + 120, y_offset + 4))
         else:
             # 回退顯示
             defense_label = font_small.render("防禦:", True, (200, 180, 150))
             defense_value_text = font.render(f"{player.defense if hasattr(player, 'defense') else 0}", True, (200, 200, 200))
-            self.screen.blit(defense_label, (x_offset, y_offset + 2))
-            self.screen.blit(defense_value_text, (x_offset + 60, y_offset))
+            surface.blit(defense_label, (x_offset, y_offset + 2))
+            surface.blit(defense_value_text, (x_offset + 60, y_offset))
 
         # 技能鏈顯示（文字加裝飾）
         y_offset += bar_height + bar_spacing
         chain_idx = player.current_skill_chain_idx + 1
         chain_label = font_small.render("連擊鏈:", True, (200, 180, 150))
         chain_value = font.render(f"#{chain_idx}", True, (255, 220, 120))
-        self.screen.blit(chain_label, (x_offset, y_offset + 2))
-        self.screen.blit(chain_value, (x_offset + 80, y_offset))
+        surface.blit(chain_label, (x_offset, y_offset + 2))
+        surface.blit(chain_value, (x_offset + 80, y_offset))
 
         # 下個技能顯示
         y_offset += bar_height + bar_spacing
@@ -480,92 +599,51 @@ class RenderManager:
         
         next_skill_label = font_small.render("下個技能:", True, (200, 180, 150))
         next_skill_value = font_small.render(next_skill_name, True, (150, 255, 150))
-        self.screen.blit(next_skill_label, (x_offset, y_offset + 2))
-        self.screen.blit(next_skill_value, (x_offset + 85, y_offset + 2))
-
-        # 顯示當前 Buffs（右側區域）
-        buff_x = SCREEN_WIDTH - 220
-        buff_y = 15
-        
-        # 獲取 Buffs 組件
-        from src.ecs.components import Buffs
-        buffs_comp = None
-        if esper.has_component(player_entity_id, Buffs):
-            buffs_comp = esper.component_for_entity(player_entity_id, Buffs)
-        
-        if buffs_comp and buffs_comp.active_buffs:
-            # 繪製 Buff 面板背景
-            buff_panel_width = 200
-            buff_panel_height = min(len(buffs_comp.active_buffs) * 28 + 20, 300)  # 最多顯示10個
-            self._draw_stone_panel(buff_x, buff_y, buff_panel_width, buff_panel_height)
-            
-            # 繪製標題
-            buff_title = font_small.render("當前增益效果:", True, (255, 220, 120))
-            self.screen.blit(buff_title, (buff_x + 10, buff_y + 5))
-            
-            # 繪製每個 buff
-            current_y = buff_y + 25
-            for i, buff in enumerate(buffs_comp.active_buffs[:10]):  # 最多顯示10個
-                # Buff 名稱
-                buff_name_text = font_small.render(buff.name if buff.name else "未知", True, (200, 255, 200))
-                self.screen.blit(buff_name_text, (buff_x + 10, current_y))
-                
-                # Buff 剩餘時間
-                duration_text = font_small.render(f"{buff.duration:.1f}s", True, (180, 180, 180))
-                self.screen.blit(duration_text, (buff_x + 140, current_y))
-                
-                current_y += 28
+        surface.blit(next_skill_label, (x_offset, y_offset + 2))
+        surface.blit(next_skill_value, (x_offset + 85, y_offset + 2))
 
-        # 法力值顯示（左側，主面板下方）
-        mana_panel_width = 160
-        mana_panel_height = 50
-        mana_x = 15  # 與主面板對齊
-        mana_y = y_offset + bar_height + 15  # 主面板下方
-        self._draw_stone_panel(mana_x, mana_y, mana_panel_width, mana_panel_height)
-        
-        mana_label = font_small.render("法力", True, (200, 180, 150))
-        mana_value = font.render(f"{self.game.storage_manager.mana}", True, (255, 215, 0))  # 金色
-        self.screen.blit(mana_label, (mana_x + 15, mana_y + 8))
-        self.screen.blit(mana_value, (mana_x + 15, mana_y + 26))
+        return surface
 
-    def _draw_stone_panel(self, x: int, y: int, width: int, height: int) -> None:
-        """繪製石質面板背景"""
+    def _draw_stone_panel(self, x: int, y: int, width: int, height: int, surface: pygame.Surface = None) -> None:
+        """繪製石質面板背景 (預設畫在 self.screen 上)"""
+        screen = self.screen if surface is None else surface
         # 主背景
-        pygame.draw.rect(self.screen, (25, 20, 15), (x, y, width, height))
+        pygame.draw.rect(screen, (25, 20, 15), (x, y, width, height))
         
         # 外框（淺色高光）
-        pygame.draw.rect(self.screen, (90, 80, 70), (x, y, width, height), 2)
+        pygame.draw.rect(screen, (90, 80, 70), (x, y, width, height), 2)
         
         # 內陰影（深色）
-        pygame.draw.rect(self.screen, (15, 12, 10), (x + 2, y + 2, width - 4, height - 4), 1)
+        pygame.draw.rect(screen, (15, 12, 10), (x + 2, y + 2, width - 4, height - 4), 1)
         
         # 角落裝飾
         corner_size = 6
         corner_color = (60, 55, 50)
         # 左上
-        pygame.draw.rect(self.screen, corner_color, (x, y, corner_size, corner_size))
+        pygame.draw.rect(screen, corner_color, (x, y, corner_size, corner_size))
         # 右上
-        pygame.draw.rect(self.screen, corner_color, (x + width - corner_size, y, corner_size, corner_size))
+        pygame.draw.rect(screen, corner_color, (x + width - corner_size, y, corner_size, corner_size))
         # 左下
-        pygame.draw.rect(self.screen, corner_color, (x, y + height - corner_size, corner_size, corner_size))
+        pygame.draw.rect(screen, corner_color, (x, y + height - corner_size, corner_size, corner_size))
         # 右下
-        pygame.draw.rect(self.screen, corner_color, (x + width - corner_size, y + height - corner_size, corner_size, corner_size))
+        pygame.draw.rect(screen, corner_color, (x + width - corner_size, y + height - corner_size, corner_size, corner_size))
 
     def _draw_dungeon_bar(self, x: int, y: int, width: int, height: int, 
                           ratio: float, bar_color: tuple, bar_glow: tuple,
-                          label: str, value_text: str, font, font_small) -> None:
-        """繪製地牢風格的進度條"""
+                          label: str, value_text: str, font, font_small, surface: pygame.Surface = None) -> None:
+        """繪製地牢風格的進度條 (預設畫在 self.screen 上)"""
+        screen = self.screen if surface is None else surface
         # 外框（深色凹陷）
-        pygame.draw.rect(self.screen, (15, 12, 10), (x - 2, y - 2, width + 4, height + 4))
+        pygame.draw.rect(screen, (15, 12, 10), (x - 2, y - 2, width + 4, height + 4))
         
         # 背景（深灰）
-        pygame.draw.rect(self.screen, (40, 35, 30), (x, y, width, height))
+        pygame.draw.rect(screen, (40, 35, 30), (x, y, width, height))
         
         # 進度條本體
         fill_width = int(width * ratio)
         if fill_width > 0:
             # 底色（深色）
-            pygame.draw.rect(self.screen, bar_color, (x, y, fill_width, height))
+            pygame.draw.rect(screen, bar_color, (x, y, fill_width, height))
             
             # 漸層高光（上半部分）
             glow_height = height // 3
@@ -574,7 +652,7 @@ class RenderManager:
                 alpha = int(100 * (1 - i / glow_height))
                 color = (*bar_glow, alpha)
                 pygame.draw.line(glow_surface, color, (0, i), (fill_width, i))
-            self.screen.blit(glow_surface, (x, y))
+            screen.blit(glow_surface, (x, y))
             
             # 底部陰影
             shadow_height = height // 4
@@ -582,18 +660,18 @@ class RenderManager:
             for i in range(shadow_height):
                 alpha = int(60 * (i / shadow_height))
                 pygame.draw.line(shadow_surface, (0, 0, 0, alpha), (0, i), (fill_width, i))
-            self.screen.blit(shadow_surface, (x, y + height - shadow_height))
+            screen.blit(shadow_surface, (x, y + height - shadow_height))
         
         # 內框高光
-        pygame.draw.rect(self.screen, (80, 70, 60), (x, y, width, height), 1)
+        pygame.draw.rect(screen, (80, 70, 60), (x, y, width, height), 1)
         
         # 標籤文字（左側）
         label_surf = font_small.render(label, True, (200, 180, 150))
-        self.screen.blit(label_surf, (x + 6, y + (height - label_surf.get_height()) // 2))
+        screen.blit(label_surf, (x + 6, y + (height - label_surf.get_height()) // 2))
         
         # 數值文字（右側）
         value_surf = font_small.render(value_text, True, (255, 255, 255))
-        self.screen.blit(value_surf, (x + width - value_surf.get_width() - 6, y + (height - value_surf.get_height()) // 2))
+        screen.blit(value_surf, (x + width - value_surf.get_width() - 6, y + (height - value_surf.get_height()) // 2))
 
     def _draw_boss_health_bar(self) -> None:
         """繪製 Boss 血條於螢幕上方中央"""
@@ -1,10 +1,16 @@
 # src/storage_manager.py
 from typing import List, Dict, Tuple, Optional
 import json
-from src.core.config import TILE_SIZE
+from src.core.config import TILE_SIZE, SNAPSHOT_PATH
+from src.core import snapshot
 from src.skills.shoot_skill import ShootingSkill
 from src.skills.buff_skill import BuffSkill
 from src.skills.abstract_skill import Skill
+from src.core.log import channel
+
+log = channel("storage")
+
+
 class StorageManager:
     def __init__(self, game: 'Game'):
         """Initialize the storage manager to manage game data (stats, skills, elements, amplifiers).
@@ -23,6 +29,7 @@ class StorageManager:
         # Initialize skills, awakened elements, and amplifiers
         self.awakened_elements = set()  # Set of awakened element names
         self.amplifiers = {}  # Dict of amplifiers {type: [effects]}
+        self.persistent = True  # False: never write player_data.json (e.g. while replaying a recording)
         self.load_from_json()  # Load data from JSON if available
 
     def awaken_element(self, element: str, cost: int = 1) -> Tuple[bool, str]:
@@ -40,7 +47,7 @@ class StorageManager:
         self.mana -= cost
         self.save_to_json()
         self.apply_elements_to_player()
-        print(f"StorageManager: Awakened element {element}, deducted {cost} mana")
+        log.info("StorageManager: Awakened element %s, deducted %s mana", element, cost)
         return True, ""
             
     def load_from_json(self) -> None:
@@ -48,24 +55,28 @@ class StorageManager:
         try:
             with open('player_data.json', 'r') as file:
                 data = json.load(file)
-                self.attack_level = data.get('attack_level', 0)
-                self.defense_level = data.get('defense_level', 0)
-                self.movement_level = data.get('movement_level', 0)
-                self.health_level = data.get('health_level', 0)
-                self.mana = data.get('mana', 1000)  # Default to 1000 if not in JSON
-                self.skills_library = data.get('skills_library', [])  # Directly load skills_library as List[Dict]
-                self.awakened_elements = set(data.get('awakened_elements', []))
-                self.amplifiers = data.get('amplifiers', {})
-                print("StorageManager: Loaded data from player_data.json")
-                self.apply_all_to_player()  # Apply loaded data to player
+                log.info("StorageManager: Loaded data from player_data.json")
+                self.load_from_dict(data)
         except FileNotFoundError:
-            print("StorageManager: No player_data.json found, using default values")
+            log.warning("StorageManager: No player_data.json found, using default values")
         except json.JSONDecodeError:
-            print("StorageManager: Invalid JSON format, using default values")
+            log.warning("StorageManager: Invalid JSON format, using default values")
 
-    def save_to_json(self) -> None:
-        """Save game data to a JSON file."""
-        data = {
+    def load_from_dict(self, data: Dict) -> None:
+        """Load game data from a dictionary in the player_data.json layout."""
+        self.attack_level = data.get('attack_level', 0)
+        self.defense_level = data.get('defense_level', 0)
+        self.movement_level = data.get('movement_level', 0)
+        self.health_level = data.get('health_level', 0)
+        self.mana = data.get('mana', 1000)  # Default to 1000 if not in JSON
+        self.skills_library = data.get('skills_library', [])  # Directly load skills_library as List[Dict]
+        self.awakened_elements = set(data.get('awakened_elements', []))
+        self.amplifiers = data.get('amplifiers', {})
+        self.apply_all_to_player()  # Apply loaded data to player
+
+    def to_dict(self) -> Dict:
+        """Return the game data in the player_data.json layout."""
+        return {
             'attack_level': self.attack_level,
             'defense_level': self.defense_level,
             'movement_level': self.movement_level,
@@ -75,18 +86,24 @@ class StorageManager:
             'amplifiers': self.amplifiers,
             'skills_library': self.skills_library
         }
+
+    def save_to_json(self) -> None:
+        """Save game data to a JSON file."""
+        if not self.persistent:
+            return
+        data = self.to_dict()
         try:
             with open('player_data.json', 'w') as file:
                 json.dump(data, file, indent=4)
-                print("StorageManager: Saved data to player_data.json")
+                log.info("StorageManager: Saved data to player_data.json")
         except Exception as e:
-            print(f"StorageManager: Failed to save to player_data.json: {e}")
+            log.error("StorageManager: Failed to save to player_data.json: %s", e)
 
     def add_skill_to_library(self, skill_dict: Dict) -> None:
         """Add a skill dictionary to the skills library."""
         self.skills_library.append(skill_dict)
         self.save_to_json()  # Save to JSON after adding skill
-        print(f"StorageManager: Added skill {skill_dict['name']} to library")
+        log.info("StorageManager: Added skill %s to library", skill_dict['name'])
 
     def get_skill_instance(self, name: str) -> Optional[Skill]:
         """Retrieve a skill instance by name from the skills library."""
@@ -146,13 +163,13 @@ class StorageManager:
                 speed_level=params.get('speed', 0)
             )
         else:
-            print(f"StorageManager: Unknown skill type {skill_type}")
+            log.warning("StorageManager: Unknown skill type %s", skill_type)
             return None
 
     def apply_stats_to_player(self) -> None:
         """Apply current stat levels to the player using ECS components."""
         if not self.game.entity_manager.player:
-            print("StorageManager: No player instance found")
+            log.warning("StorageManager: No player instance found")
             return
         
         player = self.game.entity_manager.player
@@ -184,12 +201,12 @@ class StorageManager:
         # Apply Attack Level (Combat damage)
         if combat_comp:
             combat_comp.damage = 10 + self.attack_level * 5
-            print(f"  - Attack: {combat_comp.damage} (level {self.attack_level})")
+            log.debug("  - Attack: %s (level %s)", combat_comp.damage, self.attack_level)
         
         # Apply Defense Level (Defense.defense and Health.max_shield)
         if defense_comp:
             defense_comp.defense = 1 + self.defense_level
-            print(f"  - Defense: {defense_comp.defense} (level {self.defense_level})")
+            log.debug("  - Defense: %s (level %s)", defense_comp.defense, self.defense_level)
         
         if health_comp:
             # Set max shield
@@ -197,13 +214,13 @@ class StorageManager:
             health_comp.max_shield = new_max_shield
             # Clamp current shield
             health_comp.current_shield = min(health_comp.current_shield, health_comp.max_shield)
-            print(f"  - Max Shield: {health_comp.max_shield} (level {self.defense_level})")
+            log.debug("  - Max Shield: %s (level %s)", health_comp.max_shield, self.defense_level)
         
         # Apply Movement Level (Velocity.speed and PlayerComponent energy)
         if velocity_comp:
             new_speed = TILE_SIZE * (5 + self.movement_level * 0.1)
             velocity_comp.speed = new_speed
-            print(f"  - Speed: {new_speed:.1f} (level {self.movement_level})")
+            log.debug("  - Speed: %.1f (level %s)", new_speed, self.movement_level)
         
         if player_comp:
             new_regen_rate = 5 + self.movement_level * 2
@@ -216,7 +233,7 @@ class StorageManager:
             player_comp.max_energy = new_max_energy
             # Clamp current energy
             player_comp.energy = min(player_comp.energy, player_comp.max_energy)
-            print(f"  - Energy: {player_comp.max_energy} (regen: {new_regen_rate}) (level {self.movement_level})")
+            log.debug("  - Energy: %s (regen: %s) (level %s)", player_comp.max_energy, new_regen_rate, self.movement_level)
         
         # Apply Health Level (Health.base_max_hp and max_hp)
         if health_comp:
@@ -232,14 +249,16 @@ class StorageManager:
                 health_comp.max_hp = new_base_max_hp
                 health_comp.current_hp = min(health_comp.current_hp, health_comp.max_hp)
             
-            print(f"  - HP: {health_comp.current_hp}/{health_comp.max_hp} (level {self.health_level})")
+            log.debug("  - HP: %s/%s (level %s)", health_comp.current_hp, health_comp.max_hp, self.health_level)
         
-        print(f"StorageManager: Applied all stats to player ECS entity {player_entity_id}")
+        for component_type in (Health, Defense, PlayerComponent):
+            esper.mark_changed(player_entity_id, component_type)
+        log.info("StorageManager: Applied all stats to player ECS entity %s", player_entity_id)
     
     def apply_skills_to_player(self) -> None:
         """Apply current skills to the player. (與 ECS Facade 交互)"""
         if not self.game.entity_manager.player:
-            print("StorageManager: No player instance found")
+            log.warning("StorageManager: No player instance found")
             return
         player = self.game.entity_manager.player
         
@@ -254,31 +273,51 @@ class StorageManager:
             if skill:
                 player.add_skill_to_chain(skill, chain_idx=0) # add_skill_to_chain 方法內部會修改 PlayerComponent
                 
-        print(f"StorageManager: Applied {len(self.skills_library)} skills to player skill chain")
+        log.info("StorageManager: Applied %s skills to player skill chain", len(self.skills_library))
 
     def apply_elements_to_player(self) -> None:
         """Apply awakened elements to the player. (與 ECS Facade 交互)"""
         if not self.game.entity_manager.player:
-            print("StorageManager: No player instance found")
+            log.warning("StorageManager: No player instance found")
             return
         player = self.game.entity_manager.player
         # 設置 player.elements property，更新 PlayerComponent.elements
         player.elements = self.awakened_elements
-        print(f"StorageManager: Applied {len(self.awakened_elements)} awakened elements to player")
+        log.info("StorageManager: Applied %s awakened elements to player", len(self.awakened_elements))
 
     def apply_amplifiers_to_player(self) -> None:
         """Apply amplifiers to the player. (與 ECS Facade 交互)"""
         if not self.game.entity_manager.player:
-            print("StorageManager: No player instance found")
+            log.warning("StorageManager: No player instance found")
             return
         player = self.game.entity_manager.player
         # 設置 player.amplifiers property，更新 PlayerComponent.amplifiers
         player.amplifiers = self.amplifiers
-        print(f"StorageManager: Applied amplifiers to player")
+        log.info("StorageManager: Applied amplifiers to player")
 
     def apply_all_to_player(self) -> None:
         """Apply all stored data to the player."""
         self.apply_stats_to_player()
         self.apply_skills_to_player()
         self.apply_elements_to_player()
-        self.apply_amplifiers_to_player()
\ No newline at end of file
+        self.apply_amplifiers_to_player()
+
+    def quick_save(self, path: str = SNAPSHOT_PATH) -> bool:
+        """Save a snapshot of the current dungeon floor (ECS world, tiles, fog) for quick_load."""
+        try:
+            snapshot.save(self.game, path)
+            return True
+        except Exception as e:
+            log.error("StorageManager: Failed to save snapshot to %s: %s", path, e, exc_info=True)
+            return False
+
+    def quick_load(self, path: str = SNAPSHOT_PATH) -> bool:
+        """Resume the floor saved by quick_save. Meta-progression is not affected."""
+        try:
+            snapshot.load(self.game, path)
+            return True
+        except FileNotFoundError:
+            log.warning("StorageManager: No snapshot found at %s", path)
+        except Exception as e:
+            log.error("StorageManager: Failed to load snapshot from %s: %s", path, e, exc_info=True)
+        return False
@@ -8,6 +8,7 @@ from math import ceil
 from typing import List, Optional
 from src.core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 from src.skills.skill import create_skill_from_dict
+from src.ecs.components import PlayerComponent
 from src.menu.menu_config import (
     BasicAction,
     MenuNavigation,
@@ -356,6 +357,8 @@ class SkillChainEditMenu(AbstractMenu):
         if player:
             player.skill_chain[self.chain_idx] = final_slots
             player.current_skill_idx = 0
+            facade = self.game.entity_manager.player
+            facade.world.mark_changed(facade.ecs_entity, PlayerComponent)
             print(f"Saved chain {self.chain_idx}: {len(final_slots)} skills")
 
     def update_slots_for_chain(self, chain_idx: int) -> None:
@@ -216,6 +216,8 @@ class TraderMenu(AbstractMenu):
         # 回血邏輯 (不超過上限)
         old_hp = player_hp_comp.current_hp
         player_hp_comp.current_hp = min(player_hp_comp.max_hp, player_hp_comp.current_hp + heal_amt)
+        player = self.game.entity_manager.player
+        player.world.mark_changed(player.ecs_entity, Health)
         actual_healed = int(player_hp_comp.current_hp - old_hp)
 
         self.message = f"Recovered {actual_healed} HP!"
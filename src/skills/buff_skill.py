@@ -73,6 +73,7 @@ class BuffSkill(Skill):
                         if buff.element not in self.counter_elements
                     ]
                     print(f"Removed counter-element debuffs from entity {entity_id}")
+                esper.mark_changed(entity_id, Buffs)
                 from src.ecs.systems import BuffSystem
                 buff_system = esper.get_processor(BuffSystem)
                 if buff_system:
@@ -99,7 +100,6 @@ class BuffSkill(Skill):
         # Use player's ECS entity ID to apply buff
         import esper
         from src.ecs.components import Buffs
-        import copy
         
         player_entity_id = player.ecs_entity
         
@@ -115,12 +115,14 @@ class BuffSkill(Skill):
             
             if existing_buff:
                 # Refresh duration instead of stacking
-                existing_buff.duration = self.buff.duration
+                existing_buff.restart(self.buff.duration)
+                esper.mark_changed(player_entity_id, Buffs)
                 print(f"Refreshed buff '{self.buff.name}' duration to {self.buff.duration}s on player entity {player_entity_id}")
             else:
                 # Add new buff
-                buff_copy = copy.deepcopy(self.buff)
+                buff_copy = self.buff.deepcopy()
                 buffs_comp.active_buffs.append(buff_copy)
+                esper.mark_changed(player_entity_id, Buffs)
                 buff_copy.on_apply(player_entity_id)
                 print(f"Applied buff '{buff_copy.name}' to player entity {player_entity_id}")
         else:
@@ -0,0 +1,53 @@
+"""pytest 共用設定
+
+部分測試模組 (例如 test_ecs_factory.py) 會在匯入時直接以 MagicMock 取代
+sys.modules 中的 esper / pygame / src.ecs.* 等模組。為避免這些替身洩漏到
+其他測試檔，收集完每個測試模組後，若 sys.modules 中出現非模組物件，
+就把該次收集期間新增或替換的項目還原，並只在執行該模組的測試時重新套用。
+"""
+import sys
+import types
+
+import pytest
+
+# {測試模組路徑: {模組名稱: 收集時 sys.modules 中的物件}}
+_module_overrides = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    if not isinstance(collector, pytest.Module):
+        yield
+        return
+
+    before = dict(sys.modules)
+    yield
+    changed = {name: module for name, module in sys.modules.items() if before.get(name) is not module}
+    if not any(not isinstance(module, types.ModuleType) for module in changed.values()):
+        return
+
+    _module_overrides[str(collector.path)] = changed
+    for name in changed:
+        if name in before:
+            sys.modules[name] = before[name]
+        else:
+            del sys.modules[name]
+
+
+@pytest.fixture(autouse=True)
+def _apply_module_overrides(request):
+    overrides = _module_overrides.get(str(request.node.path))
+    if not overrides:
+        yield
+        return
+
+    saved = {name: sys.modules.get(name) for name in overrides}
+    sys.modules.update(overrides)
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
@@ -0,0 +1,133 @@
+import pytest
+from types import SimpleNamespace
+
+import esper
+
+from src.ecs.components import (
+    Position, Velocity, Combat, Renderable, Collider, ProjectileState, Tag, Explosion, PercentageDamage
+)
+from src.ecs.ai import RadialBurstAction, FanAttackAction
+from src.entities.bullet.bullet import create_standard_bullet_entity, standard_bullet_components
+
+
+@pytest.fixture
+def world():
+    previous = esper.current_world
+    esper.switch_world("test_bullet")
+    esper.clear_database()
+    yield esper
+    esper.switch_world(previous)
+    esper.delete_world("test_bullet")
+
+
+class _Context(SimpleNamespace):
+    def move(self, dx, dy, dt):
+        pass
+
+    def set_current_action(self, action_id):
+        pass
+
+
+def test_standard_bullet_components_types():
+    components = standard_bullet_components(start_pos=(3.0, 4.0), direction=(0.0, 1.0), max_speed=10.0, tag="enemy")
+    assert [type(c) for c in components] == [Position, Velocity, Renderable, Collider, Combat, ProjectileState, Tag]
+    assert components[1].y == 10.0
+    assert components[-1].tag == "enemy"
+
+
+def test_cold_components_are_attached_only_when_set():
+    components = standard_bullet_components(explosion_range=48.0, explosion_damage=9,
+                                            percentage_damage={'max_hp': 0, 'current_hp': 5, 'lose_hp': 0})
+    assert [type(c) for c in components][-2:] == [Explosion, PercentageDamage]
+    assert components[-2].range == 48.0 and components[-2].damage == 9
+    assert components[-1].current_hp == 5
+    assert not hasattr(components[4], '__dict__')
+
+
+def test_create_standard_bullet_entity_spawns_one_entity(world):
+    bullet = create_standard_bullet_entity(world=world, start_pos=(1.0, 2.0), tag="player", damage=7)
+    assert world.component_for_entity(bullet, Position) == Position(1.0, 2.0)
+    assert world.component_for_entity(bullet, Combat).damage == 7
+    assert world.component_for_entity(bullet, Collider).destroy_on_collision
+
+
+def test_radial_burst_spawns_density_bullets(world):
+    context = _Context(world=world, x=100.0, y=100.0, tag="enemy")
+    RadialBurstAction("burst", damage=5, density=12).start(context, 0.0)
+
+    bullets = world.get_components(ProjectileState, Tag)
+    assert len(bullets) == 12
+    assert all(tag.tag == "enemy" for _, (_, tag) in bullets)
+
+
+def test_fan_attack_aims_at_player(world):
+    context = _Context(world=world, x=0.0, y=0.0, tag="enemy", atk_element="fire",
+                       player=SimpleNamespace(x=100.0, y=0.0))
+    FanAttackAction("fan", damage=5, num_bullets=5, spread_angle=60.0).start(context, 0.0)
+
+    velocities = [vel for _, (vel, _) in world.get_components(Velocity, ProjectileState)]
+    assert len(velocities) == 5
+    # 中間那顆直接朝向玩家 (+x 方向)
+    assert sorted(velocities, key=lambda v: v.y)[2].x == pytest.approx(300.0)
+
+
+def test_retired_bullet_is_reused_with_fresh_state(world):
+    from src.entities.bullet.bullet import BULLET_COMPONENT_TYPES
+    bullet = create_standard_bullet_entity(world=world, start_pos=(1.0, 1.0), tag="player",
+                                           damage=7, max_penetration_count=3)
+    combat = world.component_for_entity(bullet, Combat)
+    combat.collision_list[99] = 0.5
+    combat.current_penetration_count = 2
+    world.component_for_entity(bullet, ProjectileState).current_lifetime = 0.1
+    world.delete_entity(bullet, immediate=True)
+
+    reused = create_standard_bullet_entity(world=world, start_pos=(5.0, 6.0), tag="enemy", damage=3)
+    assert reused == bullet
+    assert world.component_for_entity(reused, Combat) is combat
+    assert combat.collision_list == {}
+    assert combat.current_penetration_count == 0
+    assert combat.damage == 3
+    assert combat.max_penetration_count == 0
+    assert world.component_for_entity(reused, ProjectileState).current_lifetime == 5.0
+    assert world.component_for_entity(reused, Position) == Position(5.0, 6.0)
+    assert world.component_for_entity(reused, Tag).tag == "enemy"
+    assert world.pop_retired(BULLET_COMPONENT_TYPES) is None
+
+
+def test_volley_reuses_retired_bullets_first(world):
+    from src.entities.bullet.bullet import spawn_standard_bullets
+    old = [create_standard_bullet_entity(world=world) for _ in range(2)]
+    for ent in old:
+        world.delete_entity(ent, immediate=True)
+
+    spawned = spawn_standard_bullets(world, [dict(start_pos=(float(i), 0.0)) for i in range(4)])
+    assert len(spawned) == 4
+    assert set(old) <= set(spawned)
+    assert len(world.get_components(ProjectileState, Tag)) == 4
+
+
+def test_volley_returns_entities_in_volley_order(world):
+    from src.entities.bullet.bullet import spawn_standard_bullets
+    old = [create_standard_bullet_entity(world=world) for _ in range(2)]
+    for ent in old:
+        world.delete_entity(ent, immediate=True)
+
+    # 有爆炸的子彈沒有可重用的實體，插在重用的子彈之間
+    volley = [dict(start_pos=(float(i), 0.0), explosion_range=32.0 if i % 2 == 0 else 0.0) for i in range(4)]
+    spawned = spawn_standard_bullets(world, volley)
+    assert [world.component_for_entity(ent, Position).x for ent in spawned] == [0.0, 1.0, 2.0, 3.0]
+    assert set(spawned[1::2]) == set(old)
+
+
+def test_bullets_with_cold_components_use_their_own_pool(world):
+    plain = create_standard_bullet_entity(world=world)
+    exploding = create_standard_bullet_entity(world=world, explosion_range=32.0)
+    explosion = world.component_for_entity(exploding, Explosion)
+    world.delete_entity(plain, immediate=True)
+    world.delete_entity(exploding, immediate=True)
+
+    reused = create_standard_bullet_entity(world=world, explosion_range=64.0, explosion_damage=4)
+    assert reused == exploding
+    assert world.component_for_entity(reused, Explosion) is explosion
+    assert explosion.range == 64.0 and explosion.damage == 4
+    assert create_standard_bullet_entity(world=world) == plain
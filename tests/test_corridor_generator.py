@@ -121,7 +121,7 @@ def test_expand_corridors(generator, empty_grid):
     # 驗證更遠的地方沒有受影響
     assert empty_grid[8][10] == 'Outside'
 
-def test_no_path_found_warning(generator, mock_pathfinder, empty_grid, capsys):
+def test_no_path_found_warning(generator, mock_pathfinder, empty_grid, caplog):
     """測試當無法找到路徑時的處理"""
     room1 = Room(1, 0, 0, 10, 10, RoomType.NORMAL)
     room2 = Room(2, 20, 0, 10, 10, RoomType.NORMAL)
@@ -131,9 +131,8 @@ def test_no_path_found_warning(generator, mock_pathfinder, empty_grid, capsys):
     
     generator._create_corridor(room1, room2, empty_grid)
     
-    # 驗證是否有打印警告
-    captured = capsys.readouterr()
-    assert "Warning: Could not find path" in captured.out
+    # 驗證是否有記錄警告
+    assert "Warning: Could not find path" in caplog.text
     
     # 驗證網格沒有被修改 (應該全是 Outside)
     assert empty_grid[5][5] == 'Outside'
\ No newline at end of file
@@ -31,6 +31,7 @@ mock_modules_dict = {
     'src.entities.npc.magic_crystal_npc': MagicMock(),
     'src.entities.npc.trader_npc': MagicMock(),
     'src.entities.npc.treasure_npc': MagicMock(),
+    'src.entities.npc.win_npc': MagicMock(),
 }
 
 mock_modules_dict['src.core.config'].TILE_SIZE = 32
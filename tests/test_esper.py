@@ -0,0 +1,718 @@
+import pytest
+from dataclasses import dataclass
+
+import esper
+
+
+@dataclass
+class Position:
+    x: float = 0.0
+    y: float = 0.0
+
+
+@dataclass
+class Velocity:
+    x: float = 0.0
+    y: float = 0.0
+
+
+@dataclass
+class Tag:
+    tag: str = "untagged"
+
+
+@pytest.fixture
+def world():
+    """每個測試使用獨立的 World，結束後切回原本的 World 並刪除。"""
+    previous = esper.current_world
+    esper.switch_world("test_esper")
+    esper.clear_database()
+    yield esper
+    esper.switch_world(previous)
+    esper.delete_world("test_esper")
+
+
+def _ids(results):
+    return sorted(ent for ent, _ in results)
+
+
+def test_create_entity_with_components_is_queryable(world):
+    ent = world.create_entity(Position(1, 2), Velocity(3, 4))
+    assert world.get_components(Position, Velocity) == [(ent, [Position(1, 2), Velocity(3, 4)])]
+    assert world.get_component(Position) == [(ent, Position(1, 2))]
+
+
+def test_cached_query_updates_on_add_component(world):
+    ent = world.create_entity(Position())
+    assert world.get_components(Position, Velocity) == []
+
+    world.add_component(ent, Velocity(1, 0))
+    assert _ids(world.get_components(Position, Velocity)) == [ent]
+
+
+def test_cached_query_updates_on_remove_component(world):
+    ent = world.create_entity(Position(), Velocity())
+    other = world.create_entity(Position(), Velocity())
+    assert _ids(world.get_components(Position, Velocity)) == [ent, other]
+
+    removed = world.remove_component(ent, Velocity)
+    assert removed == Velocity()
+    assert _ids(world.get_components(Position, Velocity)) == [other]
+    assert _ids(world.get_component(Position)) == [ent, other]
+
+
+def test_replacing_component_updates_cached_rows(world):
+    ent = world.create_entity(Position(0, 0), Velocity())
+    world.get_components(Position, Velocity)
+    world.get_component(Position)
+
+    world.add_component(ent, Position(5, 5))
+    assert world.get_components(Position, Velocity)[0][1][0] == Position(5, 5)
+    assert world.get_component(Position)[0][1] == Position(5, 5)
+
+
+def test_delete_entity_is_deferred_until_clear(world):
+    ent = world.create_entity(Position())
+    world.get_component(Position)
+
+    world.delete_entity(ent)
+    assert not world.entity_exists(ent)
+    assert _ids(world.get_component(Position)) == [ent]
+
+    world.clear_dead_entities()
+    assert world.get_component(Position) == []
+    with pytest.raises(KeyError):
+        world.component_for_entity(ent, Position)
+
+
+def test_immediate_delete_updates_queries(world):
+    ent = world.create_entity(Position(), Tag())
+    world.get_components(Position, Tag)
+    world.delete_entity(ent, immediate=True)
+    assert world.get_components(Position, Tag) == []
+    with pytest.raises(KeyError):
+        world.delete_entity(ent, immediate=True)
+
+
+def test_returned_lists_are_not_mutated(world):
+    """已回傳的查詢列表不會被之後的結構變更修改，可以安全地邊迭代邊新增/刪除。"""
+    first = world.create_entity(Position())
+    snapshot = world.get_component(Position)
+
+    second = world.create_entity(Position())
+    world.remove_component(first, Position)
+    assert _ids(snapshot) == [first]
+    assert _ids(world.get_component(Position)) == [second]
+
+
+def test_unchanged_query_returns_same_list(world):
+    world.create_entity(Position(), Velocity())
+    result = world.get_components(Position, Velocity)
+
+    # 不影響此查詢的結構變更不應使快取失效
+    world.create_entity(Tag())
+    assert world.get_components(Position, Velocity) is result
+
+
+def test_query_results_match_brute_force(world):
+    import random
+    rng = random.Random(1)
+    types = (Position, Velocity, Tag)
+    entities = []
+    queries = [(Position,), (Position, Velocity), (Velocity, Tag), (Position, Velocity, Tag)]
+
+    for _ in range(300):
+        roll = rng.random()
+        if roll < 0.4 or not entities:
+            comps = [t() for t in types if rng.random() < 0.6]
+            entities.append(world.create_entity(*comps))
+        elif roll < 0.7:
+            world.add_component(rng.choice(entities), rng.choice(types)())
+        elif roll < 0.85:
+            ent = rng.choice(entities)
+            comp_type = rng.choice(types)
+            if world.has_component(ent, comp_type):
+                world.remove_component(ent, comp_type)
+        else:
+            ent = entities.pop(rng.randrange(len(entities)))
+            world.delete_entity(ent, immediate=True)
+
+        for query in queries:
+            expected = sorted(ent for ent in entities if world.has_components(ent, *query))
+            if len(query) == 1:
+                assert _ids(world.get_component(query[0])) == expected
+            else:
+                assert _ids(world.get_components(*query)) == expected
+
+
+def test_clear_cache_rebuilds_queries(world):
+    ent = world.create_entity(Position(), Velocity())
+    world.get_components(Position, Velocity)
+    world.clear_cache()
+    assert _ids(world.get_components(Position, Velocity)) == [ent]
+    other = world.create_entity(Position(), Velocity())
+    assert _ids(world.get_components(Position, Velocity)) == [ent, other]
+
+
+def test_worlds_keep_separate_archetypes(world):
+    ent = world.create_entity(Position())
+    world.get_component(Position)
+
+    world.switch_world("test_esper_other")
+    try:
+        assert world.get_component(Position) == []
+        world.create_entity(Position(), Velocity())
+        assert len(world.get_components(Position, Velocity)) == 1
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+
+    assert _ids(world.get_component(Position)) == [ent]
+    assert world.get_components(Position, Velocity) == []
+
+
+def test_move_entity_transfers_components_to_another_world(recycling):
+    world = recycling
+    world.create_entity(Tag("stays"))
+    ent = world.create_entity(Position(1, 2), Tag("player"))
+    pos = world.component_for_entity(ent, Position)
+    world.get_components(Position, Tag)
+
+    moved = world.move_entity(ent, "test_esper_other")
+    try:
+        assert world.current_world == "test_esper"
+        assert not world.entity_exists(ent)
+        assert world.get_components(Position, Tag) == []
+        assert world.pop_retired((Position, Tag)) is None
+
+        world.switch_world("test_esper_other")
+        assert moved == 1
+        assert world.component_for_entity(moved, Position) is pos
+        assert _ids(world.get_components(Position, Tag)) == [moved]
+        assert world.move_entity(moved, "test_esper_other") == moved
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+
+
+def test_move_entity_keeps_column_component_identity(columns):
+    world = columns
+    ent = world.create_entity(Position(3, 4), Velocity(1, 0))
+    pos = world.component_for_entity(ent, Position)
+
+    moved = world.move_entity(ent, "test_esper_other")
+    try:
+        world.switch_world("test_esper_other")
+        assert world.component_for_entity(moved, Position) is pos
+        pos.x = 7
+        assert world.get_column_store(Position).column('x')[0] == 7.0
+        assert world.component_for_entity(moved, Velocity) == Velocity(1, 0)
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+    assert len(world.get_column_store(Position).entities) == 0
+
+
+def test_clear_database_resets_entity_ids(world):
+    world.create_entity(Position())
+    world.clear_database()
+    assert world.get_component(Position) == []
+    assert world.create_entity(Position()) == 1
+
+
+def test_spawn_inserts_all_components_at_once(world):
+    world.get_components(Position, Velocity)
+    ent = world.spawn(Position(1, 1), Velocity(2, 2), Tag("enemy"))
+    assert world.components_for_entity(ent) == (Position(1, 1), Velocity(2, 2), Tag("enemy"))
+    assert _ids(world.get_components(Position, Velocity)) == [ent]
+
+
+def test_spawn_many_returns_ids_in_order(world):
+    snapshot = world.get_components(Position, Tag)
+    entities = world.spawn_many([
+        (Position(i, 0), Tag("bullet")) for i in range(5)
+    ] + [(Position(), Velocity())])
+
+    assert entities == sorted(entities)
+    assert snapshot == []
+    assert _ids(world.get_components(Position, Tag)) == entities[:5]
+    assert _ids(world.get_component(Position)) == entities
+    assert [world.component_for_entity(ent, Position).x for ent in entities[:5]] == list(range(5))
+
+
+def test_spawn_many_empty(world):
+    assert world.spawn_many([]) == []
+
+
+def test_restore_entities_keeps_ids(world):
+    world.get_components(Position, Tag)
+    world.restore_entities([7, 3], [(Position(1, 1), Tag("enemy")), (Velocity(),)])
+
+    assert _ids(world.get_components(Position, Tag)) == [7]
+    assert world.component_for_entity(3, Velocity) == Velocity()
+    assert set(world.get_component_types()) == {Position, Tag, Velocity}
+    assert world.create_entity(Position()) == 8
+
+    with pytest.raises(ValueError):
+        world.restore_entities([3], [(Position(),)])
+    assert world.component_for_entity(3, Velocity) == Velocity()
+
+
+def test_world_generation_changes_on_clear_and_restore(world):
+    first = world.world_generation()
+    world.create_entity(Position())
+    assert world.world_generation() == first
+    world.clear_database()
+    cleared = world.world_generation()
+    world.restore_entities([4], [(Position(),)])
+    assert len({first, cleared, world.world_generation()}) == 3
+
+
+def test_command_buffer_defers_structural_changes(world):
+    ent = world.create_entity(Position())
+    snapshot = world.get_component(Position)
+
+    spawned = world.command_buffer.spawn(Position(1, 1), Tag())
+    world.command_buffer.add_component(ent, Velocity())
+    world.command_buffer.remove_component(ent, Position)
+    assert not world.entity_exists(spawned)
+    assert world.get_component(Position) is snapshot
+
+    world.command_buffer.playback()
+    assert world.components_for_entity(spawned) == (Position(1, 1), Tag())
+    assert world.components_for_entity(ent) == (Velocity(),)
+    assert _ids(world.get_component(Position)) == [spawned]
+
+
+def test_command_buffer_delete_hides_entity_until_playback(world):
+    ent = world.create_entity(Position())
+    world.command_buffer.delete_entity(ent)
+    assert not world.entity_exists(ent)
+    # 組件在回放前仍可讀取
+    assert world.component_for_entity(ent, Position) == Position()
+
+    world.command_buffer.add_component(ent, Velocity())
+    world.command_buffer.playback()
+    assert ent not in world._entities
+    assert world.get_component(Position) == []
+
+
+def test_command_buffer_skips_stale_commands(world):
+    ent = world.create_entity(Position())
+    world.command_buffer.add_component(ent, Velocity())
+    world.command_buffer.remove_component(ent, Tag)
+    world.delete_entity(ent, immediate=True)
+    world.command_buffer.playback()
+    assert world.get_component(Velocity) == []
+
+
+def test_command_buffer_call_runs_on_playback_in_order(world):
+    calls = []
+    spawned = world.command_buffer.spawn(Position())
+    world.command_buffer.call(lambda: calls.append(world.entity_exists(spawned)))
+    assert calls == []
+    world.command_buffer.playback()
+    assert calls == [True]
+    assert len(world.command_buffer) == 0
+
+
+def test_process_plays_back_after_all_processors(world):
+    seen = []
+
+    class Spawner(world.Processor):
+        def process(self):
+            world.command_buffer.spawn(Position())
+            world.command_buffer.spawn(Position())
+
+    class Reader(world.Processor):
+        def process(self):
+            seen.append(len(world.get_component(Position)))
+
+    world.add_processor(Spawner(), priority=1)
+    world.add_processor(Reader())
+    try:
+        world.process()
+        world.process()
+    finally:
+        world.remove_processor(Spawner)
+        world.remove_processor(Reader)
+    assert seen == [0, 2]
+
+
+@pytest.fixture
+def recycling(world):
+    world.set_recycling((Position, Tag), 2)
+    yield world
+    world.set_recycling((Position, Tag), 0)
+
+
+def test_restore_entities_skips_reserved_and_retired_ids(recycling):
+    world = recycling
+    plain = world.create_entity(Velocity())
+    bullets = [world.create_entity(Position(), Tag("bullet")) for _ in range(2)]
+    reserved = world.command_buffer.spawn(Position())
+    for ent in [plain] + bullets:
+        world.delete_entity(ent, immediate=True)
+
+    world.restore_entities([plain], [(Velocity(),)])
+
+    fresh = world.create_entity(Position())
+    assert fresh not in bullets + [reserved]
+    assert fresh == reserved + 1
+    world.command_buffer.playback()
+    assert world.component_for_entity(reserved, Position) == Position()
+
+
+def test_deleted_entity_is_retired_for_reuse(recycling):
+    world = recycling
+    ent = world.create_entity(Position(1, 1), Tag("bullet"))
+    world.create_entity(Position(), Velocity())
+    world.delete_entity(ent, immediate=True)
+
+    retired = world.pop_retired((Position, Tag))
+    assert retired is not None
+    entity, components = retired
+    assert entity == ent
+    assert components[Position] == Position(1, 1)
+    assert world.pop_retired((Position, Tag)) is None
+
+    assert world.respawn(entity, Position(2, 2), Tag("bullet")) == ent
+    assert world.component_for_entity(ent, Position) == Position(2, 2)
+    with pytest.raises(ValueError):
+        world.respawn(ent, Position())
+
+
+def test_recycling_respects_limit_and_exact_signature(recycling):
+    world = recycling
+    entities = [world.create_entity(Position(), Tag()) for _ in range(3)]
+    other = world.create_entity(Position(), Tag(), Velocity())
+    for ent in entities + [other]:
+        world.delete_entity(ent)
+    world.clear_dead_entities()
+
+    popped = [world.pop_retired((Position, Tag)) for _ in range(3)]
+    assert sum(item is not None for item in popped) == 2
+    assert other not in [item[0] for item in popped if item]
+
+
+def test_clear_database_drops_retired_entities(recycling):
+    world = recycling
+    world.delete_entity(world.create_entity(Position(), Tag()), immediate=True)
+    world.clear_database()
+    assert world.pop_retired((Position, Tag)) is None
+
+
+def test_command_buffer_respawn_and_spawn_many(recycling):
+    world = recycling
+    ent = world.create_entity(Position(), Tag())
+    world.delete_entity(ent, immediate=True)
+    entity, _ = world.pop_retired((Position, Tag))
+
+    world.command_buffer.respawn(entity, Position(5, 5), Tag())
+    batch = world.command_buffer.spawn_many([(Position(),), (Position(), Tag())])
+    assert not any(world.entity_exists(e) for e in [entity] + batch)
+
+    world.command_buffer.playback()
+    assert world.component_for_entity(entity, Position) == Position(5, 5)
+    assert _ids(world.get_components(Position, Tag)) == sorted([entity, batch[1]])
+
+
+@pytest.fixture
+def columns(world):
+    world.set_column_storage(Position)
+    world.set_column_storage(Velocity)
+    yield world
+    world.set_column_storage(Position, None)
+    world.set_column_storage(Velocity, None)
+
+
+def test_column_storage_keeps_attribute_access(columns):
+    world = columns
+    pos = Position(1, 2)
+    ent = world.create_entity(pos, Velocity(3, 4))
+    assert world.component_for_entity(ent, Position) is pos
+    assert isinstance(pos, Position) and pos == Position(1, 2)
+
+    pos.x += 10
+    store = world.get_column_store(Position)
+    assert list(store.column('x')) == [11.0]
+    store.column('y')[0] = 7
+    assert pos.y == 7.0
+    assert world.get_components(Position, Velocity) == [(ent, [Position(11, 7), Velocity(3, 4)])]
+
+
+def test_column_storage_compacts_slots_and_detaches(columns):
+    world = columns
+    first = Position(1, 1)
+    entities = [world.create_entity(first)] + [world.create_entity(Position(i, i)) for i in (2, 3)]
+    world.delete_entity(entities[0], immediate=True)
+
+    store = world.get_column_store(Position)
+    assert len(store) == 2
+    assert sorted(store.column('x')) == [2.0, 3.0]
+    assert [world.component_for_entity(ent, Position).x for ent in entities[1:]] == [2.0, 3.0]
+    # 離開欄位的組件恢復為一般實例並保留最後的數值
+    assert type(first) is Position and first == Position(1, 1)
+
+    removed = world.remove_component(entities[1], Position)
+    assert type(removed) is Position and removed.x == 2.0
+    assert list(store.column('x')) == [3.0]
+
+
+def test_column_batch_gathers_and_scatters_query_rows(columns):
+    world = columns
+    movers = [world.create_entity(Position(i, 0), Velocity(1, 2)) for i in range(4)]
+    world.create_entity(Position(100, 100))
+
+    batch = world.get_column_batch(Position, Velocity)
+    assert batch.entities == movers
+    xs = [x + vx for x, vx in zip(batch.gather(Position, 'x'), batch.gather(Velocity, 'x'))]
+    batch.scatter(Position, 'x', xs)
+    assert [world.component_for_entity(ent, Position).x for ent in movers] == [1.0, 2.0, 3.0, 4.0]
+    assert world.get_column_batch(Position, Velocity) is batch
+
+    # 其他實體被刪除時欄位會搬移，批次必須重建
+    world.delete_entity(movers[0], immediate=True)
+    rebuilt = world.get_column_batch(Position, Velocity)
+    assert rebuilt is not batch
+    assert rebuilt.entities == movers[1:]
+    assert list(rebuilt.gather(Position, 'x')) == [2.0, 3.0, 4.0]
+
+
+def test_column_batch_requires_column_storage(columns):
+    with pytest.raises(ValueError):
+        columns.get_column_batch(Position, Tag)
+
+
+def test_column_components_replaced_or_copied_between_worlds(columns):
+    world = columns
+    ent = world.create_entity(Position(1, 1))
+    old = world.component_for_entity(ent, Position)
+    world.add_component(ent, Position(5, 5))
+    assert type(old) is Position and old == Position(1, 1)
+    assert world.component_for_entity(ent, Position).x == 5.0
+
+    components = world.components_for_entity(ent)
+    world.switch_world("test_esper_other")
+    try:
+        copy = world.create_entity(*components)
+        assert world.try_component(copy, Position) == Position(5, 5)
+        world.component_for_entity(copy, Position).x = 9
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+    assert world.component_for_entity(ent, Position).x == 5.0
+
+
+def test_disabling_column_storage_restores_plain_components(world):
+    world.set_column_storage(Position, 'float32')
+    try:
+        ent = world.create_entity(Position(0.1, 2))
+        assert world.component_for_entity(ent, Position).x != 0.1
+    finally:
+        world.set_column_storage(Position, None)
+    pos = world.component_for_entity(ent, Position)
+    assert type(pos) is Position
+    assert pos.y == 2.0
+    assert world.get_component(Position) == [(ent, pos)]
+
+
+@pytest.fixture
+def tags(world):
+    previous = (esper._tag_type, esper._tag_attribute)
+    world.set_tag_index(Tag)
+    yield world
+    world.set_tag_index(*previous)
+
+
+def test_tag_index_follows_component_changes(tags):
+    world = tags
+    a = world.create_entity(Position(1, 1), Tag("enemy"))
+    b, c = world.spawn_many([(Position(2, 2), Tag("player")), (Tag("enemy"),)])
+    assert world.get_tagged("enemy", Position) == [(a, [Position(1, 1)])]
+    assert world.get_tagged("enemy") == [(a, []), (c, [])]
+    assert world.get_tagged("missing", Position) == []
+
+    world.add_component(b, Tag("enemy"))
+    world.retag(a, "player")
+    assert world.component_for_entity(a, Tag) == Tag("player")
+    assert _ids(world.get_tagged("player")) == [a]
+    assert _ids(world.get_tagged("enemy")) == [b, c]
+
+    world.remove_component(c, Tag)
+    world.delete_entity(b, immediate=True)
+    assert world.get_tagged("enemy") == []
+    assert world.get_tags() == ["player"]
+
+    world.clear_database()
+    assert world.get_tags() == []
+
+
+def test_tag_index_matches_brute_force(tags):
+    world = tags
+    for i in range(30):
+        components = [Position(i, i)]
+        if i % 3:
+            components.append(Tag("even" if i % 2 == 0 else "odd"))
+        if i % 4 == 0:
+            components.append(Velocity())
+        world.create_entity(*components)
+    for ent in range(1, 30, 5):
+        world.delete_entity(ent, immediate=True)
+
+    for tag in ("even", "odd"):
+        expected = sorted(ent for ent, (pos, tag_comp, _) in world.get_components(Position, Tag, Velocity)
+                          if tag_comp.tag == tag)
+        assert _ids(world.get_tagged(tag, Position, Velocity)) == expected
+
+
+def test_tag_index_is_per_world_and_follows_moved_entities(tags):
+    world = tags
+    ent = world.create_entity(Position(), Tag("player"))
+    try:
+        moved = world.move_entity(ent, "test_esper_other")
+        assert world.get_tagged("player") == []
+        world.switch_world("test_esper_other")
+        assert world.get_tagged("player", Position) == [(moved, [Position()])]
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+
+
+def test_set_tag_index_indexes_existing_entities(world):
+    previous = (esper._tag_type, esper._tag_attribute)
+    ent = world.create_entity(Velocity(), Tag("bullet"))
+    try:
+        world.set_tag_index(Velocity, 'x')
+        world.set_tag_index(Tag)
+        assert world.get_tagged("bullet", Velocity) == [(ent, [Velocity()])]
+        world.set_tag_index(None)
+        assert world.get_tagged("bullet") == []
+        with pytest.raises(ValueError):
+            world.retag(ent, "enemy")
+    finally:
+        world.set_tag_index(*previous)
+
+
+@pytest.fixture
+def tracking(world):
+    world.set_change_tracking(Position)
+    yield world
+    world.set_change_tracking(Position, False)
+
+
+def test_change_tracking_reports_added_changed_and_removed(tracking):
+    world = tracking
+    a = world.create_entity(Position(1, 1))
+    b, c = world.spawn_many([(Position(2, 2), Tag()), (Velocity(),)])
+    assert world.get_added(Position, 0) == [(a, Position(1, 1)), (b, Position(2, 2))]
+
+    since = world.change_tick()
+    assert world.get_changed(Position, since) == []
+
+    world.component_for_entity(a, Position).x = 5
+    world.mark_changed(a, Position)
+    world.mark_changed(c, Position)  # 沒有 Position：忽略
+    world.add_component(c, Position(3, 3))
+    assert world.get_changed(Position, since) == [(a, Position(5, 1)), (c, Position(3, 3))]
+    assert world.get_added(Position, since) == [(c, Position(3, 3))]
+    assert world.is_changed(a, Position, since)
+    assert not world.is_changed(b, Position, since)
+
+    since = world.change_tick()
+    world.remove_component(a, Position)
+    world.delete_entity(b, immediate=True)
+    world.delete_entity(c)
+    assert world.get_removed(Position, since) == [a, b]
+    world.clear_dead_entities()
+    assert world.get_removed(Position, since) == [a, b, c]
+    assert world.get_changed(Position, 0) == []
+
+
+def test_change_tracking_orders_by_last_change(tracking):
+    world = tracking
+    entities = [world.create_entity(Position(i, 0)) for i in range(5)]
+    since = world.change_tick()
+    for ent in (entities[3], entities[1], entities[3]):
+        world.mark_changed(ent, Position)
+    assert [ent for ent, _ in world.get_changed(Position, since)] == [entities[1], entities[3]]
+
+
+def test_change_tracking_is_opt_in(world):
+    ent = world.create_entity(Position())
+    world.mark_changed(ent, Position)
+    with pytest.raises(ValueError):
+        world.get_changed(Position, 0)
+
+
+def test_change_ticks_stay_comparable_across_worlds(tracking):
+    world = tracking
+    ent = world.create_entity(Position())
+    try:
+        moved = world.move_entity(ent, "test_esper_other")
+        since = world.change_tick()
+        assert world.get_removed(Position, 0) == [ent]
+        world.switch_world("test_esper_other")
+        assert world.get_added(Position, 0) == [(moved, Position())]
+        world.mark_changed(moved, Position)
+        assert world.change_tick() > since
+        assert world.get_changed(Position, since) == [(moved, Position())]
+    finally:
+        world.switch_world("test_esper")
+        world.delete_world("test_esper_other")
+
+
+@dataclass
+class Hit:
+    target: int
+    amount: int = 0
+
+
+def test_events_are_collected_until_flush(world):
+    received = []
+
+    def on_hit(events):
+        received.append([event.target for event in events])
+
+    esper.subscribe(Hit, on_hit)
+    try:
+        world.emit(Hit(1))
+        world.emit(Hit(2))
+        assert [event.target for event in world.get_events(Hit)] == [1, 2]
+        assert world.get_events(Position) == []
+        world.flush_events()
+        assert received == [[1, 2]]
+        assert world.get_events(Hit) == []
+        # 訂閱者在 flush 期間發出的事件同樣會被處理
+        world.emit(Hit(3))
+        world.process()
+        assert received == [[1, 2], [3]]
+    finally:
+        esper.unsubscribe(Hit, on_hit)
+
+
+def test_event_handlers_cascade_and_are_weakly_held(world):
+    received = []
+
+    class Listener:
+        def on_hit(self, events):
+            received.extend(event.target for event in events)
+            if events[0].target == 1:
+                esper.emit(Hit(2))
+
+    listener = Listener()
+    esper.subscribe(Hit, listener.on_hit)
+    world.emit(Hit(1))
+    world.flush_events()
+    assert received == [1, 2]
+
+    del listener
+    world.emit(Hit(3))
+    world.flush_events()
+    assert received == [1, 2]
+
+
+def test_clear_database_discards_pending_events(world):
+    world.emit(Hit(1))
+    world.clear_database()
+    assert world.get_events(Hit) == []
@@ -0,0 +1,129 @@
+import contextlib
+import io
+
+import pygame
+import pytest
+import esper
+
+from src.core.config import LOBBY_WORLD, DUNGEON_WORLD
+from src.ecs.components import Buffs, PlayerComponent
+from src.ecs.systems import EntityWrapper
+from src.buffs.buff import Buff
+from src.menu.menu_config import MenuNavigation
+
+from src.core.input import ScriptedInput
+from src.core.headless import create_headless_game, enter_dungeon
+
+
+def test_scripted_input_replays_events_by_frame():
+    script = ScriptedInput().press(1, pygame.K_d, frames=2).click(2, (10, 20))
+    assert script.get_events() == []
+    assert not script.get_pressed()[pygame.K_d]
+
+    assert [event.type for event in script.get_events()] == [pygame.KEYDOWN]
+    assert script.get_pressed()[pygame.K_d]
+
+    assert [event.type for event in script.get_events()] == [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP]
+    assert script.get_mouse_pos() == (10, 20)
+    assert script.get_pressed()[pygame.K_d]
+
+    script.get_events()
+    assert not script.get_pressed()[pygame.K_d]
+
+
+@pytest.fixture
+def headless_game(monkeypatch):
+    previous_world = esper.current_world
+    previous_worlds = set(esper.list_worlds())
+    previous_game = getattr(esper, "game", None)
+    esper.switch_world("test_headless")
+
+    def no_flip():
+        raise AssertionError("headless mode must not flip the display")
+
+    monkeypatch.setattr(pygame.display, "flip", no_flip)
+    script = ScriptedInput().press(0, pygame.K_d, frames=30)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(script)
+        game.start_game()
+    yield game
+    esper.game = previous_game
+    esper.switch_world(previous_world)
+    for name in set(esper.list_worlds()) - previous_worlds:
+        esper.delete_world(name)
+
+
+def test_headless_game_simulates_scripted_input(headless_game):
+    game = headless_game
+    assert game.audio_manager.enabled is False
+    assert game.audio_manager.sound_effects == {}
+    game.audio_manager.play_sound_effect("skill_activate")
+
+    start_x = game.entity_manager.player.x
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert game.simulate(60) == 60
+        game.draw()
+    assert game.timestep.ticks == 60
+    assert game.entity_manager.player.x > start_x
+
+
+def test_headless_game_runs_a_dungeon_floor(headless_game):
+    with contextlib.redirect_stdout(io.StringIO()):
+        enter_dungeon(headless_game, 1)
+        assert headless_game.simulate(300) == 300
+    assert headless_game.timestep.ticks == 300
+
+
+def test_lobby_world_stays_resident_between_dungeon_runs(headless_game):
+    game = headless_game
+    player = game.entity_manager.player
+    player_component = player._get_player_comp()
+    lobby_tiles = game.dungeon_manager.dungeon.dungeon_tiles
+    lobby_npcs = set(esper._entities) - {player.ecs_entity}
+    assert esper.current_world == LOBBY_WORLD
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        enter_dungeon(game, 1)
+        game.simulate(30)
+    assert esper.current_world == DUNGEON_WORLD
+    assert player._get_player_comp() is player_component
+    assert game.dungeon_manager.dungeon.dungeon_tiles is not lobby_tiles
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.start_game()
+        game.simulate(5)
+    assert esper.current_world == LOBBY_WORLD
+    assert game.dungeon_manager.dungeon.dungeon_tiles is lobby_tiles
+    assert set(esper._entities) - {player.ecs_entity} == lobby_npcs
+    assert player._get_player_comp() is player_component
+    assert esper.component_for_entity(player.ecs_entity, PlayerComponent) is player_component
+
+    # 再次進入地牢時，上一趟的地牢 World 被整個丟棄
+    with contextlib.redirect_stdout(io.StringIO()):
+        enter_dungeon(game, 1)
+    assert player.ecs_entity == 1
+
+
+def test_open_menu_pauses_game_time(headless_game):
+    game = headless_game
+    with contextlib.redirect_stdout(io.StringIO()):
+        enter_dungeon(game, 1)
+    player = game.entity_manager.player.ecs_entity
+    haste = Buff("Haste", 5.0, "wind", {"speed_multiplier": 1.5})
+    EntityWrapper(player, esper, game).add_buff(haste)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(60):
+            game.update_frame(1 / 60)
+        paused_at = game.current_time
+
+        # 菜單開啟 10 秒：遊戲時間不前進，Buff 的到期時間也不會在關閉菜單後一次到期
+        game.menu_manager.open_menu(MenuNavigation.PAUSE_MENU)
+        for _ in range(100):
+            game.update_frame(0.1)
+        assert game.current_time == paused_at
+        game.menu_manager.close_menu(MenuNavigation.PAUSE_MENU)
+        for _ in range(5):
+            game.update_frame(1 / 60)
+
+    assert haste in esper.component_for_entity(player, Buffs).active_buffs
+    assert haste.remaining(game.current_time) == pytest.approx(4.0, abs=0.2)
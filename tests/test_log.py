@@ -0,0 +1,79 @@
+import io
+import logging
+
+import pytest
+
+from src.core import log
+
+
+@pytest.fixture
+def stream():
+    """configure 輸出到 StringIO，結束後還原 logging 的狀態 (讓其他測試的 caplog 正常運作)。"""
+    output = io.StringIO()
+    yield output
+    root = logging.getLogger(log.ROOT)
+    if log._handler is not None:
+        root.removeHandler(log._handler)
+        log._handler = None
+    root.propagate = True
+    root.setLevel(logging.NOTSET)
+    for name in log._overridden:
+        logging.getLogger(f"{log.ROOT}.{name}").setLevel(logging.NOTSET)
+    log._overridden.clear()
+    log._refresh()
+
+
+class Loud:
+    """被格式化時記錄次數，用來確認停用的訊息不會被格式化。"""
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "loud"
+
+
+def test_channels_follow_configured_levels(stream):
+    combat = log.channel("test.ecs.combat")
+    render = log.channel("test.render")
+    assert log.channel("test.ecs.combat") is combat
+
+    log.configure("WARNING", {"test.ecs": "DEBUG"}, stream=stream)
+    assert combat.debug_on and combat.info_on
+    assert not render.debug_on and not render.info_on
+
+    log.set_level("test.render", "info")
+    assert render.info_on and not render.debug_on
+
+    # 重新設定時，上一次的分類等級不再生效
+    log.configure("INFO", {}, stream=stream)
+    assert not combat.debug_on and combat.info_on
+
+
+def test_disabled_messages_are_not_formatted(stream):
+    channel = log.channel("test.lazy")
+    value = Loud()
+    log.configure("INFO", {}, stream=stream)
+
+    channel.debug("value %s", value)
+    assert value.count == 0 and stream.getvalue() == ""
+
+    channel.info("value %s", value)
+    assert value.count == 1
+    assert stream.getvalue() == "game.test.lazy INFO: value loud\n"
+
+
+def test_parse_spec():
+    assert log.parse_spec("") == (None, {})
+    assert log.parse_spec("debug") == ("debug", {})
+    assert log.parse_spec("info, ecs.combat=debug,render=warning") == (
+        "info", {"ecs.combat": "debug", "render": "warning"})
+
+
+def test_configure_reads_environment(stream, monkeypatch):
+    monkeypatch.setenv("GAME_LOG", "error,test.env=debug")
+    log.configure(stream=stream)
+    assert log.channel("test.env").debug_on
+    assert not log.channel("test.other").info_on
+    with pytest.raises(ValueError):
+        log.set_level("test.env", "loudest")
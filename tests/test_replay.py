@@ -0,0 +1,93 @@
+import contextlib
+import io
+import random
+
+import pygame
+import pytest
+import esper
+
+from src.core import replay, rng
+from src.core.headless import create_headless_game, enter_dungeon
+from src.core.input import ScriptedInput
+from src.entities.ecs_factory import create_boss_entity
+from benchmarks.headless_soak import random_script
+
+
+@pytest.fixture
+def isolated_worlds():
+    previous_world = esper.current_world
+    previous_worlds = set(esper.list_worlds())
+    previous_game = getattr(esper, "game", None)
+    yield
+    esper.game = previous_game
+    esper.switch_world(previous_world)
+    for name in set(esper.list_worlds()) - previous_worlds:
+        esper.delete_world(name)
+
+
+def test_recording_input_round_trip(tmp_path):
+    script = ScriptedInput().press(1, pygame.K_d, frames=2).click(2, (10, 20)).key_down(3, pygame.K_e)
+    recording = replay.Recording(seed=5)
+    source = replay.RecordingInput(script, recording)
+    recorded = []
+    for frame in range(5):
+        events = source.get_events(0.01 * frame)
+        recorded.append(([(event.type, event.dict) for event in events],
+                         source.get_pressed()[pygame.K_d], source.get_mouse_pos()))
+
+    path = tmp_path / "input.replay"
+    recording.save(str(path))
+    loaded = replay.Recording.load(str(path))
+    assert loaded.dts == [0.0, 0.01, 0.02, 0.03, 0.04]
+    assert loaded.seed == 5
+
+    player = replay.ReplayInput(loaded)
+    for expected in recorded:
+        events = player.get_events()
+        assert ([(event.type, event.dict) for event in events],
+                player.get_pressed()[pygame.K_d], player.get_mouse_pos()) == expected
+    assert recorded[2][2] == (10, 20)
+    assert [attrs["key"] for _, attrs in recorded[3][0]] == [pygame.K_d, pygame.K_e]
+
+
+def test_rng_streams_follow_master_seed():
+    rng.seed(42)
+    first = [stream.random() for stream in rng.STREAMS.values()]
+    rng.seed(42)
+    assert [stream.random() for stream in rng.STREAMS.values()] == first
+    assert len(set(first)) == len(first)
+    assert rng.current_seed() == 42
+
+
+def _boss_fight(game):
+    """錄影之外的設定 (直接進入地牢並在玩家旁生成 Boss)，錄製與重播時都要執行。"""
+    enter_dungeon(game, 1)
+    player = game.entity_manager.player
+    create_boss_entity(esper, player.x + 3 * 32, player.y, game)
+
+
+def test_replay_reproduces_recorded_session(isolated_worlds, tmp_path):
+    esper.switch_world("test_replay")
+    jitter = random.Random(2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(random_script(900, seed=5))
+        recording = replay.record(game, seed=11)
+        _boss_fight(game)
+        # 不固定的幀時間：每幀 0 ~ 2 個模擬 tick
+        for _ in range(600):
+            assert game.update_frame(jitter.uniform(0.004, 0.04))
+    expected = replay.world_digest(game)
+    ticks = game.timestep.ticks
+    path = tmp_path / "boss.replay"
+    recording.save(str(path))
+
+    for _ in range(2):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = replay.replay_game(replay.Recording.load(str(path)))
+            _boss_fight(game)
+            # 重播期間的畫面特效取用 random 模組，不影響遊戲邏輯的亂數
+            random.random()
+            assert replay.play(game, recording) == 600
+        assert game.timestep.ticks == ticks
+        assert replay.world_digest(game) == expected
+        assert game.storage_manager.persistent is False
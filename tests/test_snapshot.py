@@ -0,0 +1,226 @@
+import contextlib
+import io
+from dataclasses import dataclass
+
+import pygame
+import pytest
+import esper
+
+from src.buffs.element_buff import ELEMENTAL_BUFFS
+from src.core import rng, snapshot
+from src.core.config import TILE_SIZE
+from src.core.headless import create_headless_game, enter_dungeon
+from src.core.input import ScriptedInput
+from src.buffs.buff import Buff
+from src.ecs.components import AI, Buffs, Health, Renderable
+from src.ecs.systems import EntityWrapper
+from src.entities.bullet.bullet import create_standard_bullet_entity
+from src.dungeon.config.dungeon_config import RoomType
+from src.entities.ecs_factory import create_boss_entity, create_enemy1_entity
+from src.entities.sprites import sprite
+from benchmarks.headless_soak import random_script
+
+
+@dataclass
+class Local:
+    """測試模組中的類別不在受信任的模組內，不會寫入快照。"""
+    value: int = 0
+
+
+@pytest.fixture
+def headless_game():
+    previous_world = esper.current_world
+    previous_worlds = set(esper.list_worlds())
+    previous_game = getattr(esper, "game", None)
+    esper.switch_world("test_snapshot")
+    rng.seed(3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = create_headless_game(random_script(2000, seed=3))
+        enter_dungeon(game, 1)
+    yield game
+    esper.game = previous_game
+    esper.switch_world(previous_world)
+    for name in set(esper.list_worlds()) - previous_worlds:
+        esper.delete_world(name)
+
+
+def _plain(value):
+    """把組件的值轉為可比較的形式 (Surface 比較像素，物件比較屬性；回呼不一定能還原，視為 None)。"""
+    if isinstance(value, pygame.Surface):
+        return value.get_size(), pygame.image.tobytes(value, "RGBA")
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if callable(value):
+        return None
+    if hasattr(value, '__dict__') or hasattr(type(value), '__slots__'):
+        return type(value).__name__, _plain(snapshot._object_state(value))
+    return value
+
+
+def _world_state():
+    state = {}
+    for entity in esper._entities:
+        for component in esper.components_for_entity(entity):
+            names = snapshot._fields_of(type(component))
+            state[entity, type(component).__name__] = {
+                name: _plain(getattr(component, name)) for name in names if name != 'actions'}
+            if isinstance(component, AI):
+                state[entity, 'actions'] = {
+                    name: _plain({key: value for key, value in vars(action).items() if not callable(value)})
+                    for name, action in component.actions.items()}
+    return state
+
+
+def test_snapshot_round_trip_restores_world(headless_game, tmp_path):
+    game = headless_game
+    player = game.entity_manager.player
+    enemy = create_enemy1_entity(esper, player.x + 64, player.y, game)
+    create_boss_entity(esper, player.x - 64, player.y, game)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.simulate(120)
+    assert esper.entity_exists(enemy)
+    burn = ELEMENTAL_BUFFS['fire'].deepcopy()
+    burn.effect_time = 1.25
+    esper.component_for_entity(enemy, Buffs).active_buffs.append(burn)
+
+    path = tmp_path / "floor.snap"
+    nbytes = game.storage_manager.quick_save(str(path)) and path.stat().st_size
+    assert nbytes > 0
+    state = _world_state()
+    tiles = [list(row) for row in game.dungeon_manager.dungeon.dungeon_tiles]
+    fog = [list(row) for row in game.render_manager.fog_map]
+    player_entity = game.entity_manager.player.ecs_entity
+    current_time = game.current_time
+    skill_chain = game.entity_manager.player.skill_chain
+
+    # 存檔後繼續遊戲並換一個樓層，再讀檔回到存檔的瞬間
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.simulate(60)
+        enter_dungeon(game, 1)
+        assert game.storage_manager.quick_load(str(path))
+
+    assert _world_state() == state
+    assert game.dungeon_manager.dungeon.dungeon_tiles == tiles
+    assert game.render_manager.fog_map == fog
+    assert game.entity_manager.player.ecs_entity == player_entity
+    assert game.entity_manager.player.skill_chain is skill_chain
+    assert game.current_time == current_time
+
+    # 不在快照中的部分已重建：Buff 回呼、行為樹，新實體的 ID 接在最大的 ID 之後
+    restored = esper.component_for_entity(enemy, Buffs).active_buffs[-1]
+    assert restored.effect_time == 1.25
+    assert restored.effect_per_second is ELEMENTAL_BUFFS['fire'].effect_per_second
+    ai = esper.component_for_entity(enemy, AI)
+    assert ai.behavior_tree is not None
+    assert ai.behavior_tree.children[1].actions is ai.actions
+    assert esper.create_entity(Health()) == max(entity for entity, _ in state) + 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert game.simulate(120) == 120
+
+
+def test_value_encoder_round_trip():
+    surface = pygame.Surface((3, 2), pygame.SRCALPHA)
+    surface.fill((10, 20, 30, 40))
+    value = {
+        "numbers": (1, -2.5, 2 ** 70, True, None),
+        "tiles": ["Room_floor", "Door", "Room_floor"],
+        "nested": [{1, 2}, frozenset({"a"}), b"\x00\xff"],
+        "enum": RoomType.BOSS,
+        "component": Buffs(active_buffs=[Health(current_hp=7)]),
+        "local": Local(),
+        "function": snapshot.dumps,
+        "surfaces": [surface, surface],
+        "closure": lambda: None,
+    }
+
+    encoder = snapshot._Encoder()
+    out = bytearray()
+    encoder.pack(value, out)
+    assert encoder.dropped == {"function": 1, "Local": 1}
+
+    strings = list(encoder.strings)
+    decoder = snapshot._Decoder(None, strings, encoder.surface_index.tolist(), memoryview(bytes(encoder.pixels)))
+    (result,) = decoder.unpack_all(memoryview(bytes(out)), 1)
+
+    assert result["numbers"] == (1, -2.5, 2 ** 70, True, None)
+    assert result["tiles"] == ["Room_floor", "Door", "Room_floor"]
+    assert result["nested"] == [{1, 2}, frozenset({"a"}), b"\x00\xff"]
+    assert result["enum"] is RoomType.BOSS
+    assert result["component"] == Buffs(active_buffs=[Health(current_hp=7)])
+    assert result["local"] is None
+    assert result["function"] is snapshot.dumps
+    assert result["closure"] is None
+    first, second = result["surfaces"]
+    assert first is second
+    assert first.get_at((2, 1)) == pygame.Color(10, 20, 30, 40)
+
+
+def test_snapshot_stores_action_state_and_sprite_keys(headless_game, tmp_path):
+    game = headless_game
+    player = game.entity_manager.player
+    enemy = create_enemy1_entity(esper, player.x + 64, player.y, game)
+    boss = create_boss_entity(esper, player.x - 64, player.y, game)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.simulate(120)
+    patrol = esper.component_for_entity(enemy, AI).actions['patrol']
+    patrol.current_waypoint = 3
+    patrol.timer = 1.5
+
+    sections = snapshot.capture(game)
+    # 動作的設定與閉包由 AI.brain 重建，只寫入 state_fields；精靈圖只寫入鍵值，
+    # 只有字型繪製的傷害數字仍存像素
+    assert b"direction_source" not in sections['strings'][1]
+    texts = sum(1 for _, rend in esper.get_component(Renderable) if rend.shape == "text")
+    assert len(sections['surface_index'][1]) == texts * 3 * 8
+    path = tmp_path / "floor.snap"
+    snapshot.save(game, str(path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.simulate(60)
+        snapshot.load(game, str(path))
+
+    patrol = esper.component_for_entity(enemy, AI).actions['patrol']
+    assert (patrol.current_waypoint, patrol.timer) == (3, 1.5)
+    assert esper.component_for_entity(enemy, Renderable).image is sprite('enemy1', TILE_SIZE // 2, TILE_SIZE // 2)
+    assert esper.component_for_entity(boss, Renderable).image is sprite('boss', TILE_SIZE * 3, TILE_SIZE * 3)
+
+
+def test_snapshot_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(b"not a snapshot at all")
+
+    out = bytearray()
+    encoder = snapshot._Encoder()
+    encoder.pack(snapshot.dumps, out)
+    decoder = snapshot._Decoder(None, ["os:system"], [], memoryview(b""))
+    with pytest.raises(ValueError):
+        decoder.unpack_all(memoryview(bytes(out)), 1)
+
+
+def test_schedules_restart_from_the_loaded_clock(headless_game, tmp_path):
+    """載入快照後，壽命與 Buff 依快照中的遊戲時間排程，而不是載入前的時鐘。"""
+    game = headless_game
+    player = game.entity_manager.player
+    health = esper.component_for_entity(player.ecs_entity, Health)
+    health.max_hp, health.current_hp = 10000, 100
+    esper.mark_changed(player.ecs_entity, Health)
+    EntityWrapper(player.ecs_entity, esper, game).add_buff(
+        Buff("Regen", 100.0, "wood", {"health_regen_per_second": 5}))
+    bullet = create_standard_bullet_entity(start_pos=(player.x, player.y), tag="player", max_speed=0.0, lifetime=2.0)
+    path = tmp_path / "floor.snap"
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.simulate(60)
+        assert game.storage_manager.quick_save(str(path))
+        game.simulate(1800)
+        assert not esper.entity_exists(bullet)
+        assert game.storage_manager.quick_load(str(path))
+
+        # 存檔時子彈還剩約 1 秒
+        game.simulate(30)
+        assert esper.entity_exists(bullet)
+        health_after_load = esper.component_for_entity(player.ecs_entity, Health).current_hp
+        game.simulate(60)
+    assert not esper.entity_exists(bullet)
+    # 每秒回復在載入後的下一個整數秒繼續
+    assert esper.component_for_entity(player.ecs_entity, Health).current_hp > health_after_load
@@ -0,0 +1,626 @@
+import random
+
+import pytest
+from types import SimpleNamespace
+
+import pygame
+import esper
+
+from src.core.config import PASSABLE_TILES, TILE_SIZE
+from src.ecs.components import (
+    Position, Velocity, Health, Defense, Combat, Collider, Renderable, Tag, Buffs, PercentageDamage, Explosion,
+    ExpansionLifecycle, ExpansionRenderData, TimerComponent
+)
+from src.ecs.ai import EnemyContext
+from src.ecs.collision import COLLISION_RULES, collision_layers, interacts
+from src.ecs.modifiers import (
+    ADDITIVE, MULTIPLICATIVE, SPEED_MULTIPLIER, modifier_kind, modifier_slot, modifier_value, modifier_vector
+)
+from src.ecs.events import DamageEvent
+from src.ecs.systems import (
+    BuffSystem, CombatSystem, HealthSystem, LifetimeSystem, MovementSystem, TimerSystem, EntityWrapper,
+    _bounds_overlap, _combat_bounds
+)
+from src.buffs.buff import Buff
+from src.buffs.element_buff import ELEMENTAL_BUFFS
+from src.entities.bullet.bullet import create_standard_bullet_entity
+from src.entities.ecs_factory import create_damage_text_entity
+
+
+@pytest.fixture
+def world():
+    previous_world = esper.current_world
+    previous_game = getattr(esper, "game", None)
+    pygame.font.init()
+    esper.switch_world("test_systems")
+    esper.clear_database()
+    esper.game = SimpleNamespace(on_player_death=lambda: None)
+    yield esper
+    esper.game = previous_game
+    esper.switch_world(previous_world)
+    esper.delete_world("test_systems")
+
+
+def _enemy(world, x, y, hp=100):
+    return world.create_entity(
+        Position(x=x, y=y), Health(max_hp=hp, current_hp=hp), Defense(),
+        Combat(damage=0), Collider(w=32, h=32), Tag(tag="enemy"),
+    )
+
+
+def test_destroyed_bullet_does_not_hit_again_in_same_frame(world):
+    """穿透上限為 0 的子彈命中第一個目標後即被銷毀，同一幀內不應再命中第二個目標。"""
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    first = _enemy(world, 100, 100)
+    second = _enemy(world, 104, 100)
+    bullet = create_standard_bullet_entity(world=world, start_pos=(102.0, 100.0), tag="player",
+                                           damage=10, max_penetration_count=0)
+
+    world.process(0.0)
+
+    hp = [world.component_for_entity(ent, Health).current_hp for ent in (first, second)]
+    assert sorted(hp) == [90, 100]
+    assert not world.entity_exists(bullet)
+    assert bullet not in world._entities
+
+
+def test_untagged_combat_entities_still_collide(world):
+    """沒有 Tag 組件的戰鬥實體不在標籤索引中，仍歸入 "untagged" 組參與碰撞。"""
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    enemy = _enemy(world, 100, 100)
+    world.create_entity(Position(x=100, y=100), Combat(damage=7), Collider(w=32, h=32))
+
+    world.process(0.0)
+
+    assert world.component_for_entity(enemy, Health).current_hp == 93
+
+
+def test_enemy_context_finds_player_bullets_by_tag(world):
+    enemy = _enemy(world, 0, 0)
+    bullet = create_standard_bullet_entity(world=world, start_pos=(40.0, 0.0), tag="player", damage=1)
+    context = EnemyContext(world, enemy, esper.game, ai_comp=object())
+
+    assert context.get_entities_with_tag("player") == [(bullet, [Position(x=40.0, y=0.0)])]
+    world.retag(bullet, "enemy")
+    assert context.get_entities_with_tag("player") == []
+
+
+def test_buff_modifiers_are_recomputed_only_when_buffs_change(world):
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    EntityWrapper(ent, world, esper.game).add_buff(Buff("Haste", 10.0, "wind", {"speed_multiplier": 1.5}))
+
+    world.process(0.1)
+    assert buffs.modifiers == modifier_vector({"speed_multiplier": 1.5})
+    buffs.modifiers[SPEED_MULTIPLIER] = 9.0
+    world.process(0.1)
+    assert buffs.modifiers[SPEED_MULTIPLIER] == 9.0  # 沒有變更，不重算
+
+    # 外部移除最後一個 buff 後 mark_changed，修正值也會被重設
+    buffs.active_buffs.clear()
+    world.mark_changed(ent, Buffs)
+    world.process(0.1)
+    assert buffs.modifiers == modifier_vector()
+
+
+def test_buffs_expire_on_game_time_and_tick_effects_once_per_second(world):
+    world.add_processor(BuffSystem())
+    world.add_processor(HealthSystem())
+    ent = world.create_entity(Health(max_hp=100, current_hp=50), Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    ticks = []
+    regen = Buff("Regen", 2.5, "wood", {"health_regen_per_second": 10},
+                 effect_per_second=lambda wrapper: ticks.append(wrapper.id))
+    haste = Buff("Haste", 4.0, "wind", {"speed_multiplier": 1.5})
+    wrapper = EntityWrapper(ent, world, esper.game)
+    wrapper.add_buff(regen)
+    wrapper.add_buff(haste)
+
+    # 每秒效果在共用的整數秒 tick 批次套用，到期時間以遊戲時間計
+    for step in range(1, 13):
+        world.process(0.25, current_time=step * 0.25)
+        if step == 6:
+            assert regen.remaining(1.5) == 1.0
+            assert world.component_for_entity(ent, Health).current_hp == 60
+    assert ticks == [ent, ent]
+    assert world.component_for_entity(ent, Health).current_hp == 70
+    assert buffs.active_buffs == [haste]
+    assert buffs.modifiers[SPEED_MULTIPLIER] == 1.5
+
+    # 重新計時後標記變更，依新的持續時間重新排程
+    haste.restart(2.0)
+    world.mark_changed(ent, Buffs)
+    for step in range(13, 20):
+        world.process(0.25, current_time=step * 0.25)
+    assert haste.expires_at == 5.0
+    assert buffs.active_buffs == [haste]
+    world.process(0.25, current_time=5.0)
+    assert buffs.active_buffs == []
+    assert buffs.modifiers[SPEED_MULTIPLIER] == 1.0
+
+
+def test_disorder_extends_coexisting_buffs(world):
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    haste = Buff("Haste", 2.5, "wind", {"speed_multiplier": 1.5})
+    wrapper = EntityWrapper(ent, world, esper.game)
+    wrapper.add_buff(haste)
+    wrapper.add_buff(ELEMENTAL_BUFFS['wind'].deepcopy())
+
+    # Disorder 每秒把所有 Buff 延長 0.5 秒：Haste 在 t=1, 2, 3 各延長一次，於 t=4 到期而非 t=2.5
+    for step in range(1, 16):
+        world.process(0.25, current_time=step * 0.25)
+    assert haste in buffs.active_buffs
+    assert haste.expires_at == 4.0
+    world.process(0.25, current_time=4.0)
+    assert haste not in buffs.active_buffs
+    assert [buff.name for buff in buffs.active_buffs] == ["Disorder"]
+
+
+def test_buff_synthesis_is_checked_when_a_buff_is_added(world):
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    wrapper = EntityWrapper(ent, world, esper.game)
+    wrapper.add_buff(Buff("Burn", 3.0, "fire", {}))
+    world.process(0.1)
+    assert [buff.name for buff in buffs.active_buffs] == ["Burn"]
+
+    wrapper.add_buff(Buff("Humid", 3.0, "water", {}))
+    world.process(0.1)
+    assert [buff.name for buff in buffs.active_buffs] == ["Fog"]
+
+
+def test_modifiers_fold_by_registered_kind(world):
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    wrapper = EntityWrapper(ent, world, esper.game)
+    strong = ELEMENTAL_BUFFS['earth'].deepcopy()
+    strong.strength = 2.0
+    wrapper.add_buff(strong)
+    wrapper.add_buff(Buff("Guard", 5.0, "fire", {"fire_resistance_multiplier": 0.1, "damage_multiplier": 1.5}))
+    wrapper.add_buff(Buff("Ward", 5.0, "fire", {"fire_resistance_multiplier": 0.15, "dodge_rate_add": 0.05}))
+
+    world.process(0.1)
+
+    # 乘法：(0.9 - 1) * 2 + 1 = 0.8；加法：0.1 + 0.15
+    assert buffs.modifiers[SPEED_MULTIPLIER] == pytest.approx(0.8)
+    assert buffs.modifiers[modifier_slot("vision_radius_multiplier")] == pytest.approx(0.8)
+    assert buffs.modifiers[modifier_slot("damage_multiplier")] == 1.5
+    assert buffs.modifiers[modifier_slot("fire_resistance_multiplier")] == pytest.approx(0.25)
+    assert buffs.modifiers[modifier_slot("dodge_rate_add")] == 0.05
+    assert buffs.modifiers[modifier_slot("water_resistance_multiplier")] == 0.0
+
+    # 第一次出現的名稱依命名慣例註冊，較短的舊向量讀取時視為未修正
+    slot = modifier_slot("test_only_resistance_multiplier")
+    assert modifier_value(buffs.modifiers, slot) == 0.0
+    wrapper.add_buff(Buff("Odd", 5.0, "fire", {"test_only_resistance_multiplier": 0.3}))
+    world.process(0.1)
+    assert buffs.modifiers[slot] == 0.3
+    # 名稱中含 "add" (不限結尾) 者為加法，與舊的字串分類相同
+    assert modifier_kind("test_only_added_range") == ADDITIVE
+    assert modifier_kind("test_only_range_multiplier") == MULTIPLICATIVE
+
+
+_BUFF_TEMPLATES = {template.name: template for template in ELEMENTAL_BUFFS.values()}
+
+
+@pytest.mark.parametrize("rule", [
+    rule for rule in BuffSystem().synthesis_rules.items()
+    if rule[0][0] in _BUFF_TEMPLATES and rule[0][1] in _BUFF_TEMPLATES
+], ids=lambda rule: "+".join(rule[0]))
+def test_elemental_buff_pairs_synthesize(world, rule):
+    (first, second), result = rule
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    wrapper = EntityWrapper(ent, world, esper.game)
+    wrapper.add_buff(_BUFF_TEMPLATES[first].deepcopy())
+    wrapper.add_buff(_BUFF_TEMPLATES[second].deepcopy())
+
+    world.process(0.1)
+
+    expected = [result] if result in ELEMENTAL_BUFFS else []
+    assert [buff.name for buff in buffs.active_buffs] == expected
+
+
+def test_chained_buff_synthesis_resolves_in_one_tick(world):
+    world.add_processor(BuffSystem())
+    ent = world.create_entity(Buffs())
+    buffs = world.component_for_entity(ent, Buffs)
+    wrapper = EntityWrapper(ent, world, esper.game)
+    wrapper.add_buff(ELEMENTAL_BUFFS['wind'].deepcopy())
+    world.process(0.1)
+
+    # Burn + Humid = Fog，Fog 再與已有的 Disorder 合成為 Enpty
+    wrapper.add_buff(ELEMENTAL_BUFFS['fire'].deepcopy())
+    wrapper.add_buff(ELEMENTAL_BUFFS['water'].deepcopy())
+    world.process(0.1)
+    assert [buff.name for buff in buffs.active_buffs] == ["Enpty"]
+
+    # 多個組合同時成立時依規則順序：Humid 先與 Burn 合成，Cold 留下
+    buffs.active_buffs.clear()
+    for element in ('ice', 'fire', 'water'):
+        wrapper.add_buff(ELEMENTAL_BUFFS[element].deepcopy())
+    world.process(0.1)
+    assert sorted(buff.name for buff in buffs.active_buffs) == ["Cold", "Fog"]
+
+
+def test_percentage_damage_comes_from_cold_component(world):
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    plain = _enemy(world, 100, 100, hp=200)
+    boosted = _enemy(world, 300, 300, hp=200)
+    create_standard_bullet_entity(world=world, start_pos=(100.0, 100.0), tag="player", damage=10)
+    bullet = create_standard_bullet_entity(world=world, start_pos=(300.0, 300.0), tag="player", damage=10,
+                                           percentage_damage={'max_hp': 10, 'current_hp': 0, 'lose_hp': 0})
+    assert world.has_component(bullet, PercentageDamage)
+
+    world.process(0.0)
+
+    assert world.component_for_entity(plain, Health).current_hp == 190
+    assert world.component_for_entity(boosted, Health).current_hp == 170
+
+
+def test_death_and_damage_text_are_applied_after_frame(world):
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    target = _enemy(world, 100, 100, hp=5)
+    create_standard_bullet_entity(world=world, start_pos=(100.0, 100.0), tag="player", damage=10)
+
+    world.process(0.0)
+
+    assert not world.entity_exists(target)
+    # 傷害數字實體在回放後存在
+    assert any(rend.shape == "text" for _, (_, rend) in world.get_components(Position, Renderable))
+
+
+
+def _random_dungeon(rng, width=12, height=10):
+    floor, wall = sorted(PASSABLE_TILES)[0], 'Border_wall'
+    tiles = [[floor if rng.random() < 0.7 else wall for _ in range(width)] for _ in range(height)]
+    return SimpleNamespace(grid_width=width, grid_height=height, dungeon_tiles=tiles)
+
+
+def _random_scene(world, rng, dungeon, count=300):
+    span_x, span_y = dungeon.grid_width * TILE_SIZE, dungeon.grid_height * TILE_SIZE
+    for _ in range(count):
+        components = [
+            Position(rng.uniform(-TILE_SIZE, span_x + TILE_SIZE), rng.uniform(-TILE_SIZE, span_y + TILE_SIZE)),
+            Velocity(rng.choice([0.0, rng.uniform(-600, 600)]), rng.choice([0.0, rng.uniform(-600, 600)])),
+        ]
+        if rng.random() < 0.6:
+            components.append(Collider(pass_wall=rng.random() < 0.2, destroy_on_collision=rng.random() < 0.3))
+        if rng.random() < 0.3:
+            modifiers = {'speed_multiplier': rng.uniform(0.5, 2.0)} if rng.random() < 0.7 else {}
+            components.append(Buffs(modifiers=modifier_vector(modifiers)))
+        world.create_entity(*components)
+
+
+def _movement_state(world):
+    return {ent: (world.entity_exists(ent), pos.x, pos.y, vel.x, vel.y)
+            for ent, (pos, vel) in world.get_components(Position, Velocity)}
+
+
+def _simulate(world, seed, batched, with_dungeon=True, frames=8):
+    rng = random.Random(seed)
+    dungeon = _random_dungeon(rng)
+    world.game.dungeon_manager = SimpleNamespace(get_dungeon=lambda: dungeon if with_dungeon else None)
+    _random_scene(world, rng, dungeon)
+    world.add_processor(MovementSystem(batched=batched))
+    states = []
+    try:
+        for frame in range(frames):
+            world.process(rng.choice([1 / 60, 1 / 30, 0.1]))
+            states.append(_movement_state(world))
+    finally:
+        world.remove_processor(MovementSystem)
+        world.clear_database()
+    return states
+
+
+@pytest.fixture(params=["objects", "columns"])
+def movement_world(request, world):
+    if request.param == "columns":
+        world.set_column_storage(Position)
+        world.set_column_storage(Velocity)
+    yield world
+    if request.param == "columns":
+        world.set_column_storage(Position, None)
+        world.set_column_storage(Velocity, None)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("with_dungeon", [True, False])
+def test_batched_movement_matches_per_entity(movement_world, seed, with_dungeon):
+    """批次移動與逐一處理在隨機場景中必須得到完全相同的位置、速度與刪除結果。"""
+    expected = _simulate(movement_world, seed, batched=False, with_dungeon=with_dungeon)
+    actual = _simulate(movement_world, seed, batched=True, with_dungeon=with_dungeon)
+    assert actual == expected
+    # 場景確實涵蓋撞牆銷毀與滑牆/停止
+    if with_dungeon:
+        assert len(expected[-1]) < 300
+        assert any(vx == 0 and vy == 0 for _, _, _, vx, vy in expected[-1].values())
+
+
+def test_passability_is_rebuilt_for_a_new_grid(world):
+    system = MovementSystem(batched=True)
+    rng = random.Random(0)
+    first, second = _random_dungeon(rng), _random_dungeon(rng)
+    assert system._passability(first) is system._passability(first)
+    table = system._passability(second)
+    assert [bool(table[y * second.grid_width + x]) for y in range(second.grid_height)
+            for x in range(second.grid_width)] == [tile in PASSABLE_TILES for row in second.dungeon_tiles for tile in row]
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_fast_projectile_does_not_tunnel_through_wall(movement_world, batched):
+    """一步跨過整格牆的子彈被銷毀；不會撞牆即銷毀的實體仍只檢查目的格。"""
+    floor, wall = sorted(PASSABLE_TILES)[0], 'Border_wall'
+    tiles = [[wall if x == 3 else floor for x in range(8)] for _ in range(3)]
+    dungeon = SimpleNamespace(grid_width=8, grid_height=3, dungeon_tiles=tiles)
+    movement_world.game.dungeon_manager = SimpleNamespace(get_dungeon=lambda: dungeon)
+    movement_world.add_processor(MovementSystem(batched=batched))
+    # 每 tick 移動 3 格：從第 1 格直接跳到第 4 格
+    bullet = movement_world.create_entity(Position(1.5 * TILE_SIZE, 40), Velocity(3 * TILE_SIZE, 0),
+                                          Collider(destroy_on_collision=True))
+    ghost = movement_world.create_entity(Position(1.5 * TILE_SIZE, 40), Velocity(3 * TILE_SIZE, 0), Collider())
+    away = movement_world.create_entity(Position(4.5 * TILE_SIZE, 40), Velocity(2 * TILE_SIZE, 0),
+                                        Collider(destroy_on_collision=True))
+    try:
+        movement_world.process(1.0)
+    finally:
+        movement_world.remove_processor(MovementSystem)
+
+    assert not movement_world.entity_exists(bullet)
+    assert movement_world.component_for_entity(ghost, Position).x == 4.5 * TILE_SIZE
+    assert movement_world.component_for_entity(away, Position).x == 6.5 * TILE_SIZE
+
+
+def test_hits_are_resolved_as_damage_events(world, monkeypatch):
+    def no_lookup(processor_type):
+        raise AssertionError("combat should not look up processors")
+
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    target = _enemy(world, 100, 100, hp=50)
+    create_standard_bullet_entity(world=world, start_pos=(100.0, 100.0), tag="player", damage=10)
+    received = []
+
+    def on_damage(events):
+        received.extend(events)
+
+    monkeypatch.setattr(world, "get_processor", no_lookup)
+    world.subscribe(DamageEvent, on_damage)
+    try:
+        world.process(0.0)
+    finally:
+        world.unsubscribe(DamageEvent, on_damage)
+
+    assert len(received) == 1
+    event = received[0]
+    assert event.target == target and event.resolved and not event.killed
+    assert world.component_for_entity(target, Health).current_hp == 50 - event.damage
+
+
+def test_collision_matrix_is_symmetric():
+    groups = list(COLLISION_RULES)
+    for a in groups:
+        for b in groups:
+            expected = b in COLLISION_RULES[a] or a in COLLISION_RULES[b]
+            assert interacts(*collision_layers(a), *collision_layers(b)) == expected, (a, b)
+    # collision_mask 覆寫該組預設的遮罩；未註冊的組名視為 "default"
+    assert not interacts(*collision_layers("player", ["npc"]), *collision_layers("enemy"))
+    assert collision_layers("no_such_group") == collision_layers("default")
+
+
+def test_layers_filter_combat_pairs(world):
+    """子彈不與子彈互動；同樣的配對改為 "enemy" 組才會受到傷害。"""
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    shield = world.create_entity(
+        Position(x=100, y=100), Health(max_hp=50, current_hp=50), Defense(),
+        Combat(damage=0), Collider(w=32, h=32, collision_group="projectile"), Tag(tag="enemy"),
+    )
+    create_standard_bullet_entity(world=world, start_pos=(100.0, 100.0), tag="player", damage=10)
+
+    world.process(0.0)
+    assert world.component_for_entity(shield, Health).current_hp == 50
+
+    world.component_for_entity(shield, Collider).collision_group = "enemy"
+    world.component_for_entity(shield, Collider).__post_init__()
+    world.process(0.0)
+    assert world.component_for_entity(shield, Health).current_hp == 40
+
+
+def test_player_explosion_damages_nearby_enemy(world):
+    """玩家 (沒有 Input 的子彈) 的爆炸依碰撞層波及敵人，不波及其他子彈。"""
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    target = _enemy(world, 100, 100)
+    bystander = _enemy(world, 130, 100)
+    other_bullet = world.create_entity(
+        Position(x=130, y=100), Health(max_hp=10, current_hp=10), Combat(damage=0),
+        Collider(w=8, h=8, collision_group="projectile"), Tag(tag="enemy"),
+    )
+    world.create_entity(
+        Position(x=100, y=100), Combat(damage=0, max_penetration_count=0),
+        Collider(w=8, h=8, collision_group="projectile"), Tag(tag="player"), Explosion(range=64, damage=5),
+    )
+
+    world.process(0.0)
+
+    assert world.component_for_entity(bystander, Health).current_hp < 100
+    assert world.component_for_entity(target, Health).current_hp < 100
+    assert world.component_for_entity(other_bullet, Health).current_hp == 10
+
+
+def test_combat_bounds_overlap_matches_pygame_rect():
+    rng = random.Random(0)
+    for _ in range(5000):
+        a = (rng.uniform(-80, 80), rng.uniform(-80, 80), rng.choice([0, -8, rng.randint(1, 96)]), rng.randint(0, 64))
+        b = (rng.uniform(-80, 80), rng.uniform(-80, 80), rng.randint(-16, 96), rng.randint(1, 64))
+        bounds_a, bounds_b = _combat_bounds(*a), _combat_bounds(*b)
+        overlap = bounds_a is not None and bounds_b is not None and _bounds_overlap(bounds_a, bounds_b)
+        assert overlap == pygame.Rect(*a).colliderect(pygame.Rect(*b)), (a, b)
+
+
+def _combat_scene(world, rng, count=160, span=12 * TILE_SIZE):
+    for _ in range(count):
+        roll = rng.random()
+        components = [
+            Position(rng.uniform(0, span), rng.uniform(0, span)),
+            Combat(damage=rng.randint(0, 5), max_penetration_count=rng.choice([0, 1, 3, 2147483647]),
+                   collision_cooldown=rng.choice([0.0, 0.05, 0.2])),
+        ]
+        if roll < 0.8:
+            components.append(Tag(tag=rng.choice(["player", "enemy", "enemy", "trap"])))
+        if rng.random() < 0.9:
+            size = rng.choice([8, 32, 32, 96])
+            components.append(Collider(w=size, h=rng.choice([size, 16]), collision_group=rng.choice(
+                ["default", "player", "enemy", "enemy", "projectile", "bullet", "npc"])))
+        if rng.random() < 0.6:
+            hp = rng.randint(5, 60)
+            components += [Health(max_hp=hp, current_hp=hp), Defense()]
+        if rng.random() < 0.1:
+            components.append(Explosion(range=rng.uniform(16, 64), damage=2))
+        world.create_entity(*components)
+
+
+def _combat_state(world):
+    return {ent: (world.component_for_entity(ent, Health).current_hp if world.has_component(ent, Health) else None,
+                  combat.current_penetration_count, sorted(combat.collision_list.items()))
+            for ent, combat in world.get_component(Combat)}
+
+
+def _simulate_combat(world, seed, broadphase, frames=6):
+    rng = random.Random(seed)
+    _combat_scene(world, rng)
+    world.add_processor(CombatSystem(broadphase=broadphase, cell_size=2 * TILE_SIZE))
+    world.add_processor(HealthSystem())
+    states = []
+    try:
+        for _ in range(frames):
+            world.process(rng.choice([1 / 60, 0.1]))
+            states.append(_combat_state(world))
+            for _, pos in world.get_component(Position):
+                pos.x += rng.uniform(-12, 12)
+                pos.y += rng.uniform(-12, 12)
+    finally:
+        world.remove_processor(CombatSystem)
+        world.remove_processor(HealthSystem)
+        world.clear_database()
+    return states
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_broadphase_combat_matches_pairwise(world, seed):
+    """網格寬相與兩兩比對在隨機場景中必須得到相同的生命值、穿透次數、冷卻與死亡結果。"""
+    expected = _simulate_combat(world, seed, broadphase=False)
+    actual = _simulate_combat(world, seed, broadphase=True)
+    assert actual == expected
+    # 場景確實涵蓋命中、穿透上限銷毀與死亡
+    assert len(expected[-1]) < 160
+    assert any(penetration for _, penetration, _ in expected[0].values())
+
+
+def test_projectile_expires_after_lifetime(world):
+    """子彈在 max_lifetime 後刪除；回收後重用同一個實體 ID 時不受上一段壽命的排程影響。"""
+    world.add_processor(LifetimeSystem())
+    first = create_standard_bullet_entity(world=world, start_pos=(0.0, 0.0), lifetime=0.5)
+    world.process(0.25)
+    world.delete_entity(first)
+    world.process(0.125)
+    assert not world.entity_exists(first)
+
+    second = create_standard_bullet_entity(world=world, start_pos=(0.0, 0.0), lifetime=0.5)
+    assert second == first  # 回收池重用實體
+    for _ in range(3):
+        world.process(0.125)
+    assert world.entity_exists(second)
+    world.process(0.125)  # 到期：本 tick 結束時刪除
+    assert not world.entity_exists(second)
+
+
+def test_expansion_lifecycle_phases(world):
+    world.add_processor(LifetimeSystem())
+    ent = world.create_entity(
+        Position(0, 0), Renderable(), Combat(),
+        ExpansionLifecycle(hide_time=0.5, wait_time=0.25), ExpansionRenderData(expansion_duration=0.5),
+    )
+    lifecycle, rend, combat = (world.component_for_entity(ent, t) for t in (ExpansionLifecycle, Renderable, Combat))
+    world.process(0.25)
+    assert lifecycle.is_hidden and not rend.visible and not combat.can_attack
+    world.process(0.25)
+    assert not lifecycle.is_hidden and rend.visible and combat.can_attack
+    world.process(0.5)
+    assert not lifecycle.expanded
+    world.process(0.25)
+    assert lifecycle.expanded
+
+
+def test_timers_fire_only_when_due(world):
+    pygame.font.init()
+    world.add_processor(TimerSystem())
+    fired = []
+    repeating = world.create_entity(TimerComponent(duration=0.375, on_expire=fired.append))
+    cancelled = world.create_entity(TimerComponent(duration=0.25, on_expire=fired.append))
+    text = create_damage_text_entity(world, damage=3, duration=0.5)
+    world.process(0.125)
+    world.remove_component(cancelled, TimerComponent)
+    for _ in range(2):
+        world.process(0.125)
+    assert fired == [repeating] and world.entity_exists(text)
+    world.process(0.125)
+    assert not world.entity_exists(text)
+    world.process(0.125)
+    assert fired == [repeating]
+    world.process(0.125)
+    assert fired == [repeating, repeating]
+
+
+def test_timers_follow_game_time(world):
+    """有 current_time 時以遊戲時間為準：單次計時器只觸發一次，mark_changed 重新計時，刪除實體即取消。"""
+    world.add_processor(TimerSystem())
+    fired = []
+    one_shot = world.create_entity(TimerComponent(duration=1.0, on_expire=fired.append, repeat=False))
+    restarted = world.create_entity(TimerComponent(duration=1.0, on_expire=fired.append))
+    deleted = world.create_entity(TimerComponent(duration=1.0, on_expire=fired.append))
+    world.process(0.0, current_time=10.0)
+    world.process(0.5, current_time=10.5)
+    world.delete_entity(deleted)
+    world.mark_changed(restarted, TimerComponent)  # 從 10.5 起重新計時
+    world.process(0.5, current_time=11.0)
+    assert fired == [one_shot]
+    assert world.component_for_entity(one_shot, TimerComponent).elapsed_time == 1.0
+    world.process(0.5, current_time=11.5)
+    assert fired == [one_shot, restarted]
+    world.process(0.5, current_time=13.0)
+    assert fired == [one_shot, restarted, restarted]
+
+
+def test_hit_cooldown_uses_expiry_time(world):
+    """命中冷卻以到期時間記錄：冷卻期間不重複命中，到期後再次重疊才比較並移除舊項目。"""
+    world.add_processor(CombatSystem())
+    world.add_processor(HealthSystem())
+    target = _enemy(world, 100, 100)
+    bullet = create_standard_bullet_entity(world=world, start_pos=(100.0, 100.0), tag="player", damage=10,
+                                           max_penetration_count=-1, collision_cooldown=0.25)
+    cooldowns = world.component_for_entity(bullet, Combat).collision_list
+    health = world.component_for_entity(target, Health)
+
+    world.process(0.0, current_time=5.0)
+    assert health.current_hp == 90 and cooldowns == {target: 5.25}
+    world.process(0.125, current_time=5.125)
+    assert health.current_hp == 90
+    world.process(0.125, current_time=5.25)
+    assert health.current_hp == 80 and cooldowns == {target: 5.5}
+
+    world.component_for_entity(target, Position).x = 1000
+    world.process(0.5, current_time=10.0)
+    assert cooldowns == {target: 5.5}  # 沒有再次重疊，不必走訪
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+import esper
+
+from src.core.timestep import FixedTimestep
+from src.ecs.components import Position, Velocity, Renderable
+from src.ecs.systems import MovementSystem, RenderSystem
+
+
+@pytest.fixture
+def world():
+    previous_world = esper.current_world
+    previous_game = getattr(esper, "game", None)
+    esper.switch_world("test_timestep")
+    esper.clear_database()
+    esper.game = None
+    yield esper
+    esper.game = previous_game
+    esper.switch_world(previous_world)
+    esper.delete_world("test_timestep")
+
+
+def _run(frame_times, timestep):
+    return sum(timestep.advance(frame_time) for frame_time in frame_times)
+
+
+def test_tick_count_does_not_depend_on_frame_rate():
+    rng = random.Random(0)
+    irregular = [rng.uniform(0.001, 0.05) for _ in range(200)]
+    total = sum(irregular)
+    regular = [total / 600] * 600
+
+    ticks = [_run(frames, FixedTimestep(60, 5)) for frames in (irregular, regular)]
+    assert ticks[0] == ticks[1] == int(total * 60 + 1e-6)
+
+
+def test_exact_frames_run_one_tick_each():
+    timestep = FixedTimestep(60, 5)
+    assert [timestep.advance(1 / 60) for _ in range(120)] == [1] * 120
+    assert timestep.alpha == pytest.approx(0.0, abs=1e-6)
+
+
+def test_hitch_is_capped_and_excess_time_dropped():
+    timestep = FixedTimestep(60, 5)
+    assert timestep.advance(2.0) == 5
+    assert timestep.behind
+    assert timestep.accumulator < timestep.dt
+    assert timestep.advance(1 / 120) == 0
+    assert not timestep.behind
+    assert timestep.alpha == pytest.approx(0.5)
+
+
+def _simulate(world, frame_times):
+    world.clear_database()
+    rng = random.Random(1)
+    entities = [world.create_entity(Position(rng.uniform(0, 500), rng.uniform(0, 500)),
+                                    Velocity(rng.uniform(-300, 300), rng.uniform(-300, 300)))
+                for _ in range(20)]
+    timestep = FixedTimestep(60, 8)
+    for frame_time in frame_times:
+        for _ in range(timestep.advance(frame_time)):
+            world.process(timestep.dt)
+    return [(world.component_for_entity(ent, Position).x, world.component_for_entity(ent, Position).y)
+            for ent in entities]
+
+
+def test_gameplay_is_identical_for_any_ticks_per_frame(world):
+    """同樣的總時間，不論每幀執行幾個 tick，模擬結果都完全相同。"""
+    world.add_processor(MovementSystem())
+    smooth = _simulate(world, [1 / 60] * 60)
+    slow = _simulate(world, [1 / 15] * 15)
+    fast = _simulate(world, [1 / 240] * 240)
+    assert smooth == slow == fast
+
+
+def test_render_list_interpolates_between_last_two_states(world):
+    system = RenderSystem()
+    walker = world.create_entity(Position(0, 0), Renderable(w=10, h=10))
+    teleport = world.create_entity(Position(0, 0), Renderable(w=10, h=10))
+    system.capture()
+    world.component_for_entity(walker, Position).x = 10
+    world.component_for_entity(teleport, Position).x = 1000
+    spawned = world.create_entity(Position(50, 50), Renderable(w=10, h=10))
+
+    positions = {ent: (x, y) for x, y, _, ent in system.render_list(alpha=0.25)}
+    assert positions[walker] == (2.5, 0)
+    assert positions[teleport] == (1000, 0)
+    assert positions[spawned] == (50, 50)
+    assert {ent: (x, y) for x, y, _, ent in system.render_list()}[walker] == (10, 0)